@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import Attendance, StudentAttendance, Weekend, Holiday
+from .models import Attendance, AttendanceHistory, StudentAttendance, Weekend, Holiday
 
 
 @admin.register(Attendance)
@@ -79,6 +79,18 @@ class StudentAttendanceAdmin(admin.ModelAdmin):
         return super().get_queryset(request).select_related('student', 'attendance', 'attendance__classroom')
 
 
+@admin.register(AttendanceHistory)
+class AttendanceHistoryAdmin(admin.ModelAdmin):
+    list_display = ['attendance', 'action', 'user_name', 'timestamp']
+    list_filter = ['action', 'timestamp']
+    search_fields = ['user_name', 'reason', 'attendance__classroom__code']
+    raw_id_fields = ['attendance', 'user']
+    ordering = ['-timestamp']
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('attendance__classroom')
+
+
 @admin.register(Weekend)
 class WeekendAdmin(admin.ModelAdmin):
     list_display = ['date', 'level', 'created_by', 'created_at']
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from attendance.services.history import backfill_legacy_history
+
+
+class Command(BaseCommand):
+    help = (
+        "Move Attendance.update_history JSON entries into the AttendanceHistory table "
+        "in chunked transactions. Safe to re-run; processed rows are cleared."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Attendances per transaction (default: 500)")
+
+    def handle(self, *args, **options):
+        batch_size: int = options.get("batch_size") or 500
+
+        attendances, entries = backfill_legacy_history(batch_size=batch_size)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Attendance history backfilled. Attendances: {attendances}, Entries: {entries}."
+        ))
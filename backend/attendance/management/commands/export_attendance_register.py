@@ -0,0 +1,68 @@
+import sys
+from datetime import datetime
+
+from django.core.management.base import BaseCommand
+
+from attendance.services.export import (
+    export_classrooms,
+    iter_register_csv,
+    write_register_xlsx,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Export a student x date attendance register for a classroom, level or campus "
+        "over a date range, as CSV (streamed) or XLSX (requires pandas and openpyxl)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", type=str, required=True, help="Start date in YYYY-MM-DD")
+        parser.add_argument("--end", type=str, required=True, help="End date in YYYY-MM-DD")
+        parser.add_argument("--classroom", type=int, default=None, help="Only this classroom ID")
+        parser.add_argument("--level", type=int, default=None, help="Only classrooms of this level ID")
+        parser.add_argument("--campus", type=int, default=None, help="Only classrooms of this campus ID")
+        parser.add_argument("--format", choices=["csv", "xlsx"], default="csv", help="Output format (default: csv)")
+        parser.add_argument("--output", type=str, default=None, help="Output file (default: stdout, CSV only)")
+
+    def handle(self, *args, **options):
+        try:
+            start_date = datetime.strptime(options["start"], "%Y-%m-%d").date()
+            end_date = datetime.strptime(options["end"], "%Y-%m-%d").date()
+        except ValueError:
+            self.stderr.write(self.style.ERROR("Invalid date format. Use YYYY-MM-DD"))
+            return
+
+        if start_date > end_date:
+            self.stderr.write(self.style.ERROR("--start must be on or before --end"))
+            return
+
+        output = options.get("output")
+        export_format = options["format"]
+        if export_format == "xlsx" and not output:
+            self.stderr.write(self.style.ERROR("--output is required for XLSX exports"))
+            return
+
+        classroom_ids = list(export_classrooms(
+            campus_id=options.get("campus"),
+            level_id=options.get("level"),
+            classroom_id=options.get("classroom"),
+        ).values_list("id", flat=True))
+
+        if export_format == "xlsx":
+            try:
+                write_register_xlsx(classroom_ids, start_date, end_date, output)
+            except ImportError as e:
+                self.stderr.write(self.style.ERROR(f"XLSX export needs pandas and openpyxl: {e}"))
+                return
+        elif output:
+            with open(output, "w", encoding="utf-8", newline="") as handle:
+                handle.writelines(iter_register_csv(classroom_ids, start_date, end_date))
+        else:
+            sys.stdout.writelines(iter_register_csv(classroom_ids, start_date, end_date))
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Attendance register exported. Start: {start_date}, End: {end_date}, "
+            f"Classrooms: {len(classroom_ids)}, File: {output}."
+        ))
@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from attendance.services.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild AttendanceDailyRollup rows for a date range from Attendance records. "
+        "By default, rebuilds the last 30 days."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", type=str, default=None, help="Start date in YYYY-MM-DD (default: 30 days ago)")
+        parser.add_argument("--end", type=str, default=None, help="End date in YYYY-MM-DD (default: today)")
+        parser.add_argument("--campus", type=int, default=None, help="Only rebuild rollups for this campus ID")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows written per batch (default: 1000)")
+
+    def handle(self, *args, **options):
+        start_str: str | None = options.get("start")
+        end_str: str | None = options.get("end")
+        campus_id: int | None = options.get("campus")
+        batch_size: int = options.get("batch_size") or 1000
+
+        try:
+            end_date = datetime.strptime(end_str, "%Y-%m-%d").date() if end_str else timezone.now().date()
+            start_date = datetime.strptime(start_str, "%Y-%m-%d").date() if start_str else end_date - timedelta(days=30)
+        except ValueError:
+            self.stderr.write(self.style.ERROR("Invalid date format. Use YYYY-MM-DD"))
+            return
+
+        if start_date > end_date:
+            self.stderr.write(self.style.ERROR("--start must be on or before --end"))
+            return
+
+        processed = rebuild_rollups(start_date, end_date, campus_id=campus_id, batch_size=batch_size)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Attendance rollups rebuilt. Start: {start_date}, End: {end_date}, "
+            f"Campus: {campus_id or 'all'}. Rows: {processed}."
+        ))
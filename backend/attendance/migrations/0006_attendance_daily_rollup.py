@@ -0,0 +1,82 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_rollups(apps, schema_editor):
+    """Populate rollup rows for existing attendance in batches."""
+    Attendance = apps.get_model('attendance', 'Attendance')
+    AttendanceDailyRollup = apps.get_model('attendance', 'AttendanceDailyRollup')
+
+    rows = Attendance.objects.order_by('id').values(
+        'id', 'classroom_id', 'date', 'status', 'is_deleted', 'replaced_by_holiday',
+        'total_students', 'present_count', 'absent_count', 'late_count', 'leave_count',
+        'classroom__shift', 'classroom__grade_id', 'classroom__grade__level_id',
+        'classroom__grade__level__campus_id',
+    )
+    batch = []
+    for row in rows.iterator(chunk_size=1000):
+        batch.append(AttendanceDailyRollup(
+            attendance_id=row['id'],
+            campus_id=row['classroom__grade__level__campus_id'],
+            level_id=row['classroom__grade__level_id'],
+            grade_id=row['classroom__grade_id'],
+            classroom_id=row['classroom_id'],
+            date=row['date'],
+            shift=row['classroom__shift'] or '',
+            status=row['status'],
+            is_deleted=row['is_deleted'],
+            replaced_by_holiday=row['replaced_by_holiday'],
+            total_students=row['total_students'],
+            present_count=row['present_count'],
+            absent_count=row['absent_count'],
+            late_count=row['late_count'],
+            leave_count=row['leave_count'],
+        ))
+        if len(batch) >= 1000:
+            AttendanceDailyRollup.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        AttendanceDailyRollup.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0005_add_holiday_shifts'),
+        ('campus', '0001_initial'),
+        ('classes', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceDailyRollup',
+            fields=[
+                ('attendance', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rollup', serialize=False, to='attendance.attendance')),
+                ('date', models.DateField()),
+                ('shift', models.CharField(blank=True, max_length=20)),
+                ('status', models.CharField(choices=[('draft', 'Draft'), ('submitted', 'Submitted'), ('under_review', 'Under Review'), ('approved', 'Approved')], default='draft', max_length=20)),
+                ('is_deleted', models.BooleanField(default=False)),
+                ('replaced_by_holiday', models.BooleanField(default=False)),
+                ('total_students', models.PositiveIntegerField(default=0)),
+                ('present_count', models.PositiveIntegerField(default=0)),
+                ('absent_count', models.PositiveIntegerField(default=0)),
+                ('late_count', models.PositiveIntegerField(default=0)),
+                ('leave_count', models.PositiveIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+                ('campus', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='attendance_rollups', to='campus.campus')),
+                ('classroom', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_rollups', to='classes.classroom')),
+                ('grade', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='attendance_rollups', to='classes.grade')),
+                ('level', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='attendance_rollups', to='classes.level')),
+            ],
+            options={
+                'verbose_name': 'Attendance Daily Rollup',
+                'verbose_name_plural': 'Attendance Daily Rollups',
+                'ordering': ['-date', 'classroom'],
+                'indexes': [models.Index(fields=['campus', 'date'], name='attendance__campus__b387bd_idx'), models.Index(fields=['level', 'date'], name='attendance__level_i_033e47_idx'), models.Index(fields=['grade', 'date'], name='attendance__grade_i_1c61f1_idx'), models.Index(fields=['date', 'shift'], name='attendance__date_850935_idx')],
+                'unique_together': {('classroom', 'date')},
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:00
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0006_attendance_daily_rollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timestamp', models.DateTimeField(default=django.utils.timezone.now)),
+                ('user_name', models.CharField(blank=True, max_length=255)),
+                ('action', models.CharField(max_length=50)),
+                ('reason', models.TextField(blank=True, null=True)),
+                ('changes', models.JSONField(blank=True, default=dict)),
+                ('attendance', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='history_entries', to='attendance.attendance')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='attendance_history_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Attendance History',
+                'verbose_name_plural': 'Attendance History',
+                'ordering': ['timestamp', 'id'],
+                'indexes': [models.Index(fields=['attendance', 'timestamp'], name='attendance__attenda_34c79f_idx')],
+            },
+        ),
+    ]
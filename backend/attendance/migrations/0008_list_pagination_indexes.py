@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0007_attendance_history'),
+        ('classes', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['is_deleted', '-date', '-id'], name='attendance__is_dele_0094af_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['action', '-timestamp', '-id'], name='attendance__action_e352e5_idx'),
+        ),
+    ]
@@ -90,6 +90,10 @@ class Attendance(models.Model):
     class Meta:
         unique_together = ['classroom', 'date']
         ordering = ['-date', 'classroom']
+        indexes = [
+            # Dashboard lists: is_deleted=False over a date range, newest first
+            models.Index(fields=['is_deleted', '-date', '-id']),
+        ]
         verbose_name = "Attendance"
         verbose_name_plural = "Attendances"
     
@@ -129,41 +133,59 @@ class Attendance(models.Model):
         if self.classroom and not self.classroom.grade:
             raise ValidationError("Classroom must have an associated grade")
     
+    def set_counts(self, statuses):
+        """Set calculated count fields from an iterable of student statuses (no queries, no save)"""
+        statuses = list(statuses)
+        self.total_students = len(statuses)
+        self.present_count = statuses.count('present')
+        self.absent_count = statuses.count('absent')
+        self.late_count = statuses.count('late')
+        self.leave_count = statuses.count('leave')
+
     def update_counts(self):
         """Update attendance counts from student attendance records"""
-        student_attendances = self.student_attendances.all()
-        self.total_students = student_attendances.count()
-        self.present_count = student_attendances.filter(status='present').count()
-        self.absent_count = student_attendances.filter(status='absent').count()
-        self.late_count = student_attendances.filter(status='late').count()
-        self.leave_count = student_attendances.filter(status='leave').count()
+        self.set_counts(self.student_attendances.values_list('status', flat=True))
+        self.save_counts()
+
+    def save_counts(self):
+        """Persist only the calculated count fields"""
         # Use update_fields to prevent infinite recursion
         super(Attendance, self).save(update_fields=[
             'total_students', 'present_count', 'absent_count', 
             'late_count', 'leave_count', 'updated_at'
         ])
     
-    def add_edit_history(self, user, action, reason=None, changes=None):
-        """Add entry to edit history"""
-        history_entry = {
-            'timestamp': timezone.now().isoformat(),
-            'user_id': user.id,
-            'user_name': user.get_full_name() or user.username,
-            'action': action,
-            'reason': reason,
-            'changes': changes or {}
-        }
-        self.update_history.append(history_entry)
-        self.last_edited_at = timezone.now()
+    def add_edit_history(self, user, action, reason=None, changes=None, save=True):
+        """
+        Append an entry to the edit history (one INSERT into AttendanceHistory).
+        Pass save=False when the caller saves the attendance right after.
+        """
+        entry = AttendanceHistory.objects.create(
+            attendance=self,
+            user=user,
+            user_name=user.get_full_name() or user.username,
+            action=action,
+            reason=reason,
+            changes=changes or {}
+        )
+        self.last_edited_at = entry.timestamp
         self.updated_by = user
-        self.save(update_fields=['update_history', 'last_edited_at', 'updated_by'])
+        if save:
+            super(Attendance, self).save(update_fields=['last_edited_at', 'updated_by', 'updated_at'])
+        return entry
+    
+    def get_edit_history(self):
+        """Full edit history, oldest first: entries not yet backfilled from update_history, then the table"""
+        return list(self.update_history or []) + [
+            entry.as_entry() for entry in self.history_entries.all()
+        ]
     
     def soft_delete(self, user, reason=None):
         """Soft delete attendance record"""
         self.is_deleted = True
         self.deleted_at = timezone.now()
         self.deleted_by = user
-        self.add_edit_history(user, 'deleted', reason)
+        self.add_edit_history(user, 'deleted', reason, save=False)
         self.save()
     
     def restore(self, user, reason=None):
@@ -171,7 +193,7 @@ class Attendance(models.Model):
         self.is_deleted = False
         self.deleted_at = None
         self.deleted_by = None
-        self.add_edit_history(user, 'restored', reason)
+        self.add_edit_history(user, 'restored', reason, save=False)
         self.save()
     
     def save(self, *args, **kwargs):
@@ -188,6 +210,54 @@ class Attendance(models.Model):
         super().save(*args, **kwargs)
 
 
+class AttendanceHistory(models.Model):
+    """
+    Append-only edit history for an attendance. Replaces the
+    Attendance.update_history JSON list, which is only read for entries
+    not yet moved by the backfill_attendance_history command.
+    """
+    attendance = models.ForeignKey(
+        Attendance,
+        on_delete=models.CASCADE,
+        related_name='history_entries'
+    )
+    timestamp = models.DateTimeField(default=timezone.now)
+    user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='attendance_history_entries'
+    )
+    # Kept so the entry still reads correctly after the user is removed
+    user_name = models.CharField(max_length=255, blank=True)
+    action = models.CharField(max_length=50)
+    reason = models.TextField(null=True, blank=True)
+    changes = models.JSONField(default=dict, blank=True)
+    
+    class Meta:
+        ordering = ['timestamp', 'id']
+        indexes = [
+            models.Index(fields=['attendance', 'timestamp']),
+        ]
+        verbose_name = "Attendance History"
+        verbose_name_plural = "Attendance History"
+    
+    def __str__(self):
+        return f"{self.attendance_id} - {self.action} @ {self.timestamp}"
+    
+    def as_entry(self):
+        """Same shape as the legacy update_history JSON entries"""
+        return {
+            'timestamp': self.timestamp.isoformat(),
+            'user_id': self.user_id,
+            'user_name': self.user_name,
+            'action': self.action,
+            'reason': self.reason,
+            'changes': self.changes or {}
+        }
+
+
 class StudentAttendance(models.Model):
     """Model for tracking individual student attendance with audit trail"""
     STATUS_CHOICES = [
@@ -358,6 +428,7 @@ class AuditLog(models.Model):
             models.Index(fields=['feature', 'action']),
             models.Index(fields=['entity_type', 'entity_id']),
             models.Index(fields=['user', 'timestamp']),
+            models.Index(fields=['action', '-timestamp', '-id']),
         ]
     
     def __str__(self):
@@ -382,3 +453,59 @@ class Weekend(models.Model):
     
     def __str__(self):
         return f"Weekend - {self.date} ({self.level.name})"
+
+
+class AttendanceDailyRollup(models.Model):
+    """
+    Denormalized per-classroom daily attendance totals for dashboards.
+    Kept in sync from Attendance saves (see attendance.services.rollups) so
+    analytics can range-scan by campus/level/grade/date without joining
+    through classroom -> grade -> level.
+    """
+    attendance = models.OneToOneField(
+        Attendance,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='rollup'
+    )
+    campus = models.ForeignKey('campus.Campus', on_delete=models.SET_NULL, null=True, blank=True, related_name='attendance_rollups')
+    level = models.ForeignKey('classes.Level', on_delete=models.SET_NULL, null=True, blank=True, related_name='attendance_rollups')
+    grade = models.ForeignKey('classes.Grade', on_delete=models.SET_NULL, null=True, blank=True, related_name='attendance_rollups')
+    classroom = models.ForeignKey('classes.ClassRoom', on_delete=models.CASCADE, related_name='attendance_rollups')
+    date = models.DateField()
+    shift = models.CharField(max_length=20, blank=True)
+    
+    # Mirrored from Attendance so readers can apply the same filters
+    status = models.CharField(max_length=20, choices=Attendance.STATUS_CHOICES, default='draft')
+    is_deleted = models.BooleanField(default=False)
+    replaced_by_holiday = models.BooleanField(default=False)
+    
+    total_students = models.PositiveIntegerField(default=0)
+    present_count = models.PositiveIntegerField(default=0)
+    absent_count = models.PositiveIntegerField(default=0)
+    late_count = models.PositiveIntegerField(default=0)
+    leave_count = models.PositiveIntegerField(default=0)
+    
+    refreshed_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['classroom', 'date']
+        ordering = ['-date', 'classroom']
+        indexes = [
+            models.Index(fields=['campus', 'date']),
+            models.Index(fields=['level', 'date']),
+            models.Index(fields=['grade', 'date']),
+            models.Index(fields=['date', 'shift']),
+        ]
+        verbose_name = "Attendance Daily Rollup"
+        verbose_name_plural = "Attendance Daily Rollups"
+    
+    def __str__(self):
+        return f"Rollup {self.classroom_id} - {self.date}"
+    
+    @property
+    def attendance_percentage(self):
+        """Same calculation as Attendance.attendance_percentage"""
+        if self.total_students == 0:
+            return 0
+        return round((self.present_count / self.total_students) * 100, 2)
@@ -3,13 +3,14 @@ from graphene_django import DjangoObjectType
 from graphene_django.filter import DjangoFilterConnectionField
 from graphene import relay
 from django.contrib.auth import get_user_model
-from .models import Attendance, StudentAttendance
+from .models import Attendance, AttendanceDailyRollup, StudentAttendance
 from students.models import Student
 from classes.models import ClassRoom
 from teachers.models import Teacher
 from coordinator.models import Coordinator
 from principals.models import Principal
-from django.db.models import Q
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
 from datetime import datetime, timedelta
 # import graphql_jwt  # Commented out - not compatible with Django 5.0
 
@@ -87,7 +88,7 @@ class AttendanceType(DjangoObjectType):
         return self.is_editable
     
     def resolve_edit_history(self, info):
-        return self.update_history
+        return self.get_edit_history()
 
 
 class AttendanceStatsType(graphene.ObjectType):
@@ -302,19 +303,25 @@ class Query(graphene.ObjectType):
             )
         
         elif classroom_id:
-            # Classroom statistics
+            # Classroom statistics (read from the daily rollup)
             classroom = ClassRoom.objects.get(id=classroom_id)
-            attendances = Attendance.objects.filter(
+            totals = AttendanceDailyRollup.objects.filter(
                 classroom=classroom,
                 date__range=[start_date, end_date],
                 is_deleted=False
+            ).aggregate(
+                total_days=Count('pk'),
+                total_present=Coalesce(Sum('present_count'), 0),
+                total_absent=Coalesce(Sum('absent_count'), 0),
+                total_late=Coalesce(Sum('late_count'), 0),
+                total_leave=Coalesce(Sum('leave_count'), 0),
             )
             
-            total_days = attendances.count()
-            total_present = sum(att.present_count for att in attendances)
-            total_absent = sum(att.absent_count for att in attendances)
-            total_late = sum(att.late_count for att in attendances)
-            total_leave = sum(att.leave_count for att in attendances)
+            total_days = totals['total_days']
+            total_present = totals['total_present']
+            total_absent = totals['total_absent']
+            total_late = totals['total_late']
+            total_leave = totals['total_leave']
             
             attendance_percentage = (total_present / (total_present + total_absent) * 100) if (total_present + total_absent) > 0 else 0
             
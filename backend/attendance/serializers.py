@@ -1,3 +1,4 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
 from .models import Attendance, StudentAttendance, Weekend, AuditLog
 from students.models import Student
@@ -237,6 +238,14 @@ class AttendanceSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
     
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load every relation the serializer reads so lists run a fixed number of queries"""
+        # Legacy edit history is not serialized; served by the history endpoint
+        return queryset.defer('update_history').select_related('classroom__grade__level', 'marked_by').prefetch_related(
+            Prefetch('student_attendances', queryset=StudentAttendance.objects.select_related('student'))
+        )
+    
     def get_marked_by_name(self, obj):
         if obj.marked_by:
             return obj.marked_by.get_full_name()
@@ -247,14 +256,16 @@ class AttendanceSerializer(serializers.ModelSerializer):
         return obj.date.weekday() == 6  # Sunday is 6 in Python's weekday()
     
     def get_is_holiday(self, obj):
-        """Check if the date is a holiday for this level"""
+        """Check if the date is a holiday for this classroom's level and grade"""
         try:
-            from .models import Holiday
-            level = obj.classroom.grade.level
-            return Holiday.objects.filter(
-                date=obj.date,
-                level=level
-            ).exists()
+            from .services.school_calendar import CalendarLookup
+            # One lookup per serialization so list responses share the cached calendars
+            root = self.root
+            lookup = getattr(root, '_calendar_lookup', None)
+            if lookup is None:
+                lookup = root._calendar_lookup = CalendarLookup()
+            grade = obj.classroom.grade
+            return lookup(obj.date).holiday_for(obj.date, grade.level_id, grade.id) is not None
         except:
             return False
     
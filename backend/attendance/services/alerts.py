@@ -4,16 +4,23 @@ from dataclasses import dataclass
 from datetime import timedelta
 from typing import Optional, Sequence, TYPE_CHECKING
 
-from django.db.models import QuerySet
+from django.conf import settings
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
 from attendance.models import StudentAttendance
+from attendance.services.school_calendar import non_school_days
 from notifications.models import Notification
-from notifications.services import create_notification
+from notifications.services import create_notification_batch
+from students.models import Student
 from teachers.models import Teacher
 
 if TYPE_CHECKING:
     from users.models import User
 
 
+DEFAULT_STREAK_LENGTH = 3
+
+
 @dataclass(frozen=True)
 class ConsecutiveAbsenceAlert:
     student_id: int
@@ -53,30 +60,62 @@ def _get_class_teacher_user(classroom) -> Optional["User"]:
     return None
 
 
-def _recent_attendance_queryset(student_id: int, classroom_id: int, up_to_date) -> QuerySet[StudentAttendance]:
-    return (
+def _non_school_days(classroom, start_date, end_date) -> set:
+    """
+    Dates in [start_date, end_date] on which the classroom does not meet:
+    Sundays, level weekends, and holidays targeting the classroom's level/grade.
+    """
+    grade = getattr(classroom, "grade", None)
+    return non_school_days(getattr(grade, "level_id", None), getattr(grade, "id", None), start_date, end_date)
+
+
+def _recent_statuses(student_ids, classroom_id: int, start_date, end_date, limit: int) -> dict[int, list[tuple]]:
+    """
+    Fetch the latest ``limit`` (date, status) pairs per student in one query.
+    A ROW_NUMBER() window partitioned by student keeps the result bounded.
+    """
+    rows = (
         StudentAttendance.objects.filter(
-            student_id=student_id,
+            student_id__in=student_ids,
             attendance__classroom_id=classroom_id,
-            attendance__date__lte=up_to_date,
+            attendance__date__range=[start_date, end_date],
             is_deleted=False,
         )
-        .select_related("attendance")
-        .order_by("-attendance__date")[:4]
+        .annotate(
+            row_number=Window(
+                expression=RowNumber(),
+                partition_by=[F("student_id")],
+                order_by=F("attendance__date").desc(),
+            )
+        )
+        .filter(row_number__lte=limit)
+        .values_list("student_id", "attendance__date", "status")
+        .order_by("student_id", "-attendance__date")
     )
 
+    history: dict[int, list[tuple]] = {}
+    for student_id, record_date, record_status in rows:
+        history.setdefault(student_id, []).append((record_date, record_status))
+    return history
 
-def _calculate_absence_streak(records: Sequence[StudentAttendance], anchor_date) -> int:
+
+def _calculate_absence_streak(records: Sequence[tuple], anchor_date, skip_days: Optional[set] = None) -> int:
     """
     Count consecutive 'absent' statuses starting from the provided anchor date.
-    Ensures dates are contiguous (no gaps) so weekends or missing days break the streak.
+    ``records`` are (date, status) pairs newest first. Dates must be contiguous
+    so missing days break the streak; dates in ``skip_days`` (weekends and
+    holidays in calendar-aware mode) are stepped over instead.
     """
+    skip_days = skip_days or set()
     streak = 0
     expected_date = anchor_date
 
-    for record in records:
-        record_date = record.attendance.date
-        if record.status != "absent":
+    for record_date, record_status in records:
+        if record_date in skip_days:
+            continue
+        while expected_date in skip_days:
+            expected_date = expected_date - timedelta(days=1)
+        if record_status != "absent":
             break
         if record_date != expected_date:
             break
@@ -87,19 +126,78 @@ def _calculate_absence_streak(records: Sequence[StudentAttendance], anchor_date)
     return streak
 
 
-def _notification_exists(recipient, student_id: int, classroom_id: int, absent_date: str) -> bool:
-    return Notification.objects.filter(
-        recipient=recipient,
-        data__student_id=student_id,
-        data__classroom_id=classroom_id,
-        data__last_absent_date=absent_date,
-    ).exists()
+def _alerted_student_ids(recipient, classroom_id: int, absent_date: str) -> set[int]:
+    """Students already alerted to ``recipient`` for this classroom and date (one query)."""
+    return {
+        int(student_id)
+        for student_id in Notification.objects.filter(
+            recipient=recipient,
+            data__classroom_id=classroom_id,
+            data__last_absent_date=absent_date,
+        ).values_list("data__student_id", flat=True)
+        if student_id is not None
+    }
+
+
+def detect_consecutive_absences(
+    attendance,
+    streak_length: Optional[int] = None,
+    calendar_aware: Optional[bool] = None,
+) -> dict[int, int]:
+    """
+    Return {student_id: streak} for students absent on ``attendance.date``
+    whose consecutive absence streak reaches ``streak_length``.
 
+    Runs one query for today's absentees and one windowed history query,
+    plus the calendar lookups when ``calendar_aware`` is enabled.
+    """
+    if streak_length is None:
+        streak_length = getattr(settings, "ATTENDANCE_ABSENCE_STREAK_LENGTH", DEFAULT_STREAK_LENGTH)
+    if calendar_aware is None:
+        calendar_aware = getattr(settings, "ATTENDANCE_ABSENCE_CALENDAR_AWARE", False)
+    streak_length = max(int(streak_length), 1)
+
+    absent_ids = list(
+        attendance.student_attendances.filter(status="absent").values_list("student_id", flat=True)
+    )
+    if not absent_ids:
+        return {}
+
+    anchor_date = attendance.date
+    skip_days: set = set()
+    if calendar_aware:
+        # Widen the lookback so weekends/holidays inside the streak are covered
+        lookback_days = streak_length * 2 + 7
+        start_date = anchor_date - timedelta(days=lookback_days)
+        skip_days = _non_school_days(attendance.classroom, start_date, anchor_date)
+    else:
+        start_date = anchor_date - timedelta(days=streak_length)
+
+    history = _recent_statuses(
+        absent_ids,
+        attendance.classroom_id,
+        start_date,
+        anchor_date,
+        limit=streak_length + 1 + len(skip_days),
+    )
+
+    streaks: dict[int, int] = {}
+    for student_id, records in history.items():
+        streak = _calculate_absence_streak(records, anchor_date, skip_days)
+        if streak >= streak_length:
+            streaks[student_id] = streak
+    return streaks
 
-def process_consecutive_absence_alerts(attendance) -> list[ConsecutiveAbsenceAlert]:
+
+def process_consecutive_absence_alerts(
+    attendance,
+    streak_length: Optional[int] = None,
+    calendar_aware: Optional[bool] = None,
+) -> list[ConsecutiveAbsenceAlert]:
     """
-    Detect students who have reached a 3-day consecutive absence streak (excluding leaves).
-    Sends a notification to the class teacher when a streak hits 3 days.
+    Detect students who have reached a consecutive absence streak (excluding leaves).
+    Sends a notification to the class teacher when a streak hits ``streak_length``
+    days (default 3, see ATTENDANCE_ABSENCE_STREAK_LENGTH).
     Returns a list of alerts that were generated for downstream usage (e.g., logging).
     """
     classroom = attendance.classroom
@@ -107,32 +205,20 @@ def process_consecutive_absence_alerts(attendance) -> list[ConsecutiveAbsenceAle
     if not teacher_user:
         return []
 
-    alerts: list[ConsecutiveAbsenceAlert] = []
-    current_date_iso = attendance.date.isoformat()
-
-    for student_attendance in attendance.student_attendances.select_related("student"):
-        if student_attendance.status != "absent":
-            continue
-
-        recent_records = list(
-            _recent_attendance_queryset(
-                student_attendance.student_id,
-                classroom.id,
-                attendance.date,
-            )
-        )
-        if not recent_records:
-            continue
-
-        streak = _calculate_absence_streak(recent_records, attendance.date)
-        if streak < 3:
-            continue
-
-        student = student_attendance.student
+    streaks = detect_consecutive_absences(attendance, streak_length, calendar_aware)
+    if not streaks:
+        return []
 
-        if _notification_exists(teacher_user, student.id, classroom.id, current_date_iso):
-            continue
+    current_date_iso = attendance.date.isoformat()
+    already_alerted = _alerted_student_ids(teacher_user, classroom.id, current_date_iso)
+    pending_ids = [student_id for student_id in streaks if student_id not in already_alerted]
+    if not pending_ids:
+        return []
 
+    alerts: list[ConsecutiveAbsenceAlert] = []
+    entries = []
+    for student in Student.objects.filter(id__in=pending_ids).only("id", "name").order_by("id"):
+        streak = streaks[student.id]
         alert = ConsecutiveAbsenceAlert(
             student_id=student.id,
             student_name=student.name,
@@ -143,12 +229,11 @@ def process_consecutive_absence_alerts(attendance) -> list[ConsecutiveAbsenceAle
 
         verb = f"{student.name} has missed class for {streak} consecutive days"
         target_text = f"Class {classroom} • Please reach out to the student or guardians."
-        create_notification(
-            recipient=teacher_user,
-            actor=None,
-            verb=verb,
-            target_text=target_text,
-            data={
+        entries.append((
+            teacher_user.id,
+            verb,
+            target_text,
+            {
                 "student_id": student.id,
                 "student_name": student.name,
                 "classroom_id": classroom.id,
@@ -156,7 +241,9 @@ def process_consecutive_absence_alerts(attendance) -> list[ConsecutiveAbsenceAle
                 "streak_length": streak,
                 "last_absent_date": current_date_iso,
             },
-        )
+        ))
 
-    return alerts
+    # One insert for the whole class, however many streaks it has
+    create_notification_batch(entries)
 
+    return alerts
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterable, Optional, TYPE_CHECKING
+
+from django.db import transaction
+from django.utils import timezone
+
+from attendance.models import Attendance, AttendanceHistory, AuditLog
+from attendance.services.rollups import sync_attendance_rollups
+from notifications.services import create_notification_batch, defer_after_commit
+from users.scope import coordinator_level_ids
+
+if TYPE_CHECKING:
+    from coordinator.models import Coordinator
+    from users.models import User
+
+
+APPROVABLE_STATUSES = ('draft', 'submitted', 'under_review')
+
+APPROVAL_UPDATE_FIELDS = [
+    'status', 'is_final', 'finalized_at', 'finalized_by',
+    'last_edited_at', 'updated_by', 'updated_at',
+]
+
+
+@dataclass
+class BulkApprovalResult:
+    approved_ids: list = field(default_factory=list)
+    errors: list = field(default_factory=list)
+
+    @property
+    def approved_count(self) -> int:
+        return len(self.approved_ids)
+
+    @property
+    def failed_count(self) -> int:
+        return len(self.errors)
+
+
+def _teacher_notification(attendance: Attendance, coordinator_name: str) -> Optional[tuple]:
+    """(recipient_id, verb, target_text, data) for the teacher who marked the attendance."""
+    if attendance.marked_by_id:
+        recipient_id = attendance.marked_by_id
+    else:
+        teacher = attendance.classroom.class_teacher if attendance.classroom else None
+        recipient_id = teacher.user_id if teacher else None
+    if not recipient_id:
+        return None
+    return (
+        recipient_id,
+        "Your attendance has been approved",
+        f"by {coordinator_name} for {attendance.classroom} on {attendance.date.strftime('%B %d, %Y')}.",
+        {"attendance_id": attendance.id, "classroom_id": attendance.classroom_id},
+    )
+
+
+def bulk_approve_attendance(
+    user: "User",
+    coordinator: "Coordinator",
+    attendance_ids: Iterable,
+    comment: str = '',
+    ip_address: Optional[str] = None,
+) -> BulkApprovalResult:
+    """
+    Approve many attendances for a coordinator with set-based queries.
+
+    Authorization and status checks come from one locked query scoped to
+    the coordinator's levels. Status is written with one bulk UPDATE, history
+    and audit rows with one bulk INSERT each, and teacher notifications are
+    created after commit.
+    """
+    result = BulkApprovalResult()
+    ids = []
+    for raw_id in attendance_ids:
+        try:
+            ids.append(int(raw_id))
+        except (TypeError, ValueError):
+            result.errors.append(f"Attendance {raw_id}: Invalid id")
+
+    level_ids = set(coordinator_level_ids(coordinator))
+    now = timezone.now()
+    user_name = user.get_full_name() or user.username
+    reason = f'Bulk approved by coordinator{": " + comment if comment else ""}'
+
+    with transaction.atomic():
+        attendances = {
+            attendance.id: attendance
+            for attendance in Attendance.objects.select_for_update(of=('self',))
+            .filter(id__in=set(ids), is_deleted=False)
+            .select_related('classroom__grade', 'classroom__class_teacher')
+        }
+
+        approved = []
+        for attendance_id in ids:
+            attendance = attendances.get(attendance_id)
+            if attendance is None:
+                result.errors.append(f"Attendance {attendance_id}: Not found")
+                continue
+            # Checked before access, and catches IDs repeated in the request
+            if attendance.status not in APPROVABLE_STATUSES:
+                result.errors.append(f"Attendance {attendance_id}: Cannot approve (status: {attendance.status})")
+                continue
+            grade = attendance.classroom.grade if attendance.classroom else None
+            if not grade or grade.level_id not in level_ids:
+                result.errors.append(f"Attendance {attendance_id}: Access denied")
+                continue
+
+            attendance.status = 'approved'
+            attendance.is_final = True
+            attendance.finalized_at = now
+            attendance.finalized_by = user
+            attendance.last_edited_at = now
+            attendance.updated_by = user
+            attendance.updated_at = now
+            approved.append(attendance)
+
+        if not approved:
+            return result
+
+        Attendance.objects.bulk_update(approved, APPROVAL_UPDATE_FIELDS)
+        AttendanceHistory.objects.bulk_create([
+            AttendanceHistory(
+                attendance=attendance,
+                timestamp=now,
+                user=user,
+                user_name=user_name,
+                action='coordinator_approve',
+                reason=reason,
+            )
+            for attendance in approved
+        ])
+        AuditLog.objects.bulk_create([
+            AuditLog(
+                feature='attendance',
+                action='coordinator_approve',
+                entity_type='Attendance',
+                entity_id=attendance.id,
+                user=user,
+                ip_address=ip_address,
+                changes={'status': 'approved', 'bulk_approval': True},
+            )
+            for attendance in approved
+        ])
+        # bulk_update skips post_save, so refresh the rollups directly
+        sync_attendance_rollups(approved)
+
+        coordinator_name = coordinator.full_name or user.get_full_name() or user.username
+        notifications = [
+            entry for entry in (_teacher_notification(attendance, coordinator_name) for attendance in approved)
+            if entry
+        ]
+        if notifications:
+            defer_after_commit(create_notification_batch, notifications, actor=user)
+
+    result.approved_ids = [attendance.id for attendance in approved]
+    return result
@@ -0,0 +1,196 @@
+"""
+Student x date attendance registers for a classroom, level or campus.
+
+Rows are read with one ordered query over a server-side cursor
+(``QuerySet.iterator``) and grouped per student as they arrive, so CSV
+memory does not grow with the date range or the number of classrooms.
+XLSX goes through pandas, one sheet per classroom, and holds one
+classroom's register at a time before it is written to a temporary file.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import tempfile
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Iterable, Iterator, Optional
+
+from attendance.models import StudentAttendance
+from classes.models import ClassRoom
+
+STATUS_CODES = {
+    'present': 'P',
+    'absent': 'A',
+    'late': 'L',
+    'leave': 'LV',
+    'excused': 'E',
+}
+
+TOTAL_COLUMNS = ['Present', 'Absent', 'Late', 'Leave', 'Excused']
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+@dataclass
+class RegisterRow:
+    classroom_id: int
+    classroom_code: str
+    classroom: str
+    student_code: str
+    student_name: str
+    marks: dict = field(default_factory=dict)
+
+    def cells(self, dates: list) -> list:
+        return [STATUS_CODES.get(self.marks.get(day), '') for day in dates]
+
+    def totals(self) -> list:
+        statuses = list(self.marks.values())
+        return [statuses.count(status) for status in STATUS_CODES]
+
+
+def date_range(start: date, end: date) -> list:
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+
+def export_classrooms(campus_id: Optional[int] = None, level_id: Optional[int] = None,
+                      classroom_id: Optional[int] = None, allowed_ids: Optional[Iterable[int]] = None):
+    """Classrooms covered by an export, in register order."""
+    classrooms = ClassRoom.objects.all()
+    if classroom_id:
+        classrooms = classrooms.filter(id=classroom_id)
+    if level_id:
+        classrooms = classrooms.filter(grade__level_id=level_id)
+    if campus_id:
+        classrooms = classrooms.filter(grade__level__campus_id=campus_id)
+    if allowed_ids is not None:
+        classrooms = classrooms.filter(id__in=set(allowed_ids))
+    return classrooms.order_by('grade__level__name', 'grade__name', 'section', 'id')
+
+
+def iter_register(classroom_ids: Iterable[int], start: date, end: date,
+                  chunk_size: int = 2000) -> Iterator[RegisterRow]:
+    """
+    Yield one RegisterRow per (classroom, student) with their statuses for
+    the range. Only rows from live (not deleted, not holiday-replaced)
+    attendance records are included.
+    """
+    rows = (
+        StudentAttendance.objects
+        .filter(
+            attendance__classroom_id__in=list(classroom_ids),
+            attendance__date__range=(start, end),
+            attendance__is_deleted=False,
+            attendance__replaced_by_holiday=False,
+            is_deleted=False,
+        )
+        .order_by(
+            'attendance__classroom__grade__level__name', 'attendance__classroom__grade__name',
+            'attendance__classroom__section', 'attendance__classroom_id',
+            'student__name', 'student_id', 'attendance__date',
+        )
+        .values_list(
+            'attendance__classroom_id', 'attendance__classroom__code',
+            'attendance__classroom__grade__name', 'attendance__classroom__section',
+            'student_id', 'student__student_code', 'student__student_id', 'student__name',
+            'attendance__date', 'status',
+        )
+        .iterator(chunk_size=chunk_size)
+    )
+
+    current = None
+    current_key = None
+    for classroom_id, classroom_code, grade_name, section, student_pk, code, student_id, name, day, mark in rows:
+        key = (classroom_id, student_pk)
+        if key != current_key:
+            if current is not None:
+                yield current
+            current_key = key
+            current = RegisterRow(
+                classroom_id=classroom_id,
+                classroom_code=classroom_code or '',
+                classroom=f"{grade_name} - {section}",
+                student_code=code or student_id or '',
+                student_name=name or '',
+            )
+        current.marks[day] = mark
+    if current is not None:
+        yield current
+
+
+def register_header(dates: list) -> list:
+    columns = ['Class Code', 'Classroom', 'Student Code', 'Student Name']
+    return columns + [day.isoformat() for day in dates] + TOTAL_COLUMNS
+
+
+def iter_register_csv(classroom_ids: Iterable[int], start: date, end: date) -> Iterator[str]:
+    """The register as CSV text, one line at a time."""
+    dates = date_range(start, end)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def line(values):
+        writer.writerow(values)
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return text
+
+    yield line(register_header(dates))
+    for row in iter_register(classroom_ids, start, end):
+        yield line(
+            [row.classroom_code, row.classroom, row.student_code, row.student_name]
+            + row.cells(dates) + row.totals()
+        )
+
+
+def xlsx_available() -> bool:
+    """Whether pandas and its openpyxl engine import; check before streaming starts."""
+    try:
+        import openpyxl  # noqa: F401
+        import pandas  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def write_register_xlsx(classroom_ids: Iterable[int], start: date, end: date, target) -> None:
+    """
+    Write the register to ``target`` (path or binary file) with one sheet per
+    classroom. Requires pandas with an Excel engine (openpyxl).
+    """
+    import pandas as pd
+
+    dates = date_range(start, end)
+    columns = register_header(dates)[2:]
+
+    def flush(writer, sheet, rows):
+        frame = pd.DataFrame(rows, columns=columns)
+        frame.to_excel(writer, sheet_name=sheet[:31], index=False)
+
+    with pd.ExcelWriter(target, engine='openpyxl') as writer:
+        classroom_id, sheet, rows = None, None, []
+        wrote = False
+        for row in iter_register(classroom_ids, start, end):
+            if row.classroom_id != classroom_id:
+                if rows:
+                    flush(writer, sheet, rows)
+                    wrote = True
+                # Codes are unique, labels repeat across shifts
+                classroom_id, sheet, rows = row.classroom_id, row.classroom_code or row.classroom, []
+            rows.append([row.student_code, row.student_name] + row.cells(dates) + row.totals())
+        if rows or not wrote:
+            flush(writer, sheet or 'Register', rows)
+
+
+def iter_register_xlsx(classroom_ids: Iterable[int], start: date, end: date,
+                       block_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Build the XLSX in a temporary file and yield it in blocks."""
+    with tempfile.TemporaryFile() as handle:
+        write_register_xlsx(classroom_ids, start, end, handle)
+        handle.seek(0)
+        while True:
+            block = handle.read(block_size)
+            if not block:
+                break
+            yield block
@@ -0,0 +1,112 @@
+"""
+Attendance edit history: paging over AttendanceHistory rows and moving the
+legacy Attendance.update_history JSON lists into the table.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from attendance.models import Attendance, AttendanceHistory
+
+
+class EditHistorySequence:
+    """
+    Sized, sliceable view of one attendance's history (legacy JSON entries
+    first, then table rows) so a paginator only loads the requested page.
+    """
+
+    def __init__(self, attendance: Attendance):
+        self.legacy = list(attendance.update_history or [])
+        self.queryset = attendance.history_entries.all()
+        self._table_count: Optional[int] = None
+
+    def count(self) -> int:
+        if self._table_count is None:
+            self._table_count = self.queryset.count()
+        return len(self.legacy) + self._table_count
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start, stop = index.start or 0, index.stop if index.stop is not None else self.count()
+        legacy = self.legacy[start:stop]
+        table_start = max(start - len(self.legacy), 0)
+        table_stop = stop - len(self.legacy)
+        if table_stop <= table_start:
+            return legacy
+        return legacy + [entry.as_entry() for entry in self.queryset[table_start:table_stop]]
+
+
+def _parse_timestamp(value) -> datetime:
+    parsed = parse_datetime(value) if isinstance(value, str) else None
+    if parsed is None:
+        return timezone.now()
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _history_row(attendance_id: int, entry: dict) -> AttendanceHistory:
+    return AttendanceHistory(
+        attendance_id=attendance_id,
+        timestamp=_parse_timestamp(entry.get('timestamp')),
+        user_id=entry.get('user_id'),
+        user_name=entry.get('user_name') or '',
+        action=str(entry.get('action') or '')[:50],
+        reason=entry.get('reason'),
+        changes=entry.get('changes') or {},
+    )
+
+
+def backfill_legacy_history(batch_size: int = 500) -> tuple[int, int]:
+    """
+    Move update_history JSON entries into AttendanceHistory, ``batch_size``
+    attendances per transaction. Each batch inserts the rows and clears the
+    JSON lists together, so entries are never read twice and an interrupted
+    run can simply be restarted. Returns (attendances, entries) moved.
+    """
+    from users.models import User
+
+    batch_size = max(int(batch_size or 1), 1)
+    attendances_moved = entries_moved = 0
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                Attendance.objects.select_for_update()
+                .filter(id__gt=last_id)
+                .exclude(update_history=[])
+                .order_by('id')
+                .only('id', 'update_history')[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            rows = [
+                _history_row(attendance.id, entry)
+                for attendance in batch
+                for entry in (attendance.update_history or [])
+                if isinstance(entry, dict)
+            ]
+            # Entries may point at users that have since been removed
+            user_ids = {row.user_id for row in rows if row.user_id}
+            existing = set(User.objects.filter(id__in=user_ids).values_list('id', flat=True)) if user_ids else set()
+            for row in rows:
+                if row.user_id not in existing:
+                    row.user_id = None
+
+            AttendanceHistory.objects.bulk_create(rows, batch_size=1000)
+            Attendance.objects.filter(id__in=[attendance.id for attendance in batch]).update(update_history=[])
+
+        attendances_moved += len(batch)
+        entries_moved += len(rows)
+    return attendances_moved, entries_moved
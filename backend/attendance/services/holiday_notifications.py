@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from attendance.models import Holiday
+from classes.models import ClassRoom, Level
+from coordinator.models import Coordinator
+from notifications.services import create_notifications, defer_after_commit
+from principals.models import Principal
+from teachers.models import Teacher
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HolidayRecipients:
+    teacher_user_ids: set = field(default_factory=set)
+    principal_user_ids: set = field(default_factory=set)
+    unlinked_teacher_ids: list = field(default_factory=list)
+
+
+def _match_users(people: list[dict]) -> dict[int, int]:
+    """
+    Map person id -> user id for rows without a linked user, matching on
+    email (case-insensitive) and then employee_code == username, in one query.
+    """
+    emails = {p['email'].lower() for p in people if p.get('email')}
+    codes = {p['employee_code'] for p in people if p.get('employee_code')}
+    if not emails and not codes:
+        return {}
+
+    User = get_user_model()
+    by_email: dict[str, int] = {}
+    by_username: dict[str, int] = {}
+    for user_id, email_lower, username in (
+        User.objects.annotate(email_lower=Lower('email'))
+        .filter(Q(email_lower__in=emails) | Q(username__in=codes))
+        .values_list('id', 'email_lower', 'username')
+    ):
+        if email_lower:
+            by_email.setdefault(email_lower, user_id)
+        by_username.setdefault(username, user_id)
+
+    matched = {}
+    for person in people:
+        user_id = None
+        if person.get('email'):
+            user_id = by_email.get(person['email'].lower())
+        if user_id is None and person.get('employee_code'):
+            user_id = by_username.get(person['employee_code'])
+        if user_id is not None:
+            matched[person['id']] = user_id
+    return matched
+
+
+def resolve_holiday_recipients(level_ids: Iterable[int], grade_ids: Optional[Iterable[int]] = None) -> HolidayRecipients:
+    """
+    Compute every user to notify about a holiday for the given levels/grades.
+
+    Teachers are class teachers of the affected classrooms, active teachers
+    assigned to classrooms in the levels, and active teachers assigned to the
+    levels' coordinators. Principals are the active principals of the levels'
+    campuses. Runs a fixed number of queries regardless of school size.
+    """
+    level_ids = list(set(level_ids))
+    grade_ids = list(set(grade_ids or []))
+    recipients = HolidayRecipients()
+    if not level_ids:
+        return recipients
+
+    if grade_ids:
+        scoped_classrooms = ClassRoom.objects.filter(grade_id__in=grade_ids)
+    else:
+        scoped_classrooms = ClassRoom.objects.filter(grade__level_id__in=level_ids)
+
+    # Coordinators themselves are not notified; their teachers are
+    coordinator_ids = list(
+        Coordinator.objects.filter(
+            Q(level_id__in=level_ids) | Q(assigned_levels__id__in=level_ids),
+            is_currently_active=True
+        ).distinct().values_list('id', flat=True)
+    )
+
+    teachers = list(
+        Teacher.objects.filter(
+            Q(classroom_set__in=scoped_classrooms)
+            | Q(assigned_classrooms__grade__level_id__in=level_ids, is_currently_active=True)
+            | Q(assigned_coordinators__id__in=coordinator_ids, is_currently_active=True)
+        ).distinct().values('id', 'user_id', 'email', 'employee_code')
+    )
+
+    campus_ids = [
+        campus_id for campus_id in
+        Level.objects.filter(id__in=level_ids, campus__isnull=False).values_list('campus_id', flat=True)
+    ]
+    if campus_ids:
+        recipients.principal_user_ids = set(
+            Principal.objects.filter(
+                campus_id__in=campus_ids,
+                is_currently_active=True,
+                user__isnull=False
+            ).values_list('user_id', flat=True)
+        )
+
+    matched = _match_users([t for t in teachers if not t['user_id']])
+
+    for teacher in teachers:
+        user_id = teacher['user_id'] or matched.get(teacher['id'])
+        if user_id:
+            recipients.teacher_user_ids.add(user_id)
+        else:
+            recipients.unlinked_teacher_ids.append(teacher['id'])
+    return recipients
+
+
+def snapshot_holiday(holiday: Holiday) -> dict:
+    """Capture what the notification needs while the holiday and its M2M rows still exist."""
+    levels = list(holiday.levels.all())
+    if not levels and holiday.level_id:
+        levels = list(Level.objects.filter(id=holiday.level_id))
+    grades = list(holiday.grades.all())
+    return {
+        'holiday_id': holiday.id,
+        'date': holiday.date,
+        'reason': holiday.reason,
+        'created_by_id': holiday.created_by_id,
+        'level_ids': [l.id for l in levels],
+        'level_names': ', '.join([l.name for l in levels]),
+        'grade_ids': [g.id for g in grades],
+        'grade_names': [g.name for g in grades],
+    }
+
+
+def send_holiday_notifications(snapshot: dict, action: str) -> int:
+    """Notify teachers and principals about a holiday change with one bulk insert."""
+    if not snapshot['level_ids']:
+        logger.warning("Holiday %s has no levels assigned", snapshot['holiday_id'])
+        return 0
+
+    recipients = resolve_holiday_recipients(snapshot['level_ids'], snapshot['grade_ids'])
+    if recipients.unlinked_teacher_ids:
+        logger.warning("Holiday %s: %s teachers have no user account", snapshot['holiday_id'], len(recipients.unlinked_teacher_ids))
+
+    actor = None
+    if snapshot['created_by_id']:
+        actor = get_user_model().objects.filter(id=snapshot['created_by_id']).first()
+    coordinator_name = actor.get_full_name() if actor and hasattr(actor, 'get_full_name') else (str(actor) if actor else 'System')
+    grade_names = snapshot['grade_names']
+    grade_text = f" (Grades: {', '.join(grade_names)})" if grade_names else ""
+    target_text = f"by {coordinator_name} for {snapshot['level_names']}{grade_text} on {snapshot['date'].strftime('%B %d, %Y')}: {snapshot['reason']}"
+
+    notifications = create_notifications(
+        recipients.teacher_user_ids | recipients.principal_user_ids,
+        actor=actor,
+        verb=f"Holiday {action}",
+        target_text=target_text,
+        data={
+            'holiday_id': snapshot['holiday_id'],
+            'date': str(snapshot['date']),
+            'reason': snapshot['reason'],
+            'level_ids': snapshot['level_ids'],
+            'level_names': snapshot['level_names'],
+            'grade_ids': snapshot['grade_ids'],
+            'grade_names': ', '.join(grade_names) if grade_names else 'All Grades',
+            'action': action
+        }
+    )
+    logger.info("Sent holiday %s notifications to %s teachers and %s principals", action, len(recipients.teacher_user_ids), len(recipients.principal_user_ids))
+    return len(notifications)
+
+
+def _notify_saved_holiday(holiday_id: int, action: str) -> None:
+    holiday = Holiday.objects.filter(id=holiday_id).first()
+    if holiday is None:
+        return
+    send_holiday_notifications(snapshot_holiday(holiday), action)
+
+
+def schedule_holiday_notifications(holiday: Holiday, action: str) -> None:
+    """
+    Queue notifications for a saved holiday after the transaction commits.
+    The holiday is re-read at send time so M2M levels/grades set after
+    ``save()`` are included, and repeated saves in one request send once.
+    """
+    if getattr(holiday, '_holiday_notification_scheduled', False):
+        return
+    holiday._holiday_notification_scheduled = True
+    defer_after_commit(_notify_saved_holiday, holiday.id, action)
+
+
+def schedule_holiday_deleted_notifications(snapshot: dict) -> None:
+    defer_after_commit(send_holiday_notifications, snapshot, 'deleted')
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Mapping, Optional, TYPE_CHECKING
+
+from django.utils import timezone
+
+from attendance.models import Attendance, StudentAttendance
+from students.models import Student
+
+if TYPE_CHECKING:
+    from users.models import User
+
+
+@dataclass
+class BulkMarkResult:
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    skipped_student_ids: list = field(default_factory=list)
+    statuses: dict = field(default_factory=dict)
+
+
+def _normalize_entries(student_attendance_data: Iterable[Mapping[str, Any]]) -> tuple[dict[int, dict], list]:
+    """
+    Collapse the request payload into {student_id: {status, remarks}}.
+    Later entries for the same student win; entries without a usable id are skipped.
+    """
+    entries: dict[int, dict] = {}
+    skipped: list = []
+
+    for student_data in student_attendance_data or []:
+        raw_id = student_data.get('student_id')
+        if not raw_id:
+            continue
+        try:
+            student_id = int(raw_id)
+        except (TypeError, ValueError):
+            skipped.append(raw_id)
+            continue
+
+        entries[student_id] = {
+            'status': student_data.get('status', 'present'),
+            'remarks': student_data.get('remarks', '') or '',
+        }
+
+    return entries, skipped
+
+
+def apply_student_attendance(
+    attendance: Attendance,
+    student_attendance_data: Iterable[Mapping[str, Any]],
+    user: Optional["User"],
+) -> BulkMarkResult:
+    """
+    Replace the student rows of an attendance with the submitted payload using set-based writes.
+
+    Runs a fixed number of queries regardless of class size:
+        1. one roster fetch to validate student IDs against the classroom
+        2. one fetch of the existing StudentAttendance rows to diff against
+        3. at most one DELETE, one bulk INSERT and one bulk UPDATE
+
+    Count fields on ``attendance`` are set in memory; the caller is responsible for saving it.
+    """
+    entries, skipped = _normalize_entries(student_attendance_data)
+    result = BulkMarkResult(skipped_student_ids=skipped)
+
+    # Students must still belong to this classroom (default manager hides soft-deleted ones)
+    roster = set(
+        Student.objects.filter(
+            classroom_id=attendance.classroom_id,
+            id__in=list(entries.keys()),
+        ).values_list('id', flat=True)
+    ) if entries else set()
+    result.skipped_student_ids.extend(sid for sid in entries if sid not in roster)
+
+    existing = {
+        row.student_id: row
+        for row in StudentAttendance.objects.filter(attendance=attendance)
+    }
+
+    now = timezone.now()
+    to_create: list[StudentAttendance] = []
+    to_update: list[StudentAttendance] = []
+
+    for student_id in roster:
+        entry = entries[student_id]
+        row = existing.pop(student_id, None)
+
+        if row is None:
+            to_create.append(StudentAttendance(
+                attendance=attendance,
+                student_id=student_id,
+                status=entry['status'],
+                remarks=entry['remarks'],
+                created_by=user,
+                updated_by=user,
+            ))
+        elif (
+            row.status != entry['status']
+            or (row.remarks or '') != entry['remarks']
+            or row.is_deleted
+        ):
+            row.status = entry['status']
+            row.remarks = entry['remarks']
+            row.updated_by = user
+            row.updated_at = now
+            row.is_deleted = False
+            row.deleted_at = None
+            to_update.append(row)
+
+        result.statuses[student_id] = entry['status']
+
+    # Anything left in ``existing`` was not re-submitted (or left the class) and is dropped
+    if existing:
+        result.deleted, _ = StudentAttendance.objects.filter(
+            id__in=[row.id for row in existing.values()]
+        ).delete()
+    if to_create:
+        StudentAttendance.objects.bulk_create(to_create)
+        result.created = len(to_create)
+    if to_update:
+        StudentAttendance.objects.bulk_update(
+            to_update,
+            ['status', 'remarks', 'updated_by', 'updated_at', 'is_deleted', 'deleted_at'],
+        )
+        result.updated = len(to_update)
+
+    attendance.set_counts(result.statuses.values())
+    return result
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+from attendance.models import Attendance, AttendanceDailyRollup
+from classes.models import ClassRoom
+
+
+# Attendance fields that feed the rollup; saves touching none of them are ignored
+ROLLUP_SOURCE_FIELDS = frozenset({
+    'classroom', 'date', 'status', 'is_deleted', 'replaced_by_holiday',
+    'total_students', 'present_count', 'absent_count', 'late_count', 'leave_count',
+})
+
+ROLLUP_UPDATE_FIELDS = [
+    'campus', 'level', 'grade', 'classroom', 'date', 'shift',
+    'status', 'is_deleted', 'replaced_by_holiday',
+    'total_students', 'present_count', 'absent_count', 'late_count', 'leave_count',
+    'refreshed_at',
+]
+
+
+def _classroom_keys(classroom_ids: Iterable[int]) -> dict[int, dict]:
+    """Resolve campus/level/grade/shift for classrooms in one query."""
+    return {
+        row['id']: row
+        for row in ClassRoom.objects.filter(id__in=set(classroom_ids)).values(
+            'id', 'shift', 'grade_id', 'grade__level_id', 'grade__level__campus_id',
+        )
+    }
+
+
+def _build_rollup(attendance: Attendance, keys: Optional[dict]) -> AttendanceDailyRollup:
+    keys = keys or {}
+    return AttendanceDailyRollup(
+        attendance_id=attendance.pk,
+        campus_id=keys.get('grade__level__campus_id'),
+        level_id=keys.get('grade__level_id'),
+        grade_id=keys.get('grade_id'),
+        classroom_id=attendance.classroom_id,
+        date=attendance.date,
+        shift=keys.get('shift') or '',
+        status=attendance.status,
+        is_deleted=attendance.is_deleted,
+        replaced_by_holiday=attendance.replaced_by_holiday,
+        total_students=attendance.total_students,
+        present_count=attendance.present_count,
+        absent_count=attendance.absent_count,
+        late_count=attendance.late_count,
+        leave_count=attendance.leave_count,
+    )
+
+
+def _upsert(rollups: list[AttendanceDailyRollup]) -> None:
+    if not rollups:
+        return
+    AttendanceDailyRollup.objects.bulk_create(
+        rollups,
+        update_conflicts=True,
+        unique_fields=['attendance'],
+        update_fields=ROLLUP_UPDATE_FIELDS,
+    )
+
+
+def sync_attendance_rollup(attendance: Attendance, update_fields: Optional[Iterable[str]] = None) -> bool:
+    """
+    Upsert the rollup row for a single attendance from its in-memory counts.
+    Called from the Attendance post_save signal; returns False when the save
+    did not touch any field the rollup depends on.
+    """
+    if update_fields is not None and not ROLLUP_SOURCE_FIELDS.intersection(update_fields):
+        return False
+
+    keys = _classroom_keys([attendance.classroom_id]).get(attendance.classroom_id)
+    _upsert([_build_rollup(attendance, keys)])
+    return True
+
+
+def sync_attendance_rollups(attendances: Iterable[Attendance]) -> int:
+    """Upsert rollup rows for many attendances with one lookup and one write."""
+    attendances = list(attendances)
+    if not attendances:
+        return 0
+    keys = _classroom_keys(att.classroom_id for att in attendances)
+    _upsert([_build_rollup(att, keys.get(att.classroom_id)) for att in attendances])
+    return len(attendances)
+
+
+def rebuild_rollups(start_date, end_date, campus_id: Optional[int] = None, batch_size: int = 1000) -> int:
+    """
+    Recompute rollup rows for every attendance in [start_date, end_date].
+    Rows are streamed in batches so memory stays bounded for long ranges.
+    """
+    queryset = Attendance.objects.filter(date__range=[start_date, end_date]).only(
+        'id', 'classroom_id', 'date', 'status', 'is_deleted', 'replaced_by_holiday',
+        'total_students', 'present_count', 'absent_count', 'late_count', 'leave_count',
+    ).order_by('id')
+    if campus_id:
+        queryset = queryset.filter(classroom__grade__level__campus_id=campus_id)
+
+    processed = 0
+    batch: list[Attendance] = []
+    for attendance in queryset.iterator(chunk_size=batch_size):
+        batch.append(attendance)
+        if len(batch) >= batch_size:
+            processed += sync_attendance_rollups(batch)
+            batch = []
+    processed += sync_attendance_rollups(batch)
+    return processed
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from attendance.models import Holiday, Weekend
+from utils.cache_generation import bump_generation, get_generation
+
+
+CALENDAR_CACHE_NAMESPACE = 'attendance_calendar'
+
+
+@dataclass(frozen=True)
+class HolidayEntry:
+    id: int
+    reason: str
+    # Empty when the holiday applies to every grade of its levels
+    grade_ids: frozenset = frozenset()
+    shifts: tuple = ()
+
+    def applies_to_grade(self, grade_id: Optional[int]) -> bool:
+        return not self.grade_ids or grade_id in self.grade_ids
+
+
+@dataclass
+class SchoolCalendar:
+    """
+    Holidays and weekends of one academic year, indexed by date and level.
+    Built with two queries and answered from memory afterwards.
+    """
+    start: date
+    end: date
+    # date -> level id -> holidays on that date for the level
+    holidays: dict = field(default_factory=dict)
+    # date -> level ids with a Weekend row
+    weekends: dict = field(default_factory=dict)
+
+    def covers(self, day: date) -> bool:
+        return self.start <= day < self.end
+
+    def holiday_for(self, day: date, level_id: Optional[int], grade_id: Optional[int] = None) -> Optional[HolidayEntry]:
+        """The first holiday closing the level/grade on ``day``, if any."""
+        for entry in self.holidays.get(day, {}).get(level_id, ()):
+            if entry.applies_to_grade(grade_id):
+                return entry
+        return None
+
+    def is_weekend(self, day: date, level_id: Optional[int] = None) -> bool:
+        return day.weekday() == 6 or level_id in self.weekends.get(day, ())
+
+    def has_weekend_row(self, day: date, level_id: Optional[int]) -> bool:
+        return level_id in self.weekends.get(day, ())
+
+    def is_off(self, day: date, level_id: Optional[int], grade_id: Optional[int] = None) -> bool:
+        """True when a classroom of the level/grade does not meet on ``day``."""
+        return self.is_weekend(day, level_id) or self.holiday_for(day, level_id, grade_id) is not None
+
+    def is_classroom_off(self, classroom, day: date) -> bool:
+        grade = getattr(classroom, 'grade', None)
+        return self.is_off(day, getattr(grade, 'level_id', None), getattr(grade, 'id', None))
+
+
+def academic_year_bounds(day: date) -> tuple[date, date]:
+    """[start, end) of the academic year containing ``day``."""
+    month = getattr(settings, 'ACADEMIC_YEAR_START_MONTH', 4)
+    year = day.year if day.month >= month else day.year - 1
+    return date(year, month, 1), date(year + 1, month, 1)
+
+
+def build_calendar(start: date, end: date) -> SchoolCalendar:
+    calendar = SchoolCalendar(start=start, end=end)
+
+    holidays = (
+        Holiday.objects.filter(date__gte=start, date__lt=end)
+        .prefetch_related('levels', 'grades')
+    )
+    for holiday in holidays:
+        entry = HolidayEntry(
+            id=holiday.id,
+            reason=holiday.reason,
+            grade_ids=frozenset(g.id for g in holiday.grades.all()),
+            shifts=tuple(holiday.shifts or ()),
+        )
+        # Support both the legacy single level and the levels M2M
+        level_ids = {level.id for level in holiday.levels.all()}
+        if holiday.level_id:
+            level_ids.add(holiday.level_id)
+        by_level = calendar.holidays.setdefault(holiday.date, {})
+        for level_id in level_ids:
+            by_level.setdefault(level_id, []).append(entry)
+
+    weekends = {}
+    for day, level_id in Weekend.objects.filter(date__gte=start, date__lt=end).values_list('date', 'level_id'):
+        weekends.setdefault(day, set()).add(level_id)
+    calendar.weekends = {day: frozenset(level_ids) for day, level_ids in weekends.items()}
+    return calendar
+
+
+def get_calendar(day: date) -> SchoolCalendar:
+    """
+    The SchoolCalendar for the academic year containing ``day``, from the
+    cache when possible. Holiday and Weekend signals bump the cache
+    generation, so a cached calendar is never stale.
+    """
+    start, end = academic_year_bounds(day)
+    generation = get_generation(CALENDAR_CACHE_NAMESPACE)
+    key = f'{CALENDAR_CACHE_NAMESPACE}:{generation}:{start.isoformat()}' if generation is not None else None
+
+    calendar = None
+    if key:
+        try:
+            calendar = cache.get(key)
+        except Exception:
+            calendar = None
+    if calendar is None:
+        calendar = build_calendar(start, end)
+        if key:
+            try:
+                cache.set(key, calendar, getattr(settings, 'ATTENDANCE_CALENDAR_CACHE_TIMEOUT', 86400))
+            except Exception:
+                pass
+    return calendar
+
+
+class CalendarLookup:
+    """Resolves calendars per academic year once, for loops over many dates."""
+
+    def __init__(self):
+        self._calendars = []
+
+    def __call__(self, day: date) -> SchoolCalendar:
+        for calendar in self._calendars:
+            if calendar.covers(day):
+                return calendar
+        calendar = get_calendar(day)
+        self._calendars.append(calendar)
+        return calendar
+
+
+def non_school_days(level_id: Optional[int], grade_id: Optional[int], start_date: date, end_date: date) -> set:
+    """Dates in [start_date, end_date] on which a classroom of the level/grade does not meet."""
+    lookup = CalendarLookup()
+    days = set()
+    day = start_date
+    while day <= end_date:
+        if lookup(day).is_off(day, level_id, grade_id):
+            days.add(day)
+        day += timedelta(days=1)
+    return days
+
+
+def ensure_weekend(day: date, level, created_by=None) -> None:
+    """Record a Weekend row for a Sunday unless the calendar already has it."""
+    if day.weekday() != 6 or level is None:
+        return
+    if get_calendar(day).has_weekend_row(day, level.id):
+        return
+    Weekend.objects.get_or_create(date=day, level=level, defaults={'created_by': created_by})
+
+
+def invalidate_calendar(**kwargs) -> None:
+    """Drop cached calendars once the change commits. Safe to connect as a signal receiver."""
+    transaction.on_commit(lambda: bump_generation(CALENDAR_CACHE_NAMESPACE))
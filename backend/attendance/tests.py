@@ -0,0 +1,57 @@
+from datetime import date
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import AccessToken
+
+from campus.models import Campus
+from classes.models import ClassRoom, Grade, Level
+from students.models import Student
+from users.models import User
+
+from .models import Attendance
+
+
+class LevelAttendanceSummaryQueryCountTests(TestCase):
+    """get_level_attendance_summary must cost the same queries for 1 or N sections."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.campus = Campus.objects.create(campus_name='Main', campus_code='C01', city='KHI', postal_code='75080')
+        cls.level = Level.objects.create(name='Primary', shift='morning', campus=cls.campus)
+        cls.grade = Grade.objects.create(name='Grade 1', level=cls.level)
+        cls.admin = User.objects.create_superuser(username='S1', email='su@x.com', password='x', role='superadmin')
+
+    def setUp(self):
+        self.sections = 0
+        self.headers = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(self.admin)}'}
+        self.url = f'/api/attendance/level/{self.level.id}/summary/?start_date=2025-01-01&end_date=2025-01-31'
+
+    def add_sections(self, count):
+        for _ in range(count):
+            classroom = ClassRoom.objects.create(grade=self.grade, section='ABCDE'[self.sections], shift='morning')
+            self.sections += 1
+            for i in range(3):
+                Student.objects.create(
+                    name=f'Student {classroom.id} {i}', campus=self.campus, classroom=classroom,
+                    gender='female', current_grade='Grade 1', section=classroom.section, shift='morning',
+                    is_draft=False,
+                )
+            Attendance.objects.create(classroom=classroom, date=date(2025, 1, 6), marked_by=self.admin)
+
+    def summary_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, **self.headers)
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_query_count_does_not_grow_with_sections(self):
+        self.add_sections(1)
+        response, single = self.summary_queries()
+        self.assertEqual(len(response.json()['classrooms']), 1)
+
+        self.add_sections(4)
+        with self.assertNumQueries(single):
+            response = self.client.get(self.url, **self.headers)
+        self.assertEqual(len(response.json()['classrooms']), 5)
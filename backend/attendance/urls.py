@@ -25,6 +25,7 @@ urlpatterns = [
     
     # Edit attendance
     path('edit/<int:attendance_id>/', views.edit_attendance, name='edit_attendance'),
+    path('<int:attendance_id>/history/', views.get_attendance_history, name='attendance_history'),
     
     # Coordinator endpoints
     path('coordinator/classes/', views.get_coordinator_classes, name='coordinator_classes'),
@@ -51,6 +52,9 @@ urlpatterns = [
     # Real-time metrics
     path('metrics/realtime/', views.get_realtime_attendance_metrics, name='realtime_metrics'),
     
+    # Register export (CSV/XLSX)
+    path('export/', views.export_attendance_register, name='export_attendance_register'),
+    
     # Delete logs (audit trail)
     path('delete-logs/', views.get_delete_logs, name='delete_logs'),
 ]
@@ -1,17 +1,22 @@
 from rest_framework import generics, status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from django.db import transaction
 from django.utils import timezone
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.db.models import (
+    Avg, Case, Count, F, FloatField, IntegerField, Max, OuterRef, Q, Subquery, Sum, Value, When,
+)
+from django.db.models.functions import Coalesce, Round
 from datetime import date, timedelta, datetime
 
 User = get_user_model()
 
-from .models import Attendance, StudentAttendance, Weekend
+from .models import Attendance, AttendanceDailyRollup, StudentAttendance
 from .serializers import (
     AttendanceSerializer, 
     StudentAttendanceSerializer, 
@@ -23,7 +28,21 @@ from classes.models import ClassRoom
 from teachers.models import Teacher
 from coordinator.models import Coordinator
 from notifications.services import create_notification
+from users.scope import get_user_scope
+from utils.db_routing import replica_reads
+from utils.streaming import buffered, streaming_response
 from .services.alerts import process_consecutive_absence_alerts
+from .services.approval import bulk_approve_attendance
+from .services.export import (
+    XLSX_CONTENT_TYPE,
+    export_classrooms,
+    iter_register_csv,
+    iter_register_xlsx,
+    xlsx_available,
+)
+from .services.history import EditHistorySequence
+from .services.marking import apply_student_attendance
+from .services.school_calendar import ensure_weekend, get_calendar
 from .services.holiday_utils import (
     collect_shifts_from_levels,
     normalize_shift_value,  
@@ -31,6 +50,9 @@ from .services.holiday_utils import (
     validate_grades_for_levels,
     validate_levels_for_shift,
 )
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 @api_view(['POST'])
@@ -49,38 +71,19 @@ def mark_attendance(request):
         date = data['date']
         student_attendance_data = data['student_attendance']
         
-        classroom = get_object_or_404(ClassRoom, id=classroom_id)
+        classroom = get_object_or_404(ClassRoom.objects.select_related('grade'), id=classroom_id)
         
         # Check if date is a holiday (support multiple levels and grade-specific)
-        from .models import Holiday
-        level = classroom.grade.level if classroom.grade else None
         grade = classroom.grade if classroom.grade else None
         
-        if level:
-            # Check for holidays matching this level and date
-            holidays = Holiday.objects.filter(
-                date=date
-            ).filter(
-                Q(levels=level) | Q(level=level)  # Support both old and new fields
-            ).distinct()
-            
-            # Check if any holiday applies to this classroom
-            for holiday in holidays:
-                # If holiday has specific grades, check if this classroom's grade is included
-                if holiday.grades.exists():
-                    if grade and grade in holiday.grades.all():
-                        return Response({
-                            'error': f'This date is a holiday: {holiday.reason}. Attendance marking is disabled.',
-                            'is_holiday': True,
-                            'holiday_reason': holiday.reason
-                        }, status=status.HTTP_400_BAD_REQUEST)
-                else:
-                    # No specific grades - applies to all grades in the level
-                    return Response({
-                        'error': f'This date is a holiday: {holiday.reason}. Attendance marking is disabled.',
-                        'is_holiday': True,
-                        'holiday_reason': holiday.reason
-                    }, status=status.HTTP_400_BAD_REQUEST)
+        if grade and grade.level_id:
+            holiday = get_calendar(date).holiday_for(date, grade.level_id, grade.id)
+            if holiday:
+                return Response({
+                    'error': f'This date is a holiday: {holiday.reason}. Attendance marking is disabled.',
+                    'is_holiday': True,
+                    'holiday_reason': holiday.reason
+                }, status=status.HTTP_400_BAD_REQUEST)
         
         # Get teacher from request user
         try:
@@ -130,19 +133,19 @@ def mark_attendance(request):
             # Update attendance summary
             attendance.update_counts()
             
+            # Record edit history; the save below persists last_edited_at/updated_by
+            attendance.add_edit_history(request.user, 'marked', 'Attendance marked and submitted for review', save=False)
+            
             # Save attendance with updated status
             attendance.save()
-            
-            # Add edit history after saving
-            attendance.add_edit_history(request.user, 'marked', 'Attendance marked and submitted for review')
 
             # Trigger consecutive absence alerts for class teacher
             try:
                 alerts = process_consecutive_absence_alerts(attendance)
                 if alerts:
-                    print(f"[INFO] Consecutive absence alerts generated: {[alert.student_name for alert in alerts]}")
+                    logger.info("Consecutive absence alerts generated for %s students", len(alerts))
             except Exception as alert_error:
-                print(f"[WARN] Failed to process consecutive absence alerts: {alert_error}")
+                logger.warning("Failed to process consecutive absence alerts: %s", alert_error)
 
             # Send notification to coordinator
             try:
@@ -191,7 +194,7 @@ def mark_attendance(request):
                             if not coordinator_user and coordinator.email:
                                 coordinator_user = User.objects.filter(email=coordinator.email).first()
                         except Exception as user_error:
-                            print(f"[WARN] Error finding user for coordinator {coordinator.full_name}: {user_error}")
+                            logger.warning("Error finding user for coordinator %s: %s", coordinator.full_name, user_error)
                     
                     if coordinator and coordinator_user:
                         teacher_name = teacher.full_name if teacher else request.user.get_full_name() or request.user.username
@@ -212,15 +215,13 @@ def mark_attendance(request):
                                 'teacher_name': teacher_name
                             }
                         )
-                        print(f"[OK] Sent attendance notification to coordinator {coordinator.full_name} (user: {coordinator_user.email})")
+                        logger.info("Sent attendance notification to coordinator %s (user: %s)", coordinator.full_name, coordinator_user.email)
                     elif coordinator:
-                        print(f"[WARN] Coordinator {coordinator.full_name} found but no user account exists (email: {coordinator.email}, employee_code: {coordinator.employee_code})")
+                        logger.warning("Coordinator %s found but no user account exists (email: %s, employee_code: %s)", coordinator.full_name, coordinator.email, coordinator.employee_code)
                     else:
-                        print(f"[WARN] No coordinator found for classroom {classroom_name} (level: {classroom.grade.level.name if classroom.grade and classroom.grade.level else 'N/A'})")
+                        logger.warning("No coordinator found for classroom %s (level: %s)", classroom_name, classroom.grade.level.name if classroom.grade and classroom.grade.level else 'N/A')
             except Exception as notif_error:
-                print(f"[WARN] Failed to send attendance notification: {notif_error}")
-                import traceback
-                print(f"[WARN] Traceback: {traceback.format_exc()}")
+                logger.warning("Failed to send attendance notification: %s", notif_error, exc_info=True)
                 # Don't fail the attendance marking if notification fails
             
         return Response({
@@ -262,52 +263,28 @@ def mark_bulk_attendance(request):
                 'error': 'Invalid date format. Use YYYY-MM-DD.'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        classroom = get_object_or_404(ClassRoom, id=classroom_id)
+        classroom = get_object_or_404(ClassRoom.objects.select_related('grade__level'), id=classroom_id)
         
         # Check if date is a holiday (support multiple levels and grade-specific)
-        from .models import Holiday
-        level = classroom.grade.level if classroom.grade else None
         grade = classroom.grade if classroom.grade else None
         
-        if level:
-            # Check for holidays matching this level and date
-            holidays = Holiday.objects.filter(
-                date=date_obj
-            ).filter(
-                Q(levels=level) | Q(level=level)  # Support both old and new fields
-            ).distinct()
-            
-            # Check if any holiday applies to this classroom
-            for holiday in holidays:
-                is_holiday = False
-                # If holiday has specific grades, check if this classroom's grade is included
-                if holiday.grades.exists():
-                    if grade and grade in holiday.grades.all():
-                        is_holiday = True
-                else:
-                    # No specific grades - applies to all grades in the level
-                    is_holiday = True
-                
-                if is_holiday:
-                    try:
-                        is_teacher = request.user.is_teacher()
-                    except Exception:
-                        is_teacher = False
-                    if is_teacher and not request.user.is_superuser:
-                        return Response({
-                            'error': f'This date is a holiday: {holiday.reason}. Attendance marking is disabled.',
-                            'is_holiday': True,
-                            'holiday_reason': holiday.reason
-                        }, status=status.HTTP_400_BAD_REQUEST)
+        if grade and grade.level_id:
+            holiday = get_calendar(date_obj).holiday_for(date_obj, grade.level_id, grade.id)
+            if holiday:
+                try:
+                    is_teacher = request.user.is_teacher()
+                except Exception:
+                    is_teacher = False
+                if is_teacher and not request.user.is_superuser:
+                    return Response({
+                        'error': f'This date is a holiday: {holiday.reason}. Attendance marking is disabled.',
+                        'is_holiday': True,
+                        'holiday_reason': holiday.reason
+                    }, status=status.HTTP_400_BAD_REQUEST)
         
         # Check if it's a Sunday and auto-create weekend entry, and block teacher marking
         if date_obj.weekday() == 6:  # Sunday is 6 in Python's weekday()
-            level = classroom.grade.level
-            Weekend.objects.get_or_create(
-                date=date_obj,
-                level=level,
-                defaults={'created_by': request.user}
-            )
+            ensure_weekend(date_obj, classroom.grade.level, created_by=request.user)
             # Teachers should not be able to mark Sunday attendance
             try:
                 is_teacher = request.user.is_teacher()
@@ -319,11 +296,6 @@ def mark_bulk_attendance(request):
                     'is_weekend': True
                 }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Get all students in this class (non-deleted students)
-        # Removed is_active filter to ensure all students appear consistently
-        all_students = Student.objects.filter(classroom=classroom, is_deleted=False)
-        all_student_ids = list(all_students.values_list('id', flat=True))
-        
         with transaction.atomic():
             # Get teacher from request user
             teacher = None
@@ -356,48 +328,23 @@ def mark_bulk_attendance(request):
                 attendance.submitted_by = request.user
                 attendance.marked_by = marked_by_user
             
-            # Clear existing student attendance records
-            attendance.student_attendances.all().delete()
+            # Diff submitted rows against existing ones and write them in bulk;
+            # only students of this classroom are accepted. Counts are set in memory.
+            apply_student_attendance(attendance, student_attendance_data, request.user)
             
-            # Create student attendance records
-            for student_data in student_attendance_data:
-                student_id = student_data.get('student_id')
-                attendance_status = student_data.get('status', 'present')
-                remarks = student_data.get('remarks', '')
-                
-                if not student_id:
-                    continue
-                
-                # Verify student belongs to this classroom
-                try:
-                    student = Student.objects.get(id=student_id, classroom=classroom)
-                    StudentAttendance.objects.create(
-                        attendance=attendance,
-                        student=student,
-                        status=attendance_status,
-                        remarks=remarks,
-                        created_by=request.user,
-                        updated_by=request.user
-                    )
-                except Student.DoesNotExist:
-                    continue
-            
-            # Update attendance summary
-            attendance.update_counts()
+            # Record edit history; the save below persists last_edited_at/updated_by
+            attendance.add_edit_history(request.user, 'marked', 'Attendance marked and submitted for review', save=False)
             
-            # Save attendance with updated status
+            # Save attendance with updated status and counts
             attendance.save()
             
-            # Add edit history after saving
-            attendance.add_edit_history(request.user, 'marked', 'Attendance marked and submitted for review')
-            
             # Trigger consecutive absence alerts for class teacher
             try:
                 alerts = process_consecutive_absence_alerts(attendance)
                 if alerts:
-                    print(f"[INFO] Consecutive absence alerts generated: {[alert.student_name for alert in alerts]}")
+                    logger.info("Consecutive absence alerts generated for %s students", len(alerts))
             except Exception as alert_error:
-                print(f"[WARN] Failed to process consecutive absence alerts: {alert_error}")
+                logger.warning("Failed to process consecutive absence alerts: %s", alert_error)
 
             # Send notification to coordinator
             try:
@@ -448,7 +395,7 @@ def mark_bulk_attendance(request):
                             if not coordinator_user and coordinator.email:
                                 coordinator_user = User.objects.filter(email=coordinator.email).first()
                         except Exception as user_error:
-                            print(f"[WARN] Error finding user for coordinator {coordinator.full_name}: {user_error}")
+                            logger.warning("Error finding user for coordinator %s: %s", coordinator.full_name, user_error)
                     
                     if coordinator and coordinator_user:
                         teacher_name = teacher.full_name if teacher else request.user.get_full_name() or request.user.username
@@ -469,15 +416,13 @@ def mark_bulk_attendance(request):
                                 'teacher_name': teacher_name
                             }
                         )
-                        print(f"[OK] Sent attendance notification to coordinator {coordinator.full_name} (user: {coordinator_user.email})")
+                        logger.info("Sent attendance notification to coordinator %s (user: %s)", coordinator.full_name, coordinator_user.email)
                     elif coordinator:
-                        print(f"[WARN] Coordinator {coordinator.full_name} found but no user account exists (email: {coordinator.email}, employee_code: {coordinator.employee_code})")
+                        logger.warning("Coordinator %s found but no user account exists (email: %s, employee_code: %s)", coordinator.full_name, coordinator.email, coordinator.employee_code)
                     else:
-                        print(f"[WARN] No coordinator found for classroom {classroom_name} (level: {classroom.grade.level.name if classroom.grade and classroom.grade.level else 'N/A'})")
+                        logger.warning("No coordinator found for classroom %s (level: %s)", classroom_name, classroom.grade.level.name if classroom.grade and classroom.grade.level else 'N/A')
             except Exception as notif_error:
-                print(f"[WARN] Failed to send attendance notification: {notif_error}")
-                import traceback
-                print(f"[WARN] Traceback: {traceback.format_exc()}")
+                logger.warning("Failed to send attendance notification: %s", notif_error, exc_info=True)
                 # Don't fail the attendance marking if notification fails
             
         return Response({
@@ -813,33 +758,9 @@ def edit_attendance(request, attendance_id):
             }, status=status.HTTP_400_BAD_REQUEST)
         
         with transaction.atomic():
-            # Clear existing student attendance records
-            attendance.student_attendances.all().delete()
-            
-            # Create new student attendance records
-            for student_data in student_attendance_data:
-                student_id = student_data.get('student_id')
-                attendance_status = student_data.get('status', 'present')
-                remarks = student_data.get('remarks', '')
-                
-                if not student_id:
-                    continue
-                
-                try:
-                    student = Student.objects.get(id=student_id, classroom=attendance.classroom)
-                    StudentAttendance.objects.create(
-                        student=student,
-                        attendance=attendance,
-                        status=attendance_status,
-                        remarks=remarks,
-                        created_by=user,
-                        updated_by=user
-                    )
-                except Student.DoesNotExist:
-                    continue
-            
-            # Update attendance counts
-            attendance.update_counts()
+            # Replace student attendance records with set-based writes
+            apply_student_attendance(attendance, student_attendance_data, user)
+            attendance.save_counts()
             
             # Add edit history
             attendance.add_edit_history(
@@ -871,7 +792,7 @@ def edit_attendance(request, attendance_id):
                     else:
                         attendance.marked_by = user
                 except Teacher.DoesNotExist:
-                    print(f"[WARN] Teacher not found for user {user.username}")
+                    logger.warning("Teacher not found for user %s", user.username)
                     attendance.marked_by = user
                     pass
                 
@@ -882,22 +803,19 @@ def edit_attendance(request, attendance_id):
         try:
             alerts = process_consecutive_absence_alerts(attendance)
             if alerts:
-                print(f"[INFO] Consecutive absence alerts generated: {[alert.student_name for alert in alerts]}")
+                logger.info("Consecutive absence alerts generated for %s students", len(alerts))
         except Exception as alert_error:
-            print(f"[WARN] Failed to process consecutive absence alerts: {alert_error}")
+            logger.warning("Failed to process consecutive absence alerts: %s", alert_error)
 
             # Send notification to coordinator when teacher updates attendance
             # (Don't send if coordinator is editing their own attendance)
             if user.is_teacher():
-                print(f"[DEBUG] Teacher updating attendance - user: {user.username}, is_teacher: {user.is_teacher()}, teacher: {teacher}")
                 try:
                     # Get coordinator for this classroom's level
                     coordinator = None
                     coordinator_user = None
                     classroom = attendance.classroom
                     
-                    print(f"[DEBUG] Classroom: {classroom}, Grade: {classroom.grade if classroom.grade else 'None'}, Level: {classroom.grade.level if classroom.grade and classroom.grade.level else 'None'}")
-                    
                     if classroom.grade and classroom.grade.level:
                         from coordinator.models import Coordinator
                         from django.contrib.auth import get_user_model
@@ -908,11 +826,8 @@ def edit_attendance(request, attendance_id):
                             is_currently_active=True
                         )
                         
-                        print(f"[DEBUG] Found {coordinators.count()} active coordinators")
-                        
                         # Check if coordinator manages this level
                         for coord in coordinators:
-                            print(f"[DEBUG] Checking coordinator {coord.full_name} - shift: {coord.shift}, level: {coord.level}, assigned_levels: {list(coord.assigned_levels.all()) if coord.assigned_levels.exists() else 'None'}")
                             if coord.shift == 'both':
                                 if coord.assigned_levels.exists():
                                     if classroom.grade.level in coord.assigned_levels.all():
@@ -928,11 +843,11 @@ def edit_attendance(request, attendance_id):
                         
                         # If no coordinator found, try to get from teacher's assigned coordinators
                         if not coordinator and teacher:
-                            print(f"[DEBUG] No coordinator found by level, trying teacher's assigned coordinators")
+                            logger.debug("No coordinator found by level, trying teacher's assigned coordinators")
                             assigned_coords = teacher.assigned_coordinators.filter(is_currently_active=True).first()
                             if assigned_coords:
                                 coordinator = assigned_coords
-                                print(f"[DEBUG] Found coordinator from teacher's assigned coordinators: {coordinator.full_name}")
+                                logger.debug("Found coordinator from teacher's assigned coordinators: %s", coordinator.full_name)
                         
                         # Get user for coordinator (by email or employee_code)
                         if coordinator:
@@ -944,7 +859,7 @@ def edit_attendance(request, attendance_id):
                                 if not coordinator_user and coordinator.email:
                                     coordinator_user = User.objects.filter(email=coordinator.email).first()
                             except Exception as user_error:
-                                print(f"[WARN] Error finding user for coordinator {coordinator.full_name}: {user_error}")
+                                logger.warning("Error finding user for coordinator %s: %s", coordinator.full_name, user_error)
                         
                         if coordinator and coordinator_user:
                             teacher_name = teacher.full_name if teacher else user.get_full_name() or user.username
@@ -966,15 +881,13 @@ def edit_attendance(request, attendance_id):
                                     'action': 'updated'
                                 }
                             )
-                            print(f"[OK] Sent attendance update notification to coordinator {coordinator.full_name} (user: {coordinator_user.email})")
+                            logger.info("Sent attendance update notification to coordinator %s (user: %s)", coordinator.full_name, coordinator_user.email)
                         elif coordinator:
-                            print(f"[WARN] Coordinator {coordinator.full_name} found but no user account exists (email: {coordinator.email}, employee_code: {coordinator.employee_code})")
+                            logger.warning("Coordinator %s found but no user account exists (email: %s, employee_code: %s)", coordinator.full_name, coordinator.email, coordinator.employee_code)
                         else:
-                            print(f"[WARN] No coordinator found for classroom {classroom_name} (level: {classroom.grade.level.name if classroom.grade and classroom.grade.level else 'N/A'})")
+                            logger.warning("No coordinator found for classroom %s (level: %s)", classroom_name, classroom.grade.level.name if classroom.grade and classroom.grade.level else 'N/A')
                 except Exception as notif_error:
-                    print(f"[WARN] Failed to send attendance update notification: {notif_error}")
-                    import traceback
-                    print(f"[WARN] Traceback: {traceback.format_exc()}")
+                    logger.warning("Failed to send attendance update notification: %s", notif_error, exc_info=True)
                     # Don't fail the attendance update if notification fails
         
         # Return updated attendance data
@@ -1045,11 +958,7 @@ def get_attendance_for_date(request, classroom_id, date):
             from datetime import datetime as _dt
             date_obj = _dt.strptime(date, '%Y-%m-%d').date()
             if date_obj.weekday() == 6:  # Sunday
-                Weekend.objects.get_or_create(
-                    date=date_obj,
-                    level=classroom.grade.level,
-                    defaults={'created_by': request.user}
-                )
+                ensure_weekend(date_obj, classroom.grade.level, created_by=request.user)
         except Exception:
             pass
 
@@ -1098,7 +1007,7 @@ def get_attendance_for_date(request, classroom_id, date):
                     }
                     for sa in student_attendances
                 ],
-                'edit_history': attendance.update_history
+                'edit_history': attendance.get_edit_history()
             }
             
             return Response(attendance_data)
@@ -1123,6 +1032,32 @@ def get_attendance_for_date(request, classroom_id, date):
         return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+class AttendanceHistoryPagination(PageNumberPagination):
+    """Edit history pages, oldest entry first"""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_attendance_history(request, attendance_id):
+    """Paginated edit history of one attendance record"""
+    attendance = get_object_or_404(Attendance.objects.only('id', 'classroom_id', 'update_history'), id=attendance_id)
+    
+    try:
+        scope = get_user_scope(request.user)
+        if not scope or not (scope.is_global or attendance.classroom_id in scope.classroom_ids):
+            return Response({'error': 'You do not have access to this attendance'}, status=status.HTTP_403_FORBIDDEN)
+        
+        paginator = AttendanceHistoryPagination()
+        page = paginator.paginate_queryset(EditHistorySequence(attendance), request)
+        return paginator.get_paginated_response(page)
+        
+    except Exception as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_coordinator_classes(request):
@@ -1190,6 +1125,7 @@ def get_coordinator_classes(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def get_level_attendance_summary(request, level_id):
     """
     Get attendance summary for all classes in a level
@@ -1240,10 +1176,40 @@ def get_level_attendance_summary(request, level_id):
         else:
             end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
         
-        # Get all classes in the level
+        # Per-classroom totals come from the daily rollup via its (level, date)
+        # index; classroom details and student counts are one more query.
+        record_percentage = Case(
+            When(total_students=0, then=Value(0.0)),
+            default=Round(F('present_count') * 100.0 / F('total_students'), 2),
+            output_field=FloatField(),
+        )
+        rollup_totals = {
+            row['classroom_id']: row
+            for row in AttendanceDailyRollup.objects.filter(
+                level_id=level_id,
+                date__range=[start_date, end_date]
+            ).order_by().values('classroom_id').annotate(
+                records_count=Count('pk'),
+                total_present=Sum('present_count'),
+                total_absent=Sum('absent_count'),
+                total_late=Sum('late_count'),
+                total_leave=Sum('leave_count'),
+                average_percentage=Avg(record_percentage),
+                last_attendance=Max('date'),
+            )
+        }
+        student_counts = Student.objects.filter(
+            classroom=OuterRef('pk')
+        ).order_by().values('classroom').annotate(c=Count('id')).values('c')
         classrooms = ClassRoom.objects.filter(
             grade__level_id=level_id
-        ).select_related('grade', 'grade__level__campus')
+        ).select_related('grade', 'grade__level__campus').annotate(
+            student_count=Coalesce(Subquery(student_counts, output_field=IntegerField()), 0),
+        )
+        empty_totals = {
+            'records_count': 0, 'total_present': 0, 'total_absent': 0, 'total_late': 0,
+            'total_leave': 0, 'average_percentage': 0, 'last_attendance': None,
+        }
         
         summary_data = []
         total_students = 0
@@ -1253,46 +1219,7 @@ def get_level_attendance_summary(request, level_id):
         total_leave = 0
         
         for classroom in classrooms:
-            # Get attendance records for this classroom in date range
-            attendances = Attendance.objects.filter(
-                classroom=classroom,
-                date__range=[start_date, end_date]
-            )
-            
-            # Debug logging
-            print(f"[DEBUG] Classroom: {classroom}, Date range: {start_date} to {end_date}")
-            print(f"[DEBUG] Attendance records found: {attendances.count()}")
-            if attendances.exists():
-                print(f"[DEBUG] Attendance dates: {[att.date for att in attendances]}")
-            
-            classroom_total_students = classroom.students.count()
-            classroom_present = sum(att.present_count for att in attendances)
-            classroom_absent = sum(att.absent_count for att in attendances)
-            classroom_late = sum(att.late_count for att in attendances)
-            classroom_leave = sum(att.leave_count for att in attendances)
-            classroom_records = attendances.count()
-            
-            print(f"[DEBUG] Present: {classroom_present}, Absent: {classroom_absent}, Records: {classroom_records}")
-            
-            avg_percentage = 0
-            if classroom_records > 0:
-                try:
-                    # Safely get attendance percentages, handling None values
-                    percentages = []
-                    for att in attendances:
-                        try:
-                            pct = att.attendance_percentage
-                            if pct is not None and not (isinstance(pct, float) and (pct != pct)):  # Check for NaN
-                                percentages.append(pct)
-                        except (ZeroDivisionError, TypeError, AttributeError):
-                            continue
-                    
-                    if percentages:
-                        total_percentage = sum(percentages)
-                        avg_percentage = total_percentage / len(percentages)
-                except (ZeroDivisionError, TypeError):
-                    avg_percentage = 0
-            
+            totals = rollup_totals.get(classroom.id, empty_totals)
             summary_data.append({
                 'classroom': {
                     'id': classroom.id,
@@ -1303,21 +1230,21 @@ def get_level_attendance_summary(request, level_id):
                     'shift': classroom.shift,
                     'campus': classroom.grade.level.campus.campus_name if classroom.grade.level.campus else None
                 },
-                'student_count': classroom_total_students,
-                'records_count': classroom_records,
-                'total_present': classroom_present,
-                'total_absent': classroom_absent,
-                'total_late': classroom_late,
-                'total_leave': classroom_leave,
-                'average_percentage': round(avg_percentage, 2),
-                'last_attendance': attendances.order_by('-date').first().date.isoformat() if attendances.exists() else None
+                'student_count': classroom.student_count,
+                'records_count': totals['records_count'],
+                'total_present': totals['total_present'],
+                'total_absent': totals['total_absent'],
+                'total_late': totals['total_late'],
+                'total_leave': totals['total_leave'],
+                'average_percentage': round(totals['average_percentage'] or 0, 2),
+                'last_attendance': totals['last_attendance'].isoformat() if totals['last_attendance'] else None
             })
             
-            total_students += classroom_total_students
-            total_present += classroom_present
-            total_absent += classroom_absent
-            total_late += classroom_late
-            total_leave += classroom_leave
+            total_students += classroom.student_count
+            total_present += totals['total_present']
+            total_absent += totals['total_absent']
+            total_late += totals['total_late']
+            total_leave += totals['total_leave']
         
         # Calculate overall statistics
         overall_percentage = 0
@@ -1370,7 +1297,7 @@ def submit_attendance(request, attendance_id):
             attendance.status = 'submitted'
             attendance.submitted_at = timezone.now()
             attendance.submitted_by = request.user
-            attendance.add_edit_history(request.user, 'submitted', 'Submitted for coordinator review')
+            attendance.add_edit_history(request.user, 'submitted', 'Submitted for coordinator review', save=False)
             attendance.save()
             
             # Create audit log
@@ -1427,7 +1354,7 @@ def review_attendance(request, attendance_id):
             attendance.status = 'under_review'
             attendance.reviewed_at = timezone.now()
             attendance.reviewed_by = request.user
-            attendance.add_edit_history(request.user, 'review', 'Under coordinator review')
+            attendance.add_edit_history(request.user, 'review', 'Under coordinator review', save=False)
             attendance.save()
             
             from .models import AuditLog
@@ -1482,7 +1409,7 @@ def finalize_attendance(request, attendance_id):
             attendance.is_final = True
             attendance.finalized_at = timezone.now()
             attendance.finalized_by = request.user
-            attendance.add_edit_history(request.user, 'finalize', 'Finalized by coordinator')
+            attendance.add_edit_history(request.user, 'finalize', 'Finalized by coordinator', save=False)
             attendance.save()
 
             from .models import AuditLog
@@ -1540,7 +1467,7 @@ def coordinator_approve_attendance(request, attendance_id):
             attendance.is_final = True
             attendance.finalized_at = timezone.now()
             attendance.finalized_by = request.user
-            attendance.add_edit_history(request.user, 'coordinator_approve', 'Directly approved by coordinator')
+            attendance.add_edit_history(request.user, 'coordinator_approve', 'Directly approved by coordinator', save=False)
             attendance.save()
 
             from .models import AuditLog
@@ -1596,13 +1523,11 @@ def coordinator_approve_attendance(request, attendance_id):
                             'action': 'approved'
                         }
                     )
-                    print(f"[OK] Sent approval notification to teacher {teacher.full_name if teacher else teacher_user.get_full_name()} (user: {teacher_user.email})")
+                    logger.info("Sent approval notification to teacher %s (user: %s)", teacher.full_name if teacher else teacher_user.get_full_name(), teacher_user.email)
                 else:
-                    print(f"[WARN] No teacher user found for attendance {attendance.id} (marked_by: {attendance.marked_by}, classroom: {attendance.classroom})")
+                    logger.warning("No teacher user found for attendance %s (marked_by: %s, classroom: %s)", attendance.id, attendance.marked_by, attendance.classroom)
             except Exception as notif_error:
-                print(f"[WARN] Failed to send approval notification: {notif_error}")
-                import traceback
-                print(f"[WARN] Traceback: {traceback.format_exc()}")
+                logger.warning("Failed to send approval notification: %s", notif_error, exc_info=True)
                 # Don't fail the approval if notification fails
         
         return Response({'message': 'Attendance approved successfully by coordinator'})
@@ -1627,109 +1552,19 @@ def coordinator_bulk_approve_attendance(request):
         if not coordinator:
             return Response({'error': 'Coordinator profile not found'}, status=status.HTTP_404_NOT_FOUND)
         
-        approved_count = 0
-        failed_count = 0
-        errors = []
-        
-        with transaction.atomic():
-            for attendance_id in attendance_ids:
-                try:
-                    attendance = get_object_or_404(Attendance, id=attendance_id, is_deleted=False)
-                    
-                    # Check if attendance can be approved
-                    if attendance.status not in ['draft', 'submitted', 'under_review']:
-                        failed_count += 1
-                        errors.append(f"Attendance {attendance_id}: Cannot approve (status: {attendance.status})")
-                        continue
-                    
-                    # Check membership (support assigned_levels for 'both' shifts)
-                    allowed = False
-                    if coordinator.shift == 'both':
-                        if coordinator.assigned_levels.exists():
-                            if attendance.classroom.grade.level in coordinator.assigned_levels.all():
-                                allowed = True
-                        elif coordinator.level:
-                            if coordinator.level == attendance.classroom.grade.level:
-                                allowed = True
-                    else:
-                        if coordinator.level == attendance.classroom.grade.level:
-                            allowed = True
-                    
-                    if not allowed:
-                        failed_count += 1
-                        errors.append(f"Attendance {attendance_id}: Access denied")
-                        continue
-                    
-                    # Approve attendance
-                    attendance.status = 'approved'
-                    attendance.is_final = True
-                    attendance.finalized_at = timezone.now()
-                    attendance.finalized_by = request.user
-                    attendance.add_edit_history(request.user, 'coordinator_approve', f'Bulk approved by coordinator{": " + comment if comment else ""}')
-                    attendance.save()
-                    
-                    # Create audit log
-                    from .models import AuditLog
-                    AuditLog.objects.create(
-                        feature='attendance',
-                        action='coordinator_approve',
-                        entity_type='Attendance',
-                        entity_id=attendance.id,
-                        user=request.user,
-                        ip_address=request.META.get('REMOTE_ADDR'),
-                        changes={'status': 'approved', 'bulk_approval': True}
-                    )
-                    
-                    # Send notification to teacher
-                    try:
-                        teacher_user = None
-                        teacher = None
-                        
-                        if attendance.marked_by:
-                            teacher_user = attendance.marked_by
-                            try:
-                                teacher = Teacher.objects.get(user=teacher_user)
-                            except Teacher.DoesNotExist:
-                                try:
-                                    teacher = Teacher.objects.get(employee_code=teacher_user.username)
-                                except Teacher.DoesNotExist:
-                                    pass
-                        elif attendance.classroom and attendance.classroom.class_teacher:
-                            teacher = attendance.classroom.class_teacher
-                            if teacher and teacher.user:
-                                teacher_user = teacher.user
-                        
-                        if teacher_user:
-                            coordinator_name = coordinator.full_name if coordinator else request.user.get_full_name() or request.user.username
-                            classroom_name = str(attendance.classroom)
-                            verb = "Your attendance has been approved"
-                            target_text = f"by {coordinator_name} for {classroom_name} on {attendance.date.strftime('%B %d, %Y')}."
-                            
-                            from notifications.services import create_notification
-                            create_notification(
-                                recipient=teacher_user,
-                                actor=request.user,
-                                verb=verb,
-                                target_text=target_text,
-                                data={"attendance_id": attendance.id, "classroom_id": attendance.classroom.id}
-                            )
-                    except Exception as e:
-                        # Don't fail bulk approval if notification fails
-                        import logging
-                        logger = logging.getLogger(__name__)
-                        logger.error(f"Failed to send notification for attendance {attendance_id}: {str(e)}")
-                    
-                    approved_count += 1
-                    
-                except Exception as e:
-                    failed_count += 1
-                    errors.append(f"Attendance {attendance_id}: {str(e)}")
+        result = bulk_approve_attendance(
+            request.user,
+            coordinator,
+            attendance_ids,
+            comment=comment,
+            ip_address=request.META.get('REMOTE_ADDR'),
+        )
         
         return Response({
-            'approved_count': approved_count,
-            'failed_count': failed_count,
+            'approved_count': result.approved_count,
+            'failed_count': result.failed_count,
             'total': len(attendance_ids),
-            'errors': errors[:10]  # Limit errors to first 10
+            'errors': result.errors[:10]  # Limit errors to first 10
         }, status=status.HTTP_200_OK)
         
     except Exception as e:
@@ -1777,7 +1612,7 @@ def reopen_attendance(request, attendance_id):
             attendance.reopened_at = timezone.now()
             attendance.reopened_by = request.user
             attendance.reopen_reason = reason
-            attendance.add_edit_history(request.user, 'reopen', reason)
+            attendance.add_edit_history(request.user, 'reopen', reason, save=False)
             attendance.save()
             
             from .models import AuditLog
@@ -2025,20 +1860,23 @@ def create_holiday(request):
                 except Attendance.DoesNotExist:
                     pass
 
-        # Create holiday (use first level for backward compatibility in level field)
-        holiday = Holiday.objects.create(
-            date=date_obj,
-            reason=reason,
-            level=target_levels[0] if target_levels else None,
-            created_by=request.user
-        )
+        # Create holiday atomically so the notification job (queued on commit)
+        # sees the final levels/grades
+        with transaction.atomic():
+            # Use first level for backward compatibility in level field
+            holiday = Holiday.objects.create(
+                date=date_obj,
+                reason=reason,
+                level=target_levels[0] if target_levels else None,
+                created_by=request.user
+            )
 
-        # Assign relationships
-        holiday.levels.set(target_levels)
-        if target_grades:
-            holiday.grades.set(target_grades)
-        holiday.shifts = sorted(collect_shifts_from_levels(target_levels))
-        holiday.save()
+            # Assign relationships
+            holiday.levels.set(target_levels)
+            if target_grades:
+                holiday.grades.set(target_grades)
+            holiday.shifts = sorted(collect_shifts_from_levels(target_levels))
+            holiday.save()
 
         AuditLog.objects.create(
             feature='attendance',
@@ -2334,23 +2172,24 @@ def update_holiday(request, holiday_id):
                     except Attendance.DoesNotExist:
                         pass
         
-        # Update holiday
-        holiday.date = date_obj
-        holiday.reason = reason
-        # Update level for backward compatibility (use first level)
-        holiday.level = new_levels[0] if new_levels else None
-        holiday.save()
-        
-        # Update levels M2M
-        holiday.levels.set(new_levels)
-        
-        # Update grades M2M
-        holiday.grades.set(new_grades)
+        # Update holiday (atomically, so notifications queued on commit see the new levels/grades)
+        with transaction.atomic():
+            holiday.date = date_obj
+            holiday.reason = reason
+            # Update level for backward compatibility (use first level)
+            holiday.level = new_levels[0] if new_levels else None
+            holiday.save()
+            
+            # Update levels M2M
+            holiday.levels.set(new_levels)
+            
+            # Update grades M2M
+            holiday.grades.set(new_grades)
 
-        # Store resolved shifts
-        holiday.shifts = sorted(collect_shifts_from_levels(new_levels))
-        
-        holiday.save()
+            # Store resolved shifts
+            holiday.shifts = sorted(collect_shifts_from_levels(new_levels))
+            
+            holiday.save()
         
         AuditLog.objects.create(
             feature='attendance',
@@ -2449,6 +2288,7 @@ def delete_holiday(request, holiday_id):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def get_realtime_attendance_metrics(request):
     """Get real-time attendance metrics for dashboards"""
     try:
@@ -2460,34 +2300,30 @@ def get_realtime_attendance_metrics(request):
             'classrooms': []
         }
         
-        # Get classrooms based on role
-        if user.is_teacher():
-            teacher = Teacher.objects.get(employee_code=user.username)
-            classrooms = [teacher.assigned_classroom] if teacher.assigned_classroom else []
-        elif user.is_coordinator():
-            from coordinator.models import Coordinator
-            coordinator = Coordinator.get_for_user(user)
-            if coordinator:
-                if coordinator.shift == 'both' and coordinator.assigned_levels.exists():
-                    classrooms = ClassRoom.objects.filter(grade__level__in=coordinator.assigned_levels.all())
-                elif coordinator.level:
-                    classrooms = ClassRoom.objects.filter(grade__level=coordinator.level)
-                else:
-                    classrooms = []
-            else:
-                classrooms = []
-        elif user.is_principal():
-            from principals.models import Principal
-            principal = Principal.objects.get(email=user.email)
-            classrooms = ClassRoom.objects.filter(grade__level__campus=principal.campus)
+        # Get classrooms based on role (teacher, coordinator and principal scopes)
+        scope = get_user_scope(user)
+        if scope and not scope.is_global and scope.classroom_ids:
+            classrooms = ClassRoom.objects.filter(id__in=scope.classroom_ids).select_related('grade')
         else:
             classrooms = []
         
+        classrooms = list(classrooms)
+        classroom_ids = [classroom.id for classroom in classrooms]
+        
+        # Today's totals for every classroom in one indexed lookup on the rollup
+        today_rollups = {
+            rollup.classroom_id: rollup
+            for rollup in AttendanceDailyRollup.objects.filter(date=today, classroom_id__in=classroom_ids)
+        }
+        # Roster sizes are only needed for classrooms that have not been marked yet
+        unmarked_ids = [cid for cid in classroom_ids if cid not in today_rollups]
+        student_counts = dict(
+            Student.objects.filter(classroom_id__in=unmarked_ids).order_by()
+            .values('classroom_id').annotate(c=Count('id')).values_list('classroom_id', 'c')
+        ) if unmarked_ids else {}
+        
         for classroom in classrooms:
-            attendance = Attendance.objects.filter(
-                classroom=classroom,
-                date=today
-            ).first()
+            attendance = today_rollups.get(classroom.id)
             
             status_color = 'gray'
             if attendance:
@@ -2505,7 +2341,7 @@ def get_realtime_attendance_metrics(request):
                 'name': str(classroom),
                 'status': attendance.status if attendance else 'not_marked',
                 'status_color': status_color,
-                'total_students': attendance.total_students if attendance else classroom.students.count(),
+                'total_students': attendance.total_students if attendance else student_counts.get(classroom.id, 0),
                 'present_count': attendance.present_count if attendance else 0,
                 'absent_count': attendance.absent_count if attendance else 0,
                 'percentage': attendance.attendance_percentage if attendance else 0
@@ -2516,11 +2352,29 @@ def get_realtime_attendance_metrics(request):
         return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+class AttendanceListPagination(CursorPagination):
+    """Opt-in cursor pagination for get_attendance_list (?pagination=cursor, ?page_size= or ?cursor=)"""
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = ('-date', '-id')
+
+
+class DeleteLogCursorPagination(CursorPagination):
+    """Opt-in cursor pagination for get_delete_logs (?pagination=cursor or ?cursor=)"""
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = ('-timestamp', '-id')
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_attendance_list(request):
     """
-    Get list of attendance records for dashboard
+    Get list of attendance records for dashboard.
+    Returns a plain list unless ``page_size`` or ``cursor`` is given, in
+    which case results are cursor-paginated.
     """
     try:
         # Optional campus filter: restrict attendance to classrooms
@@ -2535,10 +2389,12 @@ def get_attendance_list(request):
         # Get attendance records from last 30 days
         thirty_days_ago = timezone.now().date() - timedelta(days=30)
         
-        attendances = Attendance.objects.filter(
-            date__gte=thirty_days_ago,
-            is_deleted=False
-        ).select_related('classroom')
+        attendances = AttendanceSerializer.setup_eager_loading(
+            Attendance.objects.filter(
+                date__gte=thirty_days_ago,
+                is_deleted=False
+            )
+        )
 
         if campus_id:
             try:
@@ -2550,6 +2406,12 @@ def get_attendance_list(request):
                 # Ignore invalid campus values and fall back to all campuses
                 pass
 
+        if 'page_size' in request.GET or 'cursor' in request.GET or request.GET.get('pagination') == 'cursor':
+            paginator = AttendanceListPagination()
+            page = paginator.paginate_queryset(attendances, request)
+            serializer = AttendanceSerializer(page, many=True, context={'request': request})
+            return paginator.get_paginated_response(serializer.data)
+
         attendances = attendances.order_by('-date')
         
         # Serialize the data
@@ -2561,11 +2423,80 @@ def get_attendance_list(request):
         return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+class CSVRegisterRenderer(JSONRenderer):
+    """
+    Lets ``?format=csv`` through DRF's format override. The register itself
+    is a StreamingHttpResponse and skips rendering; only JSON errors use it.
+    """
+    format = 'csv'
+
+
+class XLSXRegisterRenderer(JSONRenderer):
+    format = 'xlsx'
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@renderer_classes([JSONRenderer, CSVRegisterRenderer, XLSXRegisterRenderer])
+def export_attendance_register(request):
+    """
+    Stream a student x date attendance register for the requested classroom,
+    level or campus (default: everything in the user's scope).
+    Query params: start, end (YYYY-MM-DD), classroom, level, campus, format=csv|xlsx.
+    """
+    try:
+        try:
+            start_date = datetime.strptime(request.GET.get('start', ''), '%Y-%m-%d').date()
+            end_date = datetime.strptime(request.GET.get('end', ''), '%Y-%m-%d').date()
+        except ValueError:
+            return Response({'error': 'start and end are required in YYYY-MM-DD format'}, status=status.HTTP_400_BAD_REQUEST)
+        if start_date > end_date:
+            return Response({'error': 'start must be on or before end'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        export_format = request.GET.get('format', 'csv').lower()
+        if export_format not in ('csv', 'xlsx'):
+            return Response({'error': 'format must be csv or xlsx'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        scope = get_user_scope(request.user)
+        if not scope:
+            return Response({'error': 'You do not have access to attendance exports'}, status=status.HTTP_403_FORBIDDEN)
+        
+        filters = {}
+        for param in ('classroom', 'level', 'campus'):
+            value = request.GET.get(param)
+            if value:
+                try:
+                    filters[f'{param}_id'] = int(value)
+                except ValueError:
+                    return Response({'error': f'Invalid {param} ID'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        classroom_ids = list(export_classrooms(
+            allowed_ids=None if scope.is_global else scope.classroom_ids,
+            **filters
+        ).values_list('id', flat=True))
+        if not classroom_ids:
+            return Response({'error': 'No classrooms found for this export'}, status=status.HTTP_404_NOT_FOUND)
+        
+        filename = f"attendance_register_{start_date.isoformat()}_{end_date.isoformat()}.{export_format}"
+        if export_format == 'xlsx':
+            if not xlsx_available():
+                return Response({'error': 'XLSX export is not available on this server'}, status=status.HTTP_501_NOT_IMPLEMENTED)
+            chunks = iter_register_xlsx(classroom_ids, start_date, end_date)
+            return streaming_response(request, chunks, XLSX_CONTENT_TYPE, filename)
+        
+        chunks = buffered(iter_register_csv(classroom_ids, start_date, end_date))
+        return streaming_response(request, chunks, 'text/csv; charset=utf-8', filename)
+        
+    except Exception as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_delete_logs(request):
     """
-    Get delete audit logs for the current user or all (based on permissions)
+    Get delete audit logs for the current user or all (based on permissions).
+    Cursor-paginated when ``pagination=cursor`` or ``cursor`` is given.
     """
     try:
         from .models import AuditLog
@@ -2609,47 +2540,32 @@ def get_delete_logs(request):
                 )
         elif hasattr(user, 'role') and user.role == 'coordinator':
             # Coordinator can see delete logs for students in their managed classrooms
-            try:
-                coordinator_obj = Coordinator.get_for_user(user)
-                if coordinator_obj and coordinator_obj.campus:
-                    # Determine which levels this coordinator manages
-                    managed_levels = []
-                    if coordinator_obj.shift == 'both' and hasattr(coordinator_obj, 'assigned_levels') and coordinator_obj.assigned_levels.exists():
-                        managed_levels = list(coordinator_obj.assigned_levels.all())
-                    elif coordinator_obj.level:
-                        managed_levels = [coordinator_obj.level]
-
-                    if managed_levels:
-                        # Get all classrooms under coordinator's managed levels
-                        coordinator_classrooms = ClassRoom.objects.filter(
-                            grade__level__in=managed_levels,
-                            grade__level__campus=coordinator_obj.campus
-                        ).values_list('id', flat=True)
-
-                        # Get all student IDs in these classrooms (including soft-deleted)
-                        coordinator_student_ids = Student.objects.with_deleted().filter(
-                            classroom__in=coordinator_classrooms
-                        ).values_list('id', flat=True)
-
-                        # Filter delete logs: show student deletions for students in coordinator's classrooms
-                        # Also show other relevant features (teacher, classroom, etc.) if they relate to coordinator's scope
-                        queryset = queryset.filter(
-                            Q(feature='student', entity_id__in=coordinator_student_ids) |
-                            Q(feature__in=['teacher', 'classroom', 'grade', 'level'])
-                        )
-                    else:
-                        # No managed levels, show only their own delete logs
-                        queryset = queryset.filter(user=user)
-                else:
-                    # No coordinator profile found or no campus, show only their own delete logs
-                    queryset = queryset.filter(user=user)
-            except Exception:
-                # If coordinator resolution fails, show only their own delete logs
+            scope = get_user_scope(user)
+            if scope and scope.coordinator_id and scope.campus_ids and scope.classroom_ids:
+                # Student IDs in these classrooms (including soft-deleted), as a subquery
+                coordinator_student_ids = Student.objects.with_deleted().filter(
+                    classroom_id__in=scope.classroom_ids
+                ).values('id')
+
+                # Filter delete logs: show student deletions for students in coordinator's classrooms
+                # Also show other relevant features (teacher, classroom, etc.) if they relate to coordinator's scope
+                queryset = queryset.filter(
+                    Q(feature='student', entity_id__in=coordinator_student_ids) |
+                    Q(feature__in=['teacher', 'classroom', 'grade', 'level'])
+                )
+            else:
+                # No coordinator profile, campus or managed classrooms: show only their own delete logs
                 queryset = queryset.filter(user=user)
         else:
             # Other users (teachers, etc.) see only their own delete logs
             queryset = queryset.filter(user=user)
         
+        if request.GET.get('pagination') == 'cursor' or 'cursor' in request.GET:
+            paginator = DeleteLogCursorPagination()
+            page = paginator.paginate_queryset(queryset, request)
+            serializer = DeleteLogSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+        
         # Limit results
         delete_logs = queryset[:limit]
         
@@ -11,7 +11,6 @@ import os
 
 from django.core.asgi import get_asgi_application
 from channels.routing import ProtocolTypeRouter, URLRouter
-from channels.auth import AuthMiddlewareStack
 from channels.security.websocket import AllowedHostsOriginValidator
 from django.conf import settings
 
@@ -24,11 +23,11 @@ django_asgi_app = get_asgi_application()
 # Import routing after Django setup
 from notifications import routing as notifications_routing
 
-# WebSocket middleware stack
-websocket_stack = AuthMiddlewareStack(
-    URLRouter(
-        notifications_routing.websocket_urlpatterns
-    )
+# WebSocket middleware stack. Consumers authenticate from the JWT in the
+# query string, so there is no session/auth middleware (it loaded the session
+# user from the database on every connect).
+websocket_stack = URLRouter(
+    notifications_routing.websocket_urlpatterns
 )
 
 # In development, allow all origins for WebSocket (for localhost testing)
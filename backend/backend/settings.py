@@ -131,6 +131,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Removes itself at startup unless REQUEST_METRICS_ENABLED is set
+    'utils.request_metrics.RequestMetricsMiddleware',
 ]
 
 ROOT_URLCONF = 'backend.urls'
@@ -167,6 +169,23 @@ DATABASES = {
     }
 }
 
+# Optional read replica for analytics endpoints (utils/db_routing.py). Set DB_REPLICA_HOST,
+# or DB_REPLICA_NAME to use a second local database; unset keeps every query on default
+if os.getenv('DB_REPLICA_HOST') or os.getenv('DB_REPLICA_NAME'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.getenv('DB_REPLICA_NAME', DATABASES['default']['NAME']),
+        'USER': os.getenv('DB_REPLICA_USER', DATABASES['default']['USER']),
+        'PASSWORD': os.getenv('DB_REPLICA_PASSWORD', DATABASES['default']['PASSWORD']),
+        'HOST': os.getenv('DB_REPLICA_HOST', DATABASES['default']['HOST']),
+        'PORT': os.getenv('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['utils.db_routing.ReplicaRouter']
+# Replica reads fall back to default while the replica lags more than this many seconds
+REPLICA_MAX_LAG_SECONDS = float(os.getenv('REPLICA_MAX_LAG_SECONDS', '5'))
+# Seconds between replica lag checks (per process)
+REPLICA_LAG_CHECK_INTERVAL = float(os.getenv('REPLICA_LAG_CHECK_INTERVAL', '5'))
 
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -265,6 +284,72 @@ CACHES = {
     }
 }
 
+# Attendance alerts
+# Consecutive absences needed before the class teacher is notified
+ATTENDANCE_ABSENCE_STREAK_LENGTH = int(os.getenv('ATTENDANCE_ABSENCE_STREAK_LENGTH', '3'))
+# When true, weekends and holidays are skipped instead of breaking a streak
+ATTENDANCE_ABSENCE_CALENDAR_AWARE = os.getenv('ATTENDANCE_ABSENCE_CALENDAR_AWARE', 'False').lower() == 'true'
+
+# School calendar (holiday/weekend index used by attendance)
+# Month the academic year starts in; one calendar is built and cached per year
+ACADEMIC_YEAR_START_MONTH = int(os.getenv('ACADEMIC_YEAR_START_MONTH', '4'))
+# Seconds a built calendar stays cached (also invalidated by Holiday/Weekend signals)
+ATTENDANCE_CALENDAR_CACHE_TIMEOUT = int(os.getenv('ATTENDANCE_CALENDAR_CACHE_TIMEOUT', '86400'))
+
+# Seconds a resolved users.scope.UserScope stays cached (also invalidated by signals)
+USER_SCOPE_CACHE_TIMEOUT = int(os.getenv('USER_SCOPE_CACHE_TIMEOUT', '300'))
+# Seconds a current-user profile stays cached (also invalidated by signals)
+USER_PROFILE_CACHE_TIMEOUT = int(os.getenv('USER_PROFILE_CACHE_TIMEOUT', '300'))
+# Seconds student dashboard_stats responses stay cached (also invalidated on student save/delete)
+STUDENT_STATS_CACHE_TIMEOUT = int(os.getenv('STUDENT_STATS_CACHE_TIMEOUT', '300'))
+
+# Per-endpoint query/latency metrics (utils/request_metrics.py); off unless enabled
+REQUEST_METRICS_ENABLED = os.getenv('REQUEST_METRICS_ENABLED', 'False').lower() in ('true', '1', 'yes')
+# Samples kept per process, seconds between publishing them to the cache, and their cache TTL
+REQUEST_METRICS_BUFFER_SIZE = int(os.getenv('REQUEST_METRICS_BUFFER_SIZE', '2000'))
+REQUEST_METRICS_PUBLISH_INTERVAL = float(os.getenv('REQUEST_METRICS_PUBLISH_INTERVAL', '10'))
+REQUEST_METRICS_TTL = int(os.getenv('REQUEST_METRICS_TTL', '3600'))
+
+# Logging: every local app logs through logging.getLogger(__name__); records are
+# written to stdout by a background thread (utils/log_handlers.py) so request
+# threads never block on console I/O. LOG_LEVEL applies to the project's apps.
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'standard': {
+            'format': '%(asctime)s %(levelname)s [%(name)s] %(message)s',
+        },
+    },
+    'handlers': {
+        'queue': {
+            'class': 'utils.log_handlers.QueueListenerHandler',
+            'formatter': 'standard',
+            'stream': 'ext://sys.stdout',
+        },
+    },
+    'root': {
+        'handlers': ['queue'],
+        'level': 'WARNING',
+    },
+    'loggers': {
+        'django': {
+            'handlers': ['queue'],
+            'level': os.getenv('DJANGO_LOG_LEVEL', 'INFO').upper(),
+            'propagate': False,
+        },
+        **{
+            app: {'level': LOG_LEVEL}
+            for app in (
+                'attendance', 'behaviour', 'campus', 'classes', 'coordinator', 'notifications',
+                'principals', 'requests', 'result', 'services', 'student_status', 'students',
+                'teachers', 'timetable', 'transfers', 'users', 'utils',
+            )
+        },
+    },
+}
+
 # Django Channels configuration
 ASGI_APPLICATION = 'backend.asgi.application'
 
@@ -286,6 +371,31 @@ else:
         },
     }
 
+# Background threads used to push notifications to the Redis channel layer
+NOTIFICATION_PUSH_WORKERS = int(os.getenv('NOTIFICATION_PUSH_WORKERS', '2'))
+# Run deferred notification fan-out (e.g. holiday notices) on those threads
+NOTIFICATION_ASYNC_FANOUT = os.getenv('NOTIFICATION_ASYNC_FANOUT', 'False' if DEBUG else 'True').lower() == 'true'
+# Only push notifications to users with an open WebSocket (notifications/presence.py);
+# needs the default cache shared by the HTTP and WebSocket workers
+NOTIFICATION_PRESENCE_ENABLED = os.getenv('NOTIFICATION_PRESENCE_ENABLED', 'False' if DEBUG else 'True').lower() == 'true'
+# Seconds a user counts as online after connecting or their last ping (the client pings every 30s)
+NOTIFICATION_PRESENCE_TTL = int(os.getenv('NOTIFICATION_PRESENCE_TTL', '90'))
+
+# Transfer events (transfers/outbox.py): broker the outbox relay publishes to,
+# 'inprocess' (the relay runs the handlers) or 'redis' (a Redis Stream read by consume_transfer_events)
+TRANSFER_EVENTS_BROKER = os.getenv('TRANSFER_EVENTS_BROKER', 'inprocess')
+TRANSFER_EVENTS_REDIS_URL = os.getenv('TRANSFER_EVENTS_REDIS_URL', os.getenv('REDIS_URL', 'redis://127.0.0.1:6379/1'))
+TRANSFER_EVENTS_STREAM = os.getenv('TRANSFER_EVENTS_STREAM', 'transfers.events')
+TRANSFER_EVENTS_STREAM_MAXLEN = int(os.getenv('TRANSFER_EVENTS_STREAM_MAXLEN', '100000'))
+# Drain the outbox right after each transfer commits (off the request thread when
+# NOTIFICATION_ASYNC_FANOUT is on); turn off when a relay_transfer_outbox worker runs
+TRANSFER_OUTBOX_RELAY_ON_COMMIT = os.getenv('TRANSFER_OUTBOX_RELAY_ON_COMMIT', 'True').lower() == 'true'
+TRANSFER_OUTBOX_BATCH_SIZE = int(os.getenv('TRANSFER_OUTBOX_BATCH_SIZE', '100'))
+# Publish attempts before an outbox row is left for inspection in the admin
+TRANSFER_OUTBOX_MAX_ATTEMPTS = int(os.getenv('TRANSFER_OUTBOX_MAX_ATTEMPTS', '10'))
+# Days published outbox rows are kept before relay_transfer_outbox deletes them (0 keeps them)
+TRANSFER_OUTBOX_RETENTION_DAYS = int(os.getenv('TRANSFER_OUTBOX_RETENTION_DAYS', '7'))
+
 # CORS/CSRF settings for frontend dev
 CORS_ALLOW_ALL_ORIGINS = os.getenv('CORS_ALLOW_ALL_ORIGINS', 'True').lower() == 'true'
 
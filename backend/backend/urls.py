@@ -19,8 +19,8 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from graphene_django.views import GraphQLView
 from django.views.decorators.csrf import csrf_exempt
+from utils.graphql_views import ReplicaGraphQLView
 
 urlpatterns = [
     path('sms-admin/', admin.site.urls),
@@ -38,8 +38,8 @@ urlpatterns = [
     path("api/transfers/", include("transfers.urls")),
     path("api/behaviour/", include("behaviour.urls")),
     path("api/timetable/", include("timetable.urls")),
-    # GraphQL endpoint (enable GraphiQL only in DEBUG)
-    path("graphql/", csrf_exempt(GraphQLView.as_view(graphiql=settings.DEBUG))),
+    # GraphQL endpoint (enable GraphiQL only in DEBUG); queries read from the replica when configured
+    path("graphql/", csrf_exempt(ReplicaGraphQLView.as_view(graphiql=settings.DEBUG))),
     # Removed services.urls - not needed for utility apps
 ]
 
@@ -0,0 +1,112 @@
+"""
+Canonical grade keys.
+
+Grade names and Student.current_grade come in many spellings ("Grade I",
+"Grade-1", "grade 01", "KG1", "KG-I"...). ``canonical_grade_key`` maps
+them to one key ("G-01", "KG-1", "NURSERY", "SPECIAL") that is stored in
+an indexed ``grade_key`` column on Grade and Student when they are saved,
+so grade filters and distributions are plain equality / GROUP BY queries.
+Unrecognized values get an empty key.
+"""
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+ROMAN_TO_NUM = {
+    'i': 1, 'ii': 2, 'iii': 3, 'iv': 4, 'v': 5,
+    'vi': 6, 'vii': 7, 'viii': 8, 'ix': 9, 'x': 10,
+}
+NUM_TO_ROMAN = {num: roman.upper() for roman, num in ROMAN_TO_NUM.items()}
+
+_KG_PATTERN = re.compile(r'kg[-_\s]?([ivx\d]+)')
+_GRADE_PATTERN = re.compile(r'grade[-_\s]*([ivx\d]+)')
+
+
+def _number(token: str) -> Optional[int]:
+    if token in ROMAN_TO_NUM:
+        return ROMAN_TO_NUM[token]
+    return int(token) if token.isdigit() else None
+
+
+def parse_grade(raw) -> tuple[str, str]:
+    """Return ``(key, label)`` for a raw grade string; label is the dashboard label."""
+    value = (raw or '').strip()
+    if not value:
+        return '', 'Unknown Grade'
+    lower = value.lower()
+
+    if 'nursery' in lower:
+        return 'NURSERY', 'Nursery'
+    if 'special' in lower:
+        return 'SPECIAL', 'Special Class'
+
+    if 'kg' in lower:
+        match = _KG_PATTERN.search(lower)
+        if not match:
+            return 'KG-1', 'KG-I'
+        number = _number(match.group(1))
+        if number is None:
+            return '', f"KG-{match.group(1)}"
+        return f"KG-{number}", grade_key_label(f"KG-{number}")
+
+    if 'grade' in lower:
+        match = _GRADE_PATTERN.search(lower)
+        if not match:
+            return '', 'Grade'
+        number = _number(match.group(1))
+        if number is None:
+            return '', f"Grade {match.group(1)}"
+        return f"G-{number:02d}", grade_key_label(f"G-{number:02d}")
+
+    return '', value
+
+
+def canonical_grade_key(raw) -> str:
+    return parse_grade(raw)[0]
+
+
+def grade_key_label(key: str) -> str:
+    """Dashboard label for a key: "Nursery", "KG-I", "Grade 7", "Special Class"."""
+    if key == 'NURSERY':
+        return 'Nursery'
+    if key == 'SPECIAL':
+        return 'Special Class'
+    if key.startswith('KG-'):
+        number = int(key[3:])
+        return f"KG-{NUM_TO_ROMAN.get(number, number)}"
+    if key.startswith('G-'):
+        return f"Grade {int(key[2:])}"
+    return key or 'Unknown Grade'
+
+
+def grade_group_label(key: str, raw=None) -> str:
+    """Label for a grade_key group; ``raw`` is the original value when the key is empty."""
+    return grade_key_label(key) if key else parse_grade(raw)[1]
+
+
+def rebuild_grade_keys(model, source_field: str, batch_size: int = 1000) -> int:
+    """
+    Recompute ``grade_key`` from ``source_field`` for every row of ``model``
+    (Grade or Student, or their historical versions in migrations) in
+    primary-key batches. Returns the number of rows rewritten.
+    """
+    manager = model._base_manager
+    updated = 0
+    last_pk = 0
+    while True:
+        batch = list(
+            manager.filter(pk__gt=last_pk).order_by('pk').only('pk', 'grade_key', source_field)[:batch_size]
+        )
+        if not batch:
+            return updated
+        last_pk = batch[-1].pk
+        changed = []
+        for obj in batch:
+            key = canonical_grade_key(getattr(obj, source_field))
+            if key != obj.grade_key:
+                obj.grade_key = key
+                changed.append(obj)
+        if changed:
+            manager.bulk_update(changed, ['grade_key'])
+            updated += len(changed)
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from classes.grade_keys import rebuild_grade_keys
+from classes.models import Grade
+from students.models import Student
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the canonical grade_key of every Grade (from name) and Student "
+        "(from current_grade). Needed after rows are changed with queryset.update() "
+        "or the key rules change."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows per batch (default: 1000)")
+
+    def handle(self, *args, **options):
+        batch_size: int = options.get("batch_size") or 1000
+
+        grades = rebuild_grade_keys(Grade, "name", batch_size=batch_size)
+        students = rebuild_grade_keys(Student, "current_grade", batch_size=batch_size)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Grade keys rebuilt. Grades updated: {grades}, Students updated: {students}."
+        ))
@@ -0,0 +1,77 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:09
+
+import re
+
+from django.db import migrations, models
+
+# Frozen copy of classes.grade_keys.canonical_grade_key as of this
+# migration; later changes to the live module must not change this backfill
+ROMAN_TO_NUM = {
+    'i': 1, 'ii': 2, 'iii': 3, 'iv': 4, 'v': 5,
+    'vi': 6, 'vii': 7, 'viii': 8, 'ix': 9, 'x': 10,
+}
+
+_KG_PATTERN = re.compile(r'kg[-_\s]?([ivx\d]+)')
+_GRADE_PATTERN = re.compile(r'grade[-_\s]*([ivx\d]+)')
+
+
+def _number(token):
+    if token in ROMAN_TO_NUM:
+        return ROMAN_TO_NUM[token]
+    return int(token) if token.isdigit() else None
+
+
+def canonical_grade_key(raw):
+    lower = (raw or '').strip().lower()
+    if not lower:
+        return ''
+    if 'nursery' in lower:
+        return 'NURSERY'
+    if 'special' in lower:
+        return 'SPECIAL'
+    if 'kg' in lower:
+        match = _KG_PATTERN.search(lower)
+        if not match:
+            return 'KG-1'
+        number = _number(match.group(1))
+        return f"KG-{number}" if number is not None else ''
+    if 'grade' in lower:
+        match = _GRADE_PATTERN.search(lower)
+        number = _number(match.group(1)) if match else None
+        return f"G-{number:02d}" if number is not None else ''
+    return ''
+
+
+def rebuild_grade_keys(model, source_field):
+    manager = model._base_manager
+    last_pk = 0
+    while True:
+        batch = list(
+            manager.filter(pk__gt=last_pk).order_by('pk').only('pk', 'grade_key', source_field)[:1000]
+        )
+        if not batch:
+            return
+        last_pk = batch[-1].pk
+        for obj in batch:
+            obj.grade_key = canonical_grade_key(getattr(obj, source_field))
+        manager.bulk_update(batch, ['grade_key'])
+
+
+def backfill_grade_keys(apps, schema_editor):
+    rebuild_grade_keys(apps.get_model('classes', 'Grade'), 'name')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('classes', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='grade',
+            name='grade_key',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=20),
+        ),
+        migrations.RunPython(backfill_grade_keys, migrations.RunPython.noop),
+    ]
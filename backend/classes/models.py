@@ -3,6 +3,8 @@ from django.utils.crypto import get_random_string
 from django.core.exceptions import ValidationError
 from django.db.models import Q
 
+from .grade_keys import canonical_grade_key
+
 # Teacher model assumed in 'teachers' app
 TEACHER_MODEL = "teachers.Teacher"
 
@@ -115,6 +117,8 @@ class Grade(models.Model):
     """
     name = models.CharField(max_length=50)
     code = models.CharField(max_length=25, unique=True, blank=True, null=True, editable=False)
+    # Canonical key of the name ("G-01", "KG-1", ...), see classes/grade_keys.py
+    grade_key = models.CharField(max_length=20, blank=True, default='', db_index=True, editable=False)
     
     # Level connection
     level = models.ForeignKey(
@@ -194,6 +198,11 @@ class Grade(models.Model):
 
             self.code = f"{level_code}-{grade_code}"
 
+        self.grade_key = canonical_grade_key(self.name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'grade_key'}
+
         super().save(*args, **kwargs)
 
     class Meta:
@@ -312,16 +321,13 @@ class ClassRoom(models.Model):
         
         from students.models import Student
         
-        # Normalize grade names for matching
-        grade_name_variations = [
-            self.grade.name,
-            self.grade.name.replace('-', ' '),  # Grade-4 -> Grade 4
-            self.grade.name.replace(' ', '-'),  # Grade 4 -> Grade-4
-        ]
-        
-        grade_query = Q()
-        for grade_var in grade_name_variations:
-            grade_query |= Q(current_grade__icontains=grade_var)
+        if self.grade.grade_key:
+            grade_query = Q(grade_key=self.grade.grade_key)
+        else:
+            # Unrecognized grade name: match spelling variants
+            grade_query = Q()
+            for grade_var in {self.grade.name, self.grade.name.replace('-', ' '), self.grade.name.replace(' ', '-')}:
+                grade_query |= Q(current_grade__icontains=grade_var)
         
         return Student.objects.filter(
             campus=self.campus,
@@ -1,7 +1,12 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from classes.models import ClassRoom
+from classes.models import ClassRoom, Grade, Level
 from coordinator.models import Coordinator
+from users.profile import invalidate_user_profiles
+from users.scope import invalidate_user_scopes
+import logging
+
+logger = logging.getLogger(__name__)
 
 @receiver(post_save, sender=ClassRoom)
 def update_teacher_coordinator_on_classroom_change(sender, instance, **kwargs):
@@ -23,6 +28,18 @@ def update_teacher_coordinator_on_classroom_change(sender, instance, **kwargs):
                 # Add coordinator (not replace) - use ManyToMany
                 if coordinator not in teacher.assigned_coordinators.all():
                     teacher.assigned_coordinators.add(coordinator)
-                    print(f"Added coordinator {coordinator.full_name} for level {instance.grade.level.name}")
+                    logger.debug("Added coordinator %s for level %s", coordinator.full_name, instance.grade.level.name)
             else:
-                print(f"No coordinator found for {instance.grade.level.name}")
\ No newline at end of file
+                logger.debug("No coordinator found for %s", instance.grade.level.name)
+
+
+@receiver(post_save, sender=ClassRoom)
+@receiver(post_delete, sender=ClassRoom)
+@receiver(post_save, sender=Grade)
+@receiver(post_delete, sender=Grade)
+@receiver(post_save, sender=Level)
+@receiver(post_delete, sender=Level)
+def invalidate_scopes_on_structure_change(sender, **kwargs):
+    """Classroom/grade/level moves change users.scope classroom sets and the cached profiles; drop both"""
+    invalidate_user_scopes()
+    invalidate_user_profiles()
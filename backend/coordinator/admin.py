@@ -4,6 +4,9 @@ from django.core.exceptions import ValidationError
 from django.utils.html import format_html
 from .models import Coordinator
 from classes.models import Level
+import logging
+
+logger = logging.getLogger(__name__)
 
 @admin.register(Coordinator)
 class CoordinatorAdmin(admin.ModelAdmin):
@@ -87,7 +90,7 @@ class CoordinatorAdmin(admin.ModelAdmin):
                         obj.save()
         except Exception as e:
             # Avoid breaking admin save; log to console for debugging
-            print(f"Error auto-assigning levels in admin for coordinator {obj}: {e}")
+            logger.warning("Error auto-assigning levels in admin for coordinator %s: %s", obj, e)
 
     def clean_email(self):
         email = self.cleaned_data.get('email')
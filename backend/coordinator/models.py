@@ -2,6 +2,9 @@ from django.db import models
 from django.utils import timezone
 from campus.models import Campus
 from classes.models import Level
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Choices
 GENDER_CHOICES = [
@@ -114,7 +117,7 @@ class Coordinator(models.Model):
                     self.campus, shift_for_code, year, 'coordinator'
                 )
             except Exception as e:
-                print(f"Error generating employee code: {str(e)}")
+                logger.warning("Error generating employee code: %s", e)
         
         super().save(*args, **kwargs)
     
@@ -216,13 +219,11 @@ class Coordinator(models.Model):
     
     def soft_delete(self):
         """Soft delete the coordinator - uses update() to bypass signals"""
-        import logging
-        logger = logging.getLogger(__name__)
         
         if not self.pk:
             raise ValueError("Cannot soft delete coordinator without primary key")
         
-        logger.info(f"[SOFT_DELETE] soft_delete() called for coordinator PK: {self.pk}, Name: {self.full_name}")
+        logger.debug("[SOFT_DELETE] soft_delete() called for coordinator PK: %s, Name: %s", self.pk, self.full_name)
         
         # Use update() to directly update database without triggering signals
         # This ensures no post_delete or other signals interfere
@@ -233,25 +234,27 @@ class Coordinator(models.Model):
             is_currently_active=False
         )
         
-        logger.info(f"[SOFT_DELETE] Database update() returned updated_count: {updated_count}")
+        logger.debug("[SOFT_DELETE] Database update() returned updated_count: %s", updated_count)
         
         if updated_count == 0:
-            logger.error(f"[SOFT_DELETE] CRITICAL: update() returned 0 - no rows were updated! Coordinator PK: {self.pk}")
+            logger.error("[SOFT_DELETE] CRITICAL: update() returned 0 - no rows were updated! Coordinator PK: %s", self.pk)
             raise Exception(f"Soft delete failed - no rows updated for coordinator PK: {self.pk}")
         
         # Refresh instance from database
         self.refresh_from_db()
-        logger.info(f"[SOFT_DELETE] After refresh_from_db(), is_deleted: {self.is_deleted}")
+        logger.debug("[SOFT_DELETE] After refresh_from_db(), is_deleted: %s", self.is_deleted)
+        
+        # update() sends no signals; drop the cached scopes and profiles their receiver would
+        from .signals import invalidate_scopes_on_coordinator_change
+        invalidate_scopes_on_coordinator_change(sender=Coordinator, instance=self)
     
     def restore(self):
         """Restore a soft deleted coordinator"""
-        import logging
-        logger = logging.getLogger(__name__)
         
         if not self.pk:
             raise ValueError("Cannot restore coordinator without primary key")
         
-        logger.info(f"[RESTORE] restore() called for coordinator PK: {self.pk}, Name: {self.full_name}")
+        logger.debug("[RESTORE] restore() called for coordinator PK: %s, Name: %s", self.pk, self.full_name)
         
         # Use update() to bypass signals
         updated_count = Coordinator.objects.with_deleted().filter(pk=self.pk).update(
@@ -260,24 +263,26 @@ class Coordinator(models.Model):
         )
         
         if updated_count == 0:
-            logger.error(f"[RESTORE] CRITICAL: update() returned 0 - no rows were updated! Coordinator PK: {self.pk}")
+            logger.error("[RESTORE] CRITICAL: update() returned 0 - no rows were updated! Coordinator PK: %s", self.pk)
             raise Exception(f"Restore failed - no rows updated for coordinator PK: {self.pk}")
         
         self.refresh_from_db()
-        logger.info(f"[RESTORE] After refresh_from_db(), is_deleted: {self.is_deleted}")
+        logger.debug("[RESTORE] After refresh_from_db(), is_deleted: %s", self.is_deleted)
+        
+        # update() sends no signals; drop the cached scopes and profiles their receiver would
+        from .signals import invalidate_scopes_on_coordinator_change
+        invalidate_scopes_on_coordinator_change(sender=Coordinator, instance=self)
     
     def delete(self, using=None, keep_parents=False):
         """
         Override delete() to prevent accidental hard deletes.
         Always use soft_delete() instead.
         """
-        import logging
-        logger = logging.getLogger(__name__)
         
-        logger.info(f"[OVERRIDE_DELETE] delete() called for coordinator PK: {self.pk}, Name: {self.full_name}, is_deleted: {self.is_deleted}")
+        logger.debug("[OVERRIDE_DELETE] delete() called for coordinator PK: %s, Name: %s, is_deleted: %s", self.pk, self.full_name, self.is_deleted)
         
         if not self.is_deleted:
-            logger.info(f"[OVERRIDE_DELETE] Calling soft_delete() instead of hard delete")
+            logger.debug("[OVERRIDE_DELETE] Calling soft_delete() instead of hard delete")
             self.soft_delete()
         else:
             raise ValueError(
@@ -286,10 +291,8 @@ class Coordinator(models.Model):
     
     def hard_delete(self):
         """Permanently delete the coordinator from database"""
-        import logging
-        logger = logging.getLogger(__name__)
         
-        logger.warning(f"[HARD_DELETE] hard_delete() called for coordinator PK: {self.pk}, Name: {self.full_name}")
+        logger.warning("[HARD_DELETE] hard_delete() called for coordinator PK: %s, Name: %s", self.pk, self.full_name)
         super().delete()
 
     def __str__(self):
@@ -2,7 +2,12 @@ from django.db.models.signals import post_delete, post_save, m2m_changed
 from django.dispatch import receiver
 from .models import Coordinator
 from users.models import User
+from users.profile import invalidate_user_profiles
+from users.scope import invalidate_user_scopes
 from notifications.services import create_notification
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 @receiver(post_save, sender=Coordinator)
@@ -31,9 +36,9 @@ def notify_coordinator_on_update(sender, instance, created, **kwargs):
                     target_text=target_text, 
                     data={"coordinator_id": instance.id}
                 )
-                print(f"[OK] Sent update notification to coordinator {instance.full_name}")
+                logger.info("Sent update notification to coordinator %s", instance.full_name)
         except Exception as e:
-            print(f"Error sending update notification to coordinator {instance.id}: {str(e)}")
+            logger.warning("Error sending update notification to coordinator %s: %s", instance.id, e)
 
 @receiver(post_delete, sender=Coordinator)
 def delete_user_when_coordinator_deleted(sender, instance: Coordinator, **kwargs):
@@ -61,7 +66,7 @@ def delete_user_when_coordinator_deleted(sender, instance: Coordinator, **kwargs
                 target_text=target_text, 
                 data={"coordinator_id": instance.id}
             )
-            print(f"[OK] Sent deletion notification to coordinator {instance.full_name}")
+            logger.info("Sent deletion notification to coordinator %s", instance.full_name)
         
         # Now cleanup user
         if instance.email:
@@ -69,7 +74,7 @@ def delete_user_when_coordinator_deleted(sender, instance: Coordinator, **kwargs
         if instance.employee_code:
             User.objects.filter(username=instance.employee_code).delete()
     except Exception as e:
-        print(f"Error in delete_user_when_coordinator_deleted: {str(e)}")
+        logger.warning("Error in delete_user_when_coordinator_deleted: %s", e)
 
 from teachers.models import Teacher
 from classes.models import Grade
@@ -90,13 +95,13 @@ def create_coordinator_user(sender, instance, created, **kwargs):
                     hasattr(instance, 'assigned_levels') and instance.assigned_levels.exists()
                 )
                 if not has_levels:
-                    print("Deferring user creation until levels are attached (both shift)")
+                    logger.debug("Deferring user creation until levels are attached (both shift)")
                     return
             
             # Check if user already exists
             from users.models import User
             if User.objects.filter(email=instance.email).exists():
-                print(f"User already exists for coordinator {instance.full_name}")
+                logger.info("User already exists for coordinator %s", instance.full_name)
                 try:
                     existing_user = User.objects.filter(email=instance.email).first()
                     campus_name = instance.campus.campus_name if instance.campus else ''
@@ -109,9 +114,9 @@ def create_coordinator_user(sender, instance, created, **kwargs):
             
             user, message = UserCreationService.create_user_from_entity(instance, 'coordinator')
             if not user:
-                print(f"Failed to create user for coordinator {instance.id}: {message}")
+                logger.warning("Failed to create user for coordinator %s: %s", instance.id, message)
             else:
-                print(f"[OK] Created user for coordinator: {instance.full_name} ({instance.employee_code})")
+                logger.info("Created user for coordinator: %s (%s)", instance.full_name, instance.employee_code)
                 try:
                     campus_name = instance.campus.campus_name if instance.campus else ''
                     verb = "You have been added as a Coordinator"
@@ -120,7 +125,7 @@ def create_coordinator_user(sender, instance, created, **kwargs):
                 except Exception:
                     pass
         except Exception as e:
-            print(f"Error creating user for coordinator {instance.id}: {str(e)}")
+            logger.warning("Error creating user for coordinator %s: %s", instance.id, e)
 
 def _auto_assign_for_coordinator(instance):
     """Shared logic to auto-assign teachers based on coordinator's managed levels."""
@@ -133,12 +138,12 @@ def _auto_assign_for_coordinator(instance):
 
     level_name = ", ".join([lvl.name for lvl in managed_levels]) if managed_levels else "No Level"
     campus_name = instance.campus.campus_name if instance.campus else "No Campus"
-    print(f"Coordinator sync: {instance.full_name} for {level_name} in {campus_name}")
+    logger.debug("Coordinator sync: %s for %s in %s", instance.full_name, level_name, campus_name)
 
     try:
         # Check if any level is assigned
         if not managed_levels:
-            print(f"No level assigned to coordinator {instance.full_name}")
+            logger.info("No level assigned to coordinator %s", instance.full_name)
             return
             
         # Get grades for these levels
@@ -146,7 +151,7 @@ def _auto_assign_for_coordinator(instance):
         grade_names = [g.name for g in grades]
         
         if not grade_names:
-            print(f"No grades found for level list: {level_name}")
+            logger.info("No grades found for level list: %s", level_name)
             return
         
         # Find teachers for this campus who teach grades in these levels
@@ -183,15 +188,15 @@ def _auto_assign_for_coordinator(instance):
                     if instance not in teacher.assigned_coordinators.all():
                         teacher.assigned_coordinators.add(instance)
                         assigned_count += 1
-                        print(f"Added coordinator {instance.full_name} to {teacher.full_name}")
+                        logger.debug("Added coordinator %s to %s", instance.full_name, teacher.full_name)
                     
             except Exception as e:
-                print(f"Error assigning teacher {teacher.full_name}: {str(e)}")
+                logger.warning("Error assigning teacher %s: %s", teacher.full_name, e)
         
-        print(f"Auto-assigned {assigned_count} teachers to coordinator {instance.full_name}")
+        logger.info("Auto-assigned %s teachers to coordinator %s", assigned_count, instance.full_name)
         
     except Exception as e:
-        print(f"Error auto-assigning teachers to coordinator {instance.full_name}: {str(e)}")
+        logger.warning("Error auto-assigning teachers to coordinator %s: %s", instance.full_name, e)
 
 
 @receiver(post_save, sender=Coordinator)
@@ -225,10 +230,19 @@ def on_assigned_levels_changed(sender, instance, action, reverse, model, pk_set,
             if not user_exists:
                 user, message = UserCreationService.create_user_from_entity(instance, 'coordinator')
                 if not user:
-                    print(f"Failed to create user after levels set for coordinator {instance.id}: {message}")
+                    logger.warning("Failed to create user after levels set for coordinator %s: %s", instance.id, message)
                 else:
-                    print(f"[OK] Created user after levels set for coordinator: {instance.full_name} ({instance.employee_code})")
+                    logger.info("Created user after levels set for coordinator: %s (%s)", instance.full_name, instance.employee_code)
         except Exception as e:
-            print(f"Error creating user after levels set for coordinator {instance.id}: {str(e)}")
+            logger.warning("Error creating user after levels set for coordinator %s: %s", instance.id, e)
+
+        _auto_assign_for_coordinator(instance)
+
 
-        _auto_assign_for_coordinator(instance)
\ No newline at end of file
+@receiver(post_save, sender=Coordinator)
+@receiver(post_delete, sender=Coordinator)
+@receiver(m2m_changed, sender=Coordinator.assigned_levels.through)
+def invalidate_scopes_on_coordinator_change(sender, **kwargs):
+    """Coordinator levels feed users.scope and the cached profiles; drop both"""
+    invalidate_user_scopes()
+    invalidate_user_profiles()
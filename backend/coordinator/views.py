@@ -7,16 +7,20 @@ from .filters import CoordinatorFilter
 from teachers.models import Teacher
 from students.models import Student
 from classes.models import ClassRoom
+from users.scope import coordinator_level_ids
 from django.db.models import Count, Q
+from utils.db_routing import ReplicaReadMixin
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-class CoordinatorViewSet(viewsets.ModelViewSet):
+class CoordinatorViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     queryset = Coordinator.objects.all()
     serializer_class = CoordinatorSerializer
     permission_classes = [permissions.IsAuthenticated]
+    # Read-only aggregate actions served from the read replica when one is configured
+    replica_actions = frozenset({'dashboard_stats'})
     
     # Filtering, search, and ordering
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
@@ -63,24 +67,24 @@ class CoordinatorViewSet(viewsets.ModelViewSet):
     
     def destroy(self, request, *args, **kwargs):
         """Override destroy to ensure soft delete is used - NEVER calls default delete"""
-        logger.info(f"[DESTROY] destroy() method called for DELETE request")
+        logger.debug("[DESTROY] destroy() method called for DELETE request")
         
         # Get the instance
         instance = self.get_object()
         coordinator_id = instance.id
         coordinator_name = instance.full_name
         
-        logger.info(f"[DESTROY] Got coordinator instance: ID={coordinator_id}, Name={coordinator_name}, is_deleted={instance.is_deleted}")
+        logger.debug("[DESTROY] Got coordinator instance: ID=%s, Name=%s, is_deleted=%s", coordinator_id, coordinator_name, instance.is_deleted)
         
         # Check if already deleted
         if instance.is_deleted:
-            logger.warning(f"[DESTROY] Coordinator {coordinator_id} is already soft deleted")
+            logger.warning("[DESTROY] Coordinator %s is already soft deleted", coordinator_id)
             from rest_framework.exceptions import NotFound
             raise NotFound("Coordinator is already deleted.")
         
         # IMPORTANT: Call perform_destroy which does soft delete
         # DO NOT call super().destroy() as it would do hard delete
-        logger.info(f"[DESTROY] Calling perform_destroy() for soft delete")
+        logger.debug("[DESTROY] Calling perform_destroy() for soft delete")
         self.perform_destroy(instance)
         
         # Verify the coordinator still exists in database (soft deleted, not hard deleted)
@@ -89,28 +93,26 @@ class CoordinatorViewSet(viewsets.ModelViewSet):
             # Use with_deleted() to check if coordinator exists (even if soft deleted)
             still_exists = Coordinator.objects.with_deleted().filter(pk=coordinator_id).exists()
             if not still_exists:
-                logger.error(f"[DESTROY] CRITICAL: Coordinator {coordinator_id} was HARD DELETED! This should not happen!")
+                logger.error("[DESTROY] CRITICAL: Coordinator %s was HARD DELETED! This should not happen!", coordinator_id)
                 raise Exception(f"CRITICAL ERROR: Coordinator {coordinator_id} was permanently deleted instead of soft deleted!")
             else:
                 # Check if it's soft deleted
                 coordinator_check = Coordinator.objects.with_deleted().get(pk=coordinator_id)
                 if coordinator_check.is_deleted:
-                    logger.info(f"[DESTROY] SUCCESS: Coordinator {coordinator_id} is soft deleted (is_deleted=True)")
+                    logger.debug("[DESTROY] SUCCESS: Coordinator %s is soft deleted (is_deleted=True)", coordinator_id)
                 else:
-                    logger.error(f"[DESTROY] ERROR: Coordinator {coordinator_id} exists but is_deleted is False!")
+                    logger.error("[DESTROY] ERROR: Coordinator %s exists but is_deleted is False!", coordinator_id)
         except Coordinator.DoesNotExist:
-            logger.error(f"[DESTROY] CRITICAL: Coordinator {coordinator_id} does not exist in database - was HARD DELETED!")
+            logger.error("[DESTROY] CRITICAL: Coordinator %s does not exist in database - was HARD DELETED!", coordinator_id)
             raise Exception(f"CRITICAL ERROR: Coordinator {coordinator_id} was permanently deleted!")
         
-        logger.info(f"[DESTROY] destroy() completed successfully")
+        logger.debug("[DESTROY] destroy() completed successfully")
         from rest_framework import status
         from rest_framework.response import Response
         return Response(status=status.HTTP_204_NO_CONTENT)
     
     def perform_destroy(self, instance):
         """Soft delete coordinator and create audit log"""
-        import logging
-        logger = logging.getLogger(__name__)
         
         instance._actor = self.request.user
         
@@ -125,27 +127,27 @@ class CoordinatorViewSet(viewsets.ModelViewSet):
         user_role = user.get_role_display() if hasattr(user, 'get_role_display') else (user.role or 'User')
         
         # Log before soft delete
-        logger.info(f"[SOFT_DELETE] Starting soft delete for coordinator ID: {coordinator_id}, Name: {coordinator_name}")
-        logger.info(f"[SOFT_DELETE] Coordinator is_deleted before: {instance.is_deleted}")
+        logger.debug("[SOFT_DELETE] Starting soft delete for coordinator ID: %s, Name: %s", coordinator_id, coordinator_name)
+        logger.debug("[SOFT_DELETE] Coordinator is_deleted before: %s", instance.is_deleted)
         
         # Soft delete the coordinator (instead of hard delete)
         # This uses update() to directly modify database, does NOT call .delete()
         # This ensures no post_delete signal is triggered
         try:
             instance.soft_delete()
-            logger.info(f"[SOFT_DELETE] soft_delete() method called successfully")
+            logger.debug("[SOFT_DELETE] soft_delete() method called successfully")
             
             # Verify soft delete worked
             instance.refresh_from_db()
-            logger.info(f"[SOFT_DELETE] Coordinator is_deleted after refresh: {instance.is_deleted}")
+            logger.debug("[SOFT_DELETE] Coordinator is_deleted after refresh: %s", instance.is_deleted)
             
             if not instance.is_deleted:
-                logger.error(f"[SOFT_DELETE] CRITICAL ERROR: Soft delete failed! Coordinator {coordinator_id} is_deleted is still False!")
+                logger.error("[SOFT_DELETE] CRITICAL ERROR: Soft delete failed! Coordinator %s is_deleted is still False!", coordinator_id)
                 raise Exception(f"Soft delete failed for coordinator {coordinator_id} - is_deleted is still False after soft_delete() call")
             
-            logger.info(f"[SOFT_DELETE] Soft delete successful for coordinator {coordinator_id}")
+            logger.debug("[SOFT_DELETE] Soft delete successful for coordinator %s", coordinator_id)
         except Exception as e:
-            logger.error(f"[SOFT_DELETE] ERROR during soft_delete(): {str(e)}")
+            logger.error("[SOFT_DELETE] ERROR during soft_delete(): %s", e)
             raise
         
         # Create audit log after soft deletion
@@ -163,15 +165,13 @@ class CoordinatorViewSet(viewsets.ModelViewSet):
             )
         except Exception as e:
             # Log error but don't fail the deletion
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"Failed to create audit log for coordinator deletion: {str(e)}")
+            logger.error("Failed to create audit log for coordinator deletion: %s", e)
     
     def create(self, request, *args, **kwargs):
         """Override create method to add debug logging"""
-        logger.info(f"Received coordinator data: {request.data}")
-        logger.info(f"DOB field value: {request.data.get('dob')}")
-        logger.info(f"DOB field type: {type(request.data.get('dob'))}")
+        logger.debug("Received coordinator data: %s", request.data)
+        logger.debug("DOB field value: %s", request.data.get('dob'))
+        logger.debug("DOB field type: %s", type(request.data.get('dob')))
         
         # Check for null values in required fields
         required_fields = ['full_name', 'dob', 'gender', 'contact_number', 'email', 'cnic', 
@@ -180,39 +180,39 @@ class CoordinatorViewSet(viewsets.ModelViewSet):
         
         for field in required_fields:
             value = request.data.get(field)
-            logger.info(f"Field {field}: {value} (type: {type(value)})")
+            logger.debug("Field %s: %s (type: %s)", field, value, type(value))
             if value is None or value == '':
-                logger.warning(f"Field {field} is null or empty!")
+                logger.warning("Field %s is null or empty!", field)
         
         try:
             return super().create(request, *args, **kwargs)
         except Exception as e:
-            logger.error(f"Error creating coordinator: {str(e)}")
-            logger.error(f"Request data: {request.data}")
+            logger.error("Error creating coordinator: %s", e)
+            logger.error("Request data: %s", request.data)
             raise
     
     def update(self, request, *args, **kwargs):
         """Override update method to add debug logging"""
-        logger.info(f"Updating coordinator {kwargs.get('pk')} with data: {request.data}")
-        logger.info(f"Request method: {request.method}")
+        logger.debug("Updating coordinator %s with data: %s", kwargs.get('pk'), request.data)
+        logger.debug("Request method: %s", request.method)
         
         try:
             return super().update(request, *args, **kwargs)
         except Exception as e:
-            logger.error(f"Error updating coordinator: {str(e)}")
-            logger.error(f"Request data: {request.data}")
+            logger.error("Error updating coordinator: %s", e)
+            logger.error("Request data: %s", request.data)
             raise
     
     def partial_update(self, request, *args, **kwargs):
         """Override partial_update method to add debug logging"""
-        logger.info(f"Partially updating coordinator {kwargs.get('pk')} with data: {request.data}")
-        logger.info(f"Request method: {request.method}")
+        logger.debug("Partially updating coordinator %s with data: %s", kwargs.get('pk'), request.data)
+        logger.debug("Request method: %s", request.method)
         
         try:
             return super().partial_update(request, *args, **kwargs)
         except Exception as e:
-            logger.error(f"Error partially updating coordinator: {str(e)}")
-            logger.error(f"Request data: {request.data}")
+            logger.error("Error partially updating coordinator: %s", e)
+            logger.error("Request data: %s", request.data)
             raise
     
     def get_queryset(self):
@@ -318,52 +318,34 @@ class CoordinatorViewSet(viewsets.ModelViewSet):
         """Get dashboard statistics for coordinator"""
         coordinator = self.get_object()
         
-        # Get teachers count assigned to this coordinator
-        teachers_count = Teacher.objects.filter(
+        # Resolve managed levels once (assigned_levels for 'both' shift, else level)
+        managed_level_ids = coordinator_level_ids(coordinator)
+        
+        # Get teachers assigned to this coordinator
+        teachers = Teacher.objects.filter(
             assigned_coordinators=coordinator,
             is_currently_active=True
-        ).count()
-        
-        # If no teachers assigned via ManyToMany, try to get teachers through level/classroom relationship
-        if teachers_count == 0:
-            # Get teachers through classroom assignments
-            managed_levels = []
-            if coordinator.shift == 'both' and coordinator.assigned_levels.exists():
-                managed_levels = list(coordinator.assigned_levels.all())
-            elif coordinator.level:
-                managed_levels = [coordinator.level]
-            
-            if managed_levels:
-                # Get classrooms under this coordinator's levels
-                classrooms = ClassRoom.objects.filter(
-                    grade__level__in=managed_levels
-                ).select_related('class_teacher')
-                
-                # Get teachers from those classrooms
-                teacher_ids = set()
-                for classroom in classrooms:
-                    if classroom.class_teacher:
-                        teacher_ids.add(classroom.class_teacher.id)
-                
-                teachers_count = len(teacher_ids)
+        )
+        teachers_count = teachers.count()
+        
+        # If no teachers assigned via ManyToMany, use class teachers of classrooms in the managed levels
+        if teachers_count == 0 and managed_level_ids:
+            class_teacher_ids = ClassRoom.objects.filter(
+                grade__level_id__in=managed_level_ids,
+                class_teacher__isnull=False
+            ).values('class_teacher_id').distinct()
+            teachers_count = class_teacher_ids.count()
+            teachers = Teacher.objects.filter(
+                id__in=class_teacher_ids,
+                is_currently_active=True
+            )
         
         # Get students count from coordinator's managed classrooms
         students_count = 0
         if coordinator.campus:
-            # Get students from classrooms under this coordinator's levels
-            managed_levels = []
-            if coordinator.shift == 'both' and coordinator.assigned_levels.exists():
-                managed_levels = list(coordinator.assigned_levels.all())
-            elif coordinator.level:
-                managed_levels = [coordinator.level]
-            
-            if managed_levels:
-                classrooms = ClassRoom.objects.filter(
-                    grade__level__in=managed_levels
-                ).values_list('id', flat=True)
-                
+            if managed_level_ids:
                 students_count = Student.objects.filter(
-                    classroom__in=classrooms,
+                    classroom__grade__level_id__in=managed_level_ids,
                     is_deleted=False
                 ).count()
             else:
@@ -375,51 +357,15 @@ class CoordinatorViewSet(viewsets.ModelViewSet):
         
         # Get classes count for this coordinator's level and campus
         classes_count = 0
-        if coordinator.campus:
-            managed_levels = []
-            if coordinator.shift == 'both' and coordinator.assigned_levels.exists():
-                managed_levels = list(coordinator.assigned_levels.all())
-            elif coordinator.level:
-                managed_levels = [coordinator.level]
-            
-            if managed_levels:
-                classes_count = ClassRoom.objects.filter(
-                    grade__level__in=managed_levels,
-                    grade__level__campus=coordinator.campus
-                ).count()
+        if coordinator.campus and managed_level_ids:
+            classes_count = ClassRoom.objects.filter(
+                grade__level_id__in=managed_level_ids,
+                grade__level__campus=coordinator.campus
+            ).count()
         
         # Get pending requests (if any)
         pending_requests = 0  # This would need to be implemented based on your request system
         
-        # Get teacher distribution by subjects
-        teachers = Teacher.objects.filter(
-            assigned_coordinators=coordinator,
-            is_currently_active=True
-        )
-        
-        # If no teachers via ManyToMany, get through classroom assignments
-        if not teachers.exists():
-            managed_levels = []
-            if coordinator.shift == 'both' and coordinator.assigned_levels.exists():
-                managed_levels = list(coordinator.assigned_levels.all())
-            elif coordinator.level:
-                managed_levels = [coordinator.level]
-            
-            if managed_levels:
-                classrooms = ClassRoom.objects.filter(
-                    grade__level__in=managed_levels
-                ).select_related('class_teacher')
-                
-                teacher_ids = set()
-                for classroom in classrooms:
-                    if classroom.class_teacher:
-                        teacher_ids.add(classroom.class_teacher.id)
-                
-                teachers = Teacher.objects.filter(
-                    id__in=teacher_ids,
-                    is_currently_active=True
-                )
-        
         subject_distribution = {}
         teachers_with_subjects = 0
         
@@ -1,11 +1,15 @@
 import json
+import logging
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import UntypedToken
-from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
-from jwt import decode as jwt_decode
-from django.conf import settings
+from rest_framework_simplejwt.exceptions import TokenError
+from . import presence
+
+logger = logging.getLogger(__name__)
 
 User = get_user_model()
 
@@ -25,20 +29,21 @@ class NotificationConsumer(AsyncWebsocketConsumer):
                 break
         
         if not token:
-            print("WebSocket: No token provided")
+            logger.info("WebSocket: No token provided")
             await self.close(code=4001)
             return
         
-        # Authenticate user
-        user = await self.authenticate_user(token)
+        # Authenticate from the token alone; the User row is only loaded by get_user()
+        user = self.authenticate_user(token)
         if not user:
-            print(f"WebSocket: Authentication failed for token")
+            logger.warning("WebSocket: Authentication failed for token")
             await self.close(code=4003)
             return
         
-        # Set user in scope
+        # Set user in scope (a TokenUser; role and campus_id are in user.token)
         self.scope['user'] = user
         self.user = user
+        self._db_user = None
         
         # Join user-specific channel group
         self.room_group_name = f'user_{user.id}'
@@ -47,7 +52,9 @@ class NotificationConsumer(AsyncWebsocketConsumer):
             self.channel_name
         )
         
-        print(f"WebSocket: User {user.id} connected to notifications")
+        await presence.mark_connected(user.id)
+        
+        logger.info("WebSocket: User %s connected to notifications", user.id)
         await self.accept()
     
     async def disconnect(self, close_code):
@@ -58,6 +65,7 @@ class NotificationConsumer(AsyncWebsocketConsumer):
                 self.room_group_name,
                 self.channel_name
             )
+            await presence.mark_disconnected(self.user.id)
     
     async def receive(self, text_data):
         """Handle messages received from WebSocket"""
@@ -66,6 +74,8 @@ class NotificationConsumer(AsyncWebsocketConsumer):
             message_type = data.get('type')
             
             if message_type == 'ping':
+                # The client's keepalive also keeps the user marked online
+                await presence.refresh(self.user.id)
                 # Respond to ping with pong
                 await self.send(text_data=json.dumps({
                     'type': 'pong'
@@ -78,29 +88,21 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         message = event['message']
         await self.send(text_data=json.dumps(message))
     
-    @database_sync_to_async
     def authenticate_user(self, token):
-        """Authenticate user from JWT token"""
+        """Validate the JWT (signature, expiry) once and return a TokenUser, or None"""
         try:
-            # Validate token
-            UntypedToken(token)
-            
-            # Decode token to get user ID
-            decoded_data = jwt_decode(
-                token,
-                settings.SECRET_KEY,
-                algorithms=["HS256"]
-            )
-            
-            # Get user
-            user_id = decoded_data.get('user_id')
-            if user_id:
-                try:
-                    return User.objects.get(id=user_id)
-                except User.DoesNotExist:
-                    return None
+            validated = UntypedToken(token)
+        except TokenError as e:
+            logger.warning("WebSocket authentication error: %s", e)
             return None
-        except (InvalidToken, TokenError, Exception) as e:
-            print(f"WebSocket authentication error: {e}")
+        if api_settings.USER_ID_CLAIM not in validated:
             return None
-
+        return TokenUser(validated)
+    
+    async def get_user(self):
+        """The User row for this connection, loaded on first use"""
+        if self._db_user is None:
+            self._db_user = await database_sync_to_async(
+                User.objects.filter(pk=self.user.id).first
+            )()
+        return self._db_user
@@ -18,6 +18,10 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['recipient', '-timestamp', '-id']),
+            models.Index(fields=['recipient', 'unread']),
+        ]
 
     def __str__(self):
         return f"Notification(to={self.recipient}, verb={self.verb})"
@@ -0,0 +1,78 @@
+"""
+WebSocket presence registry.
+
+NotificationConsumer counts each user's open sockets in the default cache
+(Redis in production, shared by the ASGI and WSGI workers). Counters expire
+after NOTIFICATION_PRESENCE_TTL seconds unless refreshed by the client's
+ping, so sockets of a crashed worker stop counting on their own.
+
+With NOTIFICATION_PRESENCE_ENABLED, notifications.services only pushes to
+users with an open socket; everyone else still gets the persisted
+notification when they next load the page. Lookups fail open: if the cache
+cannot be read every recipient is treated as online.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+PRESENCE_PREFIX = 'presence:user'
+
+
+def _key(user_id) -> str:
+    return f'{PRESENCE_PREFIX}:{user_id}'
+
+
+def _ttl() -> int:
+    return getattr(settings, 'NOTIFICATION_PRESENCE_TTL', 90)
+
+
+async def mark_connected(user_id) -> None:
+    key = _key(user_id)
+    try:
+        await cache.aadd(key, 0, _ttl())
+        await cache.aincr(key)
+        await cache.atouch(key, _ttl())
+    except Exception as e:
+        logger.warning("Could not record presence for user %s: %s", user_id, e)
+
+
+async def mark_disconnected(user_id) -> None:
+    key = _key(user_id)
+    try:
+        if await cache.adecr(key) <= 0:
+            await cache.adelete(key)
+    except ValueError:
+        # Counter already expired
+        pass
+    except Exception as e:
+        logger.warning("Could not clear presence for user %s: %s", user_id, e)
+
+
+async def refresh(user_id) -> None:
+    """Extend the user's presence; called on every client ping."""
+    key = _key(user_id)
+    try:
+        if not await cache.atouch(key, _ttl()):
+            # Counter was lost (eviction, cache restart); count this socket again
+            await cache.aadd(key, 1, _ttl())
+    except Exception as e:
+        logger.debug("Could not refresh presence for user %s: %s", user_id, e)
+
+
+def online_user_ids(user_ids: Iterable) -> Optional[set]:
+    """The subset of ``user_ids`` with an open socket, or None when unknown."""
+    keys = {_key(user_id): user_id for user_id in user_ids}
+    if not keys:
+        return set()
+    try:
+        counts = cache.get_many(list(keys))
+    except Exception as e:
+        logger.warning("Could not read presence: %s", e)
+        return None
+    return {keys[key] for key, count in counts.items() if count and count > 0}
@@ -1,12 +1,228 @@
-from typing import Optional
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from typing import Iterable, Optional
 from django.conf import settings
+from django.db import close_old_connections, transaction
 from .models import Notification
-from channels.layers import get_channel_layer
+from .presence import online_user_ids
+from channels.layers import InMemoryChannelLayer, get_channel_layer
 from asgiref.sync import async_to_sync
 
+logger = logging.getLogger(__name__)
+
+
+# Background executor for WebSocket pushes and deferred fan-out jobs so request
+# latency does not grow with the number of recipients. Created lazily on first use.
+_push_executor: Optional[ThreadPoolExecutor] = None
+_push_executor_lock = threading.Lock()
+
+
+def _get_push_executor() -> ThreadPoolExecutor:
+    global _push_executor
+    if _push_executor is None:
+        with _push_executor_lock:
+            if _push_executor is None:
+                _push_executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'NOTIFICATION_PUSH_WORKERS', 2),
+                    thread_name_prefix='notification-push',
+                )
+    return _push_executor
+
+
+def _actor_name(actor) -> Optional[str]:
+    if not actor:
+        return None
+    if hasattr(actor, 'get_full_name'):
+        return actor.get_full_name() or str(actor)
+    return str(actor)
+
+
+def _serialize(notification: Notification, actor_name: Optional[str]) -> dict:
+    return {
+        'id': notification.id,
+        'verb': notification.verb,
+        'target_text': notification.target_text,
+        'actor_name': actor_name,
+        'timestamp': notification.timestamp.isoformat(),
+        'data': notification.data,
+        'unread': notification.unread,
+    }
+
+
+def _online_only(messages: list) -> list:
+    """Drop pushes to users without an open WebSocket; their notifications are already persisted."""
+    if not getattr(settings, 'NOTIFICATION_PRESENCE_ENABLED', False):
+        return messages
+    online = online_user_ids({recipient_id for recipient_id, _ in messages})
+    if online is None:
+        return messages
+    return [(recipient_id, payload) for recipient_id, payload in messages if recipient_id in online]
+
+
+def _send_pushes(messages: list) -> None:
+    """Send (recipient_id, payload) pairs to each user's channel group."""
+    messages = _online_only(messages)
+    if not messages:
+        return
+    try:
+        channel_layer = get_channel_layer()
+    except Exception as ws_error:
+        logger.debug("Failed to get channel layer: %s", ws_error)
+        return
+    if not channel_layer:
+        return
+
+    group_send = async_to_sync(channel_layer.group_send)
+    for recipient_id, payload in messages:
+        try:
+            group_send(
+                f'user_{recipient_id}',
+                {
+                    'type': 'notification_message',
+                    'message': payload
+                }
+            )
+        except Exception as ws_error:
+            logger.debug("Failed to send WebSocket notification: %s", ws_error)
+            # Don't fail notification creation if WebSocket fails
+
+
+def _dispatch_pushes(messages: list) -> None:
+    """
+    Hand pushes to the background executor. The in-memory channel layer only
+    lives in this process's event loop, so it is sent inline instead.
+    """
+    if not messages:
+        return
+    try:
+        channel_layer = get_channel_layer()
+    except Exception:
+        channel_layer = None
+    if channel_layer is None or isinstance(channel_layer, InMemoryChannelLayer):
+        _send_pushes(messages)
+        return
+    try:
+        _get_push_executor().submit(_send_pushes, messages)
+    except RuntimeError:
+        # Executor already shut down (interpreter exit) - fall back to inline
+        _send_pushes(messages)
+
+
+def _schedule_pushes(messages: list) -> None:
+    """Push WebSocket messages once the surrounding transaction commits."""
+    if messages:
+        transaction.on_commit(lambda: _dispatch_pushes(messages))
+
+
+def _run_job(func, args, kwargs) -> None:
+    try:
+        func(*args, **kwargs)
+    except Exception as e:
+        logger.warning("Deferred notification job %s failed: %s", getattr(func, '__name__', func), e)
+    finally:
+        # Worker threads hold their own DB connection; release it between jobs
+        close_old_connections()
+
+
+def defer_after_commit(func, *args, **kwargs) -> None:
+    """
+    Run ``func(*args, **kwargs)`` once the current transaction commits.
+    With NOTIFICATION_ASYNC_FANOUT enabled the job runs on the background
+    executor so the request returns immediately; otherwise it runs inline.
+    """
+    def _submit():
+        if not getattr(settings, 'NOTIFICATION_ASYNC_FANOUT', False):
+            _run_job(func, args, kwargs)
+            return
+        try:
+            _get_push_executor().submit(_run_job, func, args, kwargs)
+        except RuntimeError:
+            _run_job(func, args, kwargs)
+
+    transaction.on_commit(_submit)
+
+
+def create_notifications(recipients: Iterable, actor: Optional[settings.AUTH_USER_MODEL] = None, verb: str = '', target_text: str = '', data: dict = None) -> list:
+    """
+    Create the same notification for many recipients with a single bulk insert.
+    Recipients may be user instances or ids; duplicates are collapsed.
+    WebSocket pushes are sent after commit off the request thread.
+    """
+    if data is None:
+        data = {}
+    try:
+        users = {}
+        missing_ids = []
+        for recipient in recipients or []:
+            if recipient is None:
+                continue
+            if hasattr(recipient, 'id'):
+                users[recipient.id] = recipient
+            else:
+                missing_ids.append(recipient)
+        missing_ids = [rid for rid in set(missing_ids) if rid not in users]
+        if missing_ids:
+            from django.contrib.auth import get_user_model
+            User = get_user_model()
+            for user in User.objects.filter(id__in=missing_ids):
+                users[user.id] = user
+        if not users:
+            return []
+
+        notifications = Notification.objects.bulk_create([
+            Notification(
+                recipient=user,
+                actor=actor,
+                verb=verb,
+                target_text=target_text or '',
+                data=data or {},
+            )
+            for user in users.values()
+        ])
+
+        actor_name = _actor_name(actor)
+        _schedule_pushes([
+            (notification.recipient_id, _serialize(notification, actor_name))
+            for notification in notifications
+        ])
+        return notifications
+    except Exception as e:
+        logger.warning("Failed to create notifications: %s", e)
+        return []
+
+
+def create_notification_batch(entries: Iterable, actor: Optional[settings.AUTH_USER_MODEL] = None) -> list:
+    """
+    Create individual notifications in one bulk insert.
+    ``entries`` are (recipient_id, verb, target_text, data) tuples; pushes
+    are sent after commit like create_notifications.
+    """
+    try:
+        notifications = Notification.objects.bulk_create([
+            Notification(
+                recipient_id=recipient_id,
+                actor=actor,
+                verb=verb,
+                target_text=target_text or '',
+                data=data or {},
+            )
+            for recipient_id, verb, target_text, data in entries
+            if recipient_id
+        ])
+        actor_name = _actor_name(actor)
+        _schedule_pushes([
+            (notification.recipient_id, _serialize(notification, actor_name))
+            for notification in notifications
+        ])
+        return notifications
+    except Exception as e:
+        logger.warning("Failed to create notifications: %s", e)
+        return []
+
 
 def create_notification(recipient, actor: Optional[settings.AUTH_USER_MODEL] = None, verb: str = '', target_text: str = '', data: dict = None):
-    """Helper to create a notification record and send via WebSocket."""
+    """Helper to create a notification record and send via WebSocket after commit."""
     if data is None:
         data = {}
     # recipient may be a user instance or id
@@ -20,15 +236,7 @@ def create_notification(recipient, actor: Optional[settings.AUTH_USER_MODEL] = N
             from django.contrib.auth import get_user_model
             User = get_user_model()
             recipient_user = User.objects.get(id=recipient_id)
-        
-        # Get actor name
-        actor_name = None
-        if actor:
-            if hasattr(actor, 'get_full_name'):
-                actor_name = actor.get_full_name() or str(actor)
-            else:
-                actor_name = str(actor)
-        
+
         notification = Notification.objects.create(
             recipient=recipient_user,
             actor=actor,
@@ -36,34 +244,10 @@ def create_notification(recipient, actor: Optional[settings.AUTH_USER_MODEL] = N
             target_text=target_text or '',
             data=data or {},
         )
-        
-        # Send notification via WebSocket
-        try:
-            channel_layer = get_channel_layer()
-            if channel_layer:
-                # Serialize notification data
-                notification_data = {
-                    'id': notification.id,
-                    'verb': notification.verb,
-                    'target_text': notification.target_text,
-                    'actor_name': actor_name,
-                    'timestamp': notification.timestamp.isoformat(),
-                    'data': notification.data,
-                    'unread': notification.unread,
-                }
-                
-                # Send to user's channel group
-                async_to_sync(channel_layer.group_send)(
-                    f'user_{recipient_id}',
-                    {
-                        'type': 'notification_message',
-                        'message': notification_data
-                    }
-                )
-        except Exception as ws_error:
-            print(f"[DEBUG] Failed to send WebSocket notification: {ws_error}")
-            # Don't fail notification creation if WebSocket fails
-        
+
+        # Send notification via WebSocket once the caller's transaction commits
+        _schedule_pushes([(recipient_id, _serialize(notification, _actor_name(actor)))])
+
         return notification
     except Exception as e:
         return None
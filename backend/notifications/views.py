@@ -1,6 +1,19 @@
-from rest_framework import viewsets, permissions, decorators, response, status
+from rest_framework import viewsets, permissions, decorators, pagination, response, status
 from .models import Notification
 from .serializers import NotificationSerializer
+from utils.pagination import OptionalCursorPagination
+
+
+class NotificationCursorPagination(pagination.CursorPagination):
+    """Keyset pagination for notifications (?pagination=cursor or ?cursor=)"""
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = ('-timestamp', '-id')
+
+
+class NotificationPagination(OptionalCursorPagination):
+    cursor_class = NotificationCursorPagination
 
 
 class NotificationViewSet(viewsets.ModelViewSet):
@@ -18,6 +31,7 @@ class NotificationViewSet(viewsets.ModelViewSet):
         return response.Response({'marked': count}, status=status.HTTP_200_OK)
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = NotificationPagination
 
     def get_queryset(self):
         return Notification.objects.filter(recipient=self.request.user)
@@ -2,6 +2,9 @@ from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from campus.models import Campus
+import logging
+
+logger = logging.getLogger(__name__)
 
 User = get_user_model()
 
@@ -104,7 +107,7 @@ class Principal(models.Model):
                     self.campus, self.shift, year, 'principal'
                 )
             except Exception as e:
-                print(f"Error generating employee code: {str(e)}")
+                logger.warning("Error generating employee code: %s", e)
         
         super().save(*args, **kwargs)
     
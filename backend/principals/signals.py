@@ -4,6 +4,11 @@ from .models import Principal
 from services.user_creation_service import UserCreationService
 from notifications.services import create_notification
 from users.models import User
+from users.profile import invalidate_user_profiles
+from users.scope import invalidate_user_scopes
+import logging
+
+logger = logging.getLogger(__name__)
 
 def safe_str(obj):
     """Safely convert object to string, handling Unicode encoding errors"""
@@ -37,8 +42,7 @@ def create_principal_user(sender, instance, created, **kwargs):
     - created=True: when Principal row is created we try to auto-create a User and send notification to that user.
     - created=False and user assigned (previously None or changed): send notification to the assigned user.
     """
-    print(f"\n[DEBUG] Principal signal triggered - created={created}")
-    print(f"[DEBUG] Principal data: id={instance.id}, email={instance.email}, campus={instance.campus}, user_id={instance.user_id if hasattr(instance, 'user_id') else None}")
+    logger.debug("Principal signal triggered - created=%s, id=%s, user_id=%s", created, instance.id, getattr(instance, 'user_id', None))
     try:
         from users.models import User
 
@@ -48,7 +52,7 @@ def create_principal_user(sender, instance, created, **kwargs):
         # Case 1: Principal row created -> try to create a user account if it doesn't exist
         if created:
             if User.objects.filter(email=instance.email).exists():
-                print(f"User already exists for principal {instance.full_name}")
+                logger.info("User already exists for principal %s", instance.full_name)
                 try:
                     existing_user = User.objects.filter(email=instance.email).first()
                     campus_name = instance.campus.name if instance.campus else ''
@@ -61,15 +65,15 @@ def create_principal_user(sender, instance, created, **kwargs):
                         target_text=target_text,
                         data={"principal_id": instance.id}
                     )
-                    print(f"Created notification for existing user {existing_user.email}: {verb} {target_text}")
+                    logger.info("Created notification for existing user %s: %s %s", existing_user.email, verb, target_text)
                 except Exception as e:
-                    print(f"Error creating notification for existing principal user: {e}")
+                    logger.warning("Error creating notification for existing principal user: %s", e)
             else:
                 user, message = UserCreationService.create_user_from_entity(instance, 'principal')
                 if not user:
-                    print(f"Failed to create user for principal {instance.id}: {message}")
+                    logger.warning("Failed to create user for principal %s: %s", instance.id, message)
                 else:
-                    print(f"Success: Created user for principal: {instance.full_name} ({instance.employee_code})")
+                    logger.info("Success: Created user for principal: %s (%s)", instance.full_name, instance.employee_code)
                     try:
                         # Use campus_name instead of name
                         campus_display = instance.campus.campus_name if instance.campus else ''
@@ -83,9 +87,9 @@ def create_principal_user(sender, instance, created, **kwargs):
                             target_text=target_text,
                             data={"principal_id": instance.id}
                         )
-                        print(f"Created notification for principal {instance.full_name}: {verb} {target_text}")
+                        logger.info("Created notification for principal %s: %s %s", instance.full_name, verb, target_text)
                     except Exception as e:
-                        print(f"Error creating notification for principal user: {e}")
+                        logger.warning("Error creating notification for principal user: %s", e)
             return
 
         # Case 2: existing Principal updated. If a `user` was assigned/changed -> notify the assigned user.
@@ -101,10 +105,10 @@ def create_principal_user(sender, instance, created, **kwargs):
                 target_text = f"at {campus_display}" if campus_display else ""
                 create_notification(recipient=current_user, actor=actor, verb=verb, target_text=target_text, data={"principal_id": instance.id})
             except Exception as e:
-                print(f"Error creating notification on principal assignment: {e}")
+                logger.warning("Error creating notification on principal assignment: %s", e)
 
     except Exception as e:
-        print(f"Error handling principal signals for {instance.id}: {e}")
+        logger.warning("Error handling principal signals for %s: %s", instance.id, e)
 
 
 @receiver(post_save, sender=Principal)
@@ -135,10 +139,10 @@ def notify_principal_on_update(sender, instance, created, **kwargs):
                     target_text=target_text, 
                     data={"principal_id": instance.id}
                 )
-                print(f"[OK] Sent update notification to principal {instance.full_name}")
+                logger.info("Sent update notification to principal %s", instance.full_name)
         except Exception as e:
             error_msg = safe_str(e)
-            print(f"[ERROR] Error sending update notification to principal {instance.id}: {error_msg}")
+            logger.error("Error sending update notification to principal %s: %s", instance.id, error_msg)
 
 @receiver(post_delete, sender=Principal)
 def delete_user_when_principal_deleted(sender, instance: Principal, **kwargs):
@@ -168,7 +172,7 @@ def delete_user_when_principal_deleted(sender, instance: Principal, **kwargs):
                 target_text=target_text, 
                 data={"principal_id": instance.id}
             )
-            print(f"[OK] Sent deletion notification to principal {instance.full_name}")
+            logger.info("Sent deletion notification to principal %s", instance.full_name)
         
         # Now cleanup user
         if instance.email:
@@ -177,4 +181,12 @@ def delete_user_when_principal_deleted(sender, instance: Principal, **kwargs):
             User.objects.filter(username=instance.employee_code).delete()
     except Exception as e:
         error_msg = safe_str(e)
-        print(f"[ERROR] Error in delete_user_when_principal_deleted: {error_msg}")
\ No newline at end of file
+        logger.error("Error in delete_user_when_principal_deleted: %s", error_msg)
+
+
+@receiver(post_save, sender=Principal)
+@receiver(post_delete, sender=Principal)
+def invalidate_scopes_on_principal_change(sender, **kwargs):
+    """Principal campus feeds users.scope and the cached profiles; drop both"""
+    invalidate_user_scopes()
+    invalidate_user_profiles()
@@ -8,14 +8,20 @@ from django.contrib.auth import get_user_model
 from users.permissions import IsSuperAdmin
 from .models import Principal
 from .serializers import PrincipalSerializer
+from utils.db_routing import ReplicaReadMixin
+import logging
+
+logger = logging.getLogger(__name__)
 
 User = get_user_model()
 
 
-class PrincipalViewSet(viewsets.ModelViewSet):
+class PrincipalViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     queryset = Principal.objects.all()
     serializer_class = PrincipalSerializer
     permission_classes = [IsAuthenticated]
+    # Read-only aggregate actions served from the read replica when one is configured
+    replica_actions = frozenset({'stats'})
     
     # Filtering, search, and ordering
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
@@ -73,17 +79,17 @@ class PrincipalViewSet(viewsets.ModelViewSet):
                     # Link user to principal
                     principal.user = existing_user
                     principal.save()
-                    print(f"[DEBUG] Updated and linked existing user to principal: {existing_user.email} (role=principal)")
+                    logger.debug("Updated and linked existing user to principal: %s (role=principal)", existing_user.email)
                 else:
                     # Create new user
                     user, message = UserCreationService.create_user_from_entity(principal, 'principal')
                     if not user:
-                        print(f"[DEBUG] Failed to create user for principal: {message}")
+                        logger.debug("Failed to create user for principal: %s", message)
                     else:
-                        print(f"[DEBUG] Created new user for principal: {user.email}")
+                        logger.debug("Created new user for principal: %s", user.email)
                     
         except Exception as e:
-            print(f"[DEBUG] Error creating user for principal: {str(e)}")
+            logger.debug("Error creating user for principal: %s", e)
     
     def perform_update(self, serializer):
         """Update principal and sync user account if needed"""
@@ -150,9 +156,7 @@ class PrincipalViewSet(viewsets.ModelViewSet):
             )
         except Exception as e:
             # Log error but don't fail the deletion
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"Failed to create audit log for principal deletion: {str(e)}")
+            logger.error("Failed to create audit log for principal deletion: %s", e)
     
     @decorators.action(detail=False, methods=['get'])
     def stats(self, request):
@@ -6,6 +6,9 @@ from coordinator.serializers import CoordinatorSerializer
 from students.models import Student
 from teachers.models import Teacher
 from coordinator.models import Coordinator
+import logging
+
+logger = logging.getLogger(__name__)
 
 class SubjectMarkSerializer(serializers.ModelSerializer):
     class Meta:
@@ -131,7 +134,7 @@ class ResultSubmitSerializer(serializers.ModelSerializer):
         failed_subjects = instance.subject_marks.filter(is_pass=False)
         if failed_subjects.exists():
             failed_names = [sm.get_subject_name_display() for sm in failed_subjects]
-            print(f"⚠️ Student failed in: {', '.join(failed_names)} - but allowing forwarding for record keeping")
+            logger.warning("Student failed in: %s - but allowing forwarding for record keeping", ', '.join(failed_names))
         
         # Set status based on what's being requested
         new_status = validated_data.get('status', 'submitted')
@@ -15,6 +15,9 @@ from users.permissions import IsTeacher, IsCoordinator
 from teachers.models import Teacher
 from coordinator.models import Coordinator
 from students.models import Student
+import logging
+
+logger = logging.getLogger(__name__)
 
 class ResultViewSet(viewsets.ModelViewSet):
     queryset = Result.objects.all()
@@ -167,43 +170,16 @@ class CoordinatorResultListView(generics.ListAPIView):
     pagination_class = None  # Disable pagination to return direct array
 
     def get_queryset(self):
-        print(f"🔍 Request user: {self.request.user}")
-        print(f"🔍 User email: {self.request.user.email}")
-        print(f"🔍 User is coordinator: {self.request.user.is_coordinator()}")
-        print(f"🔍 User is authenticated: {self.request.user.is_authenticated}")
-        
         try:
             coordinator = get_object_or_404(Coordinator, email=self.request.user.email)
-            print(f"🔍 Coordinator found: {coordinator.email}")
-            print(f"🔍 Coordinator name: {coordinator.full_name}")
         except Exception as e:
-            print(f"❌ Error finding coordinator: {e}")
-            print(f"❌ Available coordinators:")
-            for c in Coordinator.objects.all():
-                print(f"    - {c.email} ({c.full_name})")
+            logger.warning("Coordinator not found for %s: %s", self.request.user.email, e)
             return Result.objects.none()
         
-        # Check total results in database
-        total_results = Result.objects.count()
-        print(f"🔍 Total results in database: {total_results}")
-        
-        # Check results with coordinators
-        results_with_coordinators = Result.objects.filter(coordinator__isnull=False).count()
-        print(f"🔍 Results with coordinators: {results_with_coordinators}")
-        
-        # First check all results assigned to this coordinator
-        all_results = Result.objects.filter(coordinator=coordinator).select_related('student', 'teacher', 'coordinator').prefetch_related('subject_marks')
-        print(f"🔍 All results for coordinator: {all_results.count()}")
-        
-        # Check results by status
-        for status in ['draft', 'submitted', 'pending', 'under_review', 'approved', 'rejected']:
-            count = all_results.filter(status=status).count()
-            print(f"🔍 Results with status '{status}': {count}")
-        
         # Return ALL results for this coordinator (no status filter)
-        print(f"🔍 Returning all results for coordinator: {all_results.count()}")
-        
-        return all_results
+        return Result.objects.filter(coordinator=coordinator).select_related(
+            'student', 'teacher', 'coordinator'
+        ).prefetch_related('subject_marks')
 
     @action(detail=False, methods=['get'])
     def pending(self, request):
@@ -0,0 +1,62 @@
+"""
+Block allocation on GlobalCounter rows.
+
+Every call is a single ``UPDATE ... RETURNING`` on the counter row, so the
+row lock is taken once per block instead of once per record and never
+spans a separate SELECT/save/refresh round trip. Blocks never overlap and
+the counter only moves forward, so numbers stay unique and increasing.
+"""
+from __future__ import annotations
+
+from typing import Callable, Optional
+
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from .models import GlobalCounter
+
+
+def _increment(using: str, key: str, count: int) -> Optional[int]:
+    """Advance the counter by ``count``; returns the new value or None if the row is missing."""
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    sql = (
+        f"UPDATE {qn(GlobalCounter._meta.db_table)} "
+        f"SET {qn('value')} = {qn('value')} + %s, {qn('updated_at')} = %s "
+        f"WHERE {qn('key')} = %s RETURNING {qn('value')}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [count, timezone.now(), key])
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def reserve_block(key: str, count: int, seed: Optional[Callable[[], int]] = None) -> range:
+    """
+    Reserve ``count`` consecutive numbers from the ``key`` counter in one
+    transaction and return them as a range (empty when count <= 0).
+
+    ``seed`` is called when the counter is still at zero and returns the
+    value the series should continue from (e.g. the highest existing code).
+    """
+    if count <= 0:
+        return range(0)
+
+    using = router.db_for_write(GlobalCounter)
+    with transaction.atomic(using=using):
+        end = _increment(using, key, count)
+        if end is None:
+            GlobalCounter.objects.using(using).get_or_create(key=key, defaults={'value': 0})
+            end = _increment(using, key, count)
+        if seed is not None and end == count:
+            # Counter was unused; the UPDATE above holds the row lock while seeding
+            base = seed() or 0
+            if base:
+                end = base + count
+                GlobalCounter.objects.using(using).filter(key=key).update(value=end)
+    return range(end - count + 1, end + 1)
+
+
+def next_number(key: str, seed: Optional[Callable[[], int]] = None) -> int:
+    """Allocate a single number from the ``key`` counter."""
+    return reserve_block(key, 1, seed)[0]
@@ -0,0 +1,88 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection, transaction
+
+from services.counters import next_number, reserve_block
+from services.models import GlobalCounter
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark GlobalCounter contention: parallel creators allocating one "
+        "number per record versus reserving blocks. Uses throwaway counter keys; "
+        "run it against a local PostgreSQL database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=8, help="Parallel creators (default: 8)")
+        parser.add_argument("--records", type=int, default=2000, help="Numbers allocated per run (default: 2000)")
+        parser.add_argument("--block-size", type=int, default=100, help="Numbers per reserved block (default: 100)")
+        parser.add_argument(
+            "--hold-ms",
+            type=float,
+            default=2.0,
+            help="Simulated work per record inside the creator's transaction (default: 2ms)",
+        )
+
+    def handle(self, *args, **options):
+        workers: int = options["workers"]
+        records: int = options["records"]
+        block_size: int = options["block_size"]
+        hold: float = options["hold_ms"] / 1000.0
+
+        if workers < 1 or records < 1 or block_size < 1:
+            raise CommandError("workers, records and block-size must be >= 1")
+        if connection.vendor != "postgresql":
+            self.stdout.write(self.style.WARNING(
+                f"⚠️ Database is {connection.vendor}; contention figures are only meaningful on PostgreSQL"
+            ))
+
+        self.stdout.write(f"🏁 {records} numbers, {workers} workers, block size {block_size}, hold {options['hold_ms']}ms")
+        keys = ["benchmark_single", "benchmark_block"]
+        GlobalCounter.objects.filter(key__in=keys).delete()
+        try:
+            self.report("Per-record", self.run(workers, records, 1, hold, keys[0], single=True))
+            self.report("Block", self.run(workers, records, block_size, hold, keys[1], single=False))
+        finally:
+            GlobalCounter.objects.filter(key__in=keys).delete()
+
+    def run(self, workers, records, block_size, hold, key, single):
+        """Each creator allocates inside a transaction that also does the record's work."""
+        batches = [block_size] * (records // block_size)
+        if records % block_size:
+            batches.append(records % block_size)
+        allocated = []
+        lock = threading.Lock()
+
+        def create(size):
+            try:
+                with transaction.atomic():
+                    if single:
+                        numbers = [next_number(key)]
+                    else:
+                        numbers = list(reserve_block(key, size))
+                    time.sleep(hold * size)
+                with lock:
+                    allocated.append(numbers)
+            finally:
+                close_old_connections()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(create, batches))
+        return time.perf_counter() - started, allocated
+
+    def report(self, label, result):
+        elapsed, allocated = result
+        numbers = [n for block in allocated for n in block]
+        unique = len(set(numbers)) == len(numbers)
+        ordered = all(block == list(range(block[0], block[0] + len(block))) for block in allocated)
+        rate = len(numbers) / elapsed if elapsed > 0 else 0.0
+        style = self.style.SUCCESS if unique and ordered else self.style.ERROR
+        self.stdout.write(style(
+            f"{label:>10}: {len(numbers)} numbers in {elapsed:.2f}s ({rate:.0f}/sec), "
+            f"{len(allocated)} counter updates, unique={unique}, contiguous={ordered}"
+        ))
@@ -5,6 +5,9 @@ from teachers.models import Teacher
 from coordinator.models import Coordinator
 from principals.models import Principal
 from utils.id_generator import IDGenerator
+import logging
+
+logger = logging.getLogger(__name__)
 
 class UserCreationService:
     DEFAULT_PASSWORD = '12345'
@@ -66,15 +69,7 @@ class UserCreationService:
                 shift = getattr(campus, 'shift_available', 'morning')
             
             # Get year from joining date or current year
-            if hasattr(entity, 'joining_date') and entity.joining_date:
-                if isinstance(entity.joining_date, str):
-                    from datetime import datetime
-                    joining_date = datetime.strptime(entity.joining_date, '%Y-%m-%d').date()
-                    year = joining_date.year
-                else:
-                    year = entity.joining_date.year
-            else:
-                year = 2025  # Default year if no joining_date
+            year = IDGenerator.joining_year(getattr(entity, 'joining_date', None))
             
             return IDGenerator.generate_unique_employee_code(
                 campus, shift, year, entity_type
@@ -82,6 +77,26 @@ class UserCreationService:
         except Exception as e:
             raise ValueError(f"Failed to generate employee code: {str(e)}")
     
+    @staticmethod
+    def build_user(entity, entity_type, employee_code, campus, password=None):
+        """
+        Unsaved User for an entity, logging in with its employee code and the
+        default password. Pass ``password`` (an already hashed value) to share
+        one hash across many users in bulk imports.
+        """
+        name_parts = entity.full_name.split() if entity.full_name else []
+        return User(
+            username=employee_code,
+            email=entity.email,
+            first_name=name_parts[0] if name_parts else '',
+            last_name=' '.join(name_parts[1:]),
+            role=entity_type,
+            campus=campus,  # Use the correct campus field
+            phone_number=entity.contact_number,
+            password=password or make_password(UserCreationService.DEFAULT_PASSWORD),  # Default password
+            is_verified=True  # Auto-verify since created by admin
+        )
+
     @staticmethod
     def create_user_from_entity(entity, entity_type):
         """Create user from entity with full validation"""
@@ -106,17 +121,8 @@ class UserCreationService:
             
             # Create user with transaction
             with transaction.atomic():
-                user = User.objects.create(
-                    username=employee_code,
-                    email=entity.email,
-                    first_name=entity.full_name.split()[0] if entity.full_name else '',
-                    last_name=' '.join(entity.full_name.split()[1:]) if len(entity.full_name.split()) > 1 else '',
-                    role=entity_type,
-                    campus=campus,  # Use the correct campus field
-                    phone_number=entity.contact_number,
-                    password=make_password(UserCreationService.DEFAULT_PASSWORD),  # Default password
-                    is_verified=True  # Auto-verify since created by admin
-                )
+                user = UserCreationService.build_user(entity, entity_type, employee_code, campus)
+                user.save()
                 
                 # Update entity with employee code
                 entity.employee_code = employee_code
@@ -128,9 +134,9 @@ class UserCreationService:
                     user, employee_code, entity_type
                 )
                 if email_sent:
-                    print(f"[OK] Credentials email sent to {user.email}")
+                    logger.info("Credentials email sent to %s", user.email)
                 else:
-                    print(f"[WARN] Failed to send email: {email_message}")
+                    logger.warning("Failed to send email: %s", email_message)
                 
                 return user, "User created successfully"
                 
@@ -3,6 +3,9 @@
 from django.contrib import admin
 from django.utils import timezone
 from .models import Student
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 @admin.register(Student)
@@ -153,9 +156,7 @@ class StudentAdmin(admin.ModelAdmin):
                 reason=f'Student {obj.name} deleted by admin user {request.user.get_full_name() or request.user.username}'
             )
         except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"Failed to create audit log for student deletion: {str(e)}")
+            logger.error("Failed to create audit log for student deletion: %s", e)
     
     def delete_queryset(self, request, queryset):
         """Override bulk delete to use soft delete"""
@@ -180,9 +181,7 @@ class StudentAdmin(admin.ModelAdmin):
                         reason=f'Student {obj.name} deleted by admin user {request.user.get_full_name() or request.user.username}'
                     )
                 except Exception as e:
-                    import logging
-                    logger = logging.getLogger(__name__)
-                    logger.error(f"Failed to create audit log for student deletion: {str(e)}")
+                    logger.error("Failed to create audit log for student deletion: %s", e)
         
         self.message_user(request, f"✅ {count} student(s) soft deleted successfully.", level='SUCCESS')
 
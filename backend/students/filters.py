@@ -1,8 +1,13 @@
 import django_filters
 from django.db.models import Q
 from .models import Student
+from .search import search_students
 from campus.models import Campus
+from classes.grade_keys import canonical_grade_key
 from classes.models import ClassRoom
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class StudentFilter(django_filters.FilterSet):
@@ -65,17 +70,15 @@ class StudentFilter(django_filters.FilterSet):
     
     def filter_classroom_isnull(self, queryset, name, value):
         """Custom filter method for classroom__isnull"""
-        import logging
-        logger = logging.getLogger(__name__)
         
         if value and value.lower() in ('true', '1', 'yes'):
             # Force evaluation to ensure we're working with fresh data
             filtered = queryset.filter(classroom__isnull=True)
-            logger.info(f"Filtering for unassigned students (classroom__isnull=True)")
+            logger.debug("Filtering for unassigned students (classroom__isnull=True)")
             return filtered
         elif value and value.lower() in ('false', '0', 'no'):
             filtered = queryset.filter(classroom__isnull=False)
-            logger.info(f"Filtering for assigned students (classroom__isnull=False)")
+            logger.debug("Filtering for assigned students (classroom__isnull=False)")
             return filtered
         return queryset
     
@@ -116,21 +119,15 @@ class StudentFilter(django_filters.FilterSet):
     # Search functionality
     search = django_filters.CharFilter(
         method='filter_search',
-        help_text="Search in name, student_code, gr_no, father_name"
+        help_text="Search in name, father_name, student_code, student_id, gr_no (codes match by prefix)"
     )
     
     def filter_search(self, queryset, name, value):
-        """Custom search method for multiple fields"""
+        """Ranked search on the normalized search document (see students/search.py)"""
         if not value:
             return queryset
             
-        return queryset.filter(
-            Q(name__icontains=value) |
-            Q(student_code__icontains=value) |
-            Q(gr_no__icontains=value) |
-            Q(father_name__icontains=value) |
-            Q(student_id__icontains=value)
-        )
+        return search_students(queryset, value)
     
     def filter_shift(self, queryset, name, value):
         """Filter by shift - check both student.shift and classroom.shift"""
@@ -161,106 +158,21 @@ class StudentFilter(django_filters.FilterSet):
         )
     
     def filter_current_grade(self, queryset, name, value):
-        """Filter by grade - check both student.current_grade and classroom.grade.name with precise matching"""
+        """Filter by grade - student.current_grade or classroom.grade.name, compared by canonical grade key"""
         if not value:
             return queryset
         
-        # Normalize the grade value
         grade_value = value.strip()
-        
-        # Roman numeral to number mapping
-        roman_to_num = {
-            'i': '1', 'ii': '2', 'iii': '3', 'iv': '4', 'v': '5',
-            'vi': '6', 'vii': '7', 'viii': '8', 'ix': '9', 'x': '10'
-        }
-        
-        # Number to Roman mapping
-        num_to_roman = {v: k.upper() for k, v in roman_to_num.items()}
-        
-        # Extract grade type and number/roman
-        grade_lower = grade_value.lower()
-        grade_upper = grade_value.upper()
-        
-        # Build exact match variations
-        exact_matches = set()
-        
-        # Add the original value
-        exact_matches.add(grade_value)
-        exact_matches.add(grade_upper)
-        exact_matches.add(grade_lower)
-        
-        # Handle KG grades (KG-I, KG-1, KG1, etc.)
-        if 'kg' in grade_lower:
-            # Extract the number/roman part
-            import re
-            match = re.search(r'kg[-_\s]?([ivx\d]+)', grade_lower)
-            if match:
-                num_part = match.group(1)
-                # Try to convert roman to number
-                if num_part in roman_to_num:
-                    num = roman_to_num[num_part]
-                    exact_matches.add(f'KG-{num}')
-                    exact_matches.add(f'KG-{num_part.upper()}')
-                    exact_matches.add(f'KG{num}')
-                    exact_matches.add(f'KG{num_part.upper()}')
-                # Try to convert number to roman
-                elif num_part in num_to_roman:
-                    roman = num_to_roman[num_part]
-                    exact_matches.add(f'KG-{roman}')
-                    exact_matches.add(f'KG-{num_part}')
-                    exact_matches.add(f'KG{roman}')
-                    exact_matches.add(f'KG{num_part}')
-                else:
-                    # Keep as is
-                    exact_matches.add(f'KG-{num_part.upper()}')
-                    exact_matches.add(f'KG{num_part.upper()}')
-        
-        # Handle regular grades (Grade 1, Grade I, Grade-1, etc.)
-        elif 'grade' in grade_lower:
-            # Extract the number/roman part
-            import re
-            match = re.search(r'grade[-_\s]?([ivx\d]+)', grade_lower)
-            if match:
-                num_part = match.group(1)
-                # Try to convert roman to number
-                if num_part in roman_to_num:
-                    num = roman_to_num[num_part]
-                    exact_matches.add(f'Grade {num}')
-                    exact_matches.add(f'Grade-{num}')
-                    exact_matches.add(f'Grade {num_part.upper()}')
-                    exact_matches.add(f'Grade-{num_part.upper()}')
-                # Try to convert number to roman
-                elif num_part in num_to_roman:
-                    roman = num_to_roman[num_part]
-                    exact_matches.add(f'Grade {roman}')
-                    exact_matches.add(f'Grade-{roman}')
-                    exact_matches.add(f'Grade {num_part}')
-                    exact_matches.add(f'Grade-{num_part}')
-                else:
-                    # Keep as is
-                    exact_matches.add(f'Grade {num_part}')
-                    exact_matches.add(f'Grade-{num_part}')
-        
-        # Build query for student's current_grade field - use exact or iexact matching
-        student_grade_query = Q()
-        for match_value in exact_matches:
-            # Use iexact for exact matching (case-insensitive)
-            student_grade_query |= Q(current_grade__iexact=match_value)
-            # Also try with spaces normalized
-            student_grade_query |= Q(current_grade__iexact=match_value.replace('-', ' '))
-            student_grade_query |= Q(current_grade__iexact=match_value.replace(' ', '-'))
-        
-        # Build query for classroom's grade name - use exact matching
-        classroom_grade_query = Q()
-        for match_value in exact_matches:
-            # Use iexact for exact matching (case-insensitive)
-            classroom_grade_query |= Q(classroom__grade__name__iexact=match_value)
-            # Also try with spaces normalized
-            classroom_grade_query |= Q(classroom__grade__name__iexact=match_value.replace('-', ' '))
-            classroom_grade_query |= Q(classroom__grade__name__iexact=match_value.replace(' ', '-'))
-        
-        # Filter by both student's current_grade and classroom's grade
-        return queryset.filter(student_grade_query | classroom_grade_query)
+        grade_key = canonical_grade_key(grade_value)
+        if grade_key:
+            # "Grade 1", "Grade-I", "grade 01" ... all share one indexed key
+            return queryset.filter(Q(grade_key=grade_key) | Q(classroom__grade__grade_key=grade_key))
+        
+        # Unrecognized grade names: exact match on the spelling variants
+        query = Q()
+        for match_value in {grade_value, grade_value.replace('-', ' '), grade_value.replace(' ', '-')}:
+            query |= Q(current_grade__iexact=match_value) | Q(classroom__grade__name__iexact=match_value)
+        return queryset.filter(query)
     
     class Meta:
         model = Student
@@ -0,0 +1,112 @@
+import statistics
+import time
+from datetime import timedelta
+from urllib.parse import parse_qs, urlparse
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.request import Request
+
+from students.models import Student
+from students.views import StudentCursorPagination, StudentPagination
+
+BENCHMARK_GR_NO = "BENCH-PAGINATION"
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed throwaway students and compare page-number (OFFSET + COUNT) against "
+        "cursor pagination latency on the student list ordering. Run it against "
+        "PostgreSQL after migrating so the list indexes exist."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=200000, help="Students to seed (default: 200000)")
+        parser.add_argument("--page-size", type=int, default=25, help="Rows per page (default: 25)")
+        parser.add_argument("--pages", type=int, default=200, help="Pages sampled per mode (default: 200)")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows per seeding INSERT (default: 5000)")
+        parser.add_argument("--keep", action="store_true", help="Keep the seeded students for another run")
+
+    def handle(self, *args, **options):
+        total: int = options["students"]
+        page_size: int = options["page_size"]
+        pages: int = options["pages"]
+        batch_size: int = options["batch_size"]
+
+        if total < 1 or page_size < 1 or pages < 1 or batch_size < 1:
+            raise CommandError("students, page-size, pages and batch-size must be >= 1")
+        if connection.vendor != "postgresql":
+            self.stdout.write(self.style.WARNING(
+                f"⚠️ Database is {connection.vendor}; latency figures are only meaningful on PostgreSQL"
+            ))
+
+        try:
+            self.seed(total, batch_size)
+            queryset = Student.objects.filter(is_deleted=False).order_by("-created_at", "-id")
+            last_page = max((queryset.count() + page_size - 1) // page_size, 1)
+            sample = sorted({1 + (last_page - 1) * i // max(pages - 1, 1) for i in range(pages)})
+
+            self.report("Page-number", self.page_number_timings(queryset, page_size, sample), sample[-1])
+            self.report("Cursor", self.cursor_timings(queryset, page_size, sample[-1]), sample[-1])
+        finally:
+            if not options["keep"]:
+                deleted, _ = Student.objects.with_deleted().filter(gr_no=BENCHMARK_GR_NO).delete()
+                self.stdout.write(f"🧹 Removed {deleted} seeded students")
+
+    def seed(self, total, batch_size):
+        existing = Student.objects.with_deleted().filter(gr_no=BENCHMARK_GR_NO).count()
+        missing = total - existing
+        if missing <= 0:
+            self.stdout.write(f"♻️ Reusing {existing} seeded students")
+            return
+        self.stdout.write(f"🌱 Seeding {missing} students...")
+        now = timezone.now()
+        for offset in range(0, missing, batch_size):
+            size = min(batch_size, missing - offset)
+            Student.objects.bulk_create([
+                Student(
+                    name=f"Benchmark Student {existing + offset + i}",
+                    gr_no=BENCHMARK_GR_NO,
+                    created_at=now - timedelta(seconds=existing + offset + i),
+                )
+                for i in range(size)
+            ])
+
+    def request(self, **params):
+        return Request(RequestFactory().get("/api/students/", params))
+
+    def page_number_timings(self, queryset, page_size, sample):
+        timings = []
+        for page in sample:
+            started = time.perf_counter()
+            paginator = StudentPagination()
+            list(paginator.paginate_queryset(queryset, self.request(page=page, page_size=page_size)))
+            timings.append(time.perf_counter() - started)
+        return timings
+
+    def cursor_timings(self, queryset, page_size, last_page):
+        """Walk the cursor from the first page to the deepest sampled page."""
+        timings = []
+        request = self.request(page_size=page_size)
+        for _ in range(last_page):
+            started = time.perf_counter()
+            paginator = StudentCursorPagination()
+            list(paginator.paginate_queryset(queryset, request))
+            timings.append(time.perf_counter() - started)
+            next_link = paginator.get_next_link()
+            if not next_link:
+                break
+            cursor = parse_qs(urlparse(next_link).query)["cursor"][0]
+            request = self.request(page_size=page_size, cursor=cursor)
+        return timings
+
+    def report(self, label, timings, deepest):
+        ordered = sorted(timings)
+        p95 = ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+        self.stdout.write(self.style.SUCCESS(
+            f"{label:>11}: {len(timings)} pages up to page {deepest}, "
+            f"p50 {statistics.median(ordered) * 1000:.2f}ms, p95 {p95 * 1000:.2f}ms, "
+            f"max {ordered[-1] * 1000:.2f}ms"
+        ))
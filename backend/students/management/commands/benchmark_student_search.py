@@ -0,0 +1,121 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from students.models import Student
+from students.search import search_students
+
+BENCHMARK_GR_PREFIX = "BENCH-SEARCH-"
+
+FIRST_NAMES = ["Ahmed", "Ayesha", "Bilal", "Fatima", "Hamza", "Hira", "Imran", "Zainab", "Usman", "Maryam", "Saad", "Sana"]
+LAST_NAMES = ["Khan", "Ali", "Hussain", "Qureshi", "Siddiqui", "Malik", "Shaikh", "Raza", "Iqbal", "Ansari"]
+
+
+def legacy_search(queryset, value):
+    """The five-way icontains filter the student search used before the search document."""
+    return queryset.filter(
+        Q(name__icontains=value) |
+        Q(student_code__icontains=value) |
+        Q(gr_no__icontains=value) |
+        Q(father_name__icontains=value) |
+        Q(student_id__icontains=value)
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed throwaway students and compare the legacy icontains student search with "
+        "the indexed search document. Run it against PostgreSQL after migrating."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=200000, help="Students to seed (default: 200000)")
+        parser.add_argument("--queries", type=int, default=100, help="Searches per mode (default: 100)")
+        parser.add_argument("--limit", type=int, default=25, help="Rows fetched per search (default: 25)")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows per seeding INSERT (default: 5000)")
+        parser.add_argument("--keep", action="store_true", help="Keep the seeded students for another run")
+
+    def handle(self, *args, **options):
+        total: int = options["students"]
+        queries: int = options["queries"]
+        limit: int = options["limit"]
+        batch_size: int = options["batch_size"]
+
+        if total < 1 or queries < 1 or limit < 1 or batch_size < 1:
+            raise CommandError("students, queries, limit and batch-size must be >= 1")
+        if connection.vendor != "postgresql":
+            self.stdout.write(self.style.WARNING(
+                f"⚠️ Database is {connection.vendor}; no trigram index, figures are only meaningful on PostgreSQL"
+            ))
+
+        try:
+            self.seed(total, batch_size)
+            terms = self.terms(total, queries)
+            base = Student.objects.filter(is_deleted=False)
+            self.report("Legacy", [
+                self.timed(legacy_search(base, term).order_by("-created_at", "-id")[:limit]) for term in terms
+            ])
+            self.report("Document", [
+                self.timed(search_students(base, term).order_by("-search_rank", "-created_at", "-id")[:limit])
+                for term in terms
+            ])
+        finally:
+            if not options["keep"]:
+                deleted, _ = Student.objects.with_deleted().filter(gr_no__startswith=BENCHMARK_GR_PREFIX).delete()
+                self.stdout.write(f"🧹 Removed {deleted} seeded students")
+
+    def seed(self, total, batch_size):
+        existing = Student.objects.with_deleted().filter(gr_no__startswith=BENCHMARK_GR_PREFIX).count()
+        missing = total - existing
+        if missing <= 0:
+            self.stdout.write(f"♻️ Reusing {existing} seeded students")
+            return
+        self.stdout.write(f"🌱 Seeding {missing} students...")
+        rng = random.Random(existing)
+        now = timezone.now()
+        for offset in range(0, missing, batch_size):
+            students = []
+            for i in range(existing + offset, existing + offset + min(batch_size, missing - offset)):
+                student = Student(
+                    name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                    father_name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                    student_id=f"BS-M-25-{i:06d}",
+                    gr_no=f"{BENCHMARK_GR_PREFIX}{i:06d}",
+                    created_at=now - timedelta(seconds=i),
+                )
+                student.refresh_derived_fields()
+                students.append(student)
+            Student.objects.bulk_create(students)
+
+    def terms(self, total, queries):
+        """A mix of name fragments, full names and code prefixes, like the search box sends."""
+        rng = random.Random(42)
+        terms = []
+        for i in range(queries):
+            kind = i % 3
+            if kind == 0:
+                terms.append(rng.choice(FIRST_NAMES)[:rng.randint(3, 5)])
+            elif kind == 1:
+                terms.append(f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}")
+            else:
+                terms.append(f"BS-M-25-{rng.randrange(total):06d}"[:rng.randint(10, 14)])
+        return terms
+
+    def timed(self, queryset):
+        started = time.perf_counter()
+        list(queryset.values_list("id", flat=True))
+        return time.perf_counter() - started
+
+    def report(self, label, timings):
+        ordered = sorted(timings)
+        p95 = ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+        self.stdout.write(self.style.SUCCESS(
+            f"{label:>8}: {len(timings)} searches, p50 {statistics.median(ordered) * 1000:.2f}ms, "
+            f"p95 {p95 * 1000:.2f}ms, max {ordered[-1] * 1000:.2f}ms"
+        ))
@@ -7,12 +7,16 @@ from django.utils.dateparse import parse_date
 from students.models import Student
 from campus.models import Campus
 from classes.models import Grade, ClassRoom
+from utils.bulk_import import ClassroomLookup, Throughput, iter_csv_chunks, run_chunks
 import re
 
 
 class Command(BaseCommand):
     help = 'Populate students data from CSV file with classroom assignments'
 
+    # Set in bulk mode so classrooms resolve from memory instead of per-row queries
+    classroom_lookup = None
+
     def add_arguments(self, parser):
         parser.add_argument(
             'csv_file_path',
@@ -30,6 +34,18 @@ class Command(BaseCommand):
             action='store_true',
             help='Run without actually saving data (for testing)'
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=0,
+            help='Stream the CSV and bulk insert this many rows per transaction (default: 0, save row by row)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Threads inserting batches in parallel in bulk mode (default: 1)'
+        )
 
     def handle(self, *args, **options):
         csv_file_path = options['csv_file_path']
@@ -58,6 +74,12 @@ class Command(BaseCommand):
         except Campus.DoesNotExist:
             raise CommandError(f'Campus not found with code: {campus_code}')
 
+        if options['batch_size'] > 0:
+            self.handle_bulk(csv_file_path, campus, options['batch_size'], max(options['workers'], 1), dry_run)
+            return
+
+        throughput = Throughput()
+
         # Read CSV file
         students_data = []
         try:
@@ -95,6 +117,7 @@ class Command(BaseCommand):
                     )
                 
                 success_count += 1
+                throughput.add(1)
                 
             except Exception as e:
                 error_count += 1
@@ -110,7 +133,10 @@ class Command(BaseCommand):
         self.stdout.write(f'Total rows processed: {len(students_data)}')
         self.stdout.write(f'Successfully processed: {success_count}')
         self.stdout.write(f'Errors: {error_count}')
-        
+        self.stdout.write(f'Throughput: {throughput}')
+        self.write_footer(errors, success_count, dry_run)
+
+    def write_footer(self, errors, success_count, dry_run):
         if errors:
             self.stdout.write('\nERRORS:')
             for error in errors[:10]:  # Show first 10 errors
@@ -123,6 +149,104 @@ class Command(BaseCommand):
         else:
             self.stdout.write(self.style.SUCCESS(f'\n✅ Successfully processed {success_count} students'))
 
+    def handle_bulk(self, csv_file_path, campus, batch_size, workers, dry_run):
+        """
+        Streaming import: rows are parsed in chunks of ``batch_size``,
+        classrooms come from a lookup loaded once, student numbers are
+        reserved one block per chunk and each chunk is a single bulk_create.
+        bulk_create sends no post_save signals, so per-student notifications
+        are skipped; link_imported_students() runs the linking afterwards.
+        """
+        self.stdout.write(f'📦 Bulk mode: batch size {batch_size}, {workers} worker(s)')
+        if dry_run:
+            self.stdout.write(self.style.WARNING('DRY RUN MODE - No data will be saved'))
+
+        self.classroom_lookup = ClassroomLookup(campus)
+        self.stdout.write(f'🏫 Loaded {len(self.classroom_lookup.rooms)} classrooms')
+
+        throughput = Throughput()
+        errors = []
+        classroom_ids = set()
+        counts = {'rows': 0, 'created': 0}
+
+        def import_chunk(chunk):
+            students = []
+            chunk_errors = []
+            for row_num, row in chunk:
+                try:
+                    student = self.process_student_data(row, campus, row_num)
+                    if not student.classroom:
+                        # Same fallback and rule as Student.save()
+                        student.classroom = self.classroom_lookup.match(student.current_grade, student.section, student.shift)
+                    if not student.classroom:
+                        raise ValueError('No classroom is available for the selected campus/grade/section/shift. Please create the classroom first.')
+                    students.append(student)
+                except Exception as e:
+                    chunk_errors.append(f'Row {row_num}: {str(e)}')
+
+            if students and not dry_run:
+                try:
+                    self.assign_student_ids(students, campus)
+                    for student in students:
+                        student.refresh_derived_fields()
+                    with transaction.atomic():
+                        Student.objects.bulk_create(students, batch_size=len(students))
+                except Exception as e:
+                    first, last = chunk[0][0], chunk[-1][0]
+                    chunk_errors.append(f'Rows {first}-{last}: batch failed, nothing saved: {str(e)}')
+                    students = []
+            return len(chunk), students, chunk_errors
+
+        def collect(result):
+            rows, students, chunk_errors = result
+            counts['rows'] += rows
+            counts['created'] += len(students)
+            classroom_ids.update(s.classroom_id for s in students)
+            errors.extend(chunk_errors)
+            throughput.add(len(students))
+            self.stdout.write(f'✅ {counts["rows"]} rows processed ({throughput})')
+
+        try:
+            run_chunks(iter_csv_chunks(csv_file_path, batch_size), import_chunk, workers, collect)
+        except (OSError, csv.Error, UnicodeDecodeError) as e:
+            raise CommandError(f'Error reading CSV file: {str(e)}')
+
+        if not dry_run and counts['created']:
+            self.link_imported_students(classroom_ids)
+
+        self.stdout.write('\n' + '='*50)
+        self.stdout.write('SUMMARY:')
+        self.stdout.write(f'Total rows processed: {counts["rows"]}')
+        self.stdout.write(f'Successfully processed: {counts["created"]}')
+        self.stdout.write(f'Errors: {len(errors)}')
+        self.stdout.write(f'Throughput: {throughput}')
+        self.write_footer(errors, counts['created'], dry_run)
+
+    def assign_student_ids(self, students, campus):
+        """Set student_id and GR No. like Student.save(), from one reserved number block"""
+        from users.utils import generate_student_id, get_shift_code, reserve_student_numbers
+
+        pending = [s for s in students if not s.student_id and s.shift and s.enrollment_year]
+        campus_code = campus.campus_code or f"C{campus.id:02d}"
+        for student, seq in zip(pending, reserve_student_numbers(len(pending))):
+            year = str(student.enrollment_year)[-2:]
+            student.student_id = generate_student_id(campus_code, get_shift_code(student.shift), year, seq)
+            if not student.gr_no:
+                student.gr_no = f"GR-{seq:05d}"
+
+    def link_imported_students(self, classroom_ids):
+        """Post-import pass: link class teachers to coordinators once per classroom, refresh stats"""
+        from students.signals import STUDENT_STATS_CACHE_NAMESPACE, auto_assign_teacher_to_coordinators
+        from utils.cache_generation import bump_generation
+
+        teachers = {}
+        for classroom in ClassRoom.objects.filter(id__in=classroom_ids, class_teacher__isnull=False).select_related('class_teacher'):
+            teachers[classroom.class_teacher_id] = classroom.class_teacher
+        for teacher in teachers.values():
+            auto_assign_teacher_to_coordinators(teacher)
+        bump_generation(STUDENT_STATS_CACHE_NAMESPACE)
+        self.stdout.write(f'🔗 Linked {len(teachers)} class teachers to coordinators')
+
     def process_student_data(self, data, campus, row_num):
         """Process individual student data and create Student object"""
         
@@ -287,6 +411,14 @@ class Command(BaseCommand):
             
             # Convert grade name to Roman numeral format
             mapped_grade_name = grade_mapping.get(grade_name, grade_name)
+
+            if self.classroom_lookup is not None:
+                classroom = self.classroom_lookup.get(mapped_grade_name, section, shift)
+                if not classroom:
+                    self.stdout.write(f"⚠️ Classroom not found: {grade_name} -> {mapped_grade_name}-{section} for {shift} shift")
+                    return
+                student.classroom = classroom
+                return
             
             # Find the grade
             grade = Grade.objects.filter(
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from students.models import Student
+from students.search import rebuild_search_documents
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Student.search_document for all students (including deleted ones). "
+        "Needed after rows are changed with queryset.update() or the normalization changes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows per batch (default: 1000)")
+
+    def handle(self, *args, **options):
+        batch_size: int = options.get("batch_size") or 1000
+
+        updated = rebuild_search_documents(Student, batch_size=batch_size)
+
+        self.stdout.write(self.style.SUCCESS(f"Student search documents rebuilt. Rows updated: {updated}."))
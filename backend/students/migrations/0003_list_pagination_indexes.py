@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campus', '0001_initial'),
+        ('classes', '0002_initial'),
+        ('students', '0002_student_is_active'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['is_deleted', '-created_at', '-id'], name='students_st_is_dele_503ea3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['campus', 'is_deleted', '-created_at', '-id'], name='students_st_campus__b45f3a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['classroom', 'is_deleted', '-created_at', '-id'], name='students_st_classro_936ffe_idx'),
+        ),
+    ]
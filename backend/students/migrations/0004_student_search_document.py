@@ -0,0 +1,81 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:07
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+TRGM_INDEX = 'students_student_search_trgm'
+
+# Frozen copy of students.search as of this migration; later changes to
+# the live module must not change what this backfill writes
+SEARCH_SOURCE_FIELDS = ('name', 'father_name', 'student_code', 'student_id', 'gr_no')
+
+_SEPARATORS = re.compile(r'[^\w\-/]+')
+
+
+def normalize_search_text(value):
+    if not value:
+        return ''
+    text = unicodedata.normalize('NFKD', str(value))
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(_SEPARATORS.sub(' ', text.lower()).split())
+
+
+def build_search_document(student):
+    tokens = ' '.join(
+        normalized for normalized in (
+            normalize_search_text(getattr(student, name, None)) for name in SEARCH_SOURCE_FIELDS
+        ) if normalized
+    )
+    return f' {tokens} ' if tokens else ''
+
+
+def backfill_search_documents(apps, schema_editor):
+    manager = apps.get_model('students', 'Student')._base_manager
+    last_pk = 0
+    while True:
+        batch = list(
+            manager.filter(pk__gt=last_pk).order_by('pk')
+            .only('pk', 'search_document', *SEARCH_SOURCE_FIELDS)[:1000]
+        )
+        if not batch:
+            return
+        last_pk = batch[-1].pk
+        for student in batch:
+            student.search_document = build_search_document(student)
+        manager.bulk_update(batch, ['search_document'])
+
+
+def create_trigram_index(apps, schema_editor):
+    # GIN trigram indexes are PostgreSQL-only; other backends search without an index
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {TRGM_INDEX} ON students_student '
+        'USING gin (search_document gin_trgm_ops)'
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'DROP INDEX IF EXISTS {TRGM_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0003_list_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='student',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(backfill_search_documents, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -5,7 +5,13 @@ from django.utils import timezone
 from django.db.models import Q
 from django.core.validators import RegexValidator
 from django.core.exceptions import ValidationError
+from classes.grade_keys import canonical_grade_key
+
+from .search import SEARCH_SOURCE_FIELDS, build_search_document
 from .validators import StudentValidator
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class StudentManager(models.Manager):
@@ -146,6 +152,8 @@ class Student(models.Model):
     # Campus reference - set to null if campus is deleted (data preservation)
     campus = models.ForeignKey("campus.Campus", on_delete=models.SET_NULL, null=True, blank=True)
     current_grade = models.CharField(max_length=50, null=True, blank=True)
+    # Canonical key of current_grade ("G-01", "KG-1", ...), see classes/grade_keys.py
+    grade_key = models.CharField(max_length=20, blank=True, default='', db_index=True, editable=False)
     section = models.CharField(max_length=10, null=True, blank=True)
     last_class_passed = models.CharField(max_length=50, null=True, blank=True)
     last_school_name = models.CharField(max_length=200, null=True, blank=True)
@@ -216,6 +224,8 @@ class Student(models.Model):
     deleted_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
+    # Normalized name/codes for search; refreshed on save, pg_trgm GIN index on PostgreSQL
+    search_document = models.TextField(blank=True, default='', editable=False)
 
     classroom = models.ForeignKey(
         'classes.ClassRoom',
@@ -256,13 +266,11 @@ class Student(models.Model):
     
     def soft_delete(self):
         """Soft delete the student - uses update() to bypass signals"""
-        import logging
-        logger = logging.getLogger(__name__)
         
         if not self.pk:
             raise ValueError("Cannot soft delete student without primary key")
         
-        logger.info(f"[SOFT_DELETE] soft_delete() called for student PK: {self.pk}, Name: {self.name}")
+        logger.debug("[SOFT_DELETE] soft_delete() called for student PK: %s, Name: %s", self.pk, self.name)
         
         updated_count = Student.objects.with_deleted().filter(pk=self.pk).update(
             is_deleted=True,
@@ -271,15 +279,19 @@ class Student(models.Model):
             termination_reason="Deleted from system"
         )
         
-        logger.info(f"[SOFT_DELETE] Database update() returned updated_count: {updated_count}")
+        logger.debug("[SOFT_DELETE] Database update() returned updated_count: %s", updated_count)
         
         if updated_count == 0:
-            logger.error(f"[SOFT_DELETE] CRITICAL: update() returned 0 - no rows were updated! Student PK: {self.pk}")
+            logger.error("[SOFT_DELETE] CRITICAL: update() returned 0 - no rows were updated! Student PK: %s", self.pk)
             raise Exception(f"Soft delete failed - no rows updated for student PK: {self.pk}")
         
         # Refresh instance from database
         self.refresh_from_db()
-        logger.info(f"[SOFT_DELETE] After refresh_from_db(), is_deleted: {self.is_deleted}")
+        logger.debug("[SOFT_DELETE] After refresh_from_db(), is_deleted: %s", self.is_deleted)
+        
+        # update() sends no post_save; drop the caches that receiver would (restore() saves normally)
+        from .signals import invalidate_student_stats
+        invalidate_student_stats(sender=Student, instance=self)
     
     def restore(self):
         """Restore a soft deleted student"""
@@ -314,17 +326,14 @@ class Student(models.Model):
         try:
             from classes.models import ClassRoom, Grade
             
-            # Normalize grade names for matching
-            grade_name_variations = [
-                self.current_grade,
-                self.current_grade.replace('-', ' '),  # Grade-4 -> Grade 4
-                self.current_grade.replace(' ', '-'),  # Grade 4 -> Grade-4
-            ]
-            
-            # Find matching grade
-            grade_query = Q()
-            for grade_var in grade_name_variations:
-                grade_query |= Q(name__icontains=grade_var)
+            grade_key = canonical_grade_key(self.current_grade)
+            if grade_key:
+                grade_query = Q(grade_key=grade_key)
+            else:
+                # Unrecognized grade: match spelling variants of the name
+                grade_query = Q()
+                for grade_var in {self.current_grade, self.current_grade.replace('-', ' '), self.current_grade.replace(' ', '-')}:
+                    grade_query |= Q(name__icontains=grade_var)
             
             # Find grades in the same campus
             matching_grades = Grade.objects.filter(
@@ -333,7 +342,7 @@ class Student(models.Model):
             )
             
             if not matching_grades.exists():
-                print(f"[ERROR] No matching grade found for '{self.current_grade}' in campus '{self.campus.campus_name}'")
+                logger.warning("No matching grade found for '%s' in campus '%s'", self.current_grade, self.campus.campus_name)
                 return
             
             # Find classroom with matching grade, section, and shift
@@ -345,23 +354,15 @@ class Student(models.Model):
             
             if classroom:
                 self.classroom = classroom
-                print(f"[OK] Auto-assigned student '{self.name}' to classroom '{classroom.grade.name}-{classroom.section}' ({classroom.shift})")
-                
-                # If classroom has a teacher, student is automatically connected to that teacher
-                if classroom.class_teacher:
-                    print(f"[OK] Student '{self.name}' is now connected to teacher '{classroom.class_teacher.full_name}'")
+                logger.debug("Auto-assigned student '%s' to classroom %s (%s)", self.name, classroom, classroom.shift)
             else:
-                print(f"[ERROR] No classroom found for Grade: {self.current_grade}, Section: {self.section}, Shift: {self.shift} in campus '{self.campus.campus_name}'")
-                print(f"[INFO] Please create a classroom first for this combination")
+                logger.warning(
+                    "No classroom found for Grade: %s, Section: %s, Shift: %s in campus '%s'; create one for this combination",
+                    self.current_grade, self.section, self.shift, self.campus.campus_name,
+                )
                 
         except Exception as e:
-            error_msg = str(e).encode('ascii', 'replace').decode('ascii') if isinstance(str(e), str) else repr(e)
-            print(f"[ERROR] Error in auto-assignment: {error_msg}")
-            import traceback
-            try:
-                traceback.print_exc()
-            except UnicodeEncodeError:
-                print("[ERROR] Could not print traceback due to encoding error")
+            logger.error("Error in auto-assignment: %s", e, exc_info=True)
 
     def save(self, *args, **kwargs):
         # Set termination date automatically
@@ -391,7 +392,7 @@ class Student(models.Model):
                     self.classroom, self.enrollment_year or 2025
                 )
             except Exception as e:
-                print(f"Error generating student code: {str(e)}")
+                logger.warning("Error generating student code: %s", e)
 
         # Generate student_id using global student sequence
         if not self.student_id and all([self.campus, self.shift, self.enrollment_year]):
@@ -406,7 +407,7 @@ class Student(models.Model):
                 if not self.gr_no:
                     self.gr_no = f"GR-{seq:05d}"
             except Exception as e:
-                print(f"Error generating student id: {e}")
+                logger.warning("Error generating student id: %s", e)
 
         # Auto-generate GR No. from Student ID (last 5 digits)
         if self.student_id and not self.gr_no:
@@ -419,9 +420,30 @@ class Student(models.Model):
                 padded_id = self.student_id.zfill(5)
                 self.gr_no = f"GR-{padded_id}"
 
+        self.refresh_derived_fields()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if update_fields & set(SEARCH_SOURCE_FIELDS):
+                update_fields.add('search_document')
+            if 'current_grade' in update_fields:
+                update_fields.add('grade_key')
+            kwargs['update_fields'] = update_fields
+
         super().save(*args, **kwargs)
 
+    def refresh_derived_fields(self):
+        """Rebuild search_document and grade_key (needed before bulk_create)"""
+        self.search_document = build_search_document(self)
+        self.grade_key = canonical_grade_key(self.current_grade)
+
     class Meta:
         verbose_name = "Student"
         verbose_name_plural = "Students"
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            # List endpoint: is_deleted=False, optionally by campus or classroom, newest first
+            models.Index(fields=['is_deleted', '-created_at', '-id']),
+            models.Index(fields=['campus', 'is_deleted', '-created_at', '-id']),
+            models.Index(fields=['classroom', 'is_deleted', '-created_at', '-id']),
+        ]
\ No newline at end of file
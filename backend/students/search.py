@@ -0,0 +1,124 @@
+"""
+Student search on a normalized search document.
+
+``Student.search_document`` holds the lowercased, accent-stripped name,
+father's name and codes as space-separated tokens (with a leading and
+trailing space) and is refreshed on every save. On PostgreSQL it carries a
+pg_trgm GIN index, so ``LIKE '%term%'`` on it is an index scan instead of
+five ILIKE sequential scans; results are ranked by exact code match, token
+prefix match and trigram similarity. Other backends (SQLite in tests) run
+the same LIKE filters without the index and rank without similarity.
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+from functools import reduce
+from operator import and_
+
+from django.db import connection
+from django.db.models import Case, F, FloatField, Q, Value, When
+from rest_framework.filters import OrderingFilter
+
+SEARCH_SOURCE_FIELDS = ('name', 'father_name', 'student_code', 'student_id', 'gr_no')
+CODE_FIELDS = ('student_code', 'student_id', 'gr_no')
+
+RANK_ANNOTATION = 'search_rank'
+
+_SEPARATORS = re.compile(r'[^\w\-/]+')
+
+
+def normalize_search_text(value) -> str:
+    """Lowercase, strip accents and collapse everything but word chars, '-' and '/' to single spaces."""
+    if not value:
+        return ''
+    text = unicodedata.normalize('NFKD', str(value))
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(_SEPARATORS.sub(' ', text.lower()).split())
+
+
+def build_search_document(student) -> str:
+    tokens = ' '.join(
+        normalized for normalized in (
+            normalize_search_text(getattr(student, name, None)) for name in SEARCH_SOURCE_FIELDS
+        ) if normalized
+    )
+    return f' {tokens} ' if tokens else ''
+
+
+def rebuild_search_documents(model, batch_size: int = 1000) -> int:
+    """
+    Recompute search_document for every row of ``model`` (the Student model,
+    or its historical version in migrations) in primary-key batches.
+    Returns the number of rows rewritten.
+    """
+    manager = model._base_manager
+    updated = 0
+    last_pk = 0
+    while True:
+        batch = list(
+            manager.filter(pk__gt=last_pk).order_by('pk')
+            .only('pk', 'search_document', *SEARCH_SOURCE_FIELDS)[:batch_size]
+        )
+        if not batch:
+            return updated
+        last_pk = batch[-1].pk
+        changed = []
+        for student in batch:
+            document = build_search_document(student)
+            if document != student.search_document:
+                student.search_document = document
+                changed.append(student)
+        if changed:
+            manager.bulk_update(changed, ['search_document'])
+            updated += len(changed)
+
+
+def is_code_query(term: str) -> bool:
+    """Single token containing a digit: treated as a student code/ID/GR number."""
+    return bool(term) and ' ' not in term and any(ch.isdigit() for ch in term)
+
+
+def search_students(queryset, value, prefix_codes: bool = True, rank: bool = True):
+    """
+    Filter ``queryset`` to students matching ``value``.
+
+    Every token must appear in the document. Code-like queries (see
+    is_code_query) only match from the start of a token when
+    ``prefix_codes`` is set, so "25-00" does not hit every ID that merely
+    contains it. With ``rank`` the rows are annotated with ``search_rank``.
+    """
+    term = normalize_search_text(value)
+    if not term:
+        return queryset
+
+    code_query = prefix_codes and is_code_query(term)
+    if code_query:
+        queryset = queryset.filter(search_document__contains=f' {term}')
+    else:
+        queryset = queryset.filter(reduce(and_, (Q(search_document__contains=token) for token in term.split())))
+
+    if not rank:
+        return queryset
+
+    exact_code = reduce(lambda a, b: a | b, (Q(**{f'{field}__iexact': value.strip()}) for field in CODE_FIELDS))
+    score = Case(
+        When(exact_code, then=Value(3.0)),
+        When(search_document__contains=f' {term}', then=Value(2.0)),
+        default=Value(1.0),
+        output_field=FloatField(),
+    )
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import TrigramSimilarity
+        score = score + TrigramSimilarity(F('search_document'), term)
+    return queryset.annotate(**{RANK_ANNOTATION: score})
+
+
+class RankedOrderingFilter(OrderingFilter):
+    """OrderingFilter that puts the best search matches first unless ?ordering= is given."""
+
+    def get_ordering(self, request, queryset, view):
+        params = request.query_params.get(self.ordering_param)
+        if not params and RANK_ANNOTATION in queryset.query.annotations:
+            return [f'-{RANK_ANNOTATION}'] + list(self.get_default_ordering(view) or [])
+        return super().get_ordering(request, queryset, view)
@@ -7,10 +7,15 @@ from teachers.models import Teacher
 from coordinator.models import Coordinator
 from notifications.services import create_notification
 from users.models import User
+from users.profile import invalidate_student_profiles
+from utils.cache_generation import bump_generation
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Cache namespace for StudentViewSet.dashboard_stats
+STUDENT_STATS_CACHE_NAMESPACE = 'student_stats'
+
 
 @receiver(post_save, sender=Student)
 def notify_student_operations(sender, instance, created, **kwargs):
@@ -38,7 +43,7 @@ def notify_student_operations(sender, instance, created, **kwargs):
                         target_text=target_text,
                         data={"student_id": instance.id, "student_name": instance.name}
                     )
-                    logger.info(f"[OK] Sent create notification to teacher {teacher.full_name} for student {instance.name}")
+                    logger.info("[OK] Sent create notification to teacher %s for student %s", teacher.full_name, instance.name)
             
             # Notify coordinator
             if instance.classroom and instance.classroom.grade and instance.classroom.grade.level:
@@ -59,7 +64,7 @@ def notify_student_operations(sender, instance, created, **kwargs):
                                 target_text=target_text,
                                 data={"student_id": instance.id, "student_name": instance.name}
                             )
-                            logger.info(f"[OK] Sent create notification to coordinator {coordinator.full_name} for student {instance.name}")
+                            logger.info("[OK] Sent create notification to coordinator %s for student %s", coordinator.full_name, instance.name)
         else:
             # Student updated - notify teacher and coordinator
             verb = f"Student {instance.name}'s profile has been updated"
@@ -77,7 +82,7 @@ def notify_student_operations(sender, instance, created, **kwargs):
                             target_text=target_text,
                             data={"student_id": instance.id, "student_name": instance.name}
                         )
-                        logger.info(f"[OK] Sent update notification to teacher {teacher.full_name} for student {instance.name}")
+                        logger.info("[OK] Sent update notification to teacher %s for student %s", teacher.full_name, instance.name)
                 
                 # Notify coordinator
                 if instance.classroom and instance.classroom.grade and instance.classroom.grade.level:
@@ -98,15 +103,15 @@ def notify_student_operations(sender, instance, created, **kwargs):
                                     target_text=target_text,
                                     data={"student_id": instance.id, "student_name": instance.name}
                                 )
-                                logger.info(f"[OK] Sent update notification to coordinator {coordinator.full_name} for student {instance.name}")
+                                logger.info("[OK] Sent update notification to coordinator %s for student %s", coordinator.full_name, instance.name)
     except Exception as e:
-        logger.error(f"Error sending student notification: {str(e)}")
+        logger.error("Error sending student notification: %s", e)
     
     if created:
         assign_student_to_teacher_and_coordinator(instance)
     else:
         if hasattr(instance, '_previous_classroom') and instance._previous_classroom != instance.classroom:
-            logger.info(f"Student {instance.name} classroom changed from {instance._previous_classroom} to {instance.classroom}")
+            logger.info("Student %s classroom changed from %s to %s", instance.name, instance._previous_classroom, instance.classroom)
             
             old_classroom = instance._previous_classroom
             if old_classroom and old_classroom.class_teacher:
@@ -121,7 +126,7 @@ def notify_student_operations(sender, instance, created, **kwargs):
                         target_text=target_text,
                         data={"student_id": instance.id, "student_name": instance.name, "old_classroom_id": old_classroom.id}
                     )
-                    logger.info(f"[OK] Sent classroom change notification to old teacher {old_teacher.full_name} for student {instance.name}")
+                    logger.info("[OK] Sent classroom change notification to old teacher %s for student %s", old_teacher.full_name, instance.name)
             
             new_classroom = instance.classroom
             if new_classroom and new_classroom.class_teacher:
@@ -136,7 +141,7 @@ def notify_student_operations(sender, instance, created, **kwargs):
                         target_text=target_text,
                         data={"student_id": instance.id, "student_name": instance.name, "new_classroom_id": new_classroom.id}
                     )
-                    logger.info(f"[OK] Sent classroom assignment notification to new teacher {new_teacher.full_name} for student {instance.name}")
+                    logger.info("[OK] Sent classroom assignment notification to new teacher %s for student %s", new_teacher.full_name, instance.name)
             
             assign_student_to_teacher_and_coordinator(instance)
 
@@ -163,7 +168,7 @@ def notify_student_deletion(sender, instance, **kwargs):
                     target_text=target_text,
                     data={"student_id": instance.id, "student_name": instance.name}
                 )
-                logger.info(f"[OK] Sent deletion notification to teacher {teacher.full_name} for student {instance.name}")
+                logger.info("[OK] Sent deletion notification to teacher %s for student %s", teacher.full_name, instance.name)
         
         # Notify coordinator (if classroom still exists in memory)
         if hasattr(instance, 'classroom') and instance.classroom and instance.classroom.grade and instance.classroom.grade.level:
@@ -184,9 +189,9 @@ def notify_student_deletion(sender, instance, **kwargs):
                             target_text=target_text,
                             data={"student_id": instance.id, "student_name": instance.name}
                         )
-                        logger.info(f"[OK] Sent deletion notification to coordinator {coordinator.full_name} for student {instance.name}")
+                        logger.info("[OK] Sent deletion notification to coordinator %s for student %s", coordinator.full_name, instance.name)
     except Exception as e:
-        logger.error(f"Error sending student deletion notification: {str(e)}")
+        logger.error("Error sending student deletion notification: %s", e)
 
 
 @receiver(pre_save, sender=Student)
@@ -212,24 +217,24 @@ def assign_student_to_teacher_and_coordinator(student):
         # Get student's classroom
         classroom = student.classroom
         if not classroom:
-            logger.warning(f"No classroom found for student {student.name}")
+            logger.warning("No classroom found for student %s", student.name)
             return
         
         # Get classroom teacher
         class_teacher = classroom.class_teacher
         if class_teacher:
-            logger.info(f"Student {student.name} is in classroom {classroom} with teacher {class_teacher.full_name}")
+            logger.debug("Student %s is in classroom %s with teacher %s", student.name, classroom, class_teacher.full_name)
             
             # Auto-assign teacher to coordinators if not already assigned
             auto_assign_teacher_to_coordinators(class_teacher)
         else:
-            logger.warning(f"No class teacher found for classroom {classroom}")
+            logger.warning("No class teacher found for classroom %s", classroom)
         
         # Note: Student model doesn't have coordinator fields, 
         # but teacher-coordinator assignment is handled above
         
     except Exception as e:
-        logger.error(f"Error assigning student {student.name}: {str(e)}")
+        logger.error("Error assigning student %s: %s", student.name, e)
 
 
 def auto_assign_teacher_to_coordinators(teacher):
@@ -260,7 +265,7 @@ def auto_assign_teacher_to_coordinators(teacher):
             for coordinator in all_coordinators:
                 if not teacher.assigned_coordinators.filter(id=coordinator.id).exists():
                     teacher.assigned_coordinators.add(coordinator)
-                    logger.info(f"Auto-assigned teacher {teacher.full_name} to coordinator {coordinator.full_name}")
+                    logger.debug("Auto-assigned teacher %s to coordinator %s", teacher.full_name, coordinator.full_name)
         
         # Also handle assigned_classrooms (for multi-classroom teachers)
         for classroom in teacher.assigned_classrooms.all():
@@ -281,10 +286,10 @@ def auto_assign_teacher_to_coordinators(teacher):
             for coordinator in all_coordinators:
                 if not teacher.assigned_coordinators.filter(id=coordinator.id).exists():
                     teacher.assigned_coordinators.add(coordinator)
-                    logger.info(f"Auto-assigned teacher {teacher.full_name} to coordinator {coordinator.full_name} (via classroom {classroom})")
+                    logger.debug("Auto-assigned teacher %s to coordinator %s (via classroom %s)", teacher.full_name, coordinator.full_name, classroom)
                     
     except Exception as e:
-        logger.error(f"Error auto-assigning teacher {teacher.full_name} to coordinators: {str(e)}")
+        logger.error("Error auto-assigning teacher %s to coordinators: %s", teacher.full_name, e)
 
 
 
@@ -303,10 +308,10 @@ def update_classroom_assignments(sender, instance, created, **kwargs):
                 # Re-assign student to teacher and coordinators
                 assign_student_to_teacher_and_coordinator(student)
                 
-            logger.info(f"Updated assignments for {students.count()} students in classroom {instance}")
+            logger.debug("Updated assignments for %s students in classroom %s", len(students), instance)
             
         except Exception as e:
-            logger.error(f"Error updating classroom assignments for {instance}: {str(e)}")
+            logger.error("Error updating classroom assignments for %s: %s", instance, e)
 
 
 @receiver(post_save, sender=Teacher)
@@ -324,7 +329,16 @@ def update_teacher_assignments(sender, instance, created, **kwargs):
             for student in students:
                 assign_student_to_teacher_and_coordinator(student)
                 
-            logger.info(f"Updated assignments for teacher {instance.full_name}")
+            logger.debug("Updated assignments for teacher %s", instance.full_name)
             
         except Exception as e:
-            logger.error(f"Error updating teacher assignments for {instance.full_name}: {str(e)}")
+            logger.error("Error updating teacher assignments for %s: %s", instance.full_name, e)
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+def invalidate_student_stats(sender, **kwargs):
+    """Drop cached dashboard statistics and profiles whenever a student changes"""
+    bump_generation(STUDENT_STATS_CACHE_NAMESPACE)
+    # Student profiles embed the student record, which has no link to its user
+    invalidate_student_profiles()
@@ -1,16 +1,39 @@
 # views.py
+import hashlib
+
 from rest_framework import viewsets, status
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.filters import SearchFilter, OrderingFilter
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
 from users.permissions import IsSuperAdminOrPrincipal, IsTeacherOrAbove
+from users.scope import get_user_scope
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Count, Q
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, CharField, Count, F, Q, Value, When
+from classes.grade_keys import grade_group_label
 from .models import Student
 from .serializers import StudentSerializer
 from .filters import StudentFilter
+from .search import RankedOrderingFilter
+from .signals import STUDENT_STATS_CACHE_NAMESPACE
+from utils.cache_generation import get_generation
+from utils.db_routing import ReplicaReadMixin
+from utils.pagination import OptionalCursorPagination
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Raw current_grade only for rows without a canonical key, so grade
+# distributions group by grade_key and keep unrecognized spellings apart
+UNKEYED_GRADE = Case(
+    When(grade_key='', then=F('current_grade')),
+    default=Value(None),
+    output_field=CharField(),
+)
+
 
 class StudentPagination(PageNumberPagination):
     """Custom pagination for students - default 25 per page"""
@@ -18,18 +41,39 @@ class StudentPagination(PageNumberPagination):
     page_size_query_param = 'page_size'
     max_page_size = 100
 
-class StudentViewSet(viewsets.ModelViewSet):
+
+class StudentCursorPagination(CursorPagination):
+    """Keyset pagination for students (?pagination=cursor or ?cursor=)"""
+    page_size = 25
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
+
+
+class StudentListPagination(OptionalCursorPagination):
+    page_number_class = StudentPagination
+    cursor_class = StudentCursorPagination
+
+class StudentViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     queryset = Student.objects.all()
     serializer_class = StudentSerializer
     permission_classes = [IsAuthenticated, IsTeacherOrAbove]
-    pagination_class = StudentPagination
+    pagination_class = StudentListPagination
+    # Read-only aggregate actions served from the read replica when one is configured.
+    # Not dashboard_stats: it is cached per generation, and a rebuild from a lagging
+    # replica right after a write would stay cached for the full timeout
+    replica_actions = frozenset({
+        'total_students', 'gender_stats', 'campus_stats', 'grade_distribution', 'enrollment_trend',
+        'mother_tongue_distribution', 'religion_distribution', 'age_distribution', 'zakat_status',
+        'house_ownership',
+    })
     
     # Filtering, search, and ordering
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    # ?search= is handled by StudentFilter on the indexed search document
+    filter_backends = [DjangoFilterBackend, RankedOrderingFilter]
     filterset_class = StudentFilter
-    search_fields = ['name', 'student_code', 'gr_no', 'father_name', 'student_id']
     ordering_fields = ['name', 'created_at', 'enrollment_year', 'student_code']
-    ordering = ['-created_at']  # Default ordering
+    ordering = ['-created_at', '-id']  # Default ordering; id keeps pages stable
     
     def get_queryset(self):
         """Override to handle role-based filtering for list views and stats actions"""
@@ -50,6 +94,7 @@ class StudentViewSet(viewsets.ModelViewSet):
             'zakat_status',
             'house_ownership',
             'total',
+            'dashboard_stats',
         ]:
             user = self.request.user
             
@@ -60,65 +105,13 @@ class StudentViewSet(viewsets.ModelViewSet):
             # Principal: Only show students from their campus
             if hasattr(user, 'campus') and user.campus and user.is_principal():
                 queryset = queryset.filter(campus=user.campus)
-            elif user.is_teacher():
-                # Teacher: Show students from their assigned classrooms (supports both single and multiple assignments)
-                # Find teacher by employee code (username)
-                from teachers.models import Teacher
-                try:
-                    teacher_obj = Teacher.objects.get(employee_code=user.username)
-                    
-                    # Get all assigned classrooms (both legacy single assignment and new multiple assignments)
-                    assigned_classrooms = []
-                    
-                    # Add legacy single classroom assignment
-                    if teacher_obj.assigned_classroom:
-                        assigned_classrooms.append(teacher_obj.assigned_classroom)
-                    
-                    # Add multiple classroom assignments
-                    assigned_classrooms.extend(teacher_obj.assigned_classrooms.all())
-                    
-                    # Remove duplicates
-                    assigned_classrooms = list(set(assigned_classrooms))
-                    
-                    if assigned_classrooms:
-                        # Filter students by any of the assigned classrooms
-                        queryset = queryset.filter(classroom__in=assigned_classrooms)
-                    else:
-                        # If no classroom assigned, show no students
-                        queryset = queryset.none()
-                except Teacher.DoesNotExist:
-                    # If teacher object doesn't exist, show no students
-                    queryset = queryset.none()
-            elif user.is_coordinator():
-                # Coordinator: Show students from classrooms under their assigned level
-                from coordinator.models import Coordinator
-                try:
-                    coordinator_obj = Coordinator.get_for_user(user)
-                    if not coordinator_obj:
-                        queryset = queryset.none()
-                    else:
-                        # Determine which levels this coordinator manages (single level or multiple assigned_levels)
-                        managed_levels = []
-                        if coordinator_obj.shift == 'both' and coordinator_obj.assigned_levels.exists():
-                            managed_levels = list(coordinator_obj.assigned_levels.all())
-                        elif coordinator_obj.level:
-                            managed_levels = [coordinator_obj.level]
-
-                        # If no managed levels, return empty queryset
-                        if not managed_levels:
-                            queryset = queryset.none()
-                        else:
-                            # Get all classrooms under these managed levels and the coordinator's campus
-                            from classes.models import ClassRoom
-                            coordinator_classrooms = ClassRoom.objects.filter(
-                                grade__level__in=managed_levels,
-                                grade__level__campus=coordinator_obj.campus
-                            ).values_list('id', flat=True)
-
-                            # Filter students from these classrooms
-                            queryset = queryset.filter(classroom__in=coordinator_classrooms)
-                except Exception:
-                    # If coordinator resolution fails, return empty queryset
+            elif user.is_teacher() or user.is_coordinator():
+                # Teacher: assigned classrooms (legacy single + multiple assignments)
+                # Coordinator: classrooms under their managed levels on their campus
+                scope = get_user_scope(user)
+                if scope and scope.classroom_ids:
+                    queryset = queryset.filter(classroom_id__in=scope.classroom_ids)
+                else:
                     queryset = queryset.none()
             
             # Shift filtering is now handled by StudentFilter class
@@ -145,31 +138,13 @@ class StudentViewSet(viewsets.ModelViewSet):
         
         if user.is_teacher():
             # Teacher: Check if student is in their assigned classrooms
-            from teachers.models import Teacher
-            try:
-                teacher_obj = Teacher.objects.get(employee_code=user.username)
-                
-                # Get all assigned classrooms (both legacy single assignment and new multiple assignments)
-                assigned_classrooms = []
-                
-                # Add legacy single classroom assignment
-                if teacher_obj.assigned_classroom:
-                    assigned_classrooms.append(teacher_obj.assigned_classroom)
-                
-                # Add multiple classroom assignments
-                assigned_classrooms.extend(teacher_obj.assigned_classrooms.all())
-                
-                # Remove duplicates
-                assigned_classrooms = list(set(assigned_classrooms))
-                
-                if assigned_classrooms and obj.classroom not in assigned_classrooms:
-                    # Student is not in teacher's assigned classrooms
-                    from rest_framework.exceptions import PermissionDenied
-                    raise PermissionDenied("You don't have permission to view this student.")
-                    
-            except Teacher.DoesNotExist:
-                from rest_framework.exceptions import PermissionDenied
+            from rest_framework.exceptions import PermissionDenied
+            scope = get_user_scope(user)
+            if not scope or not scope.teacher_id:
                 raise PermissionDenied("Teacher profile not found.")
+            if scope.classroom_ids and obj.classroom_id not in scope.classroom_ids:
+                # Student is not in teacher's assigned classrooms
+                raise PermissionDenied("You don't have permission to view this student.")
                 
         elif user.is_principal() and hasattr(user, 'campus') and user.campus:
             # Principal: Check if student is from their campus
@@ -179,31 +154,15 @@ class StudentViewSet(viewsets.ModelViewSet):
                 
         elif user.is_coordinator():
             # Coordinator: Check if student is from their assigned level
-            from coordinator.models import Coordinator
-            try:
-                coordinator_obj = Coordinator.get_for_user(user)
-                if not coordinator_obj:
-                    from rest_framework.exceptions import PermissionDenied
-                    raise PermissionDenied("Coordinator profile not found.")
-
-                # Build managed levels similar to get_queryset
-                managed_levels = []
-                if coordinator_obj.shift == 'both' and coordinator_obj.assigned_levels.exists():
-                    managed_levels = list(coordinator_obj.assigned_levels.all())
-                elif coordinator_obj.level:
-                    managed_levels = [coordinator_obj.level]
-
-                # If student has a classroom, ensure its grade's level is among managed levels
-                if obj.classroom:
-                    student_level = obj.classroom.grade.level
-                    if not managed_levels or student_level not in managed_levels:
-                        from rest_framework.exceptions import PermissionDenied
-                        raise PermissionDenied("You don't have permission to view this student.")
-            except PermissionDenied:
-                raise
-            except Exception:
-                from rest_framework.exceptions import PermissionDenied
+            from rest_framework.exceptions import PermissionDenied
+            scope = get_user_scope(user)
+            if not scope or not scope.coordinator_id:
                 raise PermissionDenied("Coordinator profile not found.")
+
+            # If student has a classroom, ensure its grade's level is among managed levels
+            if obj.classroom:
+                if not scope.level_ids or obj.classroom.grade.level_id not in scope.level_ids:
+                    raise PermissionDenied("You don't have permission to view this student.")
         
         return obj
     
@@ -223,27 +182,25 @@ class StudentViewSet(viewsets.ModelViewSet):
     
     def destroy(self, request, *args, **kwargs):
         """Override destroy to ensure soft delete is used - NEVER calls default delete"""
-        import logging
-        logger = logging.getLogger(__name__)
         
-        logger.info(f"[DESTROY] destroy() method called for DELETE request")
+        logger.debug("[DESTROY] destroy() method called for DELETE request")
         
         # Get the instance
         instance = self.get_object()
         student_id = instance.id
         student_name = instance.name
         
-        logger.info(f"[DESTROY] Got student instance: ID={student_id}, Name={student_name}, is_deleted={instance.is_deleted}")
+        logger.debug("[DESTROY] Got student instance: ID=%s, Name=%s, is_deleted=%s", student_id, student_name, instance.is_deleted)
         
         # Check if already deleted
         if instance.is_deleted:
-            logger.warning(f"[DESTROY] Student {student_id} is already soft deleted")
+            logger.warning("[DESTROY] Student %s is already soft deleted", student_id)
             from rest_framework.exceptions import NotFound
             raise NotFound("Student is already deleted.")
         
         # IMPORTANT: Call perform_destroy which does soft delete
         # DO NOT call super().destroy() as it would do hard delete
-        logger.info(f"[DESTROY] Calling perform_destroy() for soft delete")
+        logger.debug("[DESTROY] Calling perform_destroy() for soft delete")
         self.perform_destroy(instance)
         
         # Verify the student still exists in database (soft deleted, not hard deleted)
@@ -252,20 +209,20 @@ class StudentViewSet(viewsets.ModelViewSet):
             # Use with_deleted() to check if student exists (even if soft deleted)
             still_exists = Student.objects.with_deleted().filter(pk=student_id).exists()
             if not still_exists:
-                logger.error(f"[DESTROY] CRITICAL: Student {student_id} was HARD DELETED! This should not happen!")
+                logger.error("[DESTROY] CRITICAL: Student %s was HARD DELETED! This should not happen!", student_id)
                 raise Exception(f"CRITICAL ERROR: Student {student_id} was permanently deleted instead of soft deleted!")
             else:
                 # Check if it's soft deleted
                 student_check = Student.objects.with_deleted().get(pk=student_id)
                 if student_check.is_deleted:
-                    logger.info(f"[DESTROY] SUCCESS: Student {student_id} is soft deleted (is_deleted=True)")
+                    logger.debug("[DESTROY] SUCCESS: Student %s is soft deleted (is_deleted=True)", student_id)
                 else:
-                    logger.error(f"[DESTROY] ERROR: Student {student_id} exists but is_deleted is False!")
+                    logger.error("[DESTROY] ERROR: Student %s exists but is_deleted is False!", student_id)
         except Student.DoesNotExist:
-            logger.error(f"[DESTROY] CRITICAL: Student {student_id} does not exist in database - was HARD DELETED!")
+            logger.error("[DESTROY] CRITICAL: Student %s does not exist in database - was HARD DELETED!", student_id)
             raise Exception(f"CRITICAL ERROR: Student {student_id} was permanently deleted!")
         
-        logger.info(f"[DESTROY] destroy() completed successfully")
+        logger.debug("[DESTROY] destroy() completed successfully")
         return Response(status=status.HTTP_204_NO_CONTENT)
     
     def perform_destroy(self, instance):
@@ -285,29 +242,27 @@ class StudentViewSet(viewsets.ModelViewSet):
         instance._actor = user
         
         # Log before soft delete
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.info(f"[SOFT_DELETE] Starting soft delete for student ID: {student_id}, Name: {student_name}")
-        logger.info(f"[SOFT_DELETE] Student is_deleted before: {instance.is_deleted}")
+        logger.debug("[SOFT_DELETE] Starting soft delete for student ID: %s, Name: %s", student_id, student_name)
+        logger.debug("[SOFT_DELETE] Student is_deleted before: %s", instance.is_deleted)
         
         # Soft delete the student (instead of hard delete)
         # This uses update() to directly modify database, does NOT call .delete()
         # This ensures no post_delete signal is triggered
         try:
             instance.soft_delete()
-            logger.info(f"[SOFT_DELETE] soft_delete() method called successfully")
+            logger.debug("[SOFT_DELETE] soft_delete() method called successfully")
             
             # Verify soft delete worked
             instance.refresh_from_db()
-            logger.info(f"[SOFT_DELETE] Student is_deleted after refresh: {instance.is_deleted}")
+            logger.debug("[SOFT_DELETE] Student is_deleted after refresh: %s", instance.is_deleted)
             
             if not instance.is_deleted:
-                logger.error(f"[SOFT_DELETE] CRITICAL ERROR: Soft delete failed! Student {student_id} is_deleted is still False!")
+                logger.error("[SOFT_DELETE] CRITICAL ERROR: Soft delete failed! Student %s is_deleted is still False!", student_id)
                 raise Exception(f"Soft delete failed for student {student_id} - is_deleted is still False after soft_delete() call")
             
-            logger.info(f"[SOFT_DELETE] Soft delete successful for student {student_id}")
+            logger.debug("[SOFT_DELETE] Soft delete successful for student %s", student_id)
         except Exception as e:
-            logger.error(f"[SOFT_DELETE] ERROR during soft_delete(): {str(e)}")
+            logger.error("[SOFT_DELETE] ERROR during soft_delete(): %s", e)
             raise
         
         # Create audit log after soft deletion
@@ -325,9 +280,7 @@ class StudentViewSet(viewsets.ModelViewSet):
             )
         except Exception as e:
             # Log error but don't fail the deletion
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"Failed to create audit log for student deletion: {str(e)}")
+            logger.error("Failed to create audit log for student deletion: %s", e)
 
     @action(detail=False, methods=["get"])
     def total(self, request):
@@ -565,79 +518,23 @@ class StudentViewSet(viewsets.ModelViewSet):
         - Dashboard filters should show clean, canonical labels:
           "Nursery", "KG-I", "KG-II", "Grade 1" .. "Grade 10", "Special Class".
 
-        We aggregate counts by a normalized label so that:
+        Counts are grouped by the stored canonical grade_key (one GROUP BY) and
+        mapped to labels, so that:
         - Filters look clean
         - Selecting "Grade 1" in the frontend still works (StudentFilter.current_grade
           already accepts both roman and numeric variations).
         """
         queryset = self.filter_queryset(self.get_queryset())
 
-        grade_rows = queryset.values('current_grade').annotate(
+        grade_rows = queryset.order_by().values('grade_key', unkeyed_grade=UNKEYED_GRADE).annotate(
             count=Count('id')
-        ).order_by('current_grade')
-
-        def normalize_grade_label(raw: str) -> str:
-            if not raw:
-                return "Unknown Grade"
-
-            value = (raw or "").strip()
-            lower = value.lower()
-
-            # Direct mappings for pre-primary / special
-            if 'nursery' in lower:
-                return 'Nursery'
-            if 'special' in lower:
-                return 'Special Class'
+        )
 
-            # Roman ↔ number helpers
-            roman_to_num = {
-                'i': '1', 'ii': '2', 'iii': '3', 'iv': '4', 'v': '5',
-                'vi': '6', 'vii': '7', 'viii': '8', 'ix': '9', 'x': '10',
-            }
-            num_to_roman = {v: k.upper() for k, v in roman_to_num.items()}
-
-            import re
-
-            # KG grades
-            if 'kg' in lower:
-                match = re.search(r'kg[-_\s]?([ivx\d]+)', lower)
-                if match:
-                    token = match.group(1)
-                    # token can be roman or number
-                    if token in roman_to_num:
-                        num = roman_to_num[token]
-                    else:
-                        num = token
-                    # Canonical: KG-I, KG-II
-                    if num in num_to_roman:
-                        roman = num_to_roman[num]
-                        return f"KG-{roman}"
-                    return f"KG-{num}"
-                return "KG-I"
-
-            # Regular grades
-            if 'grade' in lower:
-                match = re.search(r'grade[-_\s]*([ivx\d]+)', lower)
-                if match:
-                    token = match.group(1)
-                    if token in roman_to_num:
-                        num = roman_to_num[token]
-                    else:
-                        num = token
-                    # Canonical: Grade 1 .. Grade 10
-                    return f"Grade {num}"
-                # Fallback: just "Grade"
-                return "Grade"
-
-            # Fallback: keep original capitalization but trim
-            return value
-
-        # Aggregate counts per normalized label
+        # Aggregate counts per label (unrecognized spellings may share one)
         aggregated: dict[str, int] = {}
         for row in grade_rows:
-            raw_grade = row['current_grade']
             count = row['count'] or 0
-            label = normalize_grade_label(raw_grade)
+            label = grade_group_label(row['grade_key'], row['unkeyed_grade'])
             aggregated[label] = aggregated.get(label, 0) + count
 
         # Build response sorted by label (simple, readable order)
@@ -827,6 +724,129 @@ class StudentViewSet(viewsets.ModelViewSet):
         
         return Response(data)
 
+    def _dashboard_stats_cache_key(self, request):
+        """Cache key per role scope + filter params, under the student stats generation."""
+        generation = get_generation(STUDENT_STATS_CACHE_NAMESPACE)
+        if generation is None:
+            return None
+        user = request.user
+        scope = get_user_scope(user)
+        scope_ids = ','.join(str(cid) for cid in sorted(scope.classroom_ids)) if scope else ''
+        params = '&'.join(f'{key}={values}' for key, values in sorted(request.query_params.lists()))
+        digest = hashlib.sha1(f'{user.role}|{user.campus_id}|{scope_ids}|{params}'.encode()).hexdigest()
+        return f'{STUDENT_STATS_CACHE_NAMESPACE}:{generation}:{digest}'
+
+    @staticmethod
+    def _compute_dashboard_stats(queryset):
+        """
+        Build every dashboard distribution from one conditional aggregate for
+        the fixed categories plus one small GROUP BY per dimension, so each
+        result set is bounded by that dimension's distinct values.
+        Output shapes match the individual stats actions.
+        """
+        from collections import Counter
+        from django.db.models.functions import ExtractYear
+
+        totals = queryset.aggregate(
+            total=Count('id'),
+            male=Count('id', filter=Q(gender='male')),
+            female=Count('id', filter=Q(gender='female')),
+            other=Count('id', filter=Q(gender__isnull=True) | Q(gender='other')),
+            house_owned=Count('id', filter=Q(house_owned=True)),
+        )
+
+        def grouped(*fields, **expressions):
+            return queryset.order_by().values(*fields, **expressions).annotate(count=Count('id'))
+
+        def counts(field):
+            return Counter({row[field]: row['count'] for row in grouped(field)})
+
+        campuses = Counter()
+        for row in grouped('campus__campus_name'):
+            campuses[row['campus__campus_name'] or 'Unknown Campus'] += row['count']
+        grades = Counter()
+        for row in grouped('grade_key', unkeyed_grade=UNKEYED_GRADE):
+            grades[grade_group_label(row['grade_key'], row['unkeyed_grade'])] += row['count']
+        birth_years = Counter({
+            row['birth_year']: row['count']
+            for row in grouped(birth_year=ExtractYear('dob'))
+            if row['birth_year']
+        })
+        years = counts('enrollment_year')
+        tongues = counts('mother_tongue')
+        religions = counts('religion')
+        zakat = counts('zakat_status')
+
+        def by_count(counter):
+            return sorted(counter.items(), key=lambda item: -item[1])
+
+        current_year = 2025  # Current academic year (matches age_distribution)
+        house_rented = totals['total'] - totals['house_owned']
+        return {
+            'totalStudents': totals['total'],
+            'gender_stats': {
+                'male': totals['male'],
+                'female': totals['female'],
+                'other': totals['other'],
+            },
+            'campus_stats': [{'campus': name, 'count': count} for name, count in by_count(campuses)],
+            'grade_distribution': [
+                {'grade': label, 'count': count} for label, count in sorted(grades.items())
+            ],
+            'enrollment_trend': [
+                {'year': str(year or 2025), 'count': years[year]}
+                for year in sorted(years, key=lambda y: (y is None, y or 0))
+            ],
+            'mother_tongue_distribution': [
+                {'name': tongue or 'Unknown', 'value': count} for tongue, count in by_count(tongues)
+            ],
+            'religion_distribution': [
+                {'name': religion or 'Unknown', 'value': count} for religion, count in by_count(religions)
+            ],
+            'age_distribution': [
+                {'age': current_year - year, 'count': birth_years[year]}
+                for year in sorted(birth_years)
+                if 0 < current_year - year < 25
+            ],
+            'zakat_status': [
+                {'status': status or 'Unknown', 'count': count} for status, count in by_count(zakat)
+            ],
+            'house_ownership': [
+                {'status': status, 'count': count}
+                for status, count in sorted(
+                    [('Owned', totals['house_owned']), ('Rented', house_rented)],
+                    key=lambda item: -item[1],
+                )
+                if count
+            ],
+        }
+
+    @action(detail=False, methods=['get'], url_path='dashboard_stats')
+    def dashboard_stats(self, request):
+        """
+        All dashboard statistics in one response. Respects role scoping and
+        StudentFilter params; cached per (role scope, filter params) and
+        invalidated whenever a student is saved or deleted.
+        """
+        cache_key = self._dashboard_stats_cache_key(request)
+        if cache_key:
+            try:
+                cached = cache.get(cache_key)
+            except Exception:
+                cached = None
+            if cached is not None:
+                return Response(cached)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        data = self._compute_dashboard_stats(queryset)
+
+        if cache_key:
+            try:
+                cache.set(cache_key, data, getattr(settings, 'STUDENT_STATS_CACHE_TIMEOUT', 300))
+            except Exception:
+                pass
+        return Response(data)
+
     @action(detail=True, methods=['post'], url_path='upload-photo')
     def upload_photo(self, request, pk=None):
         """Upload or replace a student's profile photo.
@@ -0,0 +1,79 @@
+"""
+Teacher to coordinator matching rules.
+
+Shared by Teacher.save(), the teacher post_save signals and the bulk CSV
+import, so a teacher saved one at a time and a teacher bulk-created by
+populate_teachers_from_csv end up with the same coordinators.
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+
+# Map level names to grade patterns
+LEVEL_CLASS_PATTERNS = {
+    'Pre-Primary': ['nursery', 'kg-1', 'kg-2', 'kg1', 'kg2', 'kg-i', 'kg-ii', 'pre-primary', 'pre primary'],
+    'Primary': ['grade 1', 'grade 2', 'grade 3', 'grade 4', 'grade 5', 'grade-1', 'grade-2', 'grade-3', 'grade-4', 'grade-5', 'primary'],
+    'Secondary': ['grade 6', 'grade 7', 'grade 8', 'grade 9', 'grade 10', 'grade-6', 'grade-7', 'grade-8', 'grade-9', 'grade-10', 'secondary']
+}
+
+
+def classes_taught_match_levels(classes_text, level_names) -> bool:
+    """Check free-text classes taught against the grade patterns of the given level names"""
+    classes_text = (classes_text or '').lower()
+    if not classes_text:
+        return False
+    for level_name in level_names:
+        patterns = LEVEL_CLASS_PATTERNS.get(level_name, [])
+        if any(pattern in classes_text for pattern in patterns):
+            return True
+    return False
+
+
+def managed_levels(coordinator) -> list:
+    """Levels a coordinator manages: assigned_levels for 'both' shift, else its single level"""
+    if coordinator.shift == 'both' and coordinator.assigned_levels.exists():
+        return list(coordinator.assigned_levels.all())
+    if coordinator.level:
+        return [coordinator.level]
+    return []
+
+
+def active_coordinators(campus):
+    """Active coordinators of ``campus`` in primary key order, as ``.first()`` picks them"""
+    from coordinator.models import Coordinator
+
+    return Coordinator.objects.filter(campus=campus, is_currently_active=True).order_by('pk')
+
+
+def coordinators_by_level(coordinators: Iterable) -> dict:
+    """The first coordinator per level id"""
+    by_level = {}
+    for coordinator in coordinators:
+        if coordinator.level_id:
+            by_level.setdefault(coordinator.level_id, coordinator)
+    return by_level
+
+
+def campus_grades(campus) -> list:
+    """Grades of ``campus`` in primary key order, for level_ids_from_classes"""
+    from classes.models import Grade
+
+    return list(Grade.objects.filter(level__campus=campus).select_related('level').order_by('pk'))
+
+
+def level_ids_from_classes(classes_text, grades: Iterable) -> set:
+    """
+    Level ids of the grades named in free-text classes taught. Each name
+    resolves to the first grade whose name contains it (case-insensitive),
+    like ``Grade.objects.filter(name__icontains=...).first()``.
+    """
+    from .models import Teacher
+
+    grades = list(grades)
+    level_ids = set()
+    for grade_name in Teacher.grade_names_from_classes(classes_text):
+        grade = next((g for g in grades if grade_name.lower() in g.name.lower()), None)
+        if grade and grade.level_id:
+            level_ids.add(grade.level_id)
+    return level_ids
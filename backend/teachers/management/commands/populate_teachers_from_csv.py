@@ -1,19 +1,25 @@
 import csv
 import os
+import threading
 from datetime import datetime, date
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
+from django.db.models import Q
 from django.utils.dateparse import parse_date
 from teachers.models import Teacher
 from campus.models import Campus
 from classes.models import Grade, ClassRoom
 from users.models import User
+from utils.bulk_import import ClassroomLookup, Throughput, iter_csv_chunks, run_chunks
 import re
 
 
 class Command(BaseCommand):
     help = 'Populate teachers data from CSV file with classroom assignments'
 
+    # Set in bulk mode so classrooms resolve from memory instead of per-row queries
+    classroom_lookup = None
+
     def add_arguments(self, parser):
         parser.add_argument(
             'csv_file_path',
@@ -31,6 +37,18 @@ class Command(BaseCommand):
             action='store_true',
             help='Run without actually saving data (for testing)'
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=0,
+            help='Stream the CSV and bulk insert this many rows per transaction (default: 0, save row by row)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Threads inserting batches and sending credential emails in bulk mode (default: 1)'
+        )
 
     def handle(self, *args, **options):
         csv_file_path = options['csv_file_path']
@@ -57,6 +75,12 @@ class Command(BaseCommand):
         except Campus.DoesNotExist:
             raise CommandError(f'Campus not found with code: {campus_code}')
 
+        if options['batch_size'] > 0:
+            self.handle_bulk(csv_file_path, campus, options['batch_size'], max(options['workers'], 1), dry_run)
+            return
+
+        throughput = Throughput()
+
         # Read CSV file
         teachers_data = []
         try:
@@ -93,6 +117,7 @@ class Command(BaseCommand):
                     )
                 
                 success_count += 1
+                throughput.add(1)
                 
             except Exception as e:
                 error_count += 1
@@ -108,7 +133,10 @@ class Command(BaseCommand):
         self.stdout.write(f'Total rows processed: {len(teachers_data)}')
         self.stdout.write(f'Successfully processed: {success_count}')
         self.stdout.write(f'Errors: {error_count}')
-        
+        self.stdout.write(f'Throughput: {throughput}')
+        self.write_footer(errors, success_count, dry_run)
+
+    def write_footer(self, errors, success_count, dry_run):
         if errors:
             self.stdout.write('\nERRORS:')
             for error in errors:
@@ -119,6 +147,244 @@ class Command(BaseCommand):
         else:
             self.stdout.write(self.style.SUCCESS(f'\n✅ Successfully processed {success_count} teachers'))
 
+    def handle_bulk(self, csv_file_path, campus, batch_size, workers, dry_run):
+        """
+        Streaming import: rows are parsed in chunks of ``batch_size``,
+        classrooms come from a lookup loaded once, employee numbers are
+        reserved one block per chunk and each chunk is a single bulk_create.
+        bulk_create sends no post_save signals; user accounts, class teacher
+        and coordinator links are made afterwards by link_imported_teachers().
+        """
+        self.stdout.write(f'📦 Bulk mode: batch size {batch_size}, {workers} worker(s)')
+        if dry_run:
+            self.stdout.write(self.style.WARNING('DRY RUN MODE - No data will be saved'))
+
+        self.classroom_lookup = ClassroomLookup(campus)
+        self.stdout.write(f'🏫 Loaded {len(self.classroom_lookup.rooms)} classrooms')
+
+        throughput = Throughput()
+        errors = []
+        imported_ids = []
+        counts = {'rows': 0, 'created': 0}
+
+        # Unique columns claimed so far; checked under the lock so parallel
+        # chunks never insert the same email, CNIC or classroom twice
+        claim_lock = threading.Lock()
+        seen_emails, seen_cnics = set(), set()
+        claimed_classrooms = set(
+            Teacher.objects.with_deleted()
+            .filter(assigned_classroom__in=[room.id for room in self.classroom_lookup.rooms])
+            .values_list('assigned_classroom_id', flat=True)
+        )
+
+        def import_chunk(chunk):
+            parsed = []
+            chunk_errors = []
+            for row_num, row in chunk:
+                try:
+                    teacher = self.process_teacher_data(row, campus, row_num)
+                    # Mirrors the pre_save signal: class teacher iff a classroom is assigned
+                    teacher.is_class_teacher = bool(teacher.assigned_classroom_id)
+                    parsed.append((row_num, teacher))
+                except Exception as e:
+                    chunk_errors.append(f'Row {row_num}: {str(e)}')
+
+            existing = Teacher.objects.with_deleted().filter(
+                Q(email__in=[t.email for _, t in parsed]) | Q(cnic__in=[t.cnic for _, t in parsed])
+            ).values_list('email', 'cnic')
+            taken_emails = {email for email, _ in existing}
+            taken_cnics = {cnic for _, cnic in existing}
+
+            teachers = []
+            with claim_lock:
+                for row_num, teacher in parsed:
+                    if teacher.email in taken_emails or teacher.email in seen_emails:
+                        chunk_errors.append(f'Row {row_num}: Teacher with email {teacher.email} already exists')
+                    elif teacher.cnic in taken_cnics or teacher.cnic in seen_cnics:
+                        chunk_errors.append(f'Row {row_num}: Teacher with CNIC {teacher.cnic} already exists')
+                    elif teacher.assigned_classroom_id and teacher.assigned_classroom_id in claimed_classrooms:
+                        chunk_errors.append(f'Row {row_num}: Classroom {teacher.assigned_classroom} already has a class teacher')
+                    else:
+                        seen_emails.add(teacher.email)
+                        seen_cnics.add(teacher.cnic)
+                        if teacher.assigned_classroom_id:
+                            claimed_classrooms.add(teacher.assigned_classroom_id)
+                        teachers.append(teacher)
+
+            if teachers and not dry_run:
+                try:
+                    self.assign_employee_codes(teachers, campus)
+                    with transaction.atomic():
+                        Teacher.objects.bulk_create(teachers, batch_size=len(teachers))
+                except Exception as e:
+                    first, last = chunk[0][0], chunk[-1][0]
+                    chunk_errors.append(f'Rows {first}-{last}: batch failed, nothing saved: {str(e)}')
+                    teachers = []
+            return len(chunk), teachers, chunk_errors
+
+        def collect(result):
+            rows, teachers, chunk_errors = result
+            counts['rows'] += rows
+            counts['created'] += len(teachers)
+            imported_ids.extend(t.id for t in teachers)
+            errors.extend(chunk_errors)
+            throughput.add(len(teachers))
+            self.stdout.write(f'✅ {counts["rows"]} rows processed ({throughput})')
+
+        try:
+            run_chunks(iter_csv_chunks(csv_file_path, batch_size), import_chunk, workers, collect)
+        except (OSError, csv.Error, UnicodeDecodeError) as e:
+            raise CommandError(f'Error reading CSV file: {str(e)}')
+
+        if not dry_run and imported_ids:
+            self.link_imported_teachers(imported_ids, campus, batch_size, workers)
+
+        self.stdout.write('\n' + '='*50)
+        self.stdout.write('SUMMARY:')
+        self.stdout.write(f'Total rows processed: {counts["rows"]}')
+        self.stdout.write(f'Successfully processed: {counts["created"]}')
+        self.stdout.write(f'Errors: {len(errors)}')
+        self.stdout.write(f'Throughput: {throughput}')
+        self.write_footer(errors, counts['created'], dry_run)
+
+    def assign_employee_codes(self, teachers, campus):
+        """Set employee codes like Teacher.save(), from one reserved number block"""
+        from utils.id_generator import IDGenerator
+
+        pending = [t for t in teachers if not t.employee_code]
+        for teacher, number in zip(pending, IDGenerator.reserve_employee_numbers('teacher', len(pending))):
+            teacher.employee_code = IDGenerator.format_employee_code(
+                campus.campus_code, teacher.shift or 'morning', IDGenerator.joining_year(teacher.joining_date),
+                'teacher', number
+            )
+
+    def link_imported_teachers(self, teacher_ids, campus, batch_size, workers):
+        """
+        Post-import pass replacing the per-teacher post_save work: create or
+        link user accounts, set classroom class teachers and assign
+        coordinators, each with a fixed number of queries.
+        """
+        from users.profile import invalidate_user_profiles
+        from users.scope import invalidate_user_scopes
+
+        teachers = list(
+            Teacher.objects.filter(id__in=teacher_ids)
+            .select_related('assigned_classroom__grade')
+        )
+        new_users = self.create_teacher_users(teachers, campus)
+        self.send_credentials_emails(new_users, batch_size, workers)
+
+        classrooms = []
+        for teacher in teachers:
+            if teacher.assigned_classroom_id:
+                teacher.assigned_classroom.class_teacher = teacher
+                classrooms.append(teacher.assigned_classroom)
+        ClassRoom.objects.bulk_update(classrooms, ['class_teacher'], batch_size=batch_size)
+        self.stdout.write(f'🔗 Set class teacher on {len(classrooms)} classrooms')
+
+        links = self.assign_teacher_coordinators(teachers, campus)
+        self.stdout.write(f'🔗 Added {links} teacher-coordinator links')
+
+        invalidate_user_scopes()
+        invalidate_user_profiles()
+
+    def create_teacher_users(self, teachers, campus):
+        """Create missing teacher accounts in bulk and link every teacher to its user"""
+        from django.contrib.auth.hashers import make_password
+        from services.user_creation_service import UserCreationService
+
+        by_email = {}
+        for user in User.objects.filter(email__in=[t.email for t in teachers]).select_related('teacher_profile'):
+            by_email[user.email] = user
+        taken_usernames = set(
+            User.objects.filter(username__in=[t.employee_code for t in teachers]).values_list('username', flat=True)
+        )
+
+        # Hashing is deliberately slow; every new account gets the same default password
+        password = make_password(UserCreationService.DEFAULT_PASSWORD)
+        linked, new_users, pending = [], [], []
+        for teacher in teachers:
+            user = by_email.get(teacher.email)
+            if user:
+                if not hasattr(user, 'teacher_profile'):
+                    teacher.user = user
+                    linked.append(teacher)
+                continue
+            is_valid, message = UserCreationService.validate_entity_data(teacher, 'teacher')
+            if not is_valid or not teacher.employee_code or teacher.employee_code in taken_usernames:
+                self.stdout.write(f"⚠️ No user created for {teacher.full_name}: {message if not is_valid else 'username unavailable'}")
+                continue
+            new_users.append(UserCreationService.build_user(teacher, 'teacher', teacher.employee_code, campus, password))
+            pending.append(teacher)
+
+        with transaction.atomic():
+            User.objects.bulk_create(new_users)
+            for teacher, user in zip(pending, new_users):
+                teacher.user = user
+            Teacher.objects.bulk_update(linked + pending, ['user'])
+
+        self.stdout.write(f'👤 Created {len(new_users)} users, linked {len(linked)} existing users')
+        return [(user, teacher.employee_code) for teacher, user in zip(pending, new_users)]
+
+    def send_credentials_emails(self, new_users, batch_size, workers):
+        from services.email_notification_service import EmailNotificationService
+
+        def send_chunk(chunk):
+            failed = 0
+            for user, employee_code in chunk:
+                sent, _ = EmailNotificationService.send_credentials_email(user, employee_code, 'teacher')
+                failed += 0 if sent else 1
+            return failed
+
+        failures = []
+        chunks = (new_users[i:i + batch_size] for i in range(0, len(new_users), batch_size))
+        run_chunks(chunks, send_chunk, workers, failures.append)
+        if sum(failures):
+            self.stdout.write(f'⚠️ {sum(failures)} credential emails could not be sent')
+
+    def assign_teacher_coordinators(self, teachers, campus):
+        """
+        Coordinator links that Teacher.save() and the post_save signal would
+        add: the classroom level's coordinator (or the levels named in classes
+        taught), plus every coordinator whose levels match the classes taught.
+        """
+        from teachers.coordinator_links import (
+            active_coordinators, campus_grades, classes_taught_match_levels, coordinators_by_level,
+            level_ids_from_classes, managed_levels,
+        )
+
+        coordinators = list(
+            active_coordinators(campus).select_related('level').prefetch_related('assigned_levels')
+        )
+        grades = campus_grades(campus)
+        levels_with_grades = {grade.level_id for grade in grades}
+        level_coordinator = coordinators_by_level(coordinators)
+        managed_level_names = {}
+        for coordinator in coordinators:
+            levels = managed_levels(coordinator)
+            if any(level.id in levels_with_grades for level in levels):
+                managed_level_names[coordinator.id] = [level.name for level in levels]
+
+        Through = Teacher.assigned_coordinators.through
+        links = set()
+        for teacher in teachers:
+            if teacher.assigned_classroom_id:
+                level_ids = {teacher.assigned_classroom.grade.level_id}
+            else:
+                level_ids = level_ids_from_classes(teacher.current_classes_taught, grades)
+            for level_id in level_ids:
+                if level_id in level_coordinator:
+                    links.add((teacher.id, level_coordinator[level_id].id))
+            for coordinator_id, level_names in managed_level_names.items():
+                if classes_taught_match_levels(teacher.current_classes_taught, level_names):
+                    links.add((teacher.id, coordinator_id))
+
+        Through.objects.bulk_create(
+            [Through(teacher_id=teacher_id, coordinator_id=coordinator_id) for teacher_id, coordinator_id in links],
+            ignore_conflicts=True
+        )
+        return len(links)
+
     def process_teacher_data(self, data, campus, row_num):
         """Process individual teacher data and create Teacher object"""
         
@@ -302,6 +568,14 @@ class Command(BaseCommand):
             
             # Convert grade name to Roman numeral format
             mapped_grade_name = grade_mapping.get(grade_name, grade_name)
+
+            if self.classroom_lookup is not None:
+                classroom = self.classroom_lookup.get(mapped_grade_name, section, shift)
+                if not classroom:
+                    self.stdout.write(f"⚠️ Classroom not found: {grade_name}-{section} for {shift} shift")
+                    return
+                teacher.assigned_classroom = classroom
+                return
             
             # Find the grade
             grade = Grade.objects.filter(
@@ -2,6 +2,9 @@ from django.db import models
 from django.utils import timezone
 from campus.models import Campus
 from users.models import User
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Choices
 GENDER_CHOICES = [
@@ -210,23 +213,14 @@ class Teacher(models.Model):
             try:
                 shift = self.shift if self.shift else 'morning'
                 
-                if self.joining_date:
-                    if isinstance(self.joining_date, str):
-                        from datetime import datetime
-                        joining_date = datetime.strptime(self.joining_date, '%Y-%m-%d').date()
-                        year = joining_date.year
-                    else:
-                        year = self.joining_date.year
-                else:
-                    year = 2025
-                
                 # Generate employee code using IDGenerator
                 from utils.id_generator import IDGenerator
+                year = IDGenerator.joining_year(self.joining_date)
                 self.employee_code = IDGenerator.generate_unique_employee_code(
                     self.current_campus, shift, year, 'teacher'
                 )
             except Exception as e:
-                print(f"Error generating employee code: {str(e)}")
+                logger.warning("Error generating employee code: %s", e)
         
         # FIX: Auto-set class teacher status when classrooms are assigned
         has_classrooms = (self.assigned_classroom or 
@@ -234,10 +228,10 @@ class Teacher(models.Model):
         
         if has_classrooms and not self.is_class_teacher:
             self.is_class_teacher = True
-            print(f"Setting {self.full_name} as class teacher")
+            logger.debug("Setting %s as class teacher", self.full_name)
         elif not has_classrooms and self.is_class_teacher:
             self.is_class_teacher = False
-            print(f"Removing class teacher status from {self.full_name}")
+            logger.debug("Removing class teacher status from %s", self.full_name)
         
         # Save first to get ID for ManyToMany operations
         is_new = self.pk is None
@@ -258,120 +252,103 @@ class Teacher(models.Model):
     def _assign_coordinators_from_classroom(self):
         """Assign coordinator from assigned classroom"""
         try:
-            from coordinator.models import Coordinator
+            from .coordinator_links import active_coordinators, coordinators_by_level
             classroom = self.assigned_classroom
             if classroom.grade and classroom.grade.level:
                 level = classroom.grade.level
-                coordinator = Coordinator.objects.filter(
-                    level=level,
-                    campus=self.current_campus,
-                    is_currently_active=True
-                ).first()
+                coordinator = coordinators_by_level(active_coordinators(self.current_campus)).get(level.id)
                 
                 if coordinator:
                     # Add coordinator (not replace)
                     if coordinator not in self.assigned_coordinators.all():
                         self.assigned_coordinators.add(coordinator)
-                        print(f"[OK] Added coordinator {coordinator.full_name} for level {level.name}")
+                        logger.debug("Added coordinator %s for level %s", coordinator.full_name, level.name)
                 else:
-                    print(f"[WARN] No coordinator for level {level.name}")
+                    logger.warning("No coordinator for level %s", level.name)
         except Exception as e:
-            print(f"Error: {str(e)}")
+            logger.warning("Error: %s", e)
 
     def _assign_coordinators_from_classrooms(self):
         """Assign coordinators from all assigned classrooms"""
         try:
-            from coordinator.models import Coordinator
+            from .coordinator_links import active_coordinators, coordinators_by_level
             
             # Clear existing coordinators
             self.assigned_coordinators.clear()
             
             # Get coordinators for all assigned classrooms
-            for classroom in self.assigned_classrooms.all():
+            by_level = coordinators_by_level(active_coordinators(self.current_campus))
+            for classroom in self.assigned_classrooms.select_related('grade__level'):
                 if classroom.grade and classroom.grade.level:
                     level = classroom.grade.level
-                    coordinator = Coordinator.objects.filter(
-                        level=level,
-                        campus=self.current_campus,
-                        is_currently_active=True
-                    ).first()
+                    coordinator = by_level.get(level.id)
                     
                     if coordinator and coordinator not in self.assigned_coordinators.all():
                         self.assigned_coordinators.add(coordinator)
-                        print(f"[OK] Added coordinator {coordinator.full_name} for level {level.name}")
-            
-            print(f"[OK] Assigned {self.assigned_coordinators.count()} coordinators to {self.full_name}")
+                        logger.debug("Added coordinator %s for level %s", coordinator.full_name, level.name)
             
         except Exception as e:
-            print(f"Error: {str(e)}")
+            logger.warning("Error: %s", e)
+
+    @staticmethod
+    def grade_names_from_classes(classes_text):
+        """Grade names mentioned in free-text classes taught (e.g. "Grade 4, KG-1")"""
+        import re
+
+        classes_text = (classes_text or '').lower()
+        
+        # Extract ALL grade numbers from text
+        grade_numbers = re.findall(r'grade\s*[-]?\s*(\d+)', classes_text)
+        
+        # Check for pre-primary classes
+        has_nursery = 'nursery' in classes_text
+        has_kg1 = any(term in classes_text for term in ['kg-1', 'kg1', 'kg-i'])
+        has_kg2 = any(term in classes_text for term in ['kg-2', 'kg2', 'kg-ii'])
+        
+        # Build list of grade names
+        grade_names = []
+        if has_nursery:
+            grade_names.append('Nursery')
+        if has_kg1:
+            grade_names.append('KG-I')
+        if has_kg2:
+            grade_names.append('KG-II')
+        for num in grade_numbers:
+            grade_names.append(f"Grade {num}")
+        return grade_names
 
     def _assign_coordinators_from_classes(self):
         """Extract all grades and assign all relevant coordinators"""
         try:
-            from classes.models import Grade
-            from coordinator.models import Coordinator
-            import re
-            
-            classes_text = self.current_classes_taught.lower()
-            
-            # Extract ALL grade numbers from text
-            grade_numbers = re.findall(r'grade\s*[-]?\s*(\d+)', classes_text)
-            
-            # Check for pre-primary classes
-            has_nursery = 'nursery' in classes_text
-            has_kg1 = any(term in classes_text for term in ['kg-1', 'kg1', 'kg-i'])
-            has_kg2 = any(term in classes_text for term in ['kg-2', 'kg2', 'kg-ii'])
-            
-            # Build list of grade names
-            grade_names = []
-            if has_nursery:
-                grade_names.append('Nursery')
-            if has_kg1:
-                grade_names.append('KG-I')
-            if has_kg2:
-                grade_names.append('KG-II')
-            for num in grade_numbers:
-                grade_names.append(f"Grade {num}")
+            from .coordinator_links import (
+                active_coordinators, campus_grades, coordinators_by_level, level_ids_from_classes,
+            )
             
             # Find all unique levels
-            levels = set()
-            for grade_name in grade_names:
-                grade = Grade.objects.filter(
-                    name__icontains=grade_name,
-                    level__campus=self.current_campus
-                ).first()
-                if grade and grade.level:
-                    levels.add(grade.level)
+            level_ids = level_ids_from_classes(self.current_classes_taught, campus_grades(self.current_campus))
             
             # Clear existing coordinators and add new ones
             self.assigned_coordinators.clear()
             
             # Get coordinators for all levels
-            for level in levels:
-                coordinator = Coordinator.objects.filter(
-                    level=level,
-                    campus=self.current_campus,
-                    is_currently_active=True
-                ).first()
+            by_level = coordinators_by_level(active_coordinators(self.current_campus))
+            for level_id in level_ids:
+                coordinator = by_level.get(level_id)
                 
                 if coordinator:
                     self.assigned_coordinators.add(coordinator)
-                    print(f"[OK] Added coordinator {coordinator.full_name} for level {level.name}")
-            
-            print(f"[OK] Assigned {self.assigned_coordinators.count()} coordinators to {self.full_name}")
+                    logger.debug("Added coordinator %s for level %s", coordinator.full_name, level_id)
             
         except Exception as e:
-            print(f"Error: {str(e)}")
+            logger.warning("Error: %s", e)
     
     def soft_delete(self):
         """Soft delete the teacher - uses update() to bypass signals"""
-        import logging
-        logger = logging.getLogger(__name__)
         
         if not self.pk:
             raise ValueError("Cannot soft delete teacher without primary key")
         
-        logger.info(f"[SOFT_DELETE] soft_delete() called for teacher PK: {self.pk}, Name: {self.full_name}")
+        logger.debug("[SOFT_DELETE] soft_delete() called for teacher PK: %s, Name: %s", self.pk, self.full_name)
         
         # Use update() to directly update database without triggering signals
         # This ensures no post_delete or other signals interfere
@@ -382,25 +359,27 @@ class Teacher(models.Model):
             is_currently_active=False
         )
         
-        logger.info(f"[SOFT_DELETE] Database update() returned updated_count: {updated_count}")
+        logger.debug("[SOFT_DELETE] Database update() returned updated_count: %s", updated_count)
         
         if updated_count == 0:
-            logger.error(f"[SOFT_DELETE] CRITICAL: update() returned 0 - no rows were updated! Teacher PK: {self.pk}")
+            logger.error("[SOFT_DELETE] CRITICAL: update() returned 0 - no rows were updated! Teacher PK: %s", self.pk)
             raise Exception(f"Soft delete failed - no rows updated for teacher PK: {self.pk}")
         
         # Refresh instance from database
         self.refresh_from_db()
-        logger.info(f"[SOFT_DELETE] After refresh_from_db(), is_deleted: {self.is_deleted}")
+        logger.debug("[SOFT_DELETE] After refresh_from_db(), is_deleted: %s", self.is_deleted)
+        
+        # update() sends no signals; drop the cached scopes and profiles their receiver would
+        from .signals import invalidate_scopes_on_teacher_change
+        invalidate_scopes_on_teacher_change(sender=Teacher, instance=self)
     
     def restore(self):
         """Restore a soft deleted teacher"""
-        import logging
-        logger = logging.getLogger(__name__)
         
         if not self.pk:
             raise ValueError("Cannot restore teacher without primary key")
         
-        logger.info(f"[RESTORE] restore() called for teacher PK: {self.pk}, Name: {self.full_name}")
+        logger.debug("[RESTORE] restore() called for teacher PK: %s, Name: %s", self.pk, self.full_name)
         
         # Use update() to bypass signals
         updated_count = Teacher.objects.with_deleted().filter(pk=self.pk).update(
@@ -409,24 +388,26 @@ class Teacher(models.Model):
         )
         
         if updated_count == 0:
-            logger.error(f"[RESTORE] CRITICAL: update() returned 0 - no rows were updated! Teacher PK: {self.pk}")
+            logger.error("[RESTORE] CRITICAL: update() returned 0 - no rows were updated! Teacher PK: %s", self.pk)
             raise Exception(f"Restore failed - no rows updated for teacher PK: {self.pk}")
         
         self.refresh_from_db()
-        logger.info(f"[RESTORE] After refresh_from_db(), is_deleted: {self.is_deleted}")
+        logger.debug("[RESTORE] After refresh_from_db(), is_deleted: %s", self.is_deleted)
+        
+        # update() sends no signals; drop the cached scopes and profiles their receiver would
+        from .signals import invalidate_scopes_on_teacher_change
+        invalidate_scopes_on_teacher_change(sender=Teacher, instance=self)
     
     def delete(self, using=None, keep_parents=False):
         """
         Override delete() to prevent accidental hard deletes.
         Always use soft_delete() instead.
         """
-        import logging
-        logger = logging.getLogger(__name__)
         
-        logger.info(f"[OVERRIDE_DELETE] delete() called for teacher PK: {self.pk}, Name: {self.full_name}, is_deleted: {self.is_deleted}")
+        logger.debug("[OVERRIDE_DELETE] delete() called for teacher PK: %s, Name: %s, is_deleted: %s", self.pk, self.full_name, self.is_deleted)
         
         if not self.is_deleted:
-            logger.info(f"[OVERRIDE_DELETE] Calling soft_delete() instead of hard delete")
+            logger.debug("[OVERRIDE_DELETE] Calling soft_delete() instead of hard delete")
             self.soft_delete()
         else:
             raise ValueError(
@@ -435,10 +416,8 @@ class Teacher(models.Model):
     
     def hard_delete(self):
         """Permanently delete the teacher from database"""
-        import logging
-        logger = logging.getLogger(__name__)
         
-        logger.warning(f"[HARD_DELETE] hard_delete() called for teacher PK: {self.pk}, Name: {self.full_name}")
+        logger.warning("[HARD_DELETE] hard_delete() called for teacher PK: %s, Name: %s", self.pk, self.full_name)
         super().delete()
 
     def __str__(self):
@@ -1,10 +1,16 @@
-from django.db.models.signals import post_save, pre_save, post_delete
+from django.db.models.signals import m2m_changed, post_save, pre_save, post_delete
 from django.dispatch import receiver
+from .coordinator_links import active_coordinators, classes_taught_match_levels, managed_levels
 from .models import Teacher
 from services.user_creation_service import UserCreationService
 from users.models import User
+from users.profile import invalidate_user_profiles
+from users.scope import invalidate_user_scopes
 from notifications.services import create_notification
 import sys
+import logging
+
+logger = logging.getLogger(__name__)
 
 def safe_str(obj):
     """Safely convert object to string, handling Unicode encoding errors"""
@@ -23,7 +29,7 @@ def create_teacher_user(sender, instance, created, **kwargs):
             
             # Check if user already exists
             if User.objects.filter(email=instance.email).exists():
-                print(f"User already exists for {instance.full_name}")
+                logger.info("User already exists for %s", instance.full_name)
                 try:
                     existing_user = User.objects.filter(email=instance.email).first()
                     campus_name = getattr(getattr(instance, 'current_campus', None), 'campus_name', '')
@@ -36,9 +42,9 @@ def create_teacher_user(sender, instance, created, **kwargs):
 
             user, message = UserCreationService.create_user_from_entity(instance, 'teacher')
             if not user:
-                print(f"Failed to create user for teacher {instance.id}: {message}")
+                logger.warning("Failed to create user for teacher %s: %s", instance.id, message)
             else:
-                print(f"[OK] Created user for teacher: {instance.full_name} ({instance.employee_code})")
+                logger.info("Created user for teacher: %s (%s)", instance.full_name, instance.employee_code)
                 try:
                     campus_name = getattr(getattr(instance, 'current_campus', None), 'campus_name', '')
                     verb = "You have been added as a Teacher"
@@ -47,7 +53,7 @@ def create_teacher_user(sender, instance, created, **kwargs):
                 except Exception:
                     pass
         except Exception as e:
-            print(f"Error creating user for teacher {instance.id}: {str(e)}")
+            logger.warning("Error creating user for teacher %s: %s", instance.id, e)
 
 @receiver(pre_save, sender=Teacher)
 def update_class_teacher_status(sender, instance, **kwargs):
@@ -69,7 +75,7 @@ def sync_teacher_classroom_assignment(sender, instance, created, **kwargs):
         if classroom.class_teacher != instance:
             classroom.class_teacher = instance
             classroom.save(update_fields=['class_teacher'])
-            print(f"[OK] Synced: Classroom {classroom} assigned teacher {instance.full_name}")
+            logger.info("Synced: Classroom %s assigned teacher %s", classroom, instance.full_name)
     else:
         # Agar teacher se classroom remove kiya gaya hai
         # Pehle check karo ke koi classroom is teacher se assigned hai ya nahi
@@ -78,7 +84,7 @@ def sync_teacher_classroom_assignment(sender, instance, created, **kwargs):
             classroom = ClassRoom.objects.get(class_teacher=instance)
             classroom.class_teacher = None
             classroom.save(update_fields=['class_teacher'])
-            print(f"[OK] Synced: Classroom {classroom} removed teacher {instance.full_name}")
+            logger.info("Synced: Classroom %s removed teacher %s", classroom, instance.full_name)
         except ClassRoom.DoesNotExist:
             pass  # Koi classroom assigned nahi tha
 
@@ -91,13 +97,8 @@ def auto_assign_teacher_to_coordinators(sender, instance, created, **kwargs):
         return
     
     try:
-        from coordinator.models import Coordinator
-        
         # Get all active coordinators for this campus
-        coordinators = Coordinator.objects.filter(
-            campus=instance.current_campus,
-            is_currently_active=True
-        )
+        coordinators = active_coordinators(instance.current_campus)
         
         assigned_count = 0
         for coordinator in coordinators:
@@ -107,13 +108,13 @@ def auto_assign_teacher_to_coordinators(sender, instance, created, **kwargs):
                 if coordinator not in instance.assigned_coordinators.all():
                     instance.assigned_coordinators.add(coordinator)
                     assigned_count += 1
-                    print(f"[OK] Auto-assigned coordinator {coordinator.full_name} to teacher {instance.full_name}")
+                    logger.debug("Auto-assigned coordinator %s to teacher %s", coordinator.full_name, instance.full_name)
         
         if assigned_count > 0:
-            print(f"[OK] Auto-assigned {assigned_count} coordinators to teacher {instance.full_name}")
+            logger.info("Auto-assigned %s coordinators to teacher %s", assigned_count, instance.full_name)
             
     except Exception as e:
-        print(f"Error auto-assigning coordinators to teacher {instance.full_name}: {str(e)}")
+        logger.warning("Error auto-assigning coordinators to teacher %s: %s", instance.full_name, e)
 
 def teacher_teaches_coordinator_levels(teacher, coordinator):
     """Check if teacher teaches grades in coordinator's managed levels"""
@@ -121,38 +122,17 @@ def teacher_teaches_coordinator_levels(teacher, coordinator):
         return False
     
     # Determine coordinator's managed levels
-    managed_levels = []
-    if coordinator.shift == 'both' and coordinator.assigned_levels.exists():
-        managed_levels = list(coordinator.assigned_levels.all())
-    elif coordinator.level:
-        managed_levels = [coordinator.level]
-    else:
+    levels = managed_levels(coordinator)
+    if not levels:
         return False
     
     # Get grades for these levels
     from classes.models import Grade
-    grades = Grade.objects.filter(level__in=managed_levels)
-    grade_names = [g.name for g in grades]
-    
-    if not grade_names:
+    if not Grade.objects.filter(level__in=levels).exists():
         return False
     
     # Check if teacher teaches any of these grades
-    classes_text = teacher.current_classes_taught.lower()
-    
-    # Map level names to grade patterns
-    level_patterns = {
-        'Pre-Primary': ['nursery', 'kg-1', 'kg-2', 'kg1', 'kg2', 'kg-i', 'kg-ii', 'pre-primary', 'pre primary'],
-        'Primary': ['grade 1', 'grade 2', 'grade 3', 'grade 4', 'grade 5', 'grade-1', 'grade-2', 'grade-3', 'grade-4', 'grade-5', 'primary'],
-        'Secondary': ['grade 6', 'grade 7', 'grade 8', 'grade 9', 'grade 10', 'grade-6', 'grade-7', 'grade-8', 'grade-9', 'grade-10', 'secondary']
-    }
-    
-    for level in managed_levels:
-        patterns = level_patterns.get(level.name, [])
-        if any(pattern in classes_text for pattern in patterns):
-            return True
-    
-    return False
+    return classes_taught_match_levels(teacher.current_classes_taught, [level.name for level in levels])
 
 @receiver(post_save, sender=Teacher)
 def notify_teacher_on_update(sender, instance, created, **kwargs):
@@ -235,17 +215,11 @@ def notify_teacher_on_update(sender, instance, created, **kwargs):
                     target_text=target_text, 
                     data={"teacher_id": instance.id}
                 )
-                print(f"[OK] Sent update notification to teacher {instance.full_name} (user: {teacher_user.email})")
+                logger.info("Sent update notification to teacher %s (user: %s)", instance.full_name, teacher_user.email)
             else:
-                print(f"[WARN] No user found for teacher {instance.full_name} (email: {instance.email}, employee_code: {instance.employee_code})")
+                logger.warning("No user found for teacher %s (email: %s, employee_code: %s)", instance.full_name, instance.email, instance.employee_code)
         except Exception as e:
-            error_msg = safe_str(e)
-            print(f"[ERROR] Error sending update notification to teacher {instance.id}: {error_msg}")
-            import traceback
-            try:
-                traceback.print_exc()
-            except UnicodeEncodeError:
-                print("[ERROR] Could not print traceback due to encoding error")
+            logger.error("Error sending update notification to teacher %s: %s", instance.id, safe_str(e), exc_info=True)
 
 # Cleanup: when a Teacher is deleted, remove matching auth user
 @receiver(post_delete, sender=Teacher)
@@ -274,7 +248,7 @@ def delete_user_when_teacher_deleted(sender, instance: Teacher, **kwargs):
                 target_text=target_text, 
                 data={"teacher_id": instance.id}
             )
-            print(f"[OK] Sent deletion notification to teacher {instance.full_name}")
+            logger.info("Sent deletion notification to teacher %s", instance.full_name)
         
         # Now cleanup user
         if instance.email:
@@ -283,4 +257,13 @@ def delete_user_when_teacher_deleted(sender, instance: Teacher, **kwargs):
             User.objects.filter(username=instance.employee_code).delete()
     except Exception as e:
         error_msg = safe_str(e)
-        print(f"[ERROR] Error in delete_user_when_teacher_deleted: {error_msg}")
\ No newline at end of file
+        logger.error("Error in delete_user_when_teacher_deleted: %s", error_msg)
+
+
+@receiver(post_save, sender=Teacher)
+@receiver(post_delete, sender=Teacher)
+@receiver(m2m_changed, sender=Teacher.assigned_classrooms.through)
+def invalidate_scopes_on_teacher_change(sender, **kwargs):
+    """Teacher classroom assignments feed users.scope and the cached profiles; drop both"""
+    invalidate_user_scopes()
+    invalidate_user_profiles()
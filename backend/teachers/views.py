@@ -8,6 +8,9 @@ from users.permissions import IsSuperAdminOrPrincipal
 from .models import Teacher
 from .serializers import TeacherSerializer
 from .filters import TeacherFilter
+import logging
+
+logger = logging.getLogger(__name__)
 
 class TeacherViewSet(viewsets.ModelViewSet):
     queryset = Teacher.objects.all()
@@ -130,27 +133,25 @@ class TeacherViewSet(viewsets.ModelViewSet):
     
     def destroy(self, request, *args, **kwargs):
         """Override destroy to ensure soft delete is used - NEVER calls default delete"""
-        import logging
-        logger = logging.getLogger(__name__)
         
-        logger.info(f"[DESTROY] destroy() method called for DELETE request")
+        logger.debug("[DESTROY] destroy() method called for DELETE request")
         
         # Get the instance
         instance = self.get_object()
         teacher_id = instance.id
         teacher_name = instance.full_name
         
-        logger.info(f"[DESTROY] Got teacher instance: ID={teacher_id}, Name={teacher_name}, is_deleted={instance.is_deleted}")
+        logger.debug("[DESTROY] Got teacher instance: ID=%s, Name=%s, is_deleted=%s", teacher_id, teacher_name, instance.is_deleted)
         
         # Check if already deleted
         if instance.is_deleted:
-            logger.warning(f"[DESTROY] Teacher {teacher_id} is already soft deleted")
+            logger.warning("[DESTROY] Teacher %s is already soft deleted", teacher_id)
             from rest_framework.exceptions import NotFound
             raise NotFound("Teacher is already deleted.")
         
         # IMPORTANT: Call perform_destroy which does soft delete
         # DO NOT call super().destroy() as it would do hard delete
-        logger.info(f"[DESTROY] Calling perform_destroy() for soft delete")
+        logger.debug("[DESTROY] Calling perform_destroy() for soft delete")
         self.perform_destroy(instance)
         
         # Verify the teacher still exists in database (soft deleted, not hard deleted)
@@ -159,28 +160,26 @@ class TeacherViewSet(viewsets.ModelViewSet):
             # Use with_deleted() to check if teacher exists (even if soft deleted)
             still_exists = Teacher.objects.with_deleted().filter(pk=teacher_id).exists()
             if not still_exists:
-                logger.error(f"[DESTROY] CRITICAL: Teacher {teacher_id} was HARD DELETED! This should not happen!")
+                logger.error("[DESTROY] CRITICAL: Teacher %s was HARD DELETED! This should not happen!", teacher_id)
                 raise Exception(f"CRITICAL ERROR: Teacher {teacher_id} was permanently deleted instead of soft deleted!")
             else:
                 # Check if it's soft deleted
                 teacher_check = Teacher.objects.with_deleted().get(pk=teacher_id)
                 if teacher_check.is_deleted:
-                    logger.info(f"[DESTROY] SUCCESS: Teacher {teacher_id} is soft deleted (is_deleted=True)")
+                    logger.debug("[DESTROY] SUCCESS: Teacher %s is soft deleted (is_deleted=True)", teacher_id)
                 else:
-                    logger.error(f"[DESTROY] ERROR: Teacher {teacher_id} exists but is_deleted is False!")
+                    logger.error("[DESTROY] ERROR: Teacher %s exists but is_deleted is False!", teacher_id)
         except Teacher.DoesNotExist:
-            logger.error(f"[DESTROY] CRITICAL: Teacher {teacher_id} does not exist in database - was HARD DELETED!")
+            logger.error("[DESTROY] CRITICAL: Teacher %s does not exist in database - was HARD DELETED!", teacher_id)
             raise Exception(f"CRITICAL ERROR: Teacher {teacher_id} was permanently deleted!")
         
-        logger.info(f"[DESTROY] destroy() completed successfully")
+        logger.debug("[DESTROY] destroy() completed successfully")
         from rest_framework import status
         from rest_framework.response import Response
         return Response(status=status.HTTP_204_NO_CONTENT)
     
     def perform_destroy(self, instance):
         """Soft delete teacher and create audit log"""
-        import logging
-        logger = logging.getLogger(__name__)
         
         instance._actor = self.request.user
         
@@ -195,27 +194,27 @@ class TeacherViewSet(viewsets.ModelViewSet):
         user_role = user.get_role_display() if hasattr(user, 'get_role_display') else (user.role or 'User')
         
         # Log before soft delete
-        logger.info(f"[SOFT_DELETE] Starting soft delete for teacher ID: {teacher_id}, Name: {teacher_name}")
-        logger.info(f"[SOFT_DELETE] Teacher is_deleted before: {instance.is_deleted}")
+        logger.debug("[SOFT_DELETE] Starting soft delete for teacher ID: %s, Name: %s", teacher_id, teacher_name)
+        logger.debug("[SOFT_DELETE] Teacher is_deleted before: %s", instance.is_deleted)
         
         # Soft delete the teacher (instead of hard delete)
         # This uses update() to directly modify database, does NOT call .delete()
         # This ensures no post_delete signal is triggered
         try:
             instance.soft_delete()
-            logger.info(f"[SOFT_DELETE] soft_delete() method called successfully")
+            logger.debug("[SOFT_DELETE] soft_delete() method called successfully")
             
             # Verify soft delete worked
             instance.refresh_from_db()
-            logger.info(f"[SOFT_DELETE] Teacher is_deleted after refresh: {instance.is_deleted}")
+            logger.debug("[SOFT_DELETE] Teacher is_deleted after refresh: %s", instance.is_deleted)
             
             if not instance.is_deleted:
-                logger.error(f"[SOFT_DELETE] CRITICAL ERROR: Soft delete failed! Teacher {teacher_id} is_deleted is still False!")
+                logger.error("[SOFT_DELETE] CRITICAL ERROR: Soft delete failed! Teacher %s is_deleted is still False!", teacher_id)
                 raise Exception(f"Soft delete failed for teacher {teacher_id} - is_deleted is still False after soft_delete() call")
             
-            logger.info(f"[SOFT_DELETE] Soft delete successful for teacher {teacher_id}")
+            logger.debug("[SOFT_DELETE] Soft delete successful for teacher %s", teacher_id)
         except Exception as e:
-            logger.error(f"[SOFT_DELETE] ERROR during soft_delete(): {str(e)}")
+            logger.error("[SOFT_DELETE] ERROR during soft_delete(): %s", e)
             raise
         
         # Create audit log after soft deletion
@@ -233,9 +232,7 @@ class TeacherViewSet(viewsets.ModelViewSet):
             )
         except Exception as e:
             # Log error but don't fail the deletion
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"Failed to create audit log for teacher deletion: {str(e)}")
+            logger.error("Failed to create audit log for teacher deletion: %s", e)
     
     @decorators.action(detail=False, methods=['get'])
     def by_coordinator(self, request):
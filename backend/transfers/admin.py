@@ -8,6 +8,7 @@ from .models import (
     TransferApproval,
     GradeSkipTransfer,
     CampusTransfer,
+    TransferOutboxEvent,
 )
 
 
@@ -175,3 +176,11 @@ class CampusTransferAdmin(admin.ModelAdmin):
         "created_at",
         "updated_at",
     )
+
+
+@admin.register(TransferOutboxEvent)
+class TransferOutboxEventAdmin(admin.ModelAdmin):
+    list_display = ("id", "event_type", "created_at", "published_at", "attempts")
+    list_filter = ("event_type", ("published_at", admin.EmptyFieldListFilter))
+    search_fields = ("event_type", "event_id")
+    readonly_fields = ("event_id", "event_type", "payload", "created_at", "published_at", "attempts", "last_error")
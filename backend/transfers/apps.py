@@ -6,3 +6,5 @@ class TransfersConfig(AppConfig):
     name = 'transfers'
     verbose_name = 'Transfer Management'
 
+    def ready(self):
+        import transfers.event_handlers  # noqa: F401  (registers transfer event handlers)
@@ -0,0 +1,165 @@
+"""
+Side effects of applied transfers, run by the transfer event bus
+(transfers/outbox.py) after the transfer has committed.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Optional
+
+from django.contrib.auth import get_user_model
+
+from classes.models import ClassRoom
+from notifications.services import create_notification
+
+from .models import CampusTransfer, ClassTransfer, GradeSkipTransfer
+from .outbox import subscribe
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+
+def _user(user_id) -> Optional[User]:
+    return User.objects.filter(pk=user_id).first() if user_id else None
+
+
+def _teacher_user(teacher) -> Optional[User]:
+    """Login account of a Teacher: linked user, else by employee code, else by email."""
+    if teacher is None:
+        return None
+    teacher_user = getattr(teacher, 'user', None)
+    if not teacher_user and teacher.employee_code:
+        teacher_user = User.objects.filter(username=teacher.employee_code).first()
+    if not teacher_user and teacher.email:
+        teacher_user = User.objects.filter(email__iexact=teacher.email).first()
+    return teacher_user
+
+
+def _coordinator_name(changed_by, *fallbacks) -> str:
+    if hasattr(changed_by, 'coordinator'):
+        return changed_by.coordinator.full_name if changed_by.coordinator else "Coordinator"
+    for coordinator in fallbacks:
+        if coordinator:
+            return coordinator.full_name
+    return "Coordinator"
+
+
+def _classroom(classroom_id) -> Optional[ClassRoom]:
+    if not classroom_id:
+        return None
+    return ClassRoom.objects.select_related('grade', 'class_teacher__user').filter(pk=classroom_id).first()
+
+
+@subscribe('class_transfer.applied')
+def notify_class_teacher_of_class_transfer(event: dict) -> None:
+    data = event['data']
+    class_transfer = ClassTransfer.objects.select_related('student', 'coordinator').get(pk=data['class_transfer_id'])
+    to_classroom = _classroom(data['to_classroom_id'])
+    teacher_user = _teacher_user(to_classroom.class_teacher if to_classroom else None)
+    if not teacher_user:
+        return
+
+    changed_by = _user(data.get('changed_by_id'))
+    coordinator_name = _coordinator_name(changed_by, class_transfer.coordinator)
+    create_notification(
+        recipient=teacher_user,
+        actor=changed_by,
+        verb=f"{coordinator_name} has assigned new student {class_transfer.student.name} in your class by transfer request",
+        target_text=f"{to_classroom.grade.name} - {to_classroom.section} ({to_classroom.shift})",
+        data={
+            "type": "class_transfer.student_assigned",
+            "class_transfer_id": class_transfer.id,
+            "student_id": class_transfer.student_id,
+            "classroom_id": to_classroom.id,
+        },
+    )
+
+
+@subscribe('grade_skip_transfer.applied')
+def notify_class_teacher_of_grade_skip(event: dict) -> None:
+    data = event['data']
+    classroom = _classroom(data.get('classroom_id'))
+    teacher_user = _teacher_user(classroom.class_teacher if classroom else None)
+    if not teacher_user:
+        return
+
+    grade_skip_transfer = GradeSkipTransfer.objects.select_related(
+        'student', 'to_grade_coordinator', 'from_grade_coordinator'
+    ).get(pk=data['grade_skip_transfer_id'])
+    changed_by = _user(data.get('changed_by_id'))
+    coordinator_name = _coordinator_name(
+        changed_by, grade_skip_transfer.to_grade_coordinator, grade_skip_transfer.from_grade_coordinator
+    )
+    create_notification(
+        recipient=teacher_user,
+        actor=changed_by,
+        verb=f"{coordinator_name} has assigned new student {grade_skip_transfer.student.name} in your class by transfer request",
+        target_text=f"{classroom.grade.name} - {classroom.section} ({classroom.shift})",
+        data={
+            "type": "grade_skip_transfer.student_assigned",
+            "grade_skip_transfer_id": grade_skip_transfer.id,
+            "student_id": grade_skip_transfer.student_id,
+            "classroom_id": classroom.id,
+        },
+    )
+
+
+@subscribe('campus_transfer.applied')
+def notify_campus_transfer_parties(event: dict) -> None:
+    """Initiating teacher (with letter download), sending principal and destination class teacher."""
+    data = event['data']
+    campus_transfer = CampusTransfer.objects.select_related(
+        'student', 'initiated_by_teacher__user', 'from_principal'
+    ).get(pk=data['campus_transfer_id'])
+    student = campus_transfer.student
+    changed_by = _user(data.get('changed_by_id'))
+
+    teacher_user = _teacher_user(campus_transfer.initiated_by_teacher)
+    if teacher_user:
+        create_notification(
+            recipient=teacher_user,
+            actor=changed_by,
+            verb=f"Your campus transfer request for {student.name} has been fully approved!",
+            target_text=f"New ID: {campus_transfer.letter_new_student_id}. From {campus_transfer.letter_from_campus_name} to {campus_transfer.letter_to_campus_name}.",
+            data={
+                "type": "campus_transfer.approved.teacher",
+                "campus_transfer_id": campus_transfer.id,
+                "student_id": student.id,
+                "new_student_id": campus_transfer.letter_new_student_id,
+                "can_download_letter": True,  # Teacher can download letter
+            },
+        )
+
+    if campus_transfer.from_principal:
+        create_notification(
+            recipient=campus_transfer.from_principal,
+            actor=changed_by,
+            verb=f"Campus transfer for {student.name} has been approved and applied",
+            target_text=f"Student ID: {campus_transfer.letter_new_student_id}. From {campus_transfer.letter_from_campus_name} to {campus_transfer.letter_to_campus_name}.",
+            data={
+                "type": "campus_transfer.approved.from_principal",
+                "campus_transfer_id": campus_transfer.id,
+                "student_id": student.id,
+                "new_student_id": campus_transfer.letter_new_student_id,
+                "can_download_letter": False,  # View only
+            },
+        )
+
+    to_classroom = _classroom(data.get('to_classroom_id'))
+    class_teacher_user = _teacher_user(to_classroom.class_teacher if to_classroom else None)
+    if class_teacher_user:
+        create_notification(
+            recipient=class_teacher_user,
+            actor=changed_by,
+            verb=f"New student {student.name} has been transferred into your class",
+            target_text=f"From {campus_transfer.letter_from_campus_name} to {campus_transfer.letter_to_class_label}. New ID: {campus_transfer.letter_new_student_id}.",
+            data={
+                "type": "campus_transfer.student_assigned",
+                "campus_transfer_id": campus_transfer.id,
+                "student_id": student.id,
+                "classroom_id": to_classroom.id,
+                "new_student_id": campus_transfer.letter_new_student_id,
+                "can_download_letter": False,  # View only
+            },
+        )
@@ -0,0 +1,47 @@
+import os
+import socket
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from transfers.outbox import HandlerError, RedisStreamsBroker, dispatch
+
+
+class Command(BaseCommand):
+    help = (
+        "Read transfer events from the Redis Stream (TRANSFER_EVENTS_BROKER=redis) "
+        "through a consumer group and run the registered handlers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--group", type=str, default="transfer-handlers", help="Consumer group (default: transfer-handlers)")
+        parser.add_argument("--consumer", type=str, default=None, help="Consumer name (default: hostname-pid)")
+        parser.add_argument("--count", type=int, default=100, help="Messages read per call (default: 100)")
+        parser.add_argument("--block", type=int, default=5000, help="Milliseconds to block waiting for messages (default: 5000)")
+
+    def handle(self, *args, **options):
+        group: str = options["group"]
+        consumer: str = options["consumer"] or f"{socket.gethostname()}-{os.getpid()}"
+        count: int = options["count"]
+        block: int = options["block"]
+
+        if count < 1 or block < 0:
+            raise CommandError("count must be >= 1 and block >= 0")
+
+        broker = RedisStreamsBroker()
+        self.stdout.write(f"Consuming {broker.stream} as {group}/{consumer} (Ctrl+C to stop)")
+        handled = 0
+        try:
+            for message_id, event in broker.consume(group, consumer, count=count, block_ms=block):
+                close_old_connections()
+                if event is not None:
+                    try:
+                        dispatch(event)
+                    except HandlerError as e:
+                        # Left unacknowledged: redelivered from the pending list when the consumer restarts
+                        self.stderr.write(f"⚠️ {e}")
+                        continue
+                    handled += 1
+                broker.ack(group, message_id)
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.SUCCESS(f"Transfer event consumer stopped. Handled: {handled}."))
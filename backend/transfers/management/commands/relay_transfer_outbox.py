@@ -0,0 +1,62 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from transfers.outbox import prune_outbox, relay_outbox
+
+# Seconds between prunes of published rows with --loop
+PRUNE_INTERVAL = 3600
+
+
+class Command(BaseCommand):
+    help = (
+        "Publish pending transfer outbox events to the configured broker "
+        "(TRANSFER_EVENTS_BROKER) and delete rows published more than "
+        "--retention-days ago. Runs once by default; --loop keeps polling."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None, help="Rows claimed per batch (default: TRANSFER_OUTBOX_BATCH_SIZE)")
+        parser.add_argument("--loop", action="store_true", help="Keep polling until interrupted")
+        parser.add_argument("--interval", type=float, default=2.0, help="Seconds between polls with --loop (default: 2)")
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=None,
+            help="Delete rows published more than this many days ago, 0 to keep them (default: TRANSFER_OUTBOX_RETENTION_DAYS)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size: int | None = options["batch_size"]
+        interval: float = options["interval"]
+        retention_days: int | None = options["retention_days"]
+
+        if batch_size is not None and batch_size < 1:
+            raise CommandError("batch-size must be >= 1")
+        if retention_days is not None and retention_days < 0:
+            raise CommandError("retention-days must be >= 0")
+
+        if not options["loop"]:
+            published = relay_outbox(batch_size=batch_size)
+            pruned = prune_outbox(retention_days)
+            self.stdout.write(self.style.SUCCESS(f"Transfer outbox relayed. Published: {published}, pruned: {pruned}."))
+            return
+
+        self.stdout.write(f"Relaying transfer outbox every {interval}s (Ctrl+C to stop)")
+        last_prune = None
+        try:
+            while True:
+                close_old_connections()
+                published = relay_outbox(batch_size=batch_size)
+                if published:
+                    self.stdout.write(f"Published {published} transfer events")
+                    continue
+                if last_prune is None or time.monotonic() - last_prune >= PRUNE_INTERVAL:
+                    pruned = prune_outbox(retention_days)
+                    last_prune = time.monotonic()
+                    if pruned:
+                        self.stdout.write(f"Pruned {pruned} published transfer events")
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.SUCCESS("Transfer outbox relay stopped."))
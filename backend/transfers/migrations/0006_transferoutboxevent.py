@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:18
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transfers', '0005_campustransfer'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TransferOutboxEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_id', models.UUIDField(editable=False, unique=True)),
+                ('event_type', models.CharField(max_length=100)),
+                ('payload', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('published_at', models.DateTimeField(blank=True, null=True)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['published_at', 'id'], name='transfers_t_publish_869732_idx'), models.Index(fields=['event_type'], name='transfers_t_event_t_cb55d5_idx')],
+            },
+        ),
+    ]
@@ -1,3 +1,4 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils import timezone
@@ -758,4 +759,42 @@ class CampusTransfer(models.Model):
         ]
 
     def __str__(self):
-        return f'Campus transfer for {self.student.name} ({self.from_campus} → {self.to_campus})'
\ No newline at end of file
+        return f'Campus transfer for {self.student.name} ({self.from_campus} → {self.to_campus})'
+
+class TransferOutboxEvent(models.Model):
+    """
+    Transactional outbox for transfer domain events.
+
+    Rows are written by transfers.services.emit_transfer_event inside the
+    same transaction as the transfer they describe, and drained to the
+    configured broker by transfers.outbox.relay_outbox.
+    """
+
+    event_id = models.UUIDField(unique=True, editable=False)
+    event_type = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    published_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['published_at', 'id']),
+            models.Index(fields=['event_type']),
+        ]
+
+    def __str__(self):
+        state = 'published' if self.published_at else 'pending'
+        return f'{self.event_type} #{self.pk} ({state})'
+
+    def envelope(self) -> dict:
+        """Event in the shared schema (docs/microservices/07-communication-patterns.md)."""
+        return {
+            'event_type': self.event_type,
+            'event_id': str(self.event_id),
+            'timestamp': self.created_at.isoformat() if self.created_at else None,
+            'source': 'transfers',
+            'data': self.payload,
+        }
@@ -0,0 +1,230 @@
+"""
+Transactional outbox and event bus for transfer events.
+
+``record_event`` inserts a TransferOutboxEvent in the caller's transaction,
+so an event exists exactly when the transfer it describes was committed.
+``relay_outbox`` drains pending rows in id order and batches to the
+configured broker (settings.TRANSFER_EVENTS_BROKER):
+
+- ``inprocess``: the relay runs the handlers registered with ``subscribe``
+  itself, each in its own savepoint.
+- ``redis``: events are XADDed to a Redis Stream and the
+  ``consume_transfer_events`` command dispatches them to the same handlers
+  through a consumer group.
+
+The relay runs after each transfer commits (through
+notifications.services.defer_after_commit, i.e. on the background executor
+when NOTIFICATION_ASYNC_FANOUT is on) and/or from the
+``relay_transfer_outbox`` worker. Delivery is at-least-once. Published rows
+are kept for TRANSFER_OUTBOX_RETENTION_DAYS and then removed by
+``prune_outbox`` (run by ``relay_transfer_outbox``).
+"""
+from __future__ import annotations
+
+import json
+import logging
+import uuid
+from datetime import timedelta
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import TransferOutboxEvent
+
+logger = logging.getLogger(__name__)
+
+_handlers: dict = {}
+
+
+def subscribe(*event_types: str) -> Callable:
+    """Register the decorated function as a handler for ``event_types``; it receives the event envelope."""
+    def decorator(func):
+        for event_type in event_types:
+            _handlers.setdefault(event_type, []).append(func)
+        return func
+    return decorator
+
+
+class HandlerError(Exception):
+    """One or more handlers failed for an event; the event must be delivered again."""
+
+    def __init__(self, event: dict, failures: list):
+        self.failures = failures
+        names = ', '.join(f'{name}: {error}' for name, error in failures)
+        super().__init__(f"{event['event_type']} {event['event_id']} handlers failed ({names})")
+
+
+def dispatch(event: dict) -> None:
+    """
+    Run every handler for the event, each in its own savepoint. A failing
+    handler does not stop the others, but HandlerError is raised once they
+    have all run so the event stays undelivered and is retried (handlers
+    that succeeded run again; delivery is at-least-once).
+    """
+    failures = []
+    for handler in _handlers.get(event['event_type'], ()):
+        try:
+            with transaction.atomic():
+                handler(event)
+        except Exception as e:
+            logger.error(
+                "Transfer event handler %s failed for %s %s: %s",
+                handler.__name__, event['event_type'], event['event_id'], e, exc_info=True,
+            )
+            failures.append((handler.__name__, e))
+    if failures:
+        raise HandlerError(event, failures)
+
+
+class InProcessBroker:
+    """
+    Delivers events straight to the registered handlers in the relay's
+    thread; a HandlerError keeps the outbox row pending.
+    """
+
+    def publish(self, event: dict) -> None:
+        dispatch(event)
+
+
+class RedisStreamsBroker:
+    """Appends events to a Redis Stream; consume() reads them back through a consumer group."""
+
+    field = 'event'
+
+    def __init__(self, url: Optional[str] = None, stream: Optional[str] = None, maxlen: Optional[int] = None):
+        import redis
+
+        self.client = redis.Redis.from_url(url or settings.TRANSFER_EVENTS_REDIS_URL)
+        self.stream = stream or settings.TRANSFER_EVENTS_STREAM
+        self.maxlen = maxlen or settings.TRANSFER_EVENTS_STREAM_MAXLEN
+
+    def publish(self, event: dict) -> None:
+        self.client.xadd(
+            self.stream,
+            {self.field: json.dumps(event, default=str)},
+            maxlen=self.maxlen,
+            approximate=True,
+        )
+
+    def ensure_group(self, group: str) -> None:
+        import redis
+
+        try:
+            self.client.xgroup_create(self.stream, group, id='0', mkstream=True)
+        except redis.ResponseError as e:
+            if 'BUSYGROUP' not in str(e):
+                raise
+
+    def consume(self, group: str, consumer: str, count: int = 100, block_ms: int = 5000):
+        """
+        Yield ``(message_id, event)`` forever: first this consumer's pending
+        (delivered but unacknowledged) messages, then new ones. ``event`` is
+        None for entries trimmed from the stream; ack them all the same.
+        """
+        self.ensure_group(group)
+        start = '0'
+        while True:
+            response = self.client.xreadgroup(
+                group, consumer, {self.stream: start}, count=count,
+                block=None if start == '0' else block_ms,
+            )
+            messages = response[0][1] if response else []
+            if start == '0' and not messages:
+                start = '>'
+                continue
+            for message_id, fields in messages:
+                raw = (fields or {}).get(self.field.encode())
+                yield message_id, json.loads(raw) if raw else None
+
+    def ack(self, group: str, message_id) -> None:
+        self.client.xack(self.stream, group, message_id)
+
+
+BROKERS = {
+    'inprocess': InProcessBroker,
+    'redis': RedisStreamsBroker,
+}
+
+_broker = None
+
+
+def get_broker():
+    """Broker named by TRANSFER_EVENTS_BROKER (a key of BROKERS or a dotted class path)."""
+    global _broker
+    if _broker is None:
+        name = getattr(settings, 'TRANSFER_EVENTS_BROKER', 'inprocess')
+        _broker = (BROKERS.get(name) or import_string(name))()
+    return _broker
+
+
+def record_event(event_type: str, payload: dict) -> TransferOutboxEvent:
+    """Insert an outbox row in the current transaction and relay it once that commits."""
+    event = TransferOutboxEvent.objects.create(
+        event_id=uuid.uuid4(),
+        event_type=event_type,
+        payload=payload,
+    )
+    if getattr(settings, 'TRANSFER_OUTBOX_RELAY_ON_COMMIT', True):
+        from notifications.services import defer_after_commit
+        defer_after_commit(relay_outbox)
+    return event
+
+
+def relay_outbox(batch_size: Optional[int] = None, broker=None) -> int:
+    """
+    Publish pending outbox rows in id order until none are left or the broker
+    fails. Rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so several
+    relays can run at once. Rows that failed TRANSFER_OUTBOX_MAX_ATTEMPTS
+    times are left for inspection in the admin. Returns the number published.
+    """
+    batch_size = batch_size or getattr(settings, 'TRANSFER_OUTBOX_BATCH_SIZE', 100)
+    max_attempts = getattr(settings, 'TRANSFER_OUTBOX_MAX_ATTEMPTS', 10)
+    broker = broker or get_broker()
+    published = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                TransferOutboxEvent.objects.select_for_update(skip_locked=True)
+                .filter(published_at__isnull=True, attempts__lt=max_attempts)
+                .order_by('id')[:batch_size]
+            )
+            if not batch:
+                return published
+
+            handled = []
+            failed = False
+            for event in batch:
+                event.attempts += 1
+                handled.append(event)
+                try:
+                    broker.publish(event.envelope())
+                except Exception as e:
+                    event.last_error = str(e)[:2000]
+                    logger.warning("Could not publish transfer event %s (%s): %s", event.pk, event.event_type, e)
+                    failed = True
+                    break
+                event.published_at = timezone.now()
+                event.last_error = ''
+                published += 1
+            TransferOutboxEvent.objects.bulk_update(handled, ['published_at', 'attempts', 'last_error'])
+
+        if failed or len(batch) < batch_size:
+            return published
+
+
+def prune_outbox(retention_days: Optional[int] = None) -> int:
+    """
+    Delete rows published more than ``retention_days`` (default
+    TRANSFER_OUTBOX_RETENTION_DAYS) ago; 0 keeps everything. Pending and
+    failed rows are never pruned. Returns the number of rows deleted.
+    """
+    if retention_days is None:
+        retention_days = getattr(settings, 'TRANSFER_OUTBOX_RETENTION_DAYS', 7)
+    if retention_days <= 0:
+        return 0
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    deleted, _ = TransferOutboxEvent.objects.filter(published_at__lt=cutoff).delete()
+    return deleted
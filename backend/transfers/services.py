@@ -1,23 +1,28 @@
+import logging
 from datetime import datetime
 from django.db import transaction
 from django.contrib.auth.models import User
 from django.utils import timezone
 
 from .models import IDHistory, TransferRequest, ClassTransfer, ShiftTransfer, TransferApproval, GradeSkipTransfer, CampusTransfer
+from .outbox import record_event
+
+logger = logging.getLogger(__name__)
+event_logger = logging.getLogger('transfers.events')
 
 
 def emit_transfer_event(event_type: str, payload: dict) -> None:
     """
-    Lightweight event emitter for transfer-related domain events.
-    Right now this just logs to stdout; in future it can publish to Redis/Kafka.
+    Record a transfer domain event in the transactional outbox, inside the
+    caller's transaction. After commit the outbox relay publishes it to the
+    configured broker and the handlers in transfers.event_handlers run the
+    side effects (see transfers/outbox.py).
     """
-    try:
+    record_event(event_type, payload)
+    if event_logger.isEnabledFor(logging.INFO):
         # Keep payload small in logs
         trimmed = {k: payload.get(k) for k in list(payload.keys())[:10]}
-        print(f"[TRANSFER_EVENT] {event_type}: {trimmed}")
-    except Exception:
-        # Never break business logic because of logging issues
-        pass
+        event_logger.info("%s: %s", event_type, trimmed)
 
 
 class IDUpdateService:
@@ -222,48 +227,7 @@ def apply_class_transfer(class_transfer: ClassTransfer, changed_by: User):
 
     class_transfer.save()
 
-    # Send notification to destination class teacher
-    try:
-        from notifications.services import create_notification
-        from django.contrib.auth import get_user_model
-        UserModel = get_user_model()
-        
-        # Get coordinator name (from changed_by or class_transfer coordinator)
-        coordinator_name = "Coordinator"
-        if hasattr(changed_by, 'coordinator'):
-            coordinator_name = changed_by.coordinator.full_name if changed_by.coordinator else "Coordinator"
-        elif class_transfer.coordinator:
-            coordinator_name = class_transfer.coordinator.full_name
-        
-        # Get class teacher user
-        if to_classroom.class_teacher:
-            class_teacher = to_classroom.class_teacher
-            teacher_user = getattr(class_teacher, 'user', None)
-            if not teacher_user and class_teacher.employee_code:
-                teacher_user = UserModel.objects.filter(username=class_teacher.employee_code).first()
-            if not teacher_user and class_teacher.email:
-                teacher_user = UserModel.objects.filter(email__iexact=class_teacher.email).first()
-            
-            if teacher_user:
-                verb = f"{coordinator_name} has assigned new student {student.name} in your class by transfer request"
-                target_text = f"{to_classroom.grade.name} - {to_classroom.section} ({to_classroom.shift})"
-                create_notification(
-                    recipient=teacher_user,
-                    actor=changed_by,
-                    verb=verb,
-                    target_text=target_text,
-                    data={
-                        "type": "class_transfer.student_assigned",
-                        "class_transfer_id": class_transfer.id,
-                        "student_id": student.id,
-                        "classroom_id": to_classroom.id,
-                    },
-                )
-    except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.error(f"Failed to send notification to class teacher for class transfer {class_transfer.id}: {str(e)}")
-
+    # Class teacher notification: transfers.event_handlers
     emit_transfer_event(
         'class_transfer.applied',
         {
@@ -487,12 +451,7 @@ def apply_grade_skip_transfer(grade_skip_transfer, changed_by):
             final_classroom = target_classroom
         else:
             # If no classroom found, still update grade but log warning
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.warning(
-                f"No available classroom found for grade skip transfer {grade_skip_transfer.id}. "
-                f"Student {student.id} grade updated to {to_grade.name} but classroom not assigned."
-            )
+            logger.warning("No available classroom found for grade skip transfer %s. Student %s grade updated to %s but classroom not assigned.", grade_skip_transfer.id, student.id, to_grade.name)
     
     # Update shift if changed
     if to_shift and to_shift != student.shift:
@@ -545,56 +504,13 @@ def apply_grade_skip_transfer(grade_skip_transfer, changed_by):
     student._skip_notifications = True
     student.save()
     
-    # Send notification to destination class teacher
-    try:
-        from notifications.services import create_notification
-        from django.contrib.auth import get_user_model
-        UserModel = get_user_model()
-        
-        if final_classroom:
-            # Get coordinator name (from changed_by or grade_skip_transfer coordinator)
-            coordinator_name = "Coordinator"
-            if hasattr(changed_by, 'coordinator'):
-                coordinator_name = changed_by.coordinator.full_name if changed_by.coordinator else "Coordinator"
-            elif grade_skip_transfer.to_grade_coordinator:
-                coordinator_name = grade_skip_transfer.to_grade_coordinator.full_name
-            elif grade_skip_transfer.from_grade_coordinator:
-                coordinator_name = grade_skip_transfer.from_grade_coordinator.full_name
-            
-            # Get class teacher user
-            if final_classroom.class_teacher:
-                class_teacher = final_classroom.class_teacher
-                teacher_user = getattr(class_teacher, 'user', None)
-                if not teacher_user and class_teacher.employee_code:
-                    teacher_user = UserModel.objects.filter(username=class_teacher.employee_code).first()
-                if not teacher_user and class_teacher.email:
-                    teacher_user = UserModel.objects.filter(email__iexact=class_teacher.email).first()
-                
-                if teacher_user:
-                    verb = f"{coordinator_name} has assigned new student {student.name} in your class by transfer request"
-                    target_text = f"{final_classroom.grade.name} - {final_classroom.section} ({final_classroom.shift})"
-                    create_notification(
-                        recipient=teacher_user,
-                        actor=changed_by,
-                        verb=verb,
-                        target_text=target_text,
-                        data={
-                            "type": "grade_skip_transfer.student_assigned",
-                            "grade_skip_transfer_id": grade_skip_transfer.id,
-                            "student_id": student.id,
-                            "classroom_id": final_classroom.id,
-                        },
-                    )
-    except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.error(f"Failed to send notification to class teacher for grade skip transfer {grade_skip_transfer.id}: {str(e)}")
-    
+    # Class teacher notification: transfers.event_handlers
     emit_transfer_event(
         'grade_skip_transfer.applied',
         {
             'student_id': student.id,
             'grade_skip_transfer_id': grade_skip_transfer.id,
+            'classroom_id': final_classroom.id if final_classroom else None,
             'from_grade': grade_skip_transfer.from_grade_name,
             'to_grade': grade_skip_transfer.to_grade_name,
             'changed_by_id': changed_by.id if changed_by else None,
@@ -741,89 +657,7 @@ def apply_campus_transfer(campus_transfer: CampusTransfer, changed_by: User):
 
     campus_transfer.save()
 
-    # Send notifications to all relevant parties
-    try:
-        from notifications.services import create_notification
-        from django.contrib.auth import get_user_model
-
-        UserModel = get_user_model()
-
-        # 1. Notify initiating teacher (who created the request) - with letter download
-        if campus_transfer.initiated_by_teacher:
-            teacher = campus_transfer.initiated_by_teacher
-            teacher_user = getattr(teacher, 'user', None)
-            if not teacher_user and teacher.employee_code:
-                teacher_user = UserModel.objects.filter(username=teacher.employee_code).first()
-            if not teacher_user and teacher.email:
-                teacher_user = UserModel.objects.filter(email__iexact=teacher.email).first()
-
-            if teacher_user:
-                verb = f"Your campus transfer request for {student.name} has been fully approved!"
-                target_text = f"New ID: {campus_transfer.letter_new_student_id}. From {campus_transfer.letter_from_campus_name} to {campus_transfer.letter_to_campus_name}."
-                create_notification(
-                    recipient=teacher_user,
-                    actor=changed_by,
-                    verb=verb,
-                    target_text=target_text,
-                    data={
-                        "type": "campus_transfer.approved.teacher",
-                        "campus_transfer_id": campus_transfer.id,
-                        "student_id": student.id,
-                        "new_student_id": campus_transfer.letter_new_student_id,
-                        "can_download_letter": True,  # Teacher can download letter
-                    },
-                )
-
-        # 2. Notify from-campus principal (view-only notification)
-        if campus_transfer.from_principal:
-            principal_user = campus_transfer.from_principal
-            verb = f"Campus transfer for {student.name} has been approved and applied"
-            target_text = f"Student ID: {campus_transfer.letter_new_student_id}. From {campus_transfer.letter_from_campus_name} to {campus_transfer.letter_to_campus_name}."
-            create_notification(
-                recipient=principal_user,
-                actor=changed_by,
-                verb=verb,
-                target_text=target_text,
-                data={
-                    "type": "campus_transfer.approved.from_principal",
-                    "campus_transfer_id": campus_transfer.id,
-                    "student_id": student.id,
-                    "new_student_id": campus_transfer.letter_new_student_id,
-                    "can_download_letter": False,  # View only
-                },
-            )
-
-        # 3. Notify destination class teacher about new student (view-only)
-        if to_classroom and to_classroom.class_teacher:
-            class_teacher = to_classroom.class_teacher
-            teacher_user = getattr(class_teacher, 'user', None)
-            if not teacher_user and class_teacher.employee_code:
-                teacher_user = UserModel.objects.filter(username=class_teacher.employee_code).first()
-            if not teacher_user and class_teacher.email:
-                teacher_user = UserModel.objects.filter(email__iexact=class_teacher.email).first()
-
-            if teacher_user:
-                verb = f"New student {student.name} has been transferred into your class"
-                target_text = f"From {campus_transfer.letter_from_campus_name} to {campus_transfer.letter_to_class_label}. New ID: {campus_transfer.letter_new_student_id}."
-                create_notification(
-                    recipient=teacher_user,
-                    actor=changed_by,
-                    verb=verb,
-                    target_text=target_text,
-                    data={
-                        "type": "campus_transfer.student_assigned",
-                        "campus_transfer_id": campus_transfer.id,
-                        "student_id": student.id,
-                        "classroom_id": to_classroom.id,
-                        "new_student_id": campus_transfer.letter_new_student_id,
-                        "can_download_letter": False,  # View only
-                    },
-                )
-    except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.error(f"Failed to send notifications for campus transfer {campus_transfer.id}: {str(e)}")
-
+    # Teacher / principal / class teacher notifications: transfers.event_handlers
     emit_transfer_event(
         "campus_transfer.applied",
         {
@@ -832,6 +666,7 @@ def apply_campus_transfer(campus_transfer: CampusTransfer, changed_by: User):
             "transfer_request_id": transfer_request.id,
             "from_campus_id": from_campus.id,
             "to_campus_id": to_campus.id,
+            "to_classroom_id": to_classroom.id if to_classroom else None,
             "new_id": id_result.get("new_id"),
             "changed_by_id": changed_by.id if changed_by else None,
         },
@@ -43,11 +43,15 @@ from .services import (
     apply_campus_transfer,
 )
 from notifications.services import create_notification
+from users.scope import get_user_scope
 from students.models import Student
 from teachers.models import Teacher
 from campus.models import Campus
 from classes.models import ClassRoom
 from coordinator.models import Coordinator
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 def get_user_role_name(user):
@@ -77,34 +81,34 @@ def create_transfer_request(request):
             receiving_principal = None
             
             try:
-                print(f"Looking for principal for campus: {serializer.validated_data['to_campus']}")
+                logger.debug("Looking for principal for campus: %s", serializer.validated_data['to_campus'])
                 
                 receiving_principal_obj = Principal.objects.filter(
                     campus_id=serializer.validated_data['to_campus']
                 ).first()
                 
-                print(f"Found principal: {receiving_principal_obj}")
+                logger.debug("Found principal: %s", receiving_principal_obj)
                 
                 if receiving_principal_obj:
                     receiving_principal = receiving_principal_obj.user
-                    print(f"Set receiving principal to: {receiving_principal_obj.user}")
+                    logger.debug("Set receiving principal to: %s", receiving_principal_obj.user)
                 else:
                     # If no principal found for destination campus, find any available principal
-                    print(f"No principal found for campus {serializer.validated_data['to_campus']}, looking for any principal...")
+                    logger.debug("No principal found for campus %s, looking for any principal...", serializer.validated_data['to_campus'])
                     any_principal = Principal.objects.first()
                     if any_principal:
                         receiving_principal = any_principal.user
-                        print(f"Set receiving principal to any available principal: {any_principal.user}")
+                        logger.debug("Set receiving principal to any available principal: %s", any_principal.user)
                     else:
                         # Last resort: set to requesting principal
                         receiving_principal = request.user
-                        print(f"No principals found at all, set to requesting principal: {request.user}")
+                        logger.debug("No principals found at all, set to requesting principal: %s", request.user)
                         
             except Exception as e:
                 # If error, set to requesting principal
-                print(f"Error finding principal: {e}")
+                logger.warning("Error finding principal: %s", e)
                 receiving_principal = request.user
-                print(f"Set receiving principal to requesting principal due to error: {request.user}")
+                logger.warning("Set receiving principal to requesting principal due to error: %s", request.user)
             
             # Create transfer request with receiving principal
             transfer_request = serializer.save(
@@ -113,7 +117,7 @@ def create_transfer_request(request):
                 status='pending'
             )
             
-            print(f"Transfer request created with receiving_principal: {transfer_request.receiving_principal}")
+            logger.debug("Transfer request created with receiving_principal: %s", transfer_request.receiving_principal)
             
             return Response(TransferRequestSerializer(transfer_request).data, 
                           status=status.HTTP_201_CREATED)
@@ -417,7 +421,12 @@ def _get_teacher_for_user(user):
         if teacher:
             return teacher
 
-        # Fallbacks: resolve by email or employee_code-style username
+        # Teacher accounts: resolved once and cached in the user scope
+        scope = get_user_scope(user)
+        if scope and scope.teacher_id:
+            return scope.teacher()
+
+        # Fallbacks for other roles: resolve by email or employee_code-style username
         from teachers.models import Teacher
         from django.db.models import Q
 
@@ -439,8 +448,11 @@ def _get_teacher_for_user(user):
 
 
 def _get_coordinator_for_user(user):
-    """Return Coordinator instance for given auth user, using robust lookup."""
+    """Return Coordinator instance for given auth user, using the cached user scope."""
     try:
+        scope = get_user_scope(user)
+        if scope and scope.coordinator_id:
+            return scope.coordinator()
         return Coordinator.get_for_user(user)
     except Exception:
         return None
@@ -586,7 +598,7 @@ def create_class_transfer(request):
                         },
                     )
         except Exception as notify_err:
-            print(f"[WARN] Failed to send class_transfer.requested notification: {notify_err}")
+            logger.warning("Failed to send class_transfer.requested notification: %s", notify_err)
 
         return Response(ClassTransferSerializer(class_transfer).data, status=status.HTTP_201_CREATED)
     except Exception as e:
@@ -793,7 +805,7 @@ def approve_class_transfer(request, transfer_id):
                         },
                     )
         except Exception as notify_err:
-            print(f"[WARN] Failed to send class_transfer.approved notifications: {notify_err}")
+            logger.warning("Failed to send class_transfer.approved notifications: %s", notify_err)
 
         return Response(
             {
@@ -1518,35 +1530,33 @@ def create_campus_transfer(request):
         try:
             if from_coord:
                 from django.contrib.auth import get_user_model
-                import logging
-                logger = logging.getLogger(__name__)
 
                 UserModel = get_user_model()
 
                 coord_user = getattr(from_coord, 'user', None)
-                logger.info(f"Campus Transfer Notification Debug:")
-                logger.info(f"  Coordinator ID: {from_coord.id}")
-                logger.info(f"  Coordinator Name: {from_coord.full_name}")
-                logger.info(f"  Coordinator Email: {from_coord.email}")
-                logger.info(f"  Coordinator Employee Code: {from_coord.employee_code}")
-                logger.info(f"  coord_user from getattr: {coord_user}")
+                logger.debug("Campus Transfer Notification Debug:")
+                logger.debug("  Coordinator ID: %s", from_coord.id)
+                logger.debug("  Coordinator Name: %s", from_coord.full_name)
+                logger.debug("  Coordinator Email: %s", from_coord.email)
+                logger.debug("  Coordinator Employee Code: %s", from_coord.employee_code)
+                logger.debug("  coord_user from getattr: %s", coord_user)
                 
                 if not coord_user and getattr(from_coord, 'employee_code', None):
                     coord_user = UserModel.objects.filter(
                         username=from_coord.employee_code
                     ).first()
-                    logger.info(f"  coord_user from username lookup: {coord_user}")
+                    logger.debug("  coord_user from username lookup: %s", coord_user)
                     
                 if not coord_user and getattr(from_coord, 'email', None):
                     coord_user = UserModel.objects.filter(
                         email__iexact=from_coord.email
                     ).first()
-                    logger.info(f"  coord_user from email lookup: {coord_user}")
+                    logger.debug("  coord_user from email lookup: %s", coord_user)
 
                 if coord_user:
-                    logger.info(f"  ✅ Found coord_user: {coord_user.username} (ID: {coord_user.id})")
+                    logger.debug("  ✅ Found coord_user: %s (ID: %s)", coord_user.username, coord_user.id)
                 else:
-                    logger.warning(f"  ❌ No User account found for coordinator {from_coord.full_name}")
+                    logger.warning("  ❌ No User account found for coordinator %s", from_coord.full_name)
 
                 if coord_user:
                     student_name = student.name
@@ -3268,7 +3278,7 @@ def create_grade_skip_transfer(request):
                         },
                     )
         except Exception as notify_err:
-            print(f"[WARN] Failed to send grade skip creation notifications: {notify_err}")
+            logger.warning("Failed to send grade skip creation notifications: %s", notify_err)
 
         return Response(
             GradeSkipTransferSerializer(grade_skip_transfer).data,
@@ -3358,7 +3368,7 @@ def approve_grade_skip_own_coord(request, transfer_id):
                             },
                         )
             except Exception as notify_err:
-                print(f"[WARN] Failed to send grade skip approval notifications: {notify_err}")
+                logger.warning("Failed to send grade skip approval notifications: %s", notify_err)
         else:
             # Different coordinator: transfer to other coordinator
             grade_skip_transfer.status = 'pending_other_coord'
@@ -3440,7 +3450,7 @@ def approve_grade_skip_own_coord(request, transfer_id):
                             },
                         )
             except Exception as notify_err:
-                print(f"[WARN] Failed to send grade skip transfer notifications: {notify_err}")
+                logger.warning("Failed to send grade skip transfer notifications: %s", notify_err)
 
         return Response(
             {
@@ -3548,7 +3558,7 @@ def approve_grade_skip_other_coord(request, transfer_id):
                         },
                     )
         except Exception as notify_err:
-            print(f"[WARN] Failed to send grade skip final approval notifications: {notify_err}")
+            logger.warning("Failed to send grade skip final approval notifications: %s", notify_err)
 
         return Response(
             {
@@ -3676,7 +3686,7 @@ def decline_grade_skip_transfer(request, transfer_id):
                         },
                     )
         except Exception as notify_err:
-            print(f"[WARN] Failed to send grade skip decline notifications: {notify_err}")
+            logger.warning("Failed to send grade skip decline notifications: %s", notify_err)
 
         return Response(
             {
@@ -3731,10 +3741,8 @@ def available_campus_transfer_sections(request):
         current_grade = current_classroom.grade
         
         # Debug logging
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.info(f"[Campus Transfer Sections] Student: {student.id}, Current Grade: {current_grade.name} (ID: {current_grade.id})")
-        logger.info(f"[Campus Transfer Sections] To Campus: {to_campus.campus_name} (ID: {to_campus.id}), Shift: {shift_normalized}")
+        logger.debug("[Campus Transfer Sections] Student: %s, Current Grade: %s (ID: %s)", student.id, current_grade.name, current_grade.id)
+        logger.debug("[Campus Transfer Sections] To Campus: %s (ID: %s), Shift: %s", to_campus.campus_name, to_campus.id, shift_normalized)
         
         # First check if there are ANY classrooms for this grade at destination campus
         all_classrooms_in_grade = ClassRoom.objects.filter(
@@ -3743,8 +3751,6 @@ def available_campus_transfer_sections(request):
             grade__level__campus=to_campus,
         ).select_related('grade', 'grade__level', 'grade__level__campus')
         
-        logger.info(f"[Campus Transfer Sections] Found {all_classrooms_in_grade.count()} classrooms with grade name '{current_grade.name}' at destination")
-        
         available_classrooms = all_classrooms_in_grade.exclude(
             students__id=student.id  # Exclude if student is already in this classroom
         ).select_related(
@@ -3903,9 +3909,7 @@ def available_grades_for_campus_skip(request):
             'campus_name': to_campus.campus_name,
         })
     except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.error(f"[Campus Skip Grade] Error: {str(e)}")
+        logger.error("[Campus Skip Grade] Error: %s", e)
         return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
@@ -3986,7 +3990,5 @@ def available_sections_for_campus_skip(request):
 
         return Response(options)
     except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.error(f"[Campus Skip Sections] Error: {str(e)}")
+        logger.error("[Campus Skip Sections] Error: %s", e)
         return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
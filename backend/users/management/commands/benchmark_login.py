@@ -0,0 +1,187 @@
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+
+from campus.models import Campus
+from teachers.models import Teacher
+from users.models import User
+from users.services import authenticate_login, find_login_user, get_login_profile, record_login_ip
+
+BENCHMARK_USERNAME_PREFIX = "BENCH-LGN-"
+BENCHMARK_PASSWORD = "Benchmark#2025"
+
+
+def legacy_login(email_or_code, password, ip):
+    """The login flow UserLoginView used before users.services."""
+    if not User.objects.filter(email=email_or_code).exists() and not User.objects.filter(username=email_or_code).exists():
+        return None
+    user = authenticate(None, username=email_or_code, password=password)
+    if not user:
+        try:
+            user_obj = User.objects.get(email=email_or_code)
+            user = authenticate(None, username=user_obj.username, password=password)
+        except User.DoesNotExist:
+            pass
+    if not (user and user.is_active):
+        return None
+    user.last_login_ip = ip
+    user.save()
+    teacher = Teacher.objects.get(employee_code=user.username)
+    return {
+        'teacher_id': teacher.id,
+        'campus_id': teacher.current_campus.id if teacher.current_campus else None,
+        'campus_name': teacher.current_campus.campus_name if teacher.current_campus else None,
+        'assigned_classroom_id': teacher.assigned_classroom.id if teacher.assigned_classroom else None,
+    }
+
+
+def fast_login(email_or_code, password, ip):
+    """UserLoginSerializer + UserLoginView as they are now."""
+    user = find_login_user(email_or_code)
+    if user is None:
+        return None
+    user = authenticate_login(None, user, password)
+    if user is None:
+        return None
+    record_login_ip(user, ip)
+    return get_login_profile(user)
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate a shift-start login storm against throwaway teacher accounts and "
+        "compare the legacy login flow with the users.services fast path. Run it "
+        "against PostgreSQL with the production password hasher."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=300, help="Teacher accounts to seed (default: 300)")
+        parser.add_argument("--logins", type=int, default=600, help="Logins per flow (default: 600)")
+        parser.add_argument("--workers", type=int, default=8, help="Concurrent logins (default: 8)")
+        parser.add_argument(
+            "--failure-rate",
+            type=float,
+            default=0.1,
+            help="Fraction of logins with a wrong password (default: 0.1)",
+        )
+        parser.add_argument("--keep", action="store_true", help="Keep the seeded accounts for another run")
+
+    def handle(self, *args, **options):
+        users: int = options["users"]
+        logins: int = options["logins"]
+        workers: int = options["workers"]
+        failure_rate: float = options["failure_rate"]
+
+        if users < 1 or logins < 1 or workers < 1:
+            raise CommandError("users, logins and workers must be >= 1")
+        if not 0 <= failure_rate <= 1:
+            raise CommandError("failure-rate must be between 0 and 1")
+        if connection.vendor != "postgresql":
+            self.stdout.write(self.style.WARNING(
+                f"⚠️ Database is {connection.vendor}; concurrency figures are only meaningful on PostgreSQL"
+            ))
+
+        try:
+            self.seed(users)
+            attempts = self.attempts(users, logins, failure_rate)
+            self.stdout.write(
+                f"🏁 {logins} logins per flow, {workers} workers, {failure_rate:.0%} wrong passwords, "
+                f"half by email and half by employee code"
+            )
+            self.report("Legacy", self.run(legacy_login, attempts, workers))
+            self.report("Fast", self.run(fast_login, attempts, workers))
+        finally:
+            if not options["keep"]:
+                deleted = User.objects.filter(username__startswith=BENCHMARK_USERNAME_PREFIX).delete()[1].get("users.User", 0)
+                Teacher.objects.filter(employee_code__startswith=BENCHMARK_USERNAME_PREFIX).delete()
+                self.stdout.write(f"🧹 Removed {deleted} seeded accounts")
+
+    def seed(self, total):
+        existing = User.objects.filter(username__startswith=BENCHMARK_USERNAME_PREFIX).count()
+        missing = total - existing
+        if missing <= 0:
+            self.stdout.write(f"♻️ Reusing {existing} seeded accounts")
+            return
+        self.stdout.write(f"🌱 Seeding {missing} teacher accounts...")
+        # One hash shared by every account; the hasher's cost is what the storm measures
+        password = make_password(BENCHMARK_PASSWORD)
+        campus = Campus.objects.first()
+        codes = [f"{BENCHMARK_USERNAME_PREFIX}{i:05d}" for i in range(existing, total)]
+        # bulk_create skips Teacher.save() and its signals (user creation, notifications)
+        User.objects.bulk_create([
+            User(
+                username=code,
+                email=f"{code.lower()}@benchmark.invalid",
+                password=password,
+                role='teacher',
+                has_changed_default_password=True,
+            )
+            for code in codes
+        ])
+        Teacher.objects.bulk_create([
+            Teacher(
+                full_name=f"Benchmark Teacher {code}",
+                dob="1990-01-01",
+                gender="female",
+                contact_number="0000000000",
+                email=f"{code.lower()}@benchmark.invalid",
+                cnic=code,
+                employee_code=code,
+                current_campus=campus,
+            )
+            for code in codes
+        ])
+
+    def attempts(self, total, logins, failure_rate):
+        rng = random.Random(42)
+        attempts = []
+        for i in range(logins):
+            code = f"{BENCHMARK_USERNAME_PREFIX}{rng.randrange(total):05d}"
+            email_or_code = f"{code.lower()}@benchmark.invalid" if i % 2 else code
+            password = "wrong-password" if rng.random() < failure_rate else BENCHMARK_PASSWORD
+            attempts.append((email_or_code, password, f"10.0.{i // 256 % 256}.{i % 256}"))
+        return attempts
+
+    def run(self, login, attempts, workers):
+        timings = []
+        queries = []
+        lock = threading.Lock()
+
+        def attempt(args):
+            executed = [0]
+
+            def count(execute, sql, params, many, context):
+                executed[0] += 1
+                return execute(sql, params, many, context)
+
+            try:
+                started = time.perf_counter()
+                with connection.execute_wrapper(count):
+                    login(*args)
+                elapsed = time.perf_counter() - started
+                with lock:
+                    timings.append(elapsed)
+                    queries.append(executed[0])
+            finally:
+                close_old_connections()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(attempt, attempts))
+        return time.perf_counter() - started, timings, queries
+
+    def report(self, label, result):
+        elapsed, timings, queries = result
+        ordered = sorted(timings)
+        p95 = ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+        self.stdout.write(self.style.SUCCESS(
+            f"{label:>6}: {len(timings) / elapsed:.1f} logins/s, p50 {statistics.median(ordered) * 1000:.1f}ms, "
+            f"p95 {p95 * 1000:.1f}ms, {sum(queries) / len(queries):.1f} queries/login (max {max(queries)})"
+        ))
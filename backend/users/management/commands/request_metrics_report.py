@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.request_metrics import SORT_FIELDS, collect_samples, reset_metrics, summarize
+
+
+class Command(BaseCommand):
+    help = (
+        "Print the endpoints with the highest cost from the samples collected by "
+        "RequestMetricsMiddleware (REQUEST_METRICS_ENABLED=True) across all workers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sort", default="total_ms", help=f"Sort column, one of: {', '.join(SORT_FIELDS)} (default: total_ms)")
+        parser.add_argument("--limit", type=int, default=20, help="Endpoints to show (default: 20)")
+        parser.add_argument("--sql", action="store_true", help="Also print the most repeated statement per endpoint")
+        parser.add_argument("--reset", action="store_true", help="Clear the collected samples after printing")
+
+    def handle(self, *args, **options):
+        sort: str = options["sort"]
+        limit: int = options["limit"]
+
+        if sort not in SORT_FIELDS:
+            raise CommandError(f"--sort must be one of: {', '.join(SORT_FIELDS)}")
+        if limit < 1:
+            raise CommandError("limit must be >= 1")
+        if not getattr(settings, "REQUEST_METRICS_ENABLED", False):
+            self.stdout.write(self.style.WARNING(
+                "⚠️ REQUEST_METRICS_ENABLED is off in this process; showing whatever workers published"
+            ))
+
+        samples = collect_samples()
+        report = summarize(samples, sort=sort, limit=limit)
+        if not report:
+            self.stdout.write("No request samples collected")
+        else:
+            self.stdout.write(
+                f"{'method':<7} {'endpoint':<45} {'reqs':>6} {'5xx':>4} {'total ms':>11} {'p50':>8} "
+                f"{'p95':>8} {'avg q':>6} {'max q':>6} {'db ms':>8} {'dup q':>6}"
+            )
+            for row in report:
+                self.stdout.write(
+                    f"{row['method']:<7} {row['endpoint'][:45]:<45} {row['requests']:>6} {row['errors']:>4} "
+                    f"{row['total_ms']:>11.1f} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} "
+                    f"{row['avg_queries']:>6.1f} {row['max_queries']:>6} {row['avg_db_ms']:>8.1f} "
+                    f"{row['duplicate_queries']:>6}"
+                )
+                if options["sql"] and row["top_duplicate"]:
+                    top = row["top_duplicate"]
+                    self.stdout.write(f"        ↳ {top['executions']}x {top['sql']}")
+
+        if options["reset"]:
+            reset_metrics()
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {len(samples)} samples across {len(report)} endpoints" + (" (cleared)" if options["reset"] else "")
+        ))
@@ -3,6 +3,9 @@ from django.contrib.auth.models import AbstractUser
 from django.utils import timezone
 from datetime import timedelta
 import secrets
+import logging
+
+logger = logging.getLogger(__name__)
 
 class User(AbstractUser):
     """
@@ -72,11 +75,11 @@ class User(AbstractUser):
                 
                 # Set username to employee code
                 self.username = employee_code
-                print(f"[OK] Auto-generated super admin employee code: {employee_code}")
+                logger.info("Auto-generated super admin employee code: %s", employee_code)
                     
             except Exception as e:
                 error_msg = str(e).encode('ascii', 'replace').decode('ascii') if isinstance(str(e), str) else repr(e)
-                print(f"[ERROR] Error generating super admin employee code: {error_msg}")
+                logger.error("Error generating super admin employee code: %s", error_msg)
         
         # Ensure super admin doesn't have campus assignment
         if self.role == 'superadmin':
@@ -0,0 +1,286 @@
+"""
+Cached payload of users.views.current_user_profile.
+
+Profiles are cached per user ID under a generation counter
+(utils.cache_generation) that the teacher, coordinator, principal and
+classroom signals bump along with the user scopes, and the campus signals
+bump on their own. Student profiles also carry a student generation that
+the student signals bump, so student writes leave staff profiles cached.
+Saving a User drops only that user's entry. Each entry carries an ETag of
+its content, so a matching If-None-Match is answered from the cache without
+building the profile.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.utils.encoders import JSONEncoder
+
+from utils.cache_generation import bump_generation, get_generation
+
+logger = logging.getLogger(__name__)
+
+PROFILE_CACHE_PREFIX = 'user_profile'
+# Second generation in student-role keys, so student writes leave staff profiles cached
+STUDENT_PROFILE_CACHE_PREFIX = 'user_profile_student'
+
+
+def build_user_profile(user) -> dict:
+    """The user's base fields plus the complete role-specific profile."""
+    # Base user data
+    user_data = {
+        'id': user.id,
+        'username': user.username,
+        'email': user.email,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'role': user.role,
+        'campus': {
+            'id': user.campus.id,
+            'campus_name': user.campus.campus_name,
+            'campus_code': user.campus.campus_code,
+        } if user.campus else None,
+    }
+    
+    # Add role-specific data with complete profile information
+    if user.role == 'teacher':
+        try:
+            from teachers.models import Teacher
+            teacher = Teacher.objects.select_related(
+                'current_campus', 'assigned_classroom__grade__level'
+            ).get(employee_code=user.username)
+            # Build assigned_classrooms list (supports multi-class assignment)
+            assigned_list = []
+            try:
+                for cr in teacher.assigned_classrooms.all().select_related('grade', 'grade__level'):
+                    assigned_list.append({
+                        'id': cr.id,
+                        'name': str(cr),
+                        'grade': cr.grade.name if cr.grade else None,
+                        'section': cr.section,
+                        'shift': cr.shift,
+                        'code': cr.code,
+                        'grade_id': cr.grade.id if cr.grade else None,
+                        'level_id': cr.grade.level.id if cr.grade and cr.grade.level else None,
+                        'level_name': cr.grade.level.name if cr.grade and cr.grade.level else None,
+                    })
+            except Exception:
+                assigned_list = []
+
+            user_data.update({
+                'teacher_id': teacher.id,
+                'full_name': teacher.full_name,
+                'dob': teacher.dob,
+                'gender': teacher.gender,
+                'contact_number': teacher.contact_number,
+                'email': teacher.email,
+                'cnic': teacher.cnic,
+                'permanent_address': teacher.permanent_address,
+                'education_level': teacher.education_level,
+                'institution_name': teacher.institution_name,
+                'year_of_passing': teacher.year_of_passing,
+                'total_experience_years': teacher.total_experience_years,
+                'profile_image': None,  # Teacher model doesn't have profile_image field
+                'employee_code': teacher.employee_code,
+                'joining_date': teacher.joining_date,
+                'is_class_teacher': teacher.is_class_teacher,
+                'is_currently_active': teacher.is_currently_active,
+                # Prefer legacy single assignment if present; otherwise default to first in list for compatibility
+                'assigned_classroom': ({
+                    'id': teacher.assigned_classroom.id,
+                    'name': str(teacher.assigned_classroom),
+                    'grade': teacher.assigned_classroom.grade.name if teacher.assigned_classroom.grade else None,
+                    'section': teacher.assigned_classroom.section,
+                    'shift': teacher.assigned_classroom.shift,
+                    'grade_id': teacher.assigned_classroom.grade.id if teacher.assigned_classroom.grade else None,
+                    'level_id': teacher.assigned_classroom.grade.level.id if teacher.assigned_classroom.grade and teacher.assigned_classroom.grade.level else None,
+                    'level_name': teacher.assigned_classroom.grade.level.name if teacher.assigned_classroom.grade and teacher.assigned_classroom.grade.level else None,
+                } if teacher.assigned_classroom else (
+                    assigned_list[0] if assigned_list else None
+                )),
+                'assigned_classrooms': assigned_list,
+                'current_campus': {
+                    'id': teacher.current_campus.id,
+                    'campus_name': teacher.current_campus.campus_name,
+                    'campus_code': teacher.current_campus.campus_code,
+                } if teacher.current_campus else None,
+                'created_at': teacher.date_created,
+                'updated_at': teacher.date_updated,
+            })
+        except Teacher.DoesNotExist:
+            pass
+    elif user.role == 'coordinator':
+        try:
+            from coordinator.models import Coordinator
+            coordinator = Coordinator.get_for_user(user)
+            if coordinator:
+                user_data.update({
+                    'coordinator_id': coordinator.id,
+                    'full_name': coordinator.full_name,
+                    'dob': coordinator.dob,
+                    'gender': coordinator.gender,
+                    'contact_number': coordinator.contact_number,
+                    'email': coordinator.email,
+                    'cnic': coordinator.cnic,
+                    'permanent_address': coordinator.permanent_address,
+                    'education_level': coordinator.education_level,
+                    'institution_name': coordinator.institution_name,
+                    'year_of_passing': coordinator.year_of_passing,
+                    'total_experience_years': coordinator.total_experience_years,
+                    'employee_code': coordinator.employee_code,
+                    'joining_date': coordinator.joining_date,
+                    'is_currently_active': coordinator.is_currently_active,
+                    'can_assign_class_teachers': coordinator.can_assign_class_teachers,
+                    'level': {
+                        'id': coordinator.level.id,
+                        'name': coordinator.level.name,
+                        'code': coordinator.level.code,
+                    } if coordinator.level else None,
+                    'campus': {
+                        'id': coordinator.campus.id,
+                        'campus_name': coordinator.campus.campus_name,
+                        'campus_code': coordinator.campus.campus_code,
+                    } if coordinator.campus else None,
+                    'created_at': coordinator.created_at,
+                    'updated_at': coordinator.updated_at,
+                })
+        except Exception:
+            pass
+    elif user.role == 'principal':
+        try:
+            from principals.models import Principal
+            principal = Principal.objects.get(employee_code=user.username)
+            user_data.update({
+                'principal_id': principal.id,
+                'full_name': principal.full_name,
+                'dob': principal.dob,
+                'gender': principal.gender,
+                'contact_number': principal.contact_number,
+                'email': principal.email,
+                'cnic': principal.cnic,
+                'permanent_address': principal.permanent_address,
+                'education_level': principal.education_level,
+                'institution_name': principal.institution_name,
+                'year_of_passing': principal.year_of_passing,
+                'total_experience_years': principal.total_experience_years,
+                'employee_code': principal.employee_code,
+                'joining_date': principal.joining_date,
+                'is_currently_active': principal.is_currently_active,
+                'shift': principal.shift,
+                'campus': {
+                    'id': principal.campus.id,
+                    'campus_name': principal.campus.campus_name,
+                    'campus_code': principal.campus.campus_code,
+                } if principal.campus else None,
+                'created_at': principal.created_at,
+                'updated_at': principal.updated_at,
+            })
+        except Principal.DoesNotExist:
+            pass
+    elif user.role == 'student':
+        try:
+            from students.models import Student
+            student = Student.objects.get(email=user.email)
+            user_data.update({
+                'student_id': student.id,
+                'name': student.name,
+                'dob': student.dob,
+                'gender': student.gender,
+                'contact_number': student.contact_number,
+                'email': student.email,
+                'cnic': student.cnic,
+                'permanent_address': student.permanent_address,
+                'father_name': student.father_name,
+                'father_cnic': student.father_cnic,
+                'father_contact': student.father_contact,
+                'father_occupation': student.father_occupation,
+                'mother_name': student.mother_name,
+                'mother_cnic': student.mother_cnic,
+                'mother_contact': student.mother_contact,
+                'mother_occupation': student.mother_occupation,
+                'guardian_name': student.guardian_name,
+                'guardian_contact': student.guardian_contact,
+                'guardian_relation': student.guardian_relation,
+                'photo': student.photo.url if student.photo else None,
+                'classroom': {
+                    'id': student.classroom.id,
+                    'name': str(student.classroom),
+                    'grade': student.classroom.grade.name if student.classroom.grade else None,
+                    'section': student.classroom.section,
+                    'shift': student.classroom.shift,
+                } if student.classroom else None,
+                'campus': {
+                    'id': student.campus.id,
+                    'campus_name': student.campus.campus_name,
+                    'campus_code': student.campus.campus_code,
+                } if student.campus else None,
+                'created_at': student.created_at,
+                'updated_at': student.updated_at,
+            })
+        except Student.DoesNotExist:
+            pass
+    
+    return user_data
+
+
+def profile_etag(user_data: dict) -> str:
+    content = json.dumps(user_data, cls=JSONEncoder, sort_keys=True)
+    return '"%s"' % hashlib.md5(content.encode('utf-8')).hexdigest()
+
+
+def _cache_key(user) -> Optional[str]:
+    generation = get_generation(PROFILE_CACHE_PREFIX)
+    if generation is None:
+        return None
+    if user.role != 'student':
+        return f'{PROFILE_CACHE_PREFIX}:{generation}:{user.id}'
+    student_generation = get_generation(STUDENT_PROFILE_CACHE_PREFIX)
+    if student_generation is None:
+        return None
+    return f'{PROFILE_CACHE_PREFIX}:{generation}:{student_generation}:{user.id}'
+
+
+def get_user_profile(user) -> tuple[dict, str]:
+    """``(profile, etag)`` for ``user``, built on a cache miss."""
+    key = _cache_key(user)
+    entry = None
+    if key:
+        try:
+            entry = cache.get(key)
+        except Exception:
+            entry = None
+
+    if entry is None:
+        user_data = build_user_profile(user)
+        entry = (user_data, profile_etag(user_data))
+        if key:
+            try:
+                cache.set(key, entry, getattr(settings, 'USER_PROFILE_CACHE_TIMEOUT', 300))
+            except Exception as e:
+                logger.warning("Could not cache profile for user %s: %s", user.id, e)
+    return entry
+
+
+def invalidate_user_profiles(**kwargs) -> None:
+    """Invalidate every cached profile. Safe to connect directly as a signal receiver."""
+    bump_generation(PROFILE_CACHE_PREFIX)
+
+
+def invalidate_student_profiles(**kwargs) -> None:
+    """Invalidate only student-role profiles. Safe to connect directly as a signal receiver."""
+    bump_generation(STUDENT_PROFILE_CACHE_PREFIX)
+
+
+def invalidate_user_profile(user) -> None:
+    """Drop one user's cached profile."""
+    key = _cache_key(user)
+    if key:
+        try:
+            cache.delete(key)
+        except Exception:
+            pass
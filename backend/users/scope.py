@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from utils.cache_generation import bump_generation, get_generation
+
+
+SCOPE_CACHE_PREFIX = 'user_scope'
+# Attribute used to memoize the scope on the request's user instance
+_REQUEST_ATTR = '_user_scope'
+
+
+@dataclass
+class UserScope:
+    """
+    What a user manages: the resolved role profile plus campus, level and
+    classroom ID sets. ``is_global`` is set for superadmins (no filtering).
+    """
+    user_id: int
+    role: str
+    is_global: bool = False
+    teacher_id: Optional[int] = None
+    coordinator_id: Optional[int] = None
+    principal_id: Optional[int] = None
+    campus_ids: frozenset = frozenset()
+    level_ids: frozenset = frozenset()
+    classroom_ids: frozenset = frozenset()
+    # Per-request memo (profile instances, student ids); never cached
+    _memo: dict = field(default_factory=dict, repr=False, compare=False)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_memo'] = {}
+        return state
+
+    def student_ids(self, with_deleted: bool = False) -> frozenset:
+        """IDs of students in the managed classrooms (memoized for the request)."""
+        key = ('student_ids', with_deleted)
+        if key not in self._memo:
+            from students.models import Student
+            manager = Student.objects.with_deleted() if with_deleted else Student.objects.all()
+            self._memo[key] = frozenset(
+                manager.filter(classroom_id__in=self.classroom_ids).values_list('id', flat=True)
+            ) if self.classroom_ids else frozenset()
+        return self._memo[key]
+
+    def teacher(self):
+        if 'teacher' not in self._memo:
+            from teachers.models import Teacher
+            self._memo['teacher'] = (
+                Teacher.objects.filter(pk=self.teacher_id).first() if self.teacher_id else None
+            )
+        return self._memo['teacher']
+
+    def coordinator(self):
+        if 'coordinator' not in self._memo:
+            from coordinator.models import Coordinator
+            self._memo['coordinator'] = (
+                Coordinator.objects.filter(pk=self.coordinator_id).first() if self.coordinator_id else None
+            )
+        return self._memo['coordinator']
+
+    def principal(self):
+        if 'principal' not in self._memo:
+            from principals.models import Principal
+            self._memo['principal'] = (
+                Principal.objects.filter(pk=self.principal_id).first() if self.principal_id else None
+            )
+        return self._memo['principal']
+
+
+def _find_teacher(user):
+    """Teacher linked to the user, else matched by employee_code or email."""
+    from teachers.models import Teacher
+
+    q = Q(user_id=user.id)
+    if user.username:
+        q |= Q(employee_code=user.username)
+    if user.email:
+        q |= Q(email__iexact=user.email)
+    candidates = list(Teacher.objects.filter(q))
+    # Prefer the linked account, then the employee_code match, then email
+    candidates.sort(key=lambda t: (t.user_id != user.id, t.employee_code != user.username))
+    return candidates[0] if candidates else None
+
+
+def coordinator_level_ids(coordinator) -> list[int]:
+    """Levels a coordinator manages: assigned_levels for 'both' shift, else the single level."""
+    if coordinator.shift == 'both':
+        assigned = list(coordinator.assigned_levels.values_list('id', flat=True))
+        if assigned:
+            return assigned
+    return [coordinator.level_id] if coordinator.level_id else []
+
+
+def _resolve_scope(user) -> UserScope:
+    from classes.models import ClassRoom
+
+    role = getattr(user, 'role', '') or ''
+    scope = UserScope(user_id=user.id, role=role)
+
+    if user.is_superuser or role == 'superadmin':
+        scope.is_global = True
+        return scope
+
+    if role == 'teacher':
+        teacher = _find_teacher(user)
+        if teacher:
+            classroom_ids = set(teacher.assigned_classrooms.values_list('id', flat=True))
+            if teacher.assigned_classroom_id:
+                classroom_ids.add(teacher.assigned_classroom_id)
+            scope.teacher_id = teacher.id
+            scope.classroom_ids = frozenset(classroom_ids)
+            scope._memo['teacher'] = teacher
+
+    elif role == 'coordinator':
+        from coordinator.models import Coordinator
+        coordinator = Coordinator.get_for_user(user)
+        if coordinator:
+            level_ids = coordinator_level_ids(coordinator)
+            scope.coordinator_id = coordinator.id
+            scope.level_ids = frozenset(level_ids)
+            if coordinator.campus_id:
+                scope.campus_ids = frozenset([coordinator.campus_id])
+            if level_ids:
+                scope.classroom_ids = frozenset(
+                    ClassRoom.objects.filter(
+                        grade__level_id__in=level_ids,
+                        grade__level__campus_id=coordinator.campus_id
+                    ).values_list('id', flat=True)
+                )
+            scope._memo['coordinator'] = coordinator
+
+    elif role == 'principal':
+        from principals.models import Principal
+        q = Q(user_id=user.id)
+        if user.email:
+            q |= Q(email=user.email)
+        principal = Principal.objects.filter(q).first()
+        campus_id = (principal.campus_id if principal else None) or user.campus_id
+        if principal:
+            scope.principal_id = principal.id
+            scope._memo['principal'] = principal
+        if campus_id:
+            from classes.models import Level
+            scope.campus_ids = frozenset([campus_id])
+            scope.level_ids = frozenset(Level.objects.filter(campus_id=campus_id).values_list('id', flat=True))
+            scope.classroom_ids = frozenset(
+                ClassRoom.objects.filter(grade__level__campus_id=campus_id).values_list('id', flat=True)
+            )
+
+    return scope
+
+
+def _cache_key(user) -> Optional[str]:
+    generation = get_generation(SCOPE_CACHE_PREFIX)
+    if generation is None:
+        return None
+    return f'{SCOPE_CACHE_PREFIX}:{generation}:{user.id}:{getattr(user, "role", "")}'
+
+
+def get_user_scope(user) -> Optional[UserScope]:
+    """
+    Return the UserScope for ``user``.
+
+    Memoized on the user instance (one per request) and cached in the
+    default cache; entries are dropped by bumping a generation counter
+    from the teacher, coordinator, principal and classroom signals.
+    """
+    if not user or not getattr(user, 'is_authenticated', False):
+        return None
+
+    scope = getattr(user, _REQUEST_ATTR, None)
+    if scope is not None:
+        return scope
+
+    key = _cache_key(user)
+    if key:
+        try:
+            scope = cache.get(key)
+        except Exception:
+            scope = None
+
+    if scope is None:
+        scope = _resolve_scope(user)
+        if key:
+            try:
+                cache.set(key, scope, getattr(settings, 'USER_SCOPE_CACHE_TIMEOUT', 300))
+            except Exception:
+                pass
+
+    setattr(user, _REQUEST_ATTR, scope)
+    return scope
+
+
+def invalidate_user_scopes(**kwargs) -> None:
+    """Invalidate every cached scope. Safe to connect directly as a signal receiver."""
+    bump_generation(SCOPE_CACHE_PREFIX)
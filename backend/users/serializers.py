@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
 from .models import User
+from .services import find_login_user
 from campus.models import Campus
 
 class CampusSerializer(serializers.ModelSerializer):
@@ -71,11 +72,12 @@ class UserLoginSerializer(serializers.Serializer):
     email = serializers.CharField()  # Changed from EmailField to CharField
     password = serializers.CharField()
     
-    def validate_email(self, value):
-        # Check if user exists with either email or username (employee code)
-        if not User.objects.filter(email=value).exists() and not User.objects.filter(username=value).exists():
-            raise serializers.ValidationError("User with this email or employee code does not exist")
-        return value
+    def validate(self, attrs):
+        # Resolve the user by email or username (employee code) once; the view checks the password against it
+        attrs['user'] = find_login_user(attrs['email'])
+        if attrs['user'] is None:
+            raise serializers.ValidationError({'email': "User with this email or employee code does not exist"})
+        return attrs
 
 class UserUpdateSerializer(serializers.ModelSerializer):
     """
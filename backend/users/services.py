@@ -0,0 +1,136 @@
+"""
+Login fast path for UserLoginView.
+
+A login costs one query to find the account by username or email (run by
+UserLoginSerializer), exactly one password hash, a targeted UPDATE of
+last_login_ip and one select_related query for the role profile.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Optional
+
+from django.contrib.auth.signals import user_login_failed
+from django.db.models import Case, IntegerField, Q, Value, When
+
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+
+def _first_match(field: str, value) -> Case:
+    """Ordering expression that puts rows whose ``field`` equals ``value`` first."""
+    return Case(When(**{field: value}, then=Value(0)), default=Value(1), output_field=IntegerField())
+
+
+def find_login_user(email_or_code: str) -> Optional[User]:
+    """The user whose username (employee code) or email is ``email_or_code``; a username match wins."""
+    return (
+        User.objects.filter(Q(username=email_or_code) | Q(email=email_or_code))
+        .order_by(_first_match('username', email_or_code))
+        .first()
+    )
+
+
+def authenticate_login(request, user: Optional[User], password: str) -> Optional[User]:
+    """
+    Check ``password`` for a user from ``find_login_user`` with exactly one
+    hash; the same outcome as ``authenticate`` by username and then by email
+    (the default ModelBackend). Returns None for unknown accounts, wrong
+    passwords and inactive users.
+    """
+    if user is None:
+        # Hash anyway so unknown accounts take as long as wrong passwords
+        User().set_password(password)
+    elif user.check_password(password) and user.is_active:
+        return user
+    credentials = {'username': user.username if user else None}
+    user_login_failed.send(sender=__name__, credentials=credentials, request=request)
+    return None
+
+
+def record_login_ip(user: User, ip: Optional[str]) -> None:
+    """Store the login IP without a full save (no User.save() logic or signals)."""
+    User.objects.filter(pk=user.pk).update(last_login_ip=ip)
+    user.last_login_ip = ip
+
+
+def get_login_profile(user: User) -> dict:
+    """User fields plus the role profile, each role profile loaded in one query."""
+    profile_data = {
+        'id': user.id,
+        'username': user.username,
+        'email': user.email,
+        'role': user.role,
+        'is_active': user.is_active,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+    }
+
+    if user.role == 'principal':
+        from principals.models import Principal
+        principal = Principal.objects.select_related('campus').filter(employee_code=user.username).first()
+        if principal:
+            profile_data.update({
+                'principal_id': principal.id,
+                'campus_id': principal.campus.id if principal.campus else None,
+                'campus_name': principal.campus.campus_name if principal.campus else None,
+                'campus_code': principal.campus.campus_code if principal.campus else None,
+                'full_name': principal.full_name,
+                'contact_number': principal.contact_number,
+                'employee_code': principal.employee_code,
+                'shift': principal.shift,
+            })
+
+    elif user.role == 'coordinator':
+        from coordinator.models import Coordinator
+        # Same precedence as Coordinator.get_for_user: employee code, then email
+        match = Q(employee_code=user.username)
+        if user.email:
+            match |= Q(email=user.email)
+        try:
+            coordinator = (
+                Coordinator.objects.select_related('campus', 'level')
+                .filter(match)
+                .order_by(_first_match('employee_code', user.username))
+                .first()
+            )
+        except Exception as e:
+            # Return the base profile rather than failing the login
+            logger.warning("Could not load coordinator profile for %s: %s", user.username, e)
+            coordinator = None
+        if coordinator:
+            profile_data.update({
+                'coordinator_id': coordinator.id,
+                'campus_id': coordinator.campus.id if coordinator.campus else None,
+                'campus_name': coordinator.campus.campus_name if coordinator.campus else None,
+                'campus_code': coordinator.campus.campus_code if coordinator.campus else None,
+                'level_id': coordinator.level.id if coordinator.level else None,
+                'level_name': coordinator.level.name if coordinator.level else None,
+                'full_name': coordinator.full_name,
+                'contact_number': coordinator.contact_number,
+                'employee_code': coordinator.employee_code,
+            })
+
+    elif user.role == 'teacher':
+        from teachers.models import Teacher
+        teacher = (
+            Teacher.objects.select_related('current_campus', 'assigned_classroom__grade')
+            .filter(employee_code=user.username)
+            .first()
+        )
+        if teacher:
+            classroom = teacher.assigned_classroom
+            profile_data.update({
+                'teacher_id': teacher.id,
+                'campus_id': teacher.current_campus.id if teacher.current_campus else None,
+                'campus_name': teacher.current_campus.campus_name if teacher.current_campus else None,
+                'full_name': teacher.full_name,
+                'contact_number': teacher.contact_number,
+                'employee_code': teacher.employee_code,
+                'assigned_classroom_id': classroom.id if classroom else None,
+                'assigned_classroom_name': f"{classroom.grade.name}-{classroom.section}" if classroom else None,
+                'is_class_teacher': teacher.is_class_teacher,
+            })
+
+    return profile_data
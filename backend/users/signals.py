@@ -1,6 +1,7 @@
-from django.db.models.signals import post_delete
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from .models import User
+from .profile import invalidate_user_profile
 
 
 @receiver(post_delete, sender=User)
@@ -34,3 +35,10 @@ def cleanup_role_entities_on_user_delete(sender, instance: User, **kwargs):
         pass
 
 
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_profile_on_user_change(sender, instance: User, **kwargs):
+    """current_user_profile embeds the user's own fields and campus"""
+    invalidate_user_profile(instance)
@@ -0,0 +1,16 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class RoleRefreshToken(RefreshToken):
+    """
+    RefreshToken with ``role`` and ``campus_id`` claims. Access tokens and
+    refreshed tokens copy them, so the WebSocket consumer can identify the
+    user without a database lookup.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token['role'] = user.role
+        token['campus_id'] = user.campus_id
+        return token
@@ -15,7 +15,8 @@ from .views import (
     change_password_with_otp,
     send_forgot_password_otp,
     verify_forgot_password_otp,
-    reset_password_with_otp
+    reset_password_with_otp,
+    request_metrics_report,
 )
 
 urlpatterns = [
@@ -41,4 +42,7 @@ urlpatterns = [
     path('send-forgot-password-otp/', send_forgot_password_otp, name='send_forgot_password_otp'),
     path('verify-forgot-password-otp/', verify_forgot_password_otp, name='verify_forgot_password_otp'),
     path('reset-password-with-otp/', reset_password_with_otp, name='reset_password_with_otp'),
+    
+    # Per-endpoint query/latency metrics (superadmin only)
+    path('metrics/requests/', request_metrics_report, name='request_metrics_report'),
 ]
@@ -1,5 +1,3 @@
-from django.db import transaction
-from django.db.models import F
 from .models import User
 from campus.models import Campus
 
@@ -26,27 +24,27 @@ def get_next_student_number(campus, enrollment_year):
     System-wide strictly increasing student number (never repeats).
     Ignores campus/year to guarantee global uniqueness as requested.
     """
-    from services.models import GlobalCounter
+    from services.counters import next_number
 
-    with transaction.atomic():
-        counter, _ = GlobalCounter.objects.select_for_update().get_or_create(key='student')
-        counter.value = F('value') + 1
-        counter.save(update_fields=['value'])
-        counter.refresh_from_db()
-        return counter.value
+    return next_number('student')
+
+def reserve_student_numbers(count):
+    """
+    Reserve ``count`` consecutive student numbers with a single counter
+    increment and return them as a range (empty when count <= 0).
+    Used by bulk creators so the counter row is locked once per batch.
+    """
+    from services.counters import reserve_block
+
+    return reserve_block('student', count)
 
 def get_next_teacher_number(campus, joining_year):
     """
     System-wide strictly increasing employee number (never repeats).
     """
-    from services.models import GlobalCounter
+    from services.counters import next_number
 
-    with transaction.atomic():
-        counter, _ = GlobalCounter.objects.select_for_update().get_or_create(key='employee')
-        counter.value = F('value') + 1
-        counter.save(update_fields=['value'])
-        counter.refresh_from_db()
-        return counter.value
+    return next_number('employee')
 
 def get_role_code(role):
     """
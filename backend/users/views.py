@@ -2,17 +2,22 @@ from rest_framework import status, generics
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
-from django.contrib.auth import authenticate
 from django.contrib.auth.hashers import make_password
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
 from .models import User, PasswordChangeOTP
 from .serializers import UserSerializer, UserRegistrationSerializer, UserLoginSerializer
+from .services import authenticate_login, get_login_profile, record_login_ip
+from .tokens import RoleRefreshToken
+from .profile import get_user_profile
 from .permissions import IsSuperAdmin, IsPrincipal, IsCoordinator, IsTeacher
 from .validators import validate_password_strength
 from services.email_notification_service import EmailNotificationService
 from notifications.services import create_notification
 import secrets
+import logging
+
+logger = logging.getLogger(__name__)
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -51,22 +56,10 @@ class UserLoginView(generics.GenericAPIView):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        email_or_code = serializer.validated_data['email']
         password = serializer.validated_data['password']
         
-        # Try to authenticate with email first, then with username (employee code)
-        user = None
-        
-        # First try with email as username
-        user = authenticate(request, username=email_or_code, password=password)
-        
-        # If that fails, try to find user by email and authenticate with their username
-        if not user:
-            try:
-                user_obj = User.objects.get(email=email_or_code)
-                user = authenticate(request, username=user_obj.username, password=password)
-            except User.DoesNotExist:
-                pass
+        # The serializer resolved the user by email or username; check the password with a single hash
+        user = authenticate_login(request, serializer.validated_data['user'], password)
         
         if user and user.is_active:
             # Check if user needs to change password
@@ -78,14 +71,13 @@ class UserLoginView(generics.GenericAPIView):
                 }, status=status.HTTP_200_OK)
             
             # Generate JWT tokens
-            refresh = RefreshToken.for_user(user)
+            refresh = RoleRefreshToken.for_user(user)
             
             # Update last login IP
-            user.last_login_ip = self.get_client_ip(request)
-            user.save()
+            record_login_ip(user, self.get_client_ip(request))
             
             # Get complete user profile
-            user_profile = self.get_complete_user_profile(user)
+            user_profile = get_login_profile(user)
             
             return Response({
                 'access': str(refresh.access_token),
@@ -98,75 +90,6 @@ class UserLoginView(generics.GenericAPIView):
             'error': 'Invalid credentials'
         }, status=status.HTTP_401_UNAUTHORIZED)
     
-    def get_complete_user_profile(self, user):
-        """Get complete user profile based on role"""
-        profile_data = {
-            'id': user.id,
-            'username': user.username,
-            'email': user.email,
-            'role': user.role,
-            'is_active': user.is_active,
-            'first_name': user.first_name,
-            'last_name': user.last_name,
-        }
-        
-        if user.role == 'principal':
-            try:
-                from principals.models import Principal
-                principal = Principal.objects.get(employee_code=user.username)
-                profile_data.update({
-                    'principal_id': principal.id,
-                    'campus_id': principal.campus.id if principal.campus else None,
-                    'campus_name': principal.campus.campus_name if principal.campus else None,
-                    'campus_code': principal.campus.campus_code if principal.campus else None,
-                    'full_name': principal.full_name,
-                    'contact_number': principal.contact_number,
-                    'employee_code': principal.employee_code,
-                    'shift': principal.shift,
-                })
-            except Principal.DoesNotExist:
-                pass
-                
-        elif user.role == 'coordinator':
-            try:
-                from coordinator.models import Coordinator
-                coordinator = Coordinator.get_for_user(user)
-                if coordinator:
-                    profile_data.update({
-                        'coordinator_id': coordinator.id,
-                        'campus_id': coordinator.campus.id if coordinator.campus else None,
-                        'campus_name': coordinator.campus.campus_name if coordinator.campus else None,
-                        'campus_code': coordinator.campus.campus_code if coordinator.campus else None,
-                        'level_id': coordinator.level.id if coordinator.level else None,
-                        'level_name': coordinator.level.name if coordinator.level else None,
-                        'full_name': coordinator.full_name,
-                        'contact_number': coordinator.contact_number,
-                        'employee_code': coordinator.employee_code,
-                    })
-            except Exception:
-                # Swallow errors and return base profile_data
-                pass
-                
-        elif user.role == 'teacher':
-            try:
-                from teachers.models import Teacher
-                teacher = Teacher.objects.get(employee_code=user.username)
-                profile_data.update({
-                    'teacher_id': teacher.id,
-                    'campus_id': teacher.current_campus.id if teacher.current_campus else None,
-                    'campus_name': teacher.current_campus.campus_name if teacher.current_campus else None,
-                    'full_name': teacher.full_name,
-                    'contact_number': teacher.contact_number,
-                    'employee_code': teacher.employee_code,
-                    'assigned_classroom_id': teacher.assigned_classroom.id if teacher.assigned_classroom else None,
-                    'assigned_classroom_name': f"{teacher.assigned_classroom.grade.name}-{teacher.assigned_classroom.section}" if teacher.assigned_classroom else None,
-                    'is_class_teacher': teacher.is_class_teacher,
-                })
-            except Teacher.DoesNotExist:
-                pass
-        
-        return profile_data
-    
     def get_client_ip(self, request):
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
         if x_forwarded_for:
@@ -235,202 +158,18 @@ class UserListView(generics.ListAPIView):
 @permission_classes([IsAuthenticated])
 def current_user_profile(request):
     """
-    Get current user's profile with complete role-specific data
+    Get current user's profile with complete role-specific data.
+    Served from the profile cache; answers 304 when If-None-Match matches.
     """
-    user = request.user
-    
-    # Base user data
-    user_data = {
-        'id': user.id,
-        'username': user.username,
-        'email': user.email,
-        'first_name': user.first_name,
-        'last_name': user.last_name,
-        'role': user.role,
-        'campus': {
-            'id': user.campus.id,
-            'campus_name': user.campus.campus_name,
-            'campus_code': user.campus.campus_code,
-        } if user.campus else None,
-    }
-    
-    # Add role-specific data with complete profile information
-    if user.role == 'teacher':
-        try:
-            from teachers.models import Teacher
-            teacher = Teacher.objects.get(employee_code=user.username)
-            # Build assigned_classrooms list (supports multi-class assignment)
-            assigned_list = []
-            try:
-                for cr in teacher.assigned_classrooms.all().select_related('grade', 'grade__level'):
-                    assigned_list.append({
-                        'id': cr.id,
-                        'name': str(cr),
-                        'grade': cr.grade.name if cr.grade else None,
-                        'section': cr.section,
-                        'shift': cr.shift,
-                        'code': cr.code,
-                        'grade_id': cr.grade.id if cr.grade else None,
-                        'level_id': cr.grade.level.id if cr.grade and cr.grade.level else None,
-                        'level_name': cr.grade.level.name if cr.grade and cr.grade.level else None,
-                    })
-            except Exception:
-                assigned_list = []
-
-            user_data.update({
-                'teacher_id': teacher.id,
-                'full_name': teacher.full_name,
-                'dob': teacher.dob,
-                'gender': teacher.gender,
-                'contact_number': teacher.contact_number,
-                'email': teacher.email,
-                'cnic': teacher.cnic,
-                'permanent_address': teacher.permanent_address,
-                'education_level': teacher.education_level,
-                'institution_name': teacher.institution_name,
-                'year_of_passing': teacher.year_of_passing,
-                'total_experience_years': teacher.total_experience_years,
-                'profile_image': None,  # Teacher model doesn't have profile_image field
-                'employee_code': teacher.employee_code,
-                'joining_date': teacher.joining_date,
-                'is_class_teacher': teacher.is_class_teacher,
-                'is_currently_active': teacher.is_currently_active,
-                # Prefer legacy single assignment if present; otherwise default to first in list for compatibility
-                'assigned_classroom': ({
-                    'id': teacher.assigned_classroom.id,
-                    'name': str(teacher.assigned_classroom),
-                    'grade': teacher.assigned_classroom.grade.name if teacher.assigned_classroom.grade else None,
-                    'section': teacher.assigned_classroom.section,
-                    'shift': teacher.assigned_classroom.shift,
-                    'grade_id': teacher.assigned_classroom.grade.id if teacher.assigned_classroom.grade else None,
-                    'level_id': teacher.assigned_classroom.grade.level.id if teacher.assigned_classroom.grade and teacher.assigned_classroom.grade.level else None,
-                    'level_name': teacher.assigned_classroom.grade.level.name if teacher.assigned_classroom.grade and teacher.assigned_classroom.grade.level else None,
-                } if teacher.assigned_classroom else (
-                    assigned_list[0] if assigned_list else None
-                )),
-                'assigned_classrooms': assigned_list,
-                'current_campus': {
-                    'id': teacher.current_campus.id,
-                    'campus_name': teacher.current_campus.campus_name,
-                    'campus_code': teacher.current_campus.campus_code,
-                } if teacher.current_campus else None,
-                'created_at': teacher.date_created,
-                'updated_at': teacher.date_updated,
-            })
-        except Teacher.DoesNotExist:
-            pass
-    elif user.role == 'coordinator':
-        try:
-            from coordinator.models import Coordinator
-            coordinator = Coordinator.get_for_user(user)
-            if coordinator:
-                user_data.update({
-                    'coordinator_id': coordinator.id,
-                    'full_name': coordinator.full_name,
-                    'dob': coordinator.dob,
-                    'gender': coordinator.gender,
-                    'contact_number': coordinator.contact_number,
-                    'email': coordinator.email,
-                    'cnic': coordinator.cnic,
-                    'permanent_address': coordinator.permanent_address,
-                    'education_level': coordinator.education_level,
-                    'institution_name': coordinator.institution_name,
-                    'year_of_passing': coordinator.year_of_passing,
-                    'total_experience_years': coordinator.total_experience_years,
-                    'employee_code': coordinator.employee_code,
-                    'joining_date': coordinator.joining_date,
-                    'is_currently_active': coordinator.is_currently_active,
-                    'can_assign_class_teachers': coordinator.can_assign_class_teachers,
-                    'level': {
-                        'id': coordinator.level.id,
-                        'name': coordinator.level.name,
-                        'code': coordinator.level.code,
-                    } if coordinator.level else None,
-                    'campus': {
-                        'id': coordinator.campus.id,
-                        'campus_name': coordinator.campus.campus_name,
-                        'campus_code': coordinator.campus.campus_code,
-                    } if coordinator.campus else None,
-                    'created_at': coordinator.created_at,
-                    'updated_at': coordinator.updated_at,
-                })
-        except Exception:
-            pass
-    elif user.role == 'principal':
-        try:
-            from principals.models import Principal
-            principal = Principal.objects.get(employee_code=user.username)
-            user_data.update({
-                'principal_id': principal.id,
-                'full_name': principal.full_name,
-                'dob': principal.dob,
-                'gender': principal.gender,
-                'contact_number': principal.contact_number,
-                'email': principal.email,
-                'cnic': principal.cnic,
-                'permanent_address': principal.permanent_address,
-                'education_level': principal.education_level,
-                'institution_name': principal.institution_name,
-                'year_of_passing': principal.year_of_passing,
-                'total_experience_years': principal.total_experience_years,
-                'employee_code': principal.employee_code,
-                'joining_date': principal.joining_date,
-                'is_currently_active': principal.is_currently_active,
-                'shift': principal.shift,
-                'campus': {
-                    'id': principal.campus.id,
-                    'campus_name': principal.campus.campus_name,
-                    'campus_code': principal.campus.campus_code,
-                } if principal.campus else None,
-                'created_at': principal.created_at,
-                'updated_at': principal.updated_at,
-            })
-        except Principal.DoesNotExist:
-            pass
-    elif user.role == 'student':
-        try:
-            from students.models import Student
-            student = Student.objects.get(email=user.email)
-            user_data.update({
-                'student_id': student.id,
-                'name': student.name,
-                'dob': student.dob,
-                'gender': student.gender,
-                'contact_number': student.contact_number,
-                'email': student.email,
-                'cnic': student.cnic,
-                'permanent_address': student.permanent_address,
-                'father_name': student.father_name,
-                'father_cnic': student.father_cnic,
-                'father_contact': student.father_contact,
-                'father_occupation': student.father_occupation,
-                'mother_name': student.mother_name,
-                'mother_cnic': student.mother_cnic,
-                'mother_contact': student.mother_contact,
-                'mother_occupation': student.mother_occupation,
-                'guardian_name': student.guardian_name,
-                'guardian_contact': student.guardian_contact,
-                'guardian_relation': student.guardian_relation,
-                'photo': student.photo.url if student.photo else None,
-                'classroom': {
-                    'id': student.classroom.id,
-                    'name': str(student.classroom),
-                    'grade': student.classroom.grade.name if student.classroom.grade else None,
-                    'section': student.classroom.section,
-                    'shift': student.classroom.shift,
-                } if student.classroom else None,
-                'campus': {
-                    'id': student.campus.id,
-                    'campus_name': student.campus.campus_name,
-                    'campus_code': student.campus.campus_code,
-                } if student.campus else None,
-                'created_at': student.created_at,
-                'updated_at': student.updated_at,
-            })
-        except Student.DoesNotExist:
-            pass
-    
-    return Response(user_data)
+    user_data, etag = get_user_profile(request.user)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+    response = Response(user_data)
+    response['ETag'] = etag
+    # Revalidate on every page load; the 304 path is a cache lookup
+    response['Cache-Control'] = 'private, no-cache'
+    return response
 
 # @api_view(['POST'])
 # @permission_classes([IsAuthenticated])
@@ -646,7 +385,7 @@ def change_password_with_otp(request):
                 data={'type': 'password_change', 'message': 'Your password was changed successfully. Please login with your new password.'}
             )
         except Exception as e:
-            print(f"Error creating password change notification: {str(e)}")
+            logger.warning("Error creating password change notification: %s", e)
         
         # If user is a teacher, notify their coordinators
         if user.is_teacher():
@@ -686,7 +425,7 @@ def change_password_with_otp(request):
                                 }
                             )
             except Exception as e:
-                print(f"Error notifying coordinators about teacher password change: {str(e)}")
+                logger.warning("Error notifying coordinators about teacher password change: %s", e)
         
         return Response({
             'message': 'Password changed successfully. Please login again.'
@@ -866,7 +605,7 @@ def reset_password_with_otp(request):
                 data={'type': 'password_reset', 'message': 'Your password was reset successfully. Please login with your new password.'}
             )
         except Exception as e:
-            print(f"Error creating password reset notification: {str(e)}")
+            logger.warning("Error creating password reset notification: %s", e)
         
         # If user is a teacher, notify their coordinators
         if user.is_teacher():
@@ -906,7 +645,7 @@ def reset_password_with_otp(request):
                                 }
                             )
             except Exception as e:
-                print(f"Error notifying coordinators about teacher password change: {str(e)}")
+                logger.warning("Error notifying coordinators about teacher password change: %s", e)
         
         return Response({
             'message': 'Password reset successfully. Please login with your new password.'
@@ -914,3 +653,34 @@ def reset_password_with_otp(request):
         
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAuthenticated, IsSuperAdmin])
+def request_metrics_report(request):
+    """
+    Per-endpoint query count and latency aggregates from RequestMetricsMiddleware.
+    Query params: sort (total_ms, p95_ms, avg_queries, duplicate_queries, ...), limit.
+    DELETE clears the collected samples.
+    """
+    from django.conf import settings
+    from utils.request_metrics import collect_samples, reset_metrics, summarize
+    
+    if request.method == 'DELETE':
+        reset_metrics()
+        return Response({'message': 'Request metrics cleared'}, status=status.HTTP_200_OK)
+    
+    try:
+        limit = max(1, min(int(request.GET.get('limit', 20)), 200))
+    except (TypeError, ValueError):
+        limit = 20
+    samples = collect_samples()
+    try:
+        endpoints = summarize(samples, sort=request.GET.get('sort', 'total_ms'), limit=limit)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({
+        'enabled': getattr(settings, 'REQUEST_METRICS_ENABLED', False),
+        'samples': len(samples),
+        'endpoints': endpoints,
+    }, status=status.HTTP_200_OK)
@@ -0,0 +1,140 @@
+"""
+Helpers shared by the CSV import commands' bulk mode: streaming chunked
+reads, a preloaded classroom lookup and a chunk runner with optional
+worker threads.
+"""
+from __future__ import annotations
+
+import csv
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, Optional
+
+from django.db import close_old_connections
+
+from classes.grade_keys import canonical_grade_key
+
+
+def iter_csv_chunks(path: str, batch_size: int, encoding: str = 'utf-8') -> Iterator[list]:
+    """
+    Stream a CSV file as lists of ``(row_num, row)`` pairs of at most
+    ``batch_size`` rows. Row numbers match the spreadsheet (header is row 1).
+    """
+    batch_size = max(int(batch_size or 1), 1)
+    with open(path, 'r', encoding=encoding, newline='') as file:
+        chunk = []
+        for row_num, row in enumerate(csv.DictReader(file), start=2):
+            chunk.append((row_num, row))
+            if len(chunk) >= batch_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+class ClassroomLookup:
+    """
+    All classrooms of a campus loaded in one query and keyed for the import
+    commands, replacing the per-row Grade/ClassRoom queries.
+    """
+
+    def __init__(self, campus):
+        from classes.models import ClassRoom
+
+        self.rooms = list(
+            ClassRoom.objects.filter(grade__level__campus=campus)
+            .select_related('grade__level')
+            .order_by('id')
+        )
+        self._exact = {}
+        self._by_key = {}
+        for room in self.rooms:
+            self._by_key.setdefault((canonical_grade_key(room.grade.name), room.section, room.shift), room)
+            # Same rule as the row-by-row import: the grade's level and the
+            # classroom must both run in the requested shift
+            if room.grade.level.shift != room.shift:
+                continue
+            self._exact.setdefault((room.grade.name, room.section, room.shift), room)
+
+    def get(self, grade_name: str, section: str, shift: str):
+        """Classroom whose grade is named exactly ``grade_name``."""
+        return self._exact.get((grade_name, section, shift))
+
+    def match(self, grade_name: str, section: str, shift: str):
+        """
+        Fallback used by Student.save: a classroom in the campus whose grade
+        has the same canonical key, or for unrecognized grades one whose
+        name contains ``grade_name`` (or its dash/space variant).
+        """
+        if not grade_name:
+            return None
+        grade_key = canonical_grade_key(grade_name)
+        if grade_key:
+            return self._by_key.get((grade_key, section, shift))
+        variants = {
+            grade_name.lower(),
+            grade_name.replace('-', ' ').lower(),
+            grade_name.replace(' ', '-').lower(),
+        }
+        for room in self.rooms:
+            if room.section != section or room.shift != shift:
+                continue
+            name = room.grade.name.lower()
+            if any(variant in name for variant in variants):
+                return room
+        return None
+
+
+def run_chunks(chunks, handler: Callable[[list], object], workers: int = 1,
+               on_result: Optional[Callable[[object], None]] = None) -> None:
+    """
+    Call ``handler(chunk)`` for every chunk, inline or on ``workers`` threads.
+    At most ``workers * 2`` chunks are read ahead so large files stay streamed.
+    """
+    def _run(chunk):
+        try:
+            return handler(chunk)
+        finally:
+            # Each worker thread holds its own DB connection
+            if workers > 1:
+                close_old_connections()
+
+    if workers <= 1:
+        for chunk in chunks:
+            result = _run(chunk)
+            if on_result:
+                on_result(result)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='csv-import') as executor:
+        pending = []
+        for chunk in chunks:
+            pending.append(executor.submit(_run, chunk))
+            if len(pending) >= workers * 2:
+                result = pending.pop(0).result()
+                if on_result:
+                    on_result(result)
+        for future in pending:
+            result = future.result()
+            if on_result:
+                on_result(result)
+
+
+class Throughput:
+    """Rows/second counter for the import summaries."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.rows = 0
+
+    def add(self, rows: int) -> None:
+        self.rows += rows
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def __str__(self):
+        elapsed = self.elapsed
+        rate = self.rows / elapsed if elapsed > 0 else 0.0
+        return f'{self.rows} rows in {elapsed:.2f}s ({rate:.1f} rows/sec)'
@@ -0,0 +1,34 @@
+import time
+
+from django.core.cache import cache
+
+
+def _new_generation():
+    # Time-seeded so a counter lost to eviction never reuses an old generation
+    return int(time.time() * 1000)
+
+
+def get_generation(namespace):
+    """
+    Current generation number for a cache namespace, or None if the cache
+    is unreachable. Embed it in cache keys so a bump invalidates them all.
+    """
+    try:
+        return cache.get_or_set(f'{namespace}:generation', _new_generation, timeout=None)
+    except Exception:
+        return None
+
+
+def bump_generation(namespace):
+    """Invalidate every key built from the namespace's current generation."""
+    key = f'{namespace}:generation'
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Counter missing (evicted or never set) - start a fresh generation
+        try:
+            cache.set(key, _new_generation(), timeout=None)
+        except Exception:
+            pass
+    except Exception:
+        pass
@@ -0,0 +1,178 @@
+"""
+Opt-in read-replica routing.
+
+Reads go to the ``replica`` alias only inside ``use_replica()``, which the
+``replica_reads`` decorator, ``ReplicaReadMixin`` and ``ReplicaGraphQLView``
+enter for read-only analytics endpoints. Everything else, and every read in
+such a block, stays on ``default`` when:
+
+- no ``replica`` database is configured,
+- the current request has already written (pinned to primary),
+- ``default`` is inside a transaction, or
+- the replica lags more than REPLICA_MAX_LAG_SECONDS or is unreachable
+  (checked at most every REPLICA_LAG_CHECK_INTERVAL seconds per process).
+
+For local testing point DB_REPLICA_NAME at a second database and run
+``migrate --database=replica``.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Optional
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+REPLICA_ALIAS = 'replica'
+PRIMARY_ALIAS = 'default'
+
+_replica_reads: ContextVar[bool] = ContextVar('replica_reads', default=False)
+_pinned_to_primary: ContextVar[bool] = ContextVar('pinned_to_primary', default=False)
+
+# Seconds of replay lag behind the primary; 0 when the replica has replayed
+# everything it received or the database is not a standby.
+LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+def replica_configured() -> bool:
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def measure_replica_lag(alias: str = REPLICA_ALIAS) -> Optional[float]:
+    """Replication lag in seconds, or None when the replica cannot be queried."""
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        return 0.0
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(LAG_SQL)
+            return float(cursor.fetchone()[0] or 0)
+    except Exception as e:
+        logger.warning("Replica %s unavailable: %s", alias, e)
+        connection.close()
+        return None
+
+
+class _LagCheck:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checked_at = float('-inf')
+        self.fresh = False
+
+    def replica_is_fresh(self) -> bool:
+        interval = getattr(settings, 'REPLICA_LAG_CHECK_INTERVAL', 5.0)
+        now = time.monotonic()
+        if now - self.checked_at < interval:
+            return self.fresh
+        with self.lock:
+            if now - self.checked_at >= interval:
+                lag = measure_replica_lag()
+                self.fresh = lag is not None and lag <= getattr(settings, 'REPLICA_MAX_LAG_SECONDS', 5.0)
+                self.checked_at = time.monotonic()
+                if not self.fresh:
+                    logger.info("Replica reads disabled for %ss (lag: %s)", interval, lag)
+        return self.fresh
+
+
+_lag_check = _LagCheck()
+
+
+@contextmanager
+def use_replica():
+    """Route reads in this block to the replica when it is safe to."""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+@contextmanager
+def use_primary():
+    """Force reads in this block (e.g. read-your-writes checks) onto default."""
+    token = _replica_reads.set(False)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def replica_reads(view_func):
+    """Decorator for function views and viewset actions that only read."""
+    @wraps(view_func)
+    def wrapper(*args, **kwargs):
+        with use_replica():
+            return view_func(*args, **kwargs)
+    return wrapper
+
+
+class ReplicaReadMixin:
+    """
+    For class-based views: GET/HEAD requests read from the replica.
+    Set ``replica_actions`` on a viewset to limit it to those actions.
+    """
+    replica_actions: Optional[frozenset] = None
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.reads_from_replica(request):
+            with use_replica():
+                return super().dispatch(request, *args, **kwargs)
+        return super().dispatch(request, *args, **kwargs)
+
+    def reads_from_replica(self, request) -> bool:
+        method = request.method.lower()
+        if method not in ('get', 'head'):
+            return False
+        if self.replica_actions is None:
+            return True
+        return (getattr(self, 'action_map', None) or {}).get(method) in self.replica_actions
+
+
+def reset_primary_pin(**kwargs) -> None:
+    _pinned_to_primary.set(False)
+
+
+request_started.connect(reset_primary_pin, dispatch_uid='utils.db_routing.reset_primary_pin')
+
+
+class ReplicaRouter:
+    """settings.DATABASE_ROUTERS entry; see the module docstring for when reads use the replica."""
+
+    def db_for_read(self, model, **hints):
+        if not replica_configured():
+            return None
+        if (
+            _replica_reads.get()
+            and not _pinned_to_primary.get()
+            and not connections[PRIMARY_ALIAS].in_atomic_block
+            and _lag_check.replica_is_fresh()
+        ):
+            return REPLICA_ALIAS
+        # Explicitly primary, so instances loaded from the replica do not keep
+        # reading their relations from it outside use_replica()
+        return PRIMARY_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Later reads in this request must see the write
+        _pinned_to_primary.set(True)
+        return PRIMARY_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        if {obj1._state.db, obj2._state.db} <= {PRIMARY_ALIAS, REPLICA_ALIAS, None}:
+            return True
+        return None
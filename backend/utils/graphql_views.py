@@ -0,0 +1,27 @@
+from graphene_django.views import GraphQLView
+from graphql import OperationType, get_operation_ast, parse
+
+from utils.db_routing import use_replica
+
+
+class ReplicaGraphQLView(GraphQLView):
+    """GraphQLView that runs query operations on the read replica; mutations stay on default."""
+
+    def execute_graphql_request(self, request, data, query, variables, operation_name, show_graphiql=False):
+        if self.is_query_operation(query, operation_name):
+            with use_replica():
+                return super().execute_graphql_request(
+                    request, data, query, variables, operation_name, show_graphiql
+                )
+        return super().execute_graphql_request(request, data, query, variables, operation_name, show_graphiql)
+
+    @staticmethod
+    def is_query_operation(query, operation_name) -> bool:
+        if not query:
+            return False
+        try:
+            operation = get_operation_ast(parse(query), operation_name)
+        except Exception:
+            # Let the parent report the syntax error
+            return False
+        return operation is not None and operation.operation == OperationType.QUERY
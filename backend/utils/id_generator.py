@@ -3,6 +3,9 @@ from campus.models import Campus
 from teachers.models import Teacher
 from coordinator.models import Coordinator
 from principals.models import Principal
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class IDGenerator:
@@ -37,10 +40,25 @@ class IDGenerator:
         except Campus.DoesNotExist:
             return f"C{campus_id:02d}"  # Fallback to old format
     
+    @staticmethod
+    def joining_year(joining_date):
+        """Year used in employee codes: the joining year (date or 'YYYY-MM-DD'), else 2025"""
+        if not joining_date:
+            return 2025
+        if isinstance(joining_date, str):
+            from datetime import datetime
+            joining_date = datetime.strptime(joining_date, '%Y-%m-%d').date()
+        return joining_date.year
+
     @staticmethod
     def generate_employee_code(campus_id, shift, year, role, entity_id):
         """Generate employee code: C01-M-25-P-0001"""
         campus_code = IDGenerator.get_campus_code_from_id(campus_id)
+        return IDGenerator.format_employee_code(campus_code, shift, year, role, entity_id)
+
+    @staticmethod
+    def format_employee_code(campus_code, shift, year, role, entity_id):
+        """Employee code from an already resolved campus code; no queries"""
         shift_code = IDGenerator.get_shift_code(shift)
         role_code = IDGenerator.get_role_code(role)
         year_short = str(year)[-2:]  # Last 2 digits of year
@@ -77,42 +95,42 @@ class IDGenerator:
         - Existing data is respected: on first run we seed the counter from
           the current max suffix for that role, then continue from there.
         """
-        from services.models import GlobalCounter
+        return IDGenerator.reserve_employee_numbers(role, 1)[0]
+
+    @staticmethod
+    def reserve_employee_numbers(role, count):
+        """
+        Reserve ``count`` consecutive employee numbers for ROLE with a single
+        counter increment and return them as a range. Seeds the counter the
+        same way as get_next_employee_number.
+        """
+        from services.counters import reserve_block
 
         role = (role or "").lower()
         key = f"employee_{role}"  # e.g. employee_teacher, employee_principal
+        return reserve_block(key, count, seed=lambda: IDGenerator._max_employee_number(role))
 
-        with transaction.atomic():
-            counter, _ = GlobalCounter.objects.select_for_update().get_or_create(
-                key=key,
-                defaults={"value": 0},
-            )
-
-            # If this counter is brand new (or still zero), seed it from existing data
-            if counter.value == 0:
-                if role == "teacher":
-                    existing_codes = Teacher.objects.filter(
-                        employee_code__isnull=False
-                    ).values_list("employee_code", flat=True)
-                elif role == "coordinator":
-                    existing_codes = Coordinator.objects.filter(
-                        employee_code__isnull=False
-                    ).values_list("employee_code", flat=True)
-                elif role == "principal":
-                    existing_codes = Principal.objects.filter(
-                        employee_code__isnull=False
-                    ).values_list("employee_code", flat=True)
-                else:
-                    existing_codes = []
-
-                numbers = IDGenerator._extract_suffix_numbers(existing_codes)
-                # Seed with current max so next number continues the series
-                counter.value = max(numbers) if numbers else 0
+    @staticmethod
+    def _max_employee_number(role):
+        """Highest existing code suffix for ROLE, used to seed a fresh counter"""
+        if role == "teacher":
+            existing_codes = Teacher.objects.filter(
+                employee_code__isnull=False
+            ).values_list("employee_code", flat=True)
+        elif role == "coordinator":
+            existing_codes = Coordinator.objects.filter(
+                employee_code__isnull=False
+            ).values_list("employee_code", flat=True)
+        elif role == "principal":
+            existing_codes = Principal.objects.filter(
+                employee_code__isnull=False
+            ).values_list("employee_code", flat=True)
+        else:
+            existing_codes = []
 
-            # Increment and return the new value
-            counter.value = counter.value + 1
-            counter.save(update_fields=["value"])
-            return counter.value
+        numbers = IDGenerator._extract_suffix_numbers(existing_codes)
+        # Seed with current max so next number continues the series
+        return max(numbers) if numbers else 0
 
     @staticmethod
     def generate_unique_employee_code(campus, shift, year, role):
@@ -189,7 +207,7 @@ class IDGenerator:
             return max(numbers) + 1
             
         except Exception as e:
-            print(f"Error getting next super admin number: {str(e)}")
+            logger.warning("Error getting next super admin number: %s", e)
             return 1
 
     @staticmethod
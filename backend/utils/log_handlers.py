@@ -0,0 +1,47 @@
+"""
+Non-blocking log handler.
+
+QueueListenerHandler is a QueueHandler that owns a QueueListener: request
+threads only resolve the message and enqueue the record, and a background
+thread does the actual write to stdout/stderr. Configure it from
+settings.LOGGING like any other handler; the ``formatter`` set on it is
+applied by the writer thread.
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+
+class QueueListenerHandler(QueueHandler):
+    def __init__(self, stream=None):
+        super().__init__(queue.SimpleQueue())
+        self.target = logging.StreamHandler(stream or sys.stdout)
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
+        atexit.register(self.close)
+
+    def setFormatter(self, fmt):
+        super().setFormatter(fmt)
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        # Resolve %-args on the calling thread (they may be model instances
+        # bound to this thread's DB connection); formatting happens on the
+        # listener thread.
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+    def close(self):
+        listener, self.listener = self.listener, None
+        if listener is not None:
+            listener.stop()
+            self.target.close()
+        super().close()
@@ -0,0 +1,54 @@
+"""
+Opt-in keyset pagination for list endpoints.
+
+Lists keep their page-number responses by default. A request that sends
+``cursor`` (or ``pagination=cursor`` for the first page) is paginated with
+a CursorPagination instead, which seeks on the ordering index rather than
+running OFFSET scans plus a COUNT(*) for every page.
+"""
+from __future__ import annotations
+
+from rest_framework.pagination import BasePagination, CursorPagination, PageNumberPagination
+
+
+class OptionalCursorPagination(BasePagination):
+    page_number_class = PageNumberPagination
+    cursor_class = CursorPagination
+    mode_query_param = 'pagination'
+
+    def __init__(self):
+        self._paginator = None
+
+    def wants_cursor(self, request) -> bool:
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.cursor_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self._paginator = self.cursor_class() if self.wants_cursor(request) else self.page_number_class()
+        return self._paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self._paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.page_number_class().get_paginated_response_schema(schema)
+
+    def get_results(self, data):
+        return self._paginator.get_results(data)
+
+    @property
+    def display_page_controls(self):
+        return getattr(self._paginator, 'display_page_controls', False)
+
+    def to_html(self):
+        return self._paginator.to_html()
+
+    def get_schema_operation_parameters(self, view):
+        parameters = self.page_number_class().get_schema_operation_parameters(view)
+        names = {parameter['name'] for parameter in parameters}
+        return parameters + [
+            parameter for parameter in self.cursor_class().get_schema_operation_parameters(view)
+            if parameter['name'] not in names
+        ]
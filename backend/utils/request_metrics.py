@@ -0,0 +1,239 @@
+"""
+Opt-in per-endpoint request metrics.
+
+RequestMetricsMiddleware records, for each request, the resolved URL name,
+wall time, SQL query count, total DB time and the statements executed more
+than once (by SQL fingerprint, the parametrized statement text). Samples go
+into a per-process ring buffer that is published to the default cache every
+few seconds, so the report endpoint and the ``request_metrics_report``
+command see every worker.
+
+Enable with REQUEST_METRICS_ENABLED=True. When disabled the middleware
+raises MiddlewareNotUsed at startup and is dropped from the chain.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import socket
+import statistics
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = 'request_metrics'
+PROCESSES_KEY = f'{CACHE_PREFIX}:processes'
+
+# Numeric columns of a summarize() row the report can be sorted by
+SORT_FIELDS = ('total_ms', 'p95_ms', 'p50_ms', 'requests', 'errors', 'avg_queries', 'max_queries', 'avg_db_ms', 'duplicate_queries')
+
+
+@dataclass
+class RequestSample:
+    endpoint: str
+    method: str
+    status: int
+    wall_ms: float
+    queries: int
+    db_ms: float
+    duplicate_queries: int
+    # fingerprint hash -> (executions, SQL text) for statements run more than once
+    duplicates: dict = field(default_factory=dict)
+    timestamp: float = 0.0
+
+
+class _QueryCollector:
+    """connection.execute_wrapper hook counting queries, DB time and repeated statements."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.fingerprints = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+            self.fingerprints[sql] = self.fingerprints.get(sql, 0) + 1
+
+    def duplicates(self, limit: int = 5) -> dict:
+        repeated = sorted(
+            ((count, sql) for sql, count in self.fingerprints.items() if count > 1),
+            key=lambda item: -item[0],
+        )[:limit]
+        return {
+            hashlib.md5(sql.encode('utf-8')).hexdigest()[:12]: (count, sql[:300])
+            for count, sql in repeated
+        }
+
+
+class MetricsBuffer:
+    """Thread-safe ring buffer of recent samples for this process."""
+
+    def __init__(self, size: int, publish_interval: float):
+        self.samples = deque(maxlen=size)
+        self.publish_interval = publish_interval
+        self.lock = threading.Lock()
+        self.last_published = 0.0
+        self.key = f'{CACHE_PREFIX}:{socket.gethostname()}:{os.getpid()}'
+
+    def add(self, sample: RequestSample) -> None:
+        with self.lock:
+            self.samples.append(sample)
+            due = sample.timestamp - self.last_published >= self.publish_interval
+            if due:
+                self.last_published = sample.timestamp
+                snapshot = [asdict(s) for s in self.samples]
+        if due:
+            self.publish(snapshot)
+
+    def publish(self, snapshot: list) -> None:
+        timeout = getattr(settings, 'REQUEST_METRICS_TTL', 3600)
+        try:
+            cache.set(self.key, snapshot, timeout)
+            processes = cache.get(PROCESSES_KEY) or {}
+            now = time.time()
+            if now - processes.get(self.key, 0) > timeout / 2:
+                # Refresh this process and forget workers that stopped publishing
+                processes = {key: seen for key, seen in processes.items() if now - seen < timeout}
+                processes[self.key] = now
+                cache.set(PROCESSES_KEY, processes, timeout)
+        except Exception as e:
+            logger.warning("Could not publish request metrics: %s", e)
+
+
+_buffer: Optional[MetricsBuffer] = None
+
+
+def get_buffer() -> MetricsBuffer:
+    global _buffer
+    if _buffer is None:
+        _buffer = MetricsBuffer(
+            size=getattr(settings, 'REQUEST_METRICS_BUFFER_SIZE', 2000),
+            publish_interval=getattr(settings, 'REQUEST_METRICS_PUBLISH_INTERVAL', 10.0),
+        )
+    return _buffer
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_METRICS_ENABLED', False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.buffer = get_buffer()
+
+    def __call__(self, request):
+        collector = _QueryCollector()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(collector))
+            response = self.get_response(request)
+        wall = time.perf_counter() - started
+
+        match = getattr(request, 'resolver_match', None)
+        duplicates = collector.duplicates()
+        self.buffer.add(RequestSample(
+            endpoint=(match.view_name if match else None) or '<unresolved>',
+            method=request.method,
+            status=getattr(response, 'status_code', 0),
+            wall_ms=round(wall * 1000, 2),
+            queries=collector.queries,
+            db_ms=round(collector.db_time * 1000, 2),
+            duplicate_queries=sum(count - 1 for count, _ in duplicates.values()),
+            duplicates=duplicates,
+            timestamp=time.time(),
+        ))
+        return response
+
+
+def collect_samples() -> list:
+    """Samples from every process that published recently, plus this process's unpublished ones."""
+    samples = []
+    try:
+        processes = cache.get(PROCESSES_KEY) or {}
+        snapshots = cache.get_many(list(processes)) if processes else {}
+    except Exception as e:
+        logger.warning("Could not read request metrics: %s", e)
+        snapshots = {}
+    local = _buffer
+    for key, snapshot in snapshots.items():
+        if local is None or key != local.key:
+            samples.extend(snapshot)
+    if local is not None:
+        with local.lock:
+            samples.extend(asdict(s) for s in local.samples)
+    return samples
+
+
+def _percentile(ordered: list, fraction: float) -> float:
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def summarize(samples: list, sort: str = 'total_ms', limit: int = 20) -> list:
+    """
+    Aggregate samples per (method, endpoint), worst first by ``sort``, one of
+    SORT_FIELDS; anything else raises ValueError.
+    """
+    if sort not in SORT_FIELDS:
+        raise ValueError(f"sort must be one of: {', '.join(SORT_FIELDS)}")
+    grouped = {}
+    for sample in samples:
+        grouped.setdefault((sample['method'], sample['endpoint']), []).append(sample)
+
+    report = []
+    for (method, endpoint), rows in grouped.items():
+        walls = sorted(row['wall_ms'] for row in rows)
+        queries = [row['queries'] for row in rows]
+        fingerprints = {}
+        for row in rows:
+            for fingerprint, (count, sql) in row['duplicates'].items():
+                total, _ = fingerprints.get(fingerprint, (0, sql))
+                fingerprints[fingerprint] = (total + count, sql)
+        worst = max(fingerprints.items(), key=lambda item: item[1][0]) if fingerprints else None
+        report.append({
+            'endpoint': endpoint,
+            'method': method,
+            'requests': len(rows),
+            'errors': sum(1 for row in rows if row['status'] >= 500),
+            'total_ms': round(sum(walls), 2),
+            'p50_ms': round(statistics.median(walls), 2),
+            'p95_ms': round(_percentile(walls, 0.95), 2),
+            'avg_queries': round(sum(queries) / len(rows), 1),
+            'max_queries': max(queries),
+            'avg_db_ms': round(sum(row['db_ms'] for row in rows) / len(rows), 2),
+            'duplicate_queries': sum(row['duplicate_queries'] for row in rows),
+            'top_duplicate': {
+                'fingerprint': worst[0],
+                'executions': worst[1][0],
+                'sql': worst[1][1],
+            } if worst else None,
+        })
+    report.sort(key=lambda item: -item[sort])
+    return report[:limit]
+
+
+def reset_metrics() -> None:
+    """Drop published and local samples."""
+    try:
+        processes = cache.get(PROCESSES_KEY) or {}
+        cache.delete_many(list(processes) + [PROCESSES_KEY])
+    except Exception as e:
+        logger.warning("Could not reset request metrics: %s", e)
+    if _buffer is not None:
+        with _buffer.lock:
+            _buffer.samples.clear()
@@ -0,0 +1,55 @@
+"""
+StreamingHttpResponse helpers that keep memory flat under both servers.
+
+Under ASGI (daphne) Django buffers a synchronous streaming iterator into a
+list before sending it, so the body is handed over as an async iterator
+that pulls each chunk on the request's sync thread instead.
+"""
+from __future__ import annotations
+
+from typing import Iterable, Iterator, Optional
+
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
+
+_END = object()
+
+
+def buffered(parts: Iterable[str], size: int = 64 * 1024) -> Iterator[bytes]:
+    """Join small string parts (e.g. CSV lines) into ~``size`` byte chunks."""
+    buffer, length = [], 0
+    for part in parts:
+        buffer.append(part)
+        length += len(part)
+        if length >= size:
+            yield ''.join(buffer).encode('utf-8')
+            buffer, length = [], 0
+    if buffer:
+        yield ''.join(buffer).encode('utf-8')
+
+
+async def _async_chunks(chunks: Iterator[bytes]):
+    # thread_sensitive keeps every next() on the thread that owns the DB connection
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    try:
+        while True:
+            chunk = await next_chunk(chunks, _END)
+            if chunk is _END:
+                break
+            yield chunk
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close:
+            await sync_to_async(close, thread_sensitive=True)()
+
+
+def streaming_response(request, chunks: Iterable[bytes], content_type: str,
+                       filename: Optional[str] = None) -> StreamingHttpResponse:
+    """Stream ``chunks`` without buffering, as an attachment when ``filename`` is given."""
+    chunks = iter(chunks)
+    is_asgi = hasattr(getattr(request, '_request', request), 'scope')
+    response = StreamingHttpResponse(_async_chunks(chunks) if is_asgi else chunks, content_type=content_type)
+    if filename:
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['Cache-Control'] = 'no-store'
+    return response